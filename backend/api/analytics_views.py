@@ -4,12 +4,12 @@ Analytics API Views
 REST API endpoints for farm analytics and KPIs.
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 from collections import defaultdict
 
 from django.conf import settings
-from django.db.models import Sum, Count, Avg, F, Q
+from django.db.models import Sum, Count, Avg, F, Max, OuterRef, Q, Subquery
 from django.db.models.functions import TruncMonth, ExtractMonth
 from django.utils import timezone
 
@@ -24,6 +24,7 @@ from .models import (
     Field, Farm, WaterTest, WaterSource, LaborContractor,
     ApplicationEvent, TankMixItem,
 )
+from .services.dashboard_cache import dashboard_response
 from .services.season_service import SeasonService
 
 
@@ -33,6 +34,12 @@ def get_company_from_user(user):
     return membership.company if membership else None
 
 
+def _request_cache_params(request):
+    """Dashboard cache params: the query string plus today's date, which
+    season progress and due-soon counts are relative to."""
+    return {**request.query_params.dict(), 'today': date.today()}
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, HasCompanyAccess])
 def get_analytics_dashboard(request):
@@ -134,11 +141,42 @@ def _get_analytics_dashboard_impl(request, company):
         start_date = datetime(year, 1, 1).date()
         end_date = datetime(year, 12, 31).date()
 
-    year = start_date.year
-
     farm_id = request.query_params.get('farm_id')
+    today = timezone.now().date()
+
+    return dashboard_response(
+        request, 'analytics', company.id,
+        {
+            'start_date': start_date, 'end_date': end_date,
+            'farm_id': farm_id, 'today': today,
+        },
+        lambda: _build_analytics_dashboard(company, start_date, end_date, farm_id, today),
+    )
+
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
 
-    # Base querysets filtered by company and date
+def _by_month(rows):
+    """Fold TruncMonth rows into a Jan..Dec list of counts."""
+    counts = dict.fromkeys(MONTH_NAMES, 0)
+    for row in rows:
+        if row['month']:
+            counts[MONTH_NAMES[row['month'].month - 1]] += row['count']
+    return [{'month': m, 'count': counts[m]} for m in MONTH_NAMES]
+
+
+def _build_analytics_dashboard(company, start_date, end_date, farm_id, today):
+    """
+    Analytics dashboard payload for a date window.
+
+    Each source table is scanned once: status counts ride along the
+    by-month queries as filtered Counts, and harvest, revenue and labor
+    figures are grouped by field (and crop) in SQL, then folded into the
+    totals, by-crop and per-field views here. The query count does not
+    depend on how many fields, crops or contractors the company has.
+    """
     farms = Farm.objects.filter(company=company)
     if farm_id:
         farms = farms.filter(id=farm_id)
@@ -155,33 +193,22 @@ def _get_analytics_dashboard_impl(request, company):
         application_date__lte=end_date
     )
 
-    app_total = applications.count()
-    app_pending = applications.filter(status='pending_signature').count()
-    app_complete = applications.filter(status='complete').count()
-    app_submitted = applications.filter(submitted_to_pur=True).count()
-
-    # Applications by month
-    apps_by_month = (
+    apps_by_month = list(
         applications
         .annotate(month=TruncMonth('application_date'))
         .values('month')
-        .annotate(count=Count('id'))
+        .annotate(
+            count=Count('id'),
+            pending=Count('id', filter=Q(status='pending_signature')),
+            complete=Count('id', filter=Q(status='complete')),
+            submitted=Count('id', filter=Q(submitted_to_pur=True)),
+        )
         .order_by('month')
     )
-
-    month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                   'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-
-    # Initialize all months with 0
-    apps_monthly = {m: 0 for m in month_names}
-    for item in apps_by_month:
-        if item['month']:
-            month_idx = item['month'].month - 1
-            apps_monthly[month_names[month_idx]] = item['count']
-
-    apps_by_month_list = [
-        {'month': m, 'count': apps_monthly[m]} for m in month_names
-    ]
+    app_total = sum(row['count'] for row in apps_by_month)
+    app_pending = sum(row['pending'] for row in apps_by_month)
+    app_complete = sum(row['complete'] for row in apps_by_month)
+    app_submitted = sum(row['submitted'] for row in apps_by_month)
 
     # PUR compliance rate
     pur_compliance_rate = 0
@@ -189,9 +216,9 @@ def _get_analytics_dashboard_impl(request, company):
         pur_compliance_rate = round((app_submitted / app_complete) * 100, 1)
 
     # Top products used (legacy)
-    top_products = (
+    top_products = list(
         applications
-        .values('product__name')
+        .values(product_name=F('product__product_name'))
         .annotate(count=Count('id'))
         .order_by('-count')[:5]
     )
@@ -205,27 +232,20 @@ def _get_analytics_dashboard_impl(request, company):
         date_started__date__lte=end_date,
     )
 
-    evt_total = app_events.count()
-    evt_draft = app_events.filter(pur_status='draft').count()
-    evt_sent = app_events.filter(pur_status='sent').count()
-
-    events_by_month = (
+    events_by_month = list(
         app_events
         .annotate(month=TruncMonth('date_started'))
         .values('month')
-        .annotate(count=Count('id'))
+        .annotate(
+            count=Count('id'),
+            draft=Count('id', filter=Q(pur_status='draft')),
+            sent=Count('id', filter=Q(pur_status='sent')),
+        )
         .order_by('month')
     )
-
-    events_monthly = {m: 0 for m in month_names}
-    for item in events_by_month:
-        if item['month']:
-            month_idx = item['month'].month - 1
-            events_monthly[month_names[month_idx]] = item['count']
-
-    events_by_month_list = [
-        {'month': m, 'count': events_monthly[m]} for m in month_names
-    ]
+    evt_total = sum(row['count'] for row in events_by_month)
+    evt_draft = sum(row['draft'] for row in events_by_month)
+    evt_sent = sum(row['sent'] for row in events_by_month)
 
     # Top products from new model (via TankMixItem)
     evt_top_products = list(
@@ -244,43 +264,51 @@ def _get_analytics_dashboard_impl(request, company):
         harvest_date__lte=end_date
     )
 
-    total_bins = harvests.aggregate(total=Sum('total_bins'))['total'] or 0
-    total_acres_harvested = harvests.aggregate(total=Sum('acres_harvested'))['total'] or Decimal('0')
+    # Bins and acres per (field, crop); loads joined to their harvest for
+    # revenue on the same grain.
+    harvest_groups = (
+        harvests
+        .values('field_id', 'crop_variety')
+        .annotate(bins=Sum('total_bins'), acres=Sum('acres_harvested'))
+        .order_by()
+    )
+    revenue_groups = (
+        HarvestLoad.objects.filter(harvest__in=harvests)
+        .values('harvest__field_id', 'harvest__crop_variety')
+        .annotate(revenue=Sum('total_revenue'))
+        .order_by()
+    )
+
+    crops = defaultdict(lambda: {'bins': 0, 'acres': Decimal('0'), 'revenue': Decimal('0')})
+    by_field = defaultdict(lambda: {
+        'bins': 0, 'acres': Decimal('0'), 'revenue': Decimal('0'), 'cost': Decimal('0'),
+    })
+    for row in harvest_groups:
+        for bucket in (crops[row['crop_variety']], by_field[row['field_id']]):
+            bucket['bins'] += row['bins'] or 0
+            bucket['acres'] += row['acres'] or 0
+    for row in revenue_groups:
+        revenue = row['revenue'] or 0
+        crops[row['harvest__crop_variety']]['revenue'] += revenue
+        by_field[row['harvest__field_id']]['revenue'] += revenue
+
+    total_bins = sum(crop['bins'] for crop in crops.values())
+    total_acres_harvested = sum((crop['acres'] for crop in crops.values()), Decimal('0'))
+    total_revenue = sum((crop['revenue'] for crop in crops.values()), Decimal('0'))
 
     yield_per_acre = 0
     if total_acres_harvested > 0:
         yield_per_acre = round(float(total_bins) / float(total_acres_harvested), 1)
 
-    # Revenue from harvest loads
-    harvest_ids = harvests.values_list('id', flat=True)
-    loads = HarvestLoad.objects.filter(harvest_id__in=harvest_ids)
-
-    total_revenue = loads.aggregate(total=Sum('total_revenue'))['total'] or Decimal('0')
-
-    # Revenue by crop
-    revenue_by_crop = (
-        harvests
-        .values('crop_variety')
-        .annotate(
-            bins=Sum('total_bins'),
-            acres=Sum('acres_harvested')
-        )
-    )
-
-    # Get revenue for each crop variety by joining with loads
-    crop_revenue_data = []
-    for crop in revenue_by_crop:
-        crop_harvests = harvests.filter(crop_variety=crop['crop_variety'])
-        crop_harvest_ids = crop_harvests.values_list('id', flat=True)
-        crop_loads = HarvestLoad.objects.filter(harvest_id__in=crop_harvest_ids)
-        crop_revenue = crop_loads.aggregate(total=Sum('total_revenue'))['total'] or Decimal('0')
-
-        crop_revenue_data.append({
-            'crop': crop['crop_variety'] or 'Unknown',
-            'revenue': float(crop_revenue),
-            'bins': crop['bins'] or 0,
-            'acres': float(crop['acres'] or 0)
-        })
+    crop_revenue_data = [
+        {
+            'crop': crop or 'Unknown',
+            'revenue': float(data['revenue']),
+            'bins': data['bins'],
+            'acres': float(data['acres']),
+        }
+        for crop, data in crops.items()
+    ]
 
     # Sort by revenue descending
     crop_revenue_data.sort(key=lambda x: x['revenue'], reverse=True)
@@ -288,10 +316,20 @@ def _get_analytics_dashboard_impl(request, company):
     # ==========================================================================
     # LABOR DATA
     # ==========================================================================
-    labor = HarvestLabor.objects.filter(harvest_id__in=harvest_ids)
+    labor = HarvestLabor.objects.filter(harvest__in=harvests)
 
-    total_labor_cost = labor.aggregate(total=Sum('total_cost'))['total'] or Decimal('0')
-    total_labor_hours = labor.aggregate(total=Sum('hours_worked'))['total'] or Decimal('0')
+    total_labor_cost = Decimal('0')
+    total_labor_hours = Decimal('0')
+    for row in (
+        labor
+        .values('harvest__field_id')
+        .annotate(cost=Sum('total_labor_cost'), hours=Sum('total_hours'))
+        .order_by()
+    ):
+        cost = row['cost'] or 0
+        by_field[row['harvest__field_id']]['cost'] += cost
+        total_labor_cost += cost
+        total_labor_hours += row['hours'] or 0
 
     cost_per_bin = 0
     if total_bins > 0:
@@ -308,42 +346,49 @@ def _get_analytics_dashboard_impl(request, company):
     if total_acres_harvested > 0:
         revenue_per_acre = round(float(total_revenue) / float(total_acres_harvested), 2)
 
-    # Contractor performance
+    # Contractor performance. A harvest's bins are summed on only the first
+    # labor row each contractor has on it, so a harvest with several crews
+    # of one contractor is counted once.
+    first_contractor_row = (
+        HarvestLabor.objects
+        .filter(
+            harvest_id=OuterRef('harvest_id'),
+            contractor__company_name=OuterRef('contractor__company_name'),
+        )
+        .order_by('pk')
+        .values('pk')[:1]
+    )
     contractor_stats = (
         labor
-        .values('contractor__name')
+        .filter(contractor__isnull=False)
+        .values('contractor__company_name')
         .annotate(
-            total_cost=Sum('total_cost'),
-            total_hours=Sum('hours_worked'),
-            harvest_count=Count('harvest', distinct=True)
+            total_cost=Sum('total_labor_cost'),
+            total_hours=Sum('total_hours'),
+            harvest_count=Count('harvest', distinct=True),
+            bins=Sum('harvest__total_bins', filter=Q(pk=Subquery(first_contractor_row))),
         )
         .order_by('-total_cost')
     )
 
     contractors = []
     for cs in contractor_stats:
-        if cs['contractor__name']:
-            # Get bins harvested by this contractor
-            contractor_harvest_ids = labor.filter(
-                contractor__name=cs['contractor__name']
-            ).values_list('harvest_id', flat=True)
-            contractor_bins = harvests.filter(
-                id__in=contractor_harvest_ids
-            ).aggregate(total=Sum('total_bins'))['total'] or 0
+        if cs['contractor__company_name']:
+            contractor_bins_total = cs['bins'] or 0
 
             contractor_cost_per_bin = 0
-            if contractor_bins > 0:
+            if contractor_bins_total > 0:
                 contractor_cost_per_bin = round(
-                    float(cs['total_cost'] or 0) / float(contractor_bins), 2
+                    float(cs['total_cost'] or 0) / float(contractor_bins_total), 2
                 )
 
             bins_per_hour = 0
             if cs['total_hours'] and cs['total_hours'] > 0:
-                bins_per_hour = round(float(contractor_bins) / float(cs['total_hours']), 1)
+                bins_per_hour = round(float(contractor_bins_total) / float(cs['total_hours']), 1)
 
             contractors.append({
-                'name': cs['contractor__name'],
-                'bins': contractor_bins,
+                'name': cs['contractor__company_name'],
+                'bins': contractor_bins_total,
                 'cost': float(cs['total_cost'] or 0),
                 'hours': float(cs['total_hours'] or 0),
                 'cost_per_bin': contractor_cost_per_bin,
@@ -353,69 +398,67 @@ def _get_analytics_dashboard_impl(request, company):
     # ==========================================================================
     # WATER DATA
     # ==========================================================================
-    water_sources = WaterSource.objects.filter(farm_id__in=farm_ids)
-    water_source_ids = water_sources.values_list('id', flat=True)
-
-    water_tests = WaterTest.objects.filter(
-        water_source_id__in=water_source_ids,
-        sample_date__gte=start_date,
-        sample_date__lte=end_date
+    in_window = Q(test_date__gte=start_date, test_date__lte=end_date)
+    water_counts = WaterTest.objects.filter(
+        in_window, water_source__farm_id__in=farm_ids,
+    ).aggregate(
+        total=Count('id'),
+        passed=Count('id', filter=Q(status='pass')),
+        failed=Count('id', filter=Q(status='fail')),
     )
-
-    tests_total = water_tests.count()
-    tests_passed = water_tests.filter(passed=True).count()
-    tests_failed = water_tests.filter(passed=False).count()
+    tests_total = water_counts['total']
+    tests_passed = water_counts['passed']
+    tests_failed = water_counts['failed']
 
     water_pass_rate = 0
     if tests_total > 0:
         water_pass_rate = round((tests_passed / tests_total) * 100, 1)
 
     # Tests due soon (within 30 days based on test frequency)
+    due_by = today + timedelta(days=30)
     tests_due_soon = 0
-    for ws in water_sources.filter(active=True):
-        if ws.test_frequency_days:
-            last_test = water_tests.filter(water_source=ws).order_by('-sample_date').first()
-            if last_test:
-                next_due = last_test.sample_date + timedelta(days=ws.test_frequency_days)
-                if next_due <= (timezone.now().date() + timedelta(days=30)):
-                    tests_due_soon += 1
-            else:
-                tests_due_soon += 1  # Never tested
+    for frequency, last_tested in (
+        WaterSource.objects
+        .filter(farm_id__in=farm_ids, active=True, test_frequency_days__gt=0)
+        .annotate(last_tested=Max('water_tests__test_date', filter=Q(
+            water_tests__test_date__gte=start_date,
+            water_tests__test_date__lte=end_date,
+        )))
+        .values_list('test_frequency_days', 'last_tested')
+    ):
+        if last_tested is None or last_tested + timedelta(days=frequency) <= due_by:
+            tests_due_soon += 1  # Due, or never tested in the window
 
     # ==========================================================================
     # FIELD PERFORMANCE
     # ==========================================================================
-    fields = Field.objects.filter(farm_id__in=farm_ids)
+    fields = list(Field.objects.filter(farm_id__in=farm_ids).values('id', 'name', 'farm__name'))
 
     field_performance = []
     for field in fields:
-        field_harvests = harvests.filter(field=field)
-        field_bins = field_harvests.aggregate(total=Sum('total_bins'))['total'] or 0
-        field_acres = field_harvests.aggregate(total=Sum('acres_harvested'))['total'] or Decimal('0')
-
-        field_harvest_ids = field_harvests.values_list('id', flat=True)
-        field_loads = HarvestLoad.objects.filter(harvest_id__in=field_harvest_ids)
-        field_revenue = field_loads.aggregate(total=Sum('total_revenue'))['total'] or Decimal('0')
-
-        field_labor = HarvestLabor.objects.filter(harvest_id__in=field_harvest_ids)
-        field_cost = field_labor.aggregate(total=Sum('total_cost'))['total'] or Decimal('0')
+        totals = by_field.get(field['id'])
+        if totals is None:
+            continue
+        field_bins = totals['bins']
+        field_acres = totals['acres']
+        field_revenue = totals['revenue']
 
         field_yield = 0
         if field_acres > 0:
             field_yield = round(float(field_bins) / float(field_acres), 1)
 
-        field_profit = float(field_revenue) - float(field_cost)
+        field_profit = float(field_revenue) - float(totals['cost'])
 
         if field_bins > 0 or float(field_revenue) > 0:
             field_performance.append({
-                'id': field.id,
-                'name': field.name,
-                'farm_name': field.farm.name if field.farm else '',
+                'id': field['id'],
+                'name': field['name'],
+                'farm_name': field['farm__name'] or '',
                 'bins': field_bins,
                 'acres': float(field_acres),
                 'yield_per_acre': field_yield,
                 'revenue': float(field_revenue),
-                'cost': float(field_cost),
+                'cost': float(totals['cost']),
                 'profit': field_profit,
             })
 
@@ -446,11 +489,11 @@ def _get_analytics_dashboard_impl(request, company):
     # ==========================================================================
     # RESPONSE
     # ==========================================================================
-    return Response({
+    return {
         'period': {
             'start_date': start_date.isoformat(),
             'end_date': end_date.isoformat(),
-            'year': year,
+            'year': start_date.year,
         },
         'financial': {
             'total_revenue': float(total_revenue),
@@ -467,14 +510,14 @@ def _get_analytics_dashboard_impl(request, company):
             'complete': app_complete,
             'submitted_to_pur': app_submitted,
             'pur_compliance_rate': pur_compliance_rate,
-            'by_month': apps_by_month_list,
-            'top_products': list(top_products),
+            'by_month': _by_month(apps_by_month),
+            'top_products': top_products,
         },
         'application_events': {
             'total': evt_total,
             'draft': evt_draft,
             'sent': evt_sent,
-            'by_month': events_by_month_list,
+            'by_month': _by_month(events_by_month),
             'top_products': evt_top_products,
         },
         'harvests': {
@@ -491,14 +534,14 @@ def _get_analytics_dashboard_impl(request, company):
             'tests_due_soon': tests_due_soon,
         },
         'fields': {
-            'total': fields.count(),
+            'total': len(fields),
             'with_harvests': len(field_performance),
             'top_performers': top_performers,
             'needs_attention': needs_attention[:5],
             'all_performance': field_performance,
         },
         'contractors': contractors,
-    })
+    }
 
 
 @api_view(['GET'])
@@ -636,7 +679,10 @@ def get_season_dashboard(request):
         )
 
     try:
-        return _get_season_dashboard_impl(request, company)
+        return dashboard_response(
+            request, 'season', company.id, _request_cache_params(request),
+            lambda: _get_season_dashboard_impl(request, company).data,
+        )
     except Exception as e:
         logger.exception(f"Season dashboard error: {e}")
         return Response(
@@ -647,7 +693,6 @@ def get_season_dashboard(request):
 
 def _get_season_dashboard_impl(request, company):
     """Internal implementation of season dashboard."""
-    from datetime import date
 
     # Parse parameters
     season_label = request.query_params.get('season')
@@ -861,7 +906,10 @@ def get_multi_crop_season_dashboard(request):
         )
 
     try:
-        return _get_multi_crop_season_dashboard_impl(request, company)
+        return dashboard_response(
+            request, 'multi_crop_season', company.id, _request_cache_params(request),
+            lambda: _get_multi_crop_season_dashboard_impl(request, company).data,
+        )
     except Exception as e:
         tb = traceback.format_exc()
         logger.exception(f"Multi-crop season dashboard error: {e}\n{tb}")
@@ -873,7 +921,6 @@ def get_multi_crop_season_dashboard(request):
 
 def _get_multi_crop_season_dashboard_impl(request, company):
     """Internal implementation of multi-crop season dashboard."""
-    from datetime import date
     from .models import Crop, CropCategory
 
     farm_id = request.query_params.get('farm_id')
@@ -7,22 +7,179 @@ This module provides API endpoints for viewing and exporting audit logs.
 Supports filtering by date range, user, action type, and model name.
 """
 
+import base64
 from datetime import datetime, timedelta
-from io import BytesIO
 
 from django.db import models as db_models
-from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from .permissions import HasCompanyAccess
+from .view_helpers import EXPORT_CHUNK_SIZE, streaming_csv_response, xlsx_file_response
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 
 from .models import AuditLog, User
+from .services import audit_activity
+
+EXPORT_HEADERS = [
+    "Timestamp",
+    "User Email",
+    "User Name",
+    "Action",
+    "Record Type",
+    "Record ID",
+    "Description",
+    "IP Address",
+    "Changes Summary"
+]
+
+EXPORT_COLUMN_WIDTHS = [20, 30, 25, 15, 20, 15, 40, 15, 50]
+
+
+def _apply_audit_filters(queryset, params):
+    """
+    Apply the date range, user, action, model and search filters shared by
+    the list and export endpoints.
+
+    Returns (queryset, filters_applied) where filters_applied is a list of
+    human-readable descriptions of the filters that were supplied.
+    """
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    user_id = params.get('user_id')
+    action = params.get('action')
+    model_name = params.get('model_name')
+    search = params.get('search')
+
+    if start_date:
+        try:
+            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
+            if timezone.is_naive(start):
+                start = timezone.make_aware(start)
+            queryset = queryset.filter(timestamp__gte=start)
+        except ValueError:
+            pass
+
+    if end_date:
+        try:
+            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            if timezone.is_naive(end):
+                end = timezone.make_aware(end)
+            # Include the entire end date
+            end = end + timedelta(days=1)
+            queryset = queryset.filter(timestamp__lt=end)
+        except ValueError:
+            pass
+
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+
+    if action:
+        queryset = queryset.filter(action=action)
+
+    if model_name:
+        queryset = queryset.filter(model_name__iexact=model_name)
+
+    if search:
+        queryset = queryset.filter(object_repr__icontains=search)
+
+    filters_applied = []
+    if start_date:
+        filters_applied.append(f"From: {start_date}")
+    if end_date:
+        filters_applied.append(f"To: {end_date}")
+    if user_id:
+        filters_applied.append(f"User ID: {user_id}")
+    if action:
+        filters_applied.append(f"Action: {action}")
+    if model_name:
+        filters_applied.append(f"Record Type: {model_name}")
+    if search:
+        filters_applied.append(f"Search: {search}")
+
+    return queryset, filters_applied
+
+
+def _serialize_log(log):
+    """Serialize an audit log entry for the list endpoint."""
+    return {
+        'id': log.id,
+        'timestamp': log.timestamp.isoformat(),
+        'user': {
+            'id': log.user.id if log.user else None,
+            'email': log.user.email if log.user else 'System',
+            'first_name': log.user.first_name if log.user else '',
+            'last_name': log.user.last_name if log.user else '',
+        } if log.user else None,
+        'action': log.action,
+        'action_display': dict(AuditLog.ACTION_TYPES).get(log.action, log.action),
+        'model_name': log.model_name,
+        'object_id': log.object_id,
+        'object_repr': log.object_repr,
+        'changes': log.changes,
+        'ip_address': log.ip_address,
+        'user_agent': log.user_agent[:100] if log.user_agent else None,
+    }
+
+
+def _encode_cursor(log):
+    """Build an opaque keyset cursor pointing just past ``log``."""
+    raw = f"{log.timestamp.isoformat()}|{log.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(token):
+    """
+    Decode a cursor produced by _encode_cursor into (timestamp, id).
+
+    Raises ValueError if the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token.encode()).decode()
+        ts_part, id_part = raw.rsplit('|', 1)
+        return datetime.fromisoformat(ts_part), int(id_part)
+    except (UnicodeError, TypeError, ValueError) as exc:
+        raise ValueError(f"Invalid cursor: {token!r}") from exc
+
+
+def _changes_summary(changes):
+    """Condense a changes dict into a single spreadsheet-friendly string."""
+    if not changes or not isinstance(changes, dict):
+        return ""
+    changes_list = []
+    for field, change in changes.items():
+        if isinstance(change, dict) and 'old' in change and 'new' in change:
+            changes_list.append(f"{field}: {change['old']} → {change['new']}")
+        else:
+            changes_list.append(f"{field}: {change}")
+    summary = "; ".join(changes_list[:5])
+    if len(changes) > 5:
+        summary += f" (+{len(changes) - 5} more)"
+    return summary
+
+
+def _export_row(log):
+    """Flatten an audit log entry into the export column order."""
+    user_name = ""
+    if log.user:
+        user_name = f"{log.user.first_name} {log.user.last_name}".strip()
+
+    return [
+        log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        log.user.email if log.user else "System",
+        user_name,
+        dict(AuditLog.ACTION_TYPES).get(log.action, log.action),
+        log.model_name,
+        log.object_id,
+        log.object_repr,
+        log.ip_address or "",
+        _changes_summary(log.changes),
+    ]
 
 
 @api_view(['GET'])
@@ -41,6 +198,10 @@ def audit_log_list(request):
         - page: Page number (default: 1)
         - page_size: Items per page (default: 25, max: 100)
         - ordering: Field to order by (default: -timestamp)
+        - cursor: Switches to keyset pagination on (timestamp, id). Pass an
+          empty value for the first page, then the previous response's
+          next_cursor. Only timestamp orderings are supported; the
+          response omits count/total_pages so no COUNT(*) is issued.
     
     Returns:
         Paginated list of audit log entries with metadata.
@@ -56,49 +217,23 @@ def audit_log_list(request):
     
     # Base queryset - filter by company (RLS provides backup protection)
     queryset = AuditLog.objects.filter(company=company).select_related('user')
+    queryset, _ = _apply_audit_filters(queryset, request.query_params)
     
-    # Apply filters
-    start_date = request.query_params.get('start_date')
-    end_date = request.query_params.get('end_date')
-    user_id = request.query_params.get('user_id')
-    action = request.query_params.get('action')
-    model_name = request.query_params.get('model_name')
-    search = request.query_params.get('search')
-    
-    if start_date:
-        try:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            if timezone.is_naive(start):
-                start = timezone.make_aware(start)
-            queryset = queryset.filter(timestamp__gte=start)
-        except ValueError:
-            pass
-    
-    if end_date:
-        try:
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            if timezone.is_naive(end):
-                end = timezone.make_aware(end)
-            # Include the entire end date
-            end = end + timedelta(days=1)
-            queryset = queryset.filter(timestamp__lt=end)
-        except ValueError:
-            pass
-    
-    if user_id:
-        queryset = queryset.filter(user_id=user_id)
-    
-    if action:
-        queryset = queryset.filter(action=action)
+    ordering = request.query_params.get('ordering', '-timestamp')
     
-    if model_name:
-        queryset = queryset.filter(model_name__iexact=model_name)
+    try:
+        page = int(request.query_params.get('page', 1))
+        page_size = min(int(request.query_params.get('page_size', 25)), 100)
+    except ValueError:
+        page = 1
+        page_size = 25
     
-    if search:
-        queryset = queryset.filter(object_repr__icontains=search)
+    if 'cursor' in request.query_params:
+        return _cursor_page(
+            queryset, request.query_params['cursor'], ordering, page_size
+        )
     
     # Ordering
-    ordering = request.query_params.get('ordering', '-timestamp')
     valid_orderings = ['timestamp', '-timestamp', 'user__email', '-user__email', 
                        'action', '-action', 'model_name', '-model_name']
     if ordering in valid_orderings:
@@ -107,13 +242,6 @@ def audit_log_list(request):
         queryset = queryset.order_by('-timestamp')
     
     # Pagination
-    try:
-        page = int(request.query_params.get('page', 1))
-        page_size = min(int(request.query_params.get('page_size', 25)), 100)
-    except ValueError:
-        page = 1
-        page_size = 25
-    
     total_count = queryset.count()
     total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
     
@@ -122,30 +250,8 @@ def audit_log_list(request):
     
     logs = queryset[start_idx:end_idx]
     
-    # Serialize the results
-    results = []
-    for log in logs:
-        results.append({
-            'id': log.id,
-            'timestamp': log.timestamp.isoformat(),
-            'user': {
-                'id': log.user.id if log.user else None,
-                'email': log.user.email if log.user else 'System',
-                'first_name': log.user.first_name if log.user else '',
-                'last_name': log.user.last_name if log.user else '',
-            } if log.user else None,
-            'action': log.action,
-            'action_display': dict(AuditLog.ACTION_TYPES).get(log.action, log.action),
-            'model_name': log.model_name,
-            'object_id': log.object_id,
-            'object_repr': log.object_repr,
-            'changes': log.changes,
-            'ip_address': log.ip_address,
-            'user_agent': log.user_agent[:100] if log.user_agent else None,
-        })
-    
     return Response({
-        'results': results,
+        'results': [_serialize_log(log) for log in logs],
         'count': total_count,
         'page': page,
         'page_size': page_size,
@@ -155,6 +261,56 @@ def audit_log_list(request):
     })
 
 
+def _cursor_page(queryset, cursor, ordering, page_size):
+    """
+    Keyset-paginate ``queryset`` on (timestamp, id).
+
+    Each page is a range scan on the (company, timestamp, id) index, so
+    deep pages cost the same as the first one — unlike OFFSET, which
+    re-reads every skipped row.
+    """
+    if ordering not in ('timestamp', '-timestamp'):
+        ordering = '-timestamp'
+    descending = ordering.startswith('-')
+
+    if cursor:
+        try:
+            ts, last_id = _decode_cursor(cursor)
+        except ValueError:
+            return Response(
+                {"error": "Invalid cursor"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if descending:
+            queryset = queryset.filter(
+                db_models.Q(timestamp__lt=ts)
+                | db_models.Q(timestamp=ts, id__lt=last_id)
+            )
+        else:
+            queryset = queryset.filter(
+                db_models.Q(timestamp__gt=ts)
+                | db_models.Q(timestamp=ts, id__gt=last_id)
+            )
+
+    if descending:
+        queryset = queryset.order_by('-timestamp', '-id')
+    else:
+        queryset = queryset.order_by('timestamp', 'id')
+
+    # Fetch one extra row to learn whether another page exists.
+    logs = list(queryset[:page_size + 1])
+    has_next = len(logs) > page_size
+    logs = logs[:page_size]
+
+    return Response({
+        'results': [_serialize_log(log) for log in logs],
+        'page_size': page_size,
+        'next_cursor': _encode_cursor(logs[-1]) if has_next else None,
+        'has_next': has_next,
+        'has_previous': bool(cursor),
+    })
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, HasCompanyAccess])
 def audit_log_detail(request, pk):
@@ -251,7 +407,14 @@ def audit_log_filters(request):
 @permission_classes([IsAuthenticated, HasCompanyAccess])
 def audit_log_export(request):
     """
-    Export audit logs to Excel format.
+    Export audit logs to Excel or CSV.
+
+    Rows are read with a server-side iterator and written as they arrive,
+    so exports have no row cap and memory stays flat.
+
+    Query Parameters:
+        - export_format: 'xlsx' (default) or 'csv'
+        - plus the same filters as audit_log_list
     """
     user = request.user
     company = user.current_company
@@ -262,57 +425,64 @@ def audit_log_export(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    export_format = request.query_params.get('export_format', 'xlsx')
+    if export_format not in ('xlsx', 'csv'):
+        return Response(
+            {"error": "export_format must be 'xlsx' or 'csv'"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
     # Base queryset
     queryset = AuditLog.objects.filter(company=company).select_related('user')
+    queryset, filters_applied = _apply_audit_filters(queryset, request.query_params)
+    queryset = queryset.order_by('-timestamp', '-id')
     
-    # Apply filters
-    start_date = request.query_params.get('start_date')
-    end_date = request.query_params.get('end_date')
-    user_id = request.query_params.get('user_id')
-    action = request.query_params.get('action')
-    model_name = request.query_params.get('model_name')
-    search = request.query_params.get('search')
-    
-    if start_date:
-        try:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            if timezone.is_naive(start):
-                start = timezone.make_aware(start)
-            queryset = queryset.filter(timestamp__gte=start)
-        except ValueError:
-            pass
-    
-    if end_date:
-        try:
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            if timezone.is_naive(end):
-                end = timezone.make_aware(end)
-            end = end + timedelta(days=1)
-            queryset = queryset.filter(timestamp__lt=end)
-        except ValueError:
-            pass
-    
-    if user_id:
-        queryset = queryset.filter(user_id=user_id)
-    
-    if action:
-        queryset = queryset.filter(action=action)
-    
-    if model_name:
-        queryset = queryset.filter(model_name__iexact=model_name)
+    timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
     
-    if search:
-        queryset = queryset.filter(object_repr__icontains=search)
+    if export_format == 'csv':
+        # The body is produced lazily after the view returns, so record the
+        # export first and keep that entry out of the stream.
+        export_log = _log_export(user, company, filters_applied, queryset.count())
+        rows = (
+            _export_row(log)
+            for log in queryset.exclude(pk=export_log.pk).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return streaming_csv_response(
+            rows, f"audit_log_export_{timestamp}.csv", header=EXPORT_HEADERS
+        )
     
-    queryset = queryset.order_by('-timestamp')
+    wb, record_count = _write_xlsx(queryset, company, user, filters_applied)
+    _log_export(user, company, filters_applied, record_count)
     
-    # Limit export to 10,000 records
-    logs = list(queryset[:10000])
+    return xlsx_file_response(wb, f"audit_log_export_{timestamp}.xlsx")
+
+
+def _log_export(user, company, filters_applied, record_count):
+    """Record the export itself in the audit log."""
+    return AuditLog.objects.create(
+        user=user,
+        company=company,
+        action='export',
+        model_name='AuditLog',
+        object_repr=f'Exported {record_count} audit log entries',
+        changes={'filters': filters_applied, 'record_count': record_count}
+    )
+
+
+def _write_xlsx(queryset, company, user, filters_applied):
+    """
+    Write ``queryset`` to a write-only workbook.
+
+    Write-only mode flushes each row to disk instead of keeping a cell
+    grid in memory. Returns (workbook, row count).
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Audit Log")
     
-    # Create Excel workbook
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Audit Log"
+    # Column widths and frozen header must be set before any rows are written
+    for col, width in enumerate(EXPORT_COLUMN_WIDTHS, 1):
+        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = width
+    ws.freeze_panes = "A2"
     
     # Styles
     header_font = Font(bold=True, color="FFFFFF")
@@ -325,121 +495,38 @@ def audit_log_export(request):
         bottom=Side(style='thin')
     )
     
-    # Headers
-    headers = [
-        "Timestamp",
-        "User Email",
-        "User Name",
-        "Action",
-        "Record Type",
-        "Record ID",
-        "Description",
-        "IP Address",
-        "Changes Summary"
-    ]
-    
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
+    header_cells = []
+    for header in EXPORT_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
         cell.font = header_font
         cell.fill = header_fill
         cell.alignment = header_alignment
         cell.border = thin_border
-    
-    # Data rows
-    for row_num, log in enumerate(logs, 2):
-        changes_summary = ""
-        if log.changes:
-            if isinstance(log.changes, dict):
-                changes_list = []
-                for field, change in log.changes.items():
-                    if isinstance(change, dict) and 'old' in change and 'new' in change:
-                        changes_list.append(f"{field}: {change['old']} → {change['new']}")
-                    else:
-                        changes_list.append(f"{field}: {change}")
-                changes_summary = "; ".join(changes_list[:5])
-                if len(log.changes) > 5:
-                    changes_summary += f" (+{len(log.changes) - 5} more)"
-        
-        user_name = ""
-        if log.user:
-            user_name = f"{log.user.first_name} {log.user.last_name}".strip()
-        
-        row_data = [
-            log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-            log.user.email if log.user else "System",
-            user_name,
-            dict(AuditLog.ACTION_TYPES).get(log.action, log.action),
-            log.model_name,
-            log.object_id,
-            log.object_repr,
-            log.ip_address or "",
-            changes_summary
-        ]
-        
-        for col, value in enumerate(row_data, 1):
-            cell = ws.cell(row=row_num, column=col, value=value)
+        header_cells.append(cell)
+    ws.append(header_cells)
+    
+    record_count = 0
+    for log in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row_cells = []
+        for value in _export_row(log):
+            cell = WriteOnlyCell(ws, value=value)
             cell.border = thin_border
-    
-    # Column widths
-    column_widths = [20, 30, 25, 15, 20, 15, 40, 15, 50]
-    for col, width in enumerate(column_widths, 1):
-        ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = width
-    
-    ws.freeze_panes = "A2"
+            row_cells.append(cell)
+        ws.append(row_cells)
+        record_count += 1
     
     # Metadata sheet
     ws_meta = wb.create_sheet("Export Info")
-    ws_meta['A1'] = "Export Date:"
-    ws_meta['B1'] = timezone.now().strftime("%Y-%m-%d %H:%M:%S")
-    ws_meta['A2'] = "Company:"
-    ws_meta['B2'] = company.name
-    ws_meta['A3'] = "Exported By:"
-    ws_meta['B3'] = user.email
-    ws_meta['A4'] = "Total Records:"
-    ws_meta['B4'] = len(logs)
-    ws_meta['A5'] = "Filters Applied:"
-    
-    filters_applied = []
-    if start_date:
-        filters_applied.append(f"From: {start_date}")
-    if end_date:
-        filters_applied.append(f"To: {end_date}")
-    if user_id:
-        filters_applied.append(f"User ID: {user_id}")
-    if action:
-        filters_applied.append(f"Action: {action}")
-    if model_name:
-        filters_applied.append(f"Record Type: {model_name}")
-    if search:
-        filters_applied.append(f"Search: {search}")
-    
-    ws_meta['B5'] = "; ".join(filters_applied) if filters_applied else "None"
-    
-    # Save to bytes
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"audit_log_export_{timestamp}.xlsx"
-    
-    response = HttpResponse(
-        output.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="{filename}"'
-    
-    # Log the export
-    AuditLog.objects.create(
-        user=user,
-        company=company,
-        action='export',
-        model_name='AuditLog',
-        object_repr=f'Exported {len(logs)} audit log entries',
-        changes={'filters': filters_applied, 'record_count': len(logs)}
-    )
-    
-    return response
+    ws_meta.append(["Export Date:", timezone.now().strftime("%Y-%m-%d %H:%M:%S")])
+    ws_meta.append(["Company:", company.name])
+    ws_meta.append(["Exported By:", user.email])
+    ws_meta.append(["Total Records:", record_count])
+    ws_meta.append([
+        "Filters Applied:",
+        "; ".join(filters_applied) if filters_applied else "None"
+    ])
+    
+    return wb, record_count
 
 
 @api_view(['GET'])
@@ -447,6 +534,10 @@ def audit_log_export(request):
 def audit_log_statistics(request):
     """
     Get statistics about audit log entries.
+
+    Whole-day ranges (the dashboard's usual request) are answered from the
+    AuditLogDailyCount counters; ranges with sub-day bounds fall back to
+    grouping AuditLog directly.
     """
     user = request.user
     company = user.current_company
@@ -461,6 +552,7 @@ def audit_log_statistics(request):
     
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
+    start = end = None
     
     if start_date:
         try:
@@ -469,7 +561,7 @@ def audit_log_statistics(request):
                 start = timezone.make_aware(start)
             queryset = queryset.filter(timestamp__gte=start)
         except ValueError:
-            pass
+            start = None
     
     if end_date:
         try:
@@ -479,47 +571,10 @@ def audit_log_statistics(request):
             end = end + timedelta(days=1)
             queryset = queryset.filter(timestamp__lt=end)
         except ValueError:
-            pass
-    
-    action_counts = queryset.values('action').annotate(
-        count=db_models.Count('id')
-    ).order_by('-count')
-    
-    action_stats = [
-        {
-            'action': item['action'],
-            'action_display': dict(AuditLog.ACTION_TYPES).get(item['action'], item['action']),
-            'count': item['count']
-        }
-        for item in action_counts
-    ]
+            end = None
     
-    model_counts = queryset.values('model_name').annotate(
-        count=db_models.Count('id')
-    ).order_by('-count')[:10]
+    days = audit_activity.day_bounds(start, end)
+    if days is None:
+        return Response(audit_activity.statistics_from_logs(queryset))
     
-    user_counts = queryset.values('user__email', 'user__first_name', 'user__last_name').annotate(
-        count=db_models.Count('id')
-    ).order_by('-count')[:10]
-    
-    user_stats = [
-        {
-            'email': item['user__email'] or 'System',
-            'name': f"{item['user__first_name'] or ''} {item['user__last_name'] or ''}".strip() or 'System',
-            'count': item['count']
-        }
-        for item in user_counts
-    ]
-    
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    daily_counts = queryset.filter(timestamp__gte=seven_days_ago).extra(
-        select={'day': "date(timestamp)"}
-    ).values('day').annotate(count=db_models.Count('id')).order_by('day')
-    
-    return Response({
-        'total_count': queryset.count(),
-        'by_action': action_stats,
-        'by_model': list(model_counts),
-        'by_user': user_stats,
-        'daily_activity': list(daily_counts),
-    })
+    return Response(audit_activity.statistics_from_counters(company, *days))
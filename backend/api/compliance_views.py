@@ -922,16 +922,22 @@ class ComplianceDashboardViewSet(viewsets.ViewSet):
         company = require_company(request.user)
         today = date.today()
 
-        # Auto-generate deadlines on first visit if not yet done
+        # Auto-generate deadlines on first visit if not yet done. If a run
+        # for this company is already in progress, leave the flag unset and
+        # tell the client; the next visit picks up its deadlines.
+        deadlines_generating = False
         try:
             profile = ComplianceProfile.objects.get(company=company)
             if not profile.deadlines_auto_populated:
                 deadline_count = ComplianceDeadline.objects.filter(company=company).count()
                 if deadline_count == 0:
                     from .tasks.compliance_tasks import generate_recurring_deadlines
-                    generate_recurring_deadlines(company_id=company.id)
-                profile.deadlines_auto_populated = True
-                profile.save(update_fields=["deadlines_auto_populated"])
+                    from .tasks.fanout import is_locked_out
+                    stats = generate_recurring_deadlines(company_id=company.id)
+                    deadlines_generating = is_locked_out(stats)
+                if not deadlines_generating:
+                    profile.deadlines_auto_populated = True
+                    profile.save(update_fields=["deadlines_auto_populated"])
         except ComplianceProfile.DoesNotExist:
             pass
         except Exception:
@@ -1024,6 +1030,7 @@ class ComplianceDashboardViewSet(viewsets.ViewSet):
         data = {
             'overall_status': overall_status,
             'score': score,
+            'deadlines_generating': deadlines_generating,
             'summary': {
                 'deadlines_this_month': deadlines_this_month,
                 'overdue_items': overdue_deadlines,
@@ -0,0 +1,47 @@
+"""Shared scaffolding for the benchmark_* management commands.
+
+Benchmarks that need database rows build a synthetic company inside
+BenchmarkCommand.rolled_back(), a transaction that is always rolled back,
+so they are safe to point at a development database. timed() runs one
+step and prints its wall time and query count on a single aligned line.
+"""
+
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+class _Rollback(Exception):
+    pass
+
+
+class BenchmarkCommand(BaseCommand):
+
+    @contextmanager
+    def rolled_back(self):
+        """Run the block in a transaction that is rolled back afterwards."""
+        try:
+            with transaction.atomic():
+                yield
+                raise _Rollback
+        except _Rollback:
+            self.stdout.write('Synthetic data rolled back.')
+
+    def timed(self, label, func, detail=None):
+        """
+        Call func() and print its time and query count; returns its result.
+
+        detail, if given, is called with the result and appended to the line.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - started
+        line = f'  {label:<34} {elapsed * 1000:>9.0f} ms  {len(ctx.captured_queries):>4} queries'
+        if detail:
+            line += f', {detail(result)}'
+        self.stdout.write(line)
+        return result
@@ -0,0 +1,147 @@
+"""Benchmark the commodity normalization and unit lookups.
+
+Times normalize_commodity, get_crop_category_for_commodity,
+get_primary_unit_for_commodity and get_varieties_for_commodity per call on
+a commodity mix shaped like pick & haul receipts: mostly portal codes
+(LEM, NA, VA, ...), then pool commodity names and the odd free-text or
+unknown value. Each lookup is timed against the string-scanning
+implementation it replaced. With --db the mix is drawn from the
+commodity_code values of the PickHaulReceipt rows in the database instead.
+
+Usage:
+    python manage.py benchmark_commodity_lookups
+    python manage.py benchmark_commodity_lookups --calls=500000 --db
+"""
+
+import logging
+import random
+import time as time_module
+
+from django.core.management.base import BaseCommand
+
+from api.services import season_service
+from api.services.season_service import _COMMODITY_LOOKUP, CROP_VARIETY_TO_COMMODITY
+
+# (value, weight) pairs; portal codes dominate receipt rows
+RECEIPT_COMMODITY_MIX = (
+    ('LEM', 40), ('NA', 18), ('VA', 10), ('CAR', 6), ('MAN', 5), ('PIX', 3),
+    ('CLEM', 2), ('LEMONS', 4), ('NAVELS', 3), ('AVOCADOS', 3),
+    ('HASS', 2), ('Hass Avocado', 1), ('CALIFORNIA HASS AVOCADO', 1),
+    ('GRAPEFRUIT', 1), ('CITRUS', 1), ('SESPE', 1),
+)
+
+
+def _legacy_normalize_commodity(raw):
+    cleaned = (raw or '').strip().upper()
+    if not cleaned:
+        return cleaned
+    if cleaned in _COMMODITY_LOOKUP:
+        return _COMMODITY_LOOKUP[cleaned]
+    for keyword, canonical in _COMMODITY_LOOKUP.items():
+        if keyword in cleaned:
+            return canonical
+    return cleaned
+
+
+def _legacy_crop_category(commodity_string):
+    upper = (commodity_string or '').upper()
+    if any(c in upper for c in ['AVOCADO', 'SUBTROPICAL']):
+        return 'subtropical'
+    elif any(c in upper for c in [
+        'LEMON', 'ORANGE', 'NAVEL', 'VALENCIA',
+        'TANGERINE', 'MANDARIN', 'GRAPEFRUIT', 'CITRUS', 'LIME'
+    ]):
+        return 'citrus'
+    elif any(c in upper for c in ['ALMOND', 'WALNUT', 'PISTACHIO']):
+        return 'nut'
+    elif any(c in upper for c in ['GRAPE', 'WINE']):
+        return 'vine'
+    return 'citrus'
+
+
+def _legacy_primary_unit(commodity):
+    if _legacy_crop_category(commodity) == 'subtropical':
+        return {
+            'unit': 'LBS', 'label_singular': 'Lb', 'label_plural': 'Lbs',
+            'db_field': 'total_weight_lbs', 'delivery_db_field': 'weight_lbs',
+            'net_per_field': 'net_per_lb',
+        }
+    return {
+        'unit': 'BIN', 'label_singular': 'Bin', 'label_plural': 'Bins',
+        'db_field': 'total_bins', 'delivery_db_field': 'bins',
+        'net_per_field': 'net_per_bin',
+    }
+
+
+def _legacy_varieties(commodity):
+    upper = commodity.upper()
+    return [k for k, v in CROP_VARIETY_TO_COMMODITY.items() if v.upper() == upper]
+
+
+class Command(BaseCommand):
+    help = 'Time commodity normalization and unit lookups per call, before and after'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--calls', type=int, default=200000)
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument(
+            '--db',
+            action='store_true',
+            help='Draw the mix from PickHaulReceipt.commodity_code values',
+        )
+
+    def handle(self, *args, **options):
+        values = self._mix(options)
+        self.stdout.write(f'{len(values):,} lookups over {len(set(values))} distinct values')
+
+        canonical = [_legacy_normalize_commodity(v) for v in values]
+        lookups = (
+            ('normalize_commodity', values,
+             _legacy_normalize_commodity, season_service.normalize_commodity),
+            ('get_crop_category_for_commodity', values,
+             _legacy_crop_category, season_service.get_crop_category_for_commodity),
+            ('get_primary_unit_for_commodity', canonical,
+             _legacy_primary_unit, season_service.get_primary_unit_for_commodity),
+            ('get_varieties_for_commodity', canonical,
+             _legacy_varieties, season_service.get_varieties_for_commodity),
+        )
+
+        # Unknown values log a warning on every call in both versions
+        logging.disable(logging.WARNING)
+        try:
+            for label, inputs, before, after in lookups:
+                mismatches = sum(1 for v in set(inputs) if before(v) != after(v))
+                before_ns = self._time(before, inputs)
+                after_ns = self._time(after, inputs)
+                line = (
+                    f'  {label:<34} {before_ns:>9.0f} ns -> {after_ns:>6.0f} ns per call '
+                    f'({before_ns / after_ns:.1f}x)'
+                )
+                if mismatches:
+                    line += f', {mismatches} values differ'
+                self.stdout.write(line)
+        finally:
+            logging.disable(logging.NOTSET)
+
+    def _mix(self, options):
+        rng = random.Random(options['seed'])
+        population, weights = zip(*RECEIPT_COMMODITY_MIX)
+        if options['db']:
+            from django.db.models import Count
+            from api.models import PickHaulReceipt
+
+            rows = list(
+                PickHaulReceipt.objects.exclude(commodity_code='')
+                .values_list('commodity_code').annotate(n=Count('id'))
+            )
+            if rows:
+                population, weights = zip(*rows)
+            else:
+                self.stdout.write('No receipts with a commodity code; using the built-in mix.')
+        return rng.choices(population, weights=weights, k=options['calls'])
+
+    def _time(self, lookup, inputs):
+        started = time_module.perf_counter()
+        for value in inputs:
+            lookup(value)
+        return (time_module.perf_counter() - started) * 1e9 / len(inputs)
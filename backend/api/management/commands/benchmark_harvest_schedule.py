@@ -0,0 +1,163 @@
+"""Benchmark the crew-aware harvest scheduler on synthetic ranches.
+
+For each block count (default 50, 200 and 1000) it generates fields with
+staggered PHI release dates and mixed yields, then times HarvestScheduler
+against several crews and a daily packinghouse intake cap, reporting the
+cost of each priority-rule ordering. With --db it also builds the fields,
+pesticide applications and harvest history for a synthetic company and
+times HarvestPlanningService.get_harvest_schedule_recommendation end to
+end; that data is rolled back afterwards (see api/management/benchmark.py).
+
+Usage:
+    python manage.py benchmark_harvest_schedule
+    python manage.py benchmark_harvest_schedule --blocks=200 --crews=6 --db
+"""
+
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from api.management.benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = 'Time crew-aware harvest scheduling for 50/200/1000-block ranches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--blocks',
+            default='50,200,1000',
+            help='Comma-separated block counts to benchmark',
+        )
+        parser.add_argument(
+            '--crews',
+            type=int,
+            default=0,
+            help='Crews per ranch (default: one per 15 blocks)',
+        )
+        parser.add_argument('--crew-size', type=int, default=10)
+        parser.add_argument('--days', type=int, default=21)
+        parser.add_argument(
+            '--intake',
+            type=int,
+            default=0,
+            help='Packinghouse bins per day (default: 80%% of crew capacity)',
+        )
+        parser.add_argument('--seed', type=int, default=11)
+        parser.add_argument(
+            '--db',
+            action='store_true',
+            help='Also time get_harvest_schedule_recommendation on database rows',
+        )
+
+    def handle(self, *args, **options):
+        from api.services.operations.harvest_planning import HarvestPlanningService
+
+        self.bins_per_picker_hour = HarvestPlanningService.PRODUCTIVITY['bins_per_picker_hour']
+        self.start = date.today()
+        self.end = self.start + timedelta(days=options['days'] - 1)
+
+        for count in [int(n) for n in options['blocks'].split(',') if n]:
+            crews = options['crews'] or max(1, count // 15)
+            self.crews = [
+                {'name': f'Crew {n + 1}', 'size': options['crew_size']}
+                for n in range(crews)
+            ]
+            crew_capacity = crews * options['crew_size'] * 8 * self.bins_per_picker_hour
+            self.intake = options['intake'] or int(crew_capacity * 0.8)
+            self.stdout.write(
+                f'{count:,} blocks: {crews} crews x {options["crew_size"]} pickers, '
+                f'{options["days"]} days, intake {self.intake:,} bins/day'
+            )
+            self._run_solver(count, options)
+            if options['db']:
+                with self.rolled_back():
+                    self._run_service(count, options)
+
+    def _blocks(self, count, seed):
+        rng = random.Random(seed)
+        for n in range(count):
+            yield {
+                'acres': Decimal(rng.choice([5, 10, 15, 20, 40])),
+                'release': rng.choice([0, 0, 0, 2, 5, 9]),
+                'name': f'Block {n}',
+            }
+
+    def _run_solver(self, count, options):
+        from api.services.operations.harvest_planning import HarvestPlanningService
+        from api.services.operations.harvest_scheduling import Crew, HarvestScheduler, ScheduleBlock
+
+        blocks = [
+            ScheduleBlock(
+                field_id=n, field_name=spec['name'],
+                bins=float(spec['acres']) * 15,
+                release_date=self.start + timedelta(days=spec['release']),
+                weight=HarvestPlanningService.PRIORITY_WEIGHTS['low' if spec['release'] else 'medium'],
+            )
+            for n, spec in enumerate(self._blocks(count, options['seed']))
+        ]
+        scheduler = HarvestScheduler(
+            [Crew(name=c['name'], size=c['size']) for c in self.crews],
+            self.start, self.end, self.bins_per_picker_hour, delivery_capacity=self.intake,
+        )
+
+        costs = [scheduler.decode(order)[0] for order in scheduler.priority_orders(blocks)]
+        self.timed(
+            'solve', lambda: scheduler.solve(blocks),
+            lambda result: (
+                f'{len(result.assignments):,} scheduled, {len(result.unscheduled):,} unscheduled, '
+                f'cost {result.cost:,.0f} (orderings: {", ".join(f"{c:,.0f}" for c in costs)})'
+            ),
+        )
+
+    def _run_service(self, count, options):
+        from api.models import (
+            Company, Farm, Field, Harvest, PesticideApplication, PesticideProduct,
+        )
+        from api.services.operations.harvest_planning import HarvestPlanningService
+
+        company = Company.objects.create(name='Harvest Benchmark Co', county='ventura')
+        farm = Farm.objects.create(
+            company=company, name='Bench Ranch', address='1 Orchard Rd', county='ventura',
+        )
+        specs = list(self._blocks(count, options['seed']))
+        fields = Field.objects.bulk_create(
+            Field(
+                farm=farm, name=spec['name'], total_acres=spec['acres'],
+                county='ventura', current_crop='navel',
+            )
+            for spec in specs
+        )
+        product = PesticideProduct.objects.create(
+            product_name='Bench PHI Product', epa_registration_number='9999-7', phi_days=10,
+        )
+        PesticideApplication.objects.bulk_create(
+            PesticideApplication(
+                field=field, product=product,
+                application_date=self.start + timedelta(days=spec['release'] - 10),
+                start_time=time(6, 0), end_time=time(9, 0),
+                acres_treated=spec['acres'], amount_used=Decimal('10'),
+                unit_of_measure='gal', application_method='Ground Spray',
+                applicator_name='Bench Applicator',
+            )
+            for field, spec in zip(fields, specs) if spec['release']
+        )
+        Harvest.objects.bulk_create(
+            Harvest(
+                field=field, harvest_date=self.start - timedelta(days=365),
+                crop_variety='navel_orange', acres_harvested=field.total_acres,
+                total_bins=int(field.total_acres * 14), status='complete',
+                lot_number=f'BENCH-{field.pk}',
+            )
+            for field in fields[::2]
+        )
+
+        service = HarvestPlanningService(company_id=company.id)
+        self.timed(
+            'get_harvest_schedule_recommendation',
+            lambda: service.get_harvest_schedule_recommendation(
+                farm_id=farm.id, start_date=self.start, end_date=self.end,
+                crews=self.crews, delivery_capacity_bins=self.intake,
+            ),
+            lambda result: f'{result["summary"]["total_fields"]:,} scheduled',
+        )
@@ -0,0 +1,134 @@
+"""Benchmark the pool list aggregate annotations.
+
+Builds one packinghouse with N pools (default 20), each with D deliveries
+(default 300) and R packout reports (default 200), then times the pool
+list annotation against the join-and-group form it replaced and prints
+each query's EXPLAIN estimate. PostgreSQL reports a planner cost; other
+backends only print the plan. The data is rolled back afterwards (see
+api/management/benchmark.py).
+
+Usage:
+    python manage.py benchmark_pool_aggregates
+    python manage.py benchmark_pool_aggregates --pools=50 --deliveries=500 --reports=300
+"""
+
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Count, DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from api.management.benchmark import BenchmarkCommand
+
+
+def _joined_aggregates(queryset):
+    """The previous annotation: Sums over both multi-valued joins at once."""
+    from api.models import PoolSettlement
+
+    return queryset.annotate(
+        _delivery_count=Count('deliveries', distinct=True),
+        _packout_bins=Coalesce(
+            Sum('packout_reports__bins_this_period'), Decimal('0'), output_field=DecimalField(),
+        ),
+        _delivery_bins=Coalesce(
+            Sum('deliveries__bins'), Decimal('0'), output_field=DecimalField(),
+        ),
+        _settlement_weight=Subquery(
+            PoolSettlement.objects.filter(
+                pool=OuterRef('pk')
+            ).order_by('-statement_date').values('total_weight_lbs')[:1],
+            output_field=DecimalField(),
+        ),
+        _delivery_weight=Coalesce(
+            Sum('deliveries__weight_lbs'), Decimal('0'), output_field=DecimalField(),
+        ),
+    )
+
+
+class Command(BenchmarkCommand):
+    help = 'Time pool list aggregates: correlated subqueries vs joined sums'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pools', type=int, default=20)
+        parser.add_argument('--deliveries', type=int, default=300)
+        parser.add_argument('--reports', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with self.rolled_back():
+            packinghouse = self._build(options)
+            self._run(packinghouse)
+
+    def _build(self, options):
+        from api.models import (
+            Company, Farm, Field, Packinghouse, PackinghouseDelivery, PackoutReport, Pool,
+        )
+
+        company = Company.objects.create(name='Pool Benchmark Co', county='ventura')
+        packinghouse = Packinghouse.objects.create(company=company, name='Bench Packing')
+        farm = Farm.objects.create(
+            company=company, name='Bench Ranch', address='1 Orchard Rd', county='ventura',
+        )
+        field = Field.objects.create(
+            farm=farm, name='Bench Block', total_acres=Decimal('20'), county='ventura',
+        )
+        pools = Pool.objects.bulk_create(
+            Pool(
+                packinghouse=packinghouse, pool_id=f'BENCH-{n}', name=f'Bench Pool {n}',
+                commodity='NAVELS', season='2025-2026',
+            )
+            for n in range(options['pools'])
+        )
+        start = date(2026, 1, 5)
+        PackinghouseDelivery.objects.bulk_create(
+            PackinghouseDelivery(
+                pool=pool, field=field, ticket_number=f'{pool.pk}-{n}',
+                delivery_date=start + timedelta(days=n % 90),
+                bins=Decimal('20.00'), weight_lbs=Decimal('18000.00'),
+            )
+            for pool in pools for n in range(options['deliveries'])
+        )
+        PackoutReport.objects.bulk_create(
+            PackoutReport(
+                pool=pool, report_date=start + timedelta(days=n),
+                period_start=start, period_end=start + timedelta(days=n),
+                bins_this_period=Decimal('15.00'), bins_cumulative=Decimal(15 * (n + 1)),
+            )
+            for pool in pools for n in range(options['reports'])
+        )
+        self.stdout.write(
+            f'{len(pools):,} pools x {options["deliveries"]:,} deliveries '
+            f'x {options["reports"]:,} packout reports'
+        )
+        return packinghouse
+
+    def _run(self, packinghouse):
+        from api.models import Pool
+        from api.packinghouse_views import _annotate_pool_aggregates
+
+        pools = Pool.objects.filter(packinghouse=packinghouse)
+        totals = {}
+        for label, annotate in (
+            ('correlated subqueries', _annotate_pool_aggregates),
+            ('joined sums', _joined_aggregates),
+        ):
+            queryset = annotate(pools).order_by('pk')
+            rows = self.timed(
+                label,
+                lambda: list(queryset.values_list('_delivery_count', '_packout_bins', '_delivery_bins')),
+                lambda rows: self._plan_summary(queryset),
+            )
+            totals[label] = rows[0] if rows else None
+        self.stdout.write(
+            f'    first pool (count, packout bins, delivery bins): '
+            + ', '.join(f'{label} {row}' for label, row in totals.items())
+        )
+
+    def _plan_summary(self, queryset):
+        plan = queryset.explain()
+        if connection.vendor == 'postgresql':
+            match = re.search(r'cost=[\d.]+\.\.([\d.]+) rows=(\d+)', plan)
+            if match:
+                return f'EXPLAIN cost {float(match.group(1)):,.0f}, rows {int(match.group(2)):,}'
+        return f'EXPLAIN {len(plan.splitlines())} plan steps'
@@ -0,0 +1,123 @@
+"""Benchmark PUR report generation over a synthetic dataset.
+
+Builds one company with a CA compliance profile, a spread of farms, fields
+and products, and N pesticide applications (default 50,000) dated last
+month, then times the PURReportGenerator summary, validation and CSV
+stream and the auto_generate_monthly_pur_report task against it. The data
+is rolled back afterwards (see api/management/benchmark.py).
+
+Usage:
+    python manage.py benchmark_pur_report
+    python manage.py benchmark_pur_report --applications=10000 --invalid-every=50
+"""
+
+import time as time_module
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.utils import timezone
+
+from api.management.benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = 'Time PUR summaries, validation and the monthly PUR task on synthetic data'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=50000)
+        parser.add_argument('--farms', type=int, default=20)
+        parser.add_argument('--fields-per-farm', type=int, default=10)
+        parser.add_argument('--products', type=int, default=40)
+        parser.add_argument(
+            '--invalid-every',
+            type=int,
+            default=100,
+            help='Make every Nth application fail validation (0 for none)',
+        )
+
+    def handle(self, *args, **options):
+        with self.rolled_back():
+            company, applications = self._build(options)
+            self._run(company, applications)
+
+    def _build(self, options):
+        from api.models import (
+            Company, ComplianceProfile, Farm, Field, PesticideApplication,
+            PesticideProduct,
+        )
+
+        started = time_module.perf_counter()
+        company = Company.objects.create(name='PUR Benchmark Co', county='ventura')
+        ComplianceProfile.objects.create(
+            company=company, primary_state='CA', requires_pur_reporting=True,
+        )
+        counties = ['Ventura', 'Kern', 'Tulare', 'Santa Barbara']
+        fields = []
+        for f in range(options['farms']):
+            farm = Farm.objects.create(
+                company=company, name=f'Bench Farm {f}',
+                address=f'{f} Orchard Rd', county='ventura',
+            )
+            for n in range(options['fields_per_farm']):
+                fields.append(Field.objects.create(
+                    farm=farm, name=f'Block {f}-{n}', total_acres=Decimal('20.00'),
+                    county=counties[(f + n) % len(counties)],
+                ))
+        products = [
+            PesticideProduct.objects.create(
+                product_name=f'Bench Product {p}',
+                epa_registration_number=f'9999-{p}',
+                restricted_use=(p % 7 == 0),
+            )
+            for p in range(options['products'])
+        ]
+
+        today = timezone.now().date()
+        period_end = today.replace(day=1) - timedelta(days=1)
+        period_days = period_end.day
+        invalid_every = options['invalid_every']
+        methods = ['Ground Spray', 'Aerial Application', 'Chemigation', 'Broadcast']
+
+        PesticideApplication.objects.bulk_create(
+            (
+                PesticideApplication(
+                    field=fields[i % len(fields)],
+                    product=products[i % len(products)],
+                    application_date=period_end - timedelta(days=i % period_days),
+                    start_time=time(6, 0),
+                    end_time=time(9, 30),
+                    acres_treated=Decimal('12.50'),
+                    amount_used=(
+                        Decimal('0') if invalid_every and i % invalid_every == 0
+                        else Decimal('18.00')
+                    ),
+                    unit_of_measure='gal',
+                    application_method=methods[i % len(methods)],
+                    applicator_name='Bench Applicator',
+                )
+                for i in range(options['applications'])
+            ),
+            batch_size=2000,
+        )
+        applications = PesticideApplication.objects.filter(field__farm__company=company)
+        self.stdout.write(
+            f'Built {options["applications"]:,} applications across {len(fields)} fields '
+            f'in {time_module.perf_counter() - started:.1f}s'
+        )
+        return company, applications
+
+    def _run(self, company, applications):
+        from api.pur_reporting import PURReportGenerator
+        from api.tasks.compliance_tasks import auto_generate_monthly_pur_report
+
+        generator = PURReportGenerator(applications)
+        self.timed('generate_summary_report', generator.generate_summary_report)
+        self.timed(
+            'validate_for_pur', generator.validate_for_pur,
+            lambda result: f'{len(result["errors"]):,} errors, {len(result["warnings"]):,} warnings',
+        )
+        self.timed('iter_csv', lambda: sum(1 for _ in generator.iter_csv()))
+        self.timed(
+            'auto_generate_monthly_pur_report',
+            lambda: auto_generate_monthly_pur_report(company_id=company.id),
+        )
@@ -0,0 +1,121 @@
+"""Benchmark company-wide spray window detection over synthetic forecasts.
+
+Generates an hourly forecast for N farms (default 500) over the next week,
+then times the columnar engine on the whole company at once against
+scoring the same forecasts one farm at a time. With --db it also stores
+the forecasts in WeatherCache for a synthetic company and times
+SprayPlanningService.find_company_spray_windows end to end; those rows are
+rolled back afterwards (see api/management/benchmark.py).
+
+Usage:
+    python manage.py benchmark_spray_windows
+    python manage.py benchmark_spray_windows --farms=2000 --days=7 --db
+"""
+
+import math
+import random
+from decimal import Decimal
+
+from django.utils import timezone
+
+from api.management.benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    help = 'Time hourly spray window detection for a synthetic multi-farm company'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--farms', type=int, default=500)
+        parser.add_argument('--days', type=int, default=7)
+        parser.add_argument('--step-hours', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument(
+            '--db',
+            action='store_true',
+            help='Also time find_company_spray_windows through WeatherCache',
+        )
+
+    def handle(self, *args, **options):
+        from api.services.operations.spray_windows import ForecastBlock, detect_spray_windows
+        from api.weather_service import WeatherService
+
+        now = timezone.now()
+        forecasts = self._forecasts(now, options)
+        steps = sum(len(f['hourly']['dt']) for f in forecasts.values())
+        self.stdout.write(f'{len(forecasts):,} farms, {steps:,} forecast steps')
+
+        thresholds = WeatherService.THRESHOLDS
+        windows = self.timed(
+            'company block',
+            lambda: detect_spray_windows(
+                ForecastBlock.from_forecasts(forecasts), thresholds, now=now,
+            ),
+        )
+        self.timed(
+            'farm by farm',
+            lambda: {
+                farm_id: detect_spray_windows(
+                    ForecastBlock.from_forecasts({farm_id: forecast}), thresholds, now=now,
+                )[farm_id]
+                for farm_id, forecast in forecasts.items()
+            },
+        )
+        found = sum(len(w) for w in windows.values())
+        self.stdout.write(f'    {found:,} windows, {found / len(windows):.1f} per farm')
+
+        if options['db']:
+            with self.rolled_back():
+                self._run_service(forecasts, options)
+
+    def _forecasts(self, now, options):
+        rng = random.Random(options['seed'])
+        step = options['step_hours'] * 3600
+        start = int(now.timestamp()) // step * step
+        count = options['days'] * 24 // options['step_hours']
+
+        forecasts = {}
+        for farm_id in range(1, options['farms'] + 1):
+            base = rng.uniform(55, 75)
+            hourly = {
+                'step_hours': options['step_hours'], 'dt': [], 'temperature': [],
+                'humidity': [], 'wind_speed': [], 'dewpoint': [], 'rain': [],
+            }
+            for n in range(count):
+                dt = start + n * step
+                hour = (dt // 3600) % 24
+                temp = base + 14 * math.sin((hour - 9) / 24 * 2 * math.pi) + rng.gauss(0, 2)
+                spread = max(0.5, 4 + (temp - base) * 0.8 + rng.gauss(0, 2))
+                hourly['dt'].append(dt)
+                hourly['temperature'].append(round(temp, 1))
+                hourly['humidity'].append(round(min(100, max(10, 85 - spread * 3))))
+                hourly['wind_speed'].append(round(max(0, rng.gauss(7, 4)), 1))
+                hourly['dewpoint'].append(round(temp - spread, 1))
+                hourly['rain'].append(round(rng.uniform(0.5, 4), 1) if rng.random() < 0.03 else 0)
+            forecasts[farm_id] = {'hourly': hourly}
+        return forecasts
+
+    def _run_service(self, forecasts, options):
+        from api.models import Company, Farm, WeatherCache
+        from api.services.operations import SprayPlanningService
+
+        company = Company.objects.create(name='Spray Benchmark Co', county='ventura')
+        farms = Farm.objects.bulk_create(
+            Farm(
+                company=company, name=f'Bench Farm {n}', address=f'{n} Orchard Rd',
+                county='ventura', gps_latitude=Decimal('34.2'), gps_longitude=Decimal('-119.1'),
+            )
+            for n in range(len(forecasts))
+        )
+        WeatherCache.objects.bulk_create(
+            WeatherCache(
+                farm=farm, latitude=Decimal('34.2'), longitude=Decimal('-119.1'), weather_data={},
+                forecast_data=forecast,
+            )
+            for farm, forecast in zip(farms, forecasts.values())
+        )
+
+        service = SprayPlanningService(company_id=company.id)
+        self.timed(
+            'find_company_spray_windows',
+            lambda: service.find_company_spray_windows(days_ahead=options['days']),
+        )
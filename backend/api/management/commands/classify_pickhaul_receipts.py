@@ -0,0 +1,68 @@
+"""Backfill the canonical commodity stored on pick & haul receipts.
+
+Bundles classify each receipt's codes as they are applied. Run this once
+after deploying the commodity column to classify receipts from earlier
+seasons, and with --reclassify after COMMODITY_ALIASES changes so stored
+commodities follow the new aliases. Classification is set-based: one
+UPDATE per commodity for each company and season.
+
+Usage:
+    python manage.py classify_pickhaul_receipts
+    python manage.py classify_pickhaul_receipts --season=2026 --reclassify
+    python manage.py classify_pickhaul_receipts --company="Finch Farms"
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.models import Company, PickHaulReceipt
+from api.services.dashboard_cache import invalidate_company_dashboards
+from api.services.pickhaul.codes import classify_receipts
+from api.services.season_overview import invalidate_season_overview
+
+
+class Command(BaseCommand):
+    help = 'Store the canonical commodity on PickHaulReceipt rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', type=int, help='Only this season (end year)')
+        parser.add_argument(
+            '--company',
+            type=str,
+            help='Limit to one company by name (substring match)',
+        )
+        parser.add_argument(
+            '--reclassify',
+            action='store_true',
+            help='Re-derive every receipt, not just unclassified ones',
+        )
+
+    def handle(self, *args, **options):
+        receipts = PickHaulReceipt.objects.all()
+        if options['company']:
+            company = Company.objects.filter(name__icontains=options['company']).first()
+            if company is None:
+                raise CommandError(f"No company matching {options['company']!r}")
+            receipts = receipts.filter(company=company)
+        if options['season']:
+            receipts = receipts.filter(season=options['season'])
+
+        scopes = receipts.values_list('company_id', 'season').distinct().order_by('company_id', 'season')
+        total = 0
+        for company_id, season in scopes:
+            with transaction.atomic():
+                changed = classify_receipts(
+                    receipts.filter(company_id=company_id, season=season),
+                    reclassify=options['reclassify'],
+                )
+                if changed:
+                    # update() skips the signals behind both caches
+                    invalidate_season_overview(
+                        company_id, season, sections=('delivered', 'costs', 'houses'),
+                    )
+                    invalidate_company_dashboards(company_id)
+            if changed:
+                self.stdout.write(f'  company {company_id}, season {season}: {changed} receipts')
+            total += changed
+
+        self.stdout.write(self.style.SUCCESS(f'Classified {total} receipts'))
@@ -0,0 +1,64 @@
+"""Create upcoming AuditLog partitions and archive months past retention.
+
+The monthly maintain_audit_partitions beat task does the same thing; use
+this to run it by hand, preview what would be archived, or archive with a
+different retention window.
+
+Usage:
+    python manage.py manage_audit_partitions                      # create partitions only
+    python manage.py manage_audit_partitions --archive
+    python manage.py manage_audit_partitions --archive --retention-months=12
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.services import audit_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming AuditLog partitions and archive cold months'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            help='Future monthly partitions to keep created '
+                 '(default: AUDIT_LOG_PARTITION_MONTHS_AHEAD)',
+        )
+        parser.add_argument(
+            '--archive',
+            action='store_true',
+            help='Archive months older than the retention window to storage',
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            help='Months kept in the database (default: AUDIT_LOG_RETENTION_MONTHS)',
+        )
+
+    def handle(self, *args, **options):
+        if not audit_partitions.is_partitioned():
+            self.stdout.write(
+                'api_auditlog is not partitioned on this database; '
+                'skipping partition creation.'
+            )
+        else:
+            created = audit_partitions.ensure_partitions(ahead=options['months_ahead'])
+            if created:
+                for name in created:
+                    self.stdout.write(f'Created partition {name}')
+            else:
+                self.stdout.write('All upcoming partitions already exist.')
+
+        if not options['archive']:
+            return
+
+        archived = audit_partitions.archive_partitions(
+            retention=options['retention_months']
+        )
+        for item in archived:
+            self.stdout.write(f'Archived {item.rows} rows for {item.month} -> {item.path}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {len(archived)} month(s), '
+            f'{sum(item.rows for item in archived)} rows'
+        ))
@@ -0,0 +1,65 @@
+"""Rebuild the pre-aggregated audit activity counters from AuditLog.
+
+The counters behind the audit statistics endpoint are maintained as entries
+are written and re-rolled nightly for recent days. Run this once after
+deploying the counter table, or whenever entries were loaded without
+signals, to rebuild any range.
+
+Usage:
+    python manage.py rollup_audit_counts                     # full history
+    python manage.py rollup_audit_counts --days=30
+    python manage.py rollup_audit_counts --company="Finch Farms"
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from api.models import AuditLog, Company
+from api.services.audit_activity import rollup_daily_counts
+
+
+class Command(BaseCommand):
+    help = 'Rebuild AuditLogDailyCount rows from AuditLog'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Only rebuild the last N local days (default: all history)',
+        )
+        parser.add_argument(
+            '--company',
+            type=str,
+            help='Limit to one company by name (substring match)',
+        )
+
+    def handle(self, *args, **options):
+        company = None
+        if options['company']:
+            company = Company.objects.filter(name__icontains=options['company']).first()
+            if company is None:
+                raise CommandError(f"No company matching {options['company']!r}")
+
+        today = timezone.localdate()
+        if options['days']:
+            first_day = today - timedelta(days=options['days'] - 1)
+            last_day = today
+        else:
+            logs = AuditLog.objects.all()
+            if company is not None:
+                logs = logs.filter(company=company)
+            bounds = logs.aggregate(earliest=Min('timestamp'), latest=Max('timestamp'))
+            if bounds['earliest'] is None:
+                self.stdout.write('No audit log entries; nothing to roll up.')
+                return
+            first_day = timezone.localdate(bounds['earliest'])
+            last_day = timezone.localdate(bounds['latest'])
+
+        rows = rollup_daily_counts(first_day, last_day, company=company)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {rows} counter rows for {first_day} to {last_day}'
+            + (f' ({company.name})' if company else '')
+        ))
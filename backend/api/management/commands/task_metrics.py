@@ -0,0 +1,47 @@
+"""Print per-task Celery run metrics recorded in TaskRunMetric.
+
+Shows run and failure counts, p50/p95/max wall time, p50/p95 query counts,
+database time and rows processed for every api.tasks task that ran in the
+window.
+
+Usage:
+    python manage.py task_metrics                 # last 7 days
+    python manage.py task_metrics --days=1
+    python manage.py task_metrics --task=api.tasks.compliance_tasks.check_active_reis
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from api.services.task_metrics import summarize_task_runs
+
+
+class Command(BaseCommand):
+    help = 'Summarise Celery task run metrics (p50/p95 per task)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=float, default=7, help='Trailing window in days (default 7)')
+        parser.add_argument('--task', type=str, help='Limit to one task name')
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        summaries = summarize_task_runs(since=since, task_name=options['task'])
+        if not summaries:
+            self.stdout.write('No task runs recorded in the window.')
+            return
+
+        header = (
+            f"{'task':<60} {'runs':>5} {'fail':>4} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'max ms':>9} {'p50 q':>6} {'p95 q':>6} {'db ms':>9} {'rows':>8}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for s in summaries:
+            name = s['task'].replace('api.tasks.', '')
+            self.stdout.write(
+                f"{name:<60} {s['runs']:>5} {s['failures']:>4} {s['p50_ms']:>9.0f} "
+                f"{s['p95_ms']:>9.0f} {s['max_ms']:>9.0f} {s['p50_queries']:>6.0f} "
+                f"{s['p95_queries']:>6.0f} {s['total_query_ms']:>9.0f} {s['total_rows']:>8}"
+            )
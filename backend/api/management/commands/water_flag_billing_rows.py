@@ -34,6 +34,7 @@ from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from api.models import WaterSource, WellReading
+from api.services.dashboard_cache import invalidate_company_dashboards
 
 # Month-day of the readings that close a UWCD billing period.
 UWCD_BILLING_DAYS = {'06-30', '12-31'}
@@ -134,6 +135,11 @@ class Command(BaseCommand):
             WellReading.objects.bulk_update(
                 to_interim + to_billing, ['is_billing_row'], batch_size=500
             )
+            # bulk_update skips the signals that invalidate SGMA dashboards
+            for company_id in WaterSource.objects.filter(
+                pk__in={r.water_source_id for r in to_interim + to_billing}
+            ).values_list('farm__company_id', flat=True).distinct():
+                invalidate_company_dashboards(company_id)
 
         self.stdout.write('')
         self.stdout.write(self.style.SUCCESS(
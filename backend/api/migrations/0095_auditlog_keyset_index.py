@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0094_packer_commitment'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['company', '-timestamp', '-id'], name='api_auditlo_company_3f52b8_idx'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:53
+#
+# Pre-aggregated audit activity counters behind audit_log_statistics.
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def add_rls_policy(apps, schema_editor):
+    """Postgres-only defence in depth, matching 0087/0093."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute("""
+        ALTER TABLE api_auditlogdailycount ENABLE ROW LEVEL SECURITY;
+        DROP POLICY IF EXISTS tenant_isolation ON api_auditlogdailycount;
+        CREATE POLICY tenant_isolation ON api_auditlogdailycount
+            FOR ALL
+            USING (company_id::text = current_setting('app.current_company_id', true));
+    """)
+
+
+def drop_rls_policy(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        "DROP POLICY IF EXISTS tenant_isolation ON api_auditlogdailycount;"
+    )
+    schema_editor.execute(
+        "ALTER TABLE api_auditlogdailycount DISABLE ROW LEVEL SECURITY;"
+    )
+
+
+def _set_company_context(connection, company_id):
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT set_config('app.current_company_id', %s, false)", [company_id]
+        )
+
+
+def backfill_counts(apps, schema_editor):
+    """
+    Seed counters from existing history, one grouped pass per company.
+
+    api_auditlog forces row-level security, so each pass runs under that
+    company's context; with none set the grouping would see no rows.
+    """
+    AuditLog = apps.get_model('api', 'AuditLog')
+    AuditLogDailyCount = apps.get_model('api', 'AuditLogDailyCount')
+    Company = apps.get_model('api', 'Company')
+    connection = schema_editor.connection
+    tz = timezone.get_current_timezone()
+
+    try:
+        for company_id in Company.objects.order_by('pk').values_list('pk', flat=True):
+            _set_company_context(connection, str(company_id))
+            grouped = (
+                AuditLog.objects.filter(company_id=company_id)
+                .annotate(day=TruncDate('timestamp', tzinfo=tz))
+                .values('day', 'action', 'model_name', 'user_id')
+                .annotate(n=Count('id'))
+                .order_by()
+            )
+            AuditLogDailyCount.objects.bulk_create(
+                [
+                    AuditLogDailyCount(
+                        company_id=company_id, day=row['day'], action=row['action'],
+                        model_name=row['model_name'], user_id=row['user_id'], count=row['n'],
+                    )
+                    for row in grouped.iterator()
+                ],
+                batch_size=1000,
+            )
+    finally:
+        _set_company_context(connection, '')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0095_auditlog_keyset_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Local (TIME_ZONE) calendar day of the entries')),
+                ('action', models.CharField(choices=[('create', 'Created'), ('update', 'Updated'), ('delete', 'Deleted'), ('login', 'Logged In'), ('logout', 'Logged Out'), ('export', 'Exported Data'), ('submit', 'Submitted Report'), ('invite', 'Sent Invitation'), ('invite_accept', 'Accepted Invitation')], max_length=20)),
+                ('model_name', models.CharField(max_length=100)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_log_daily_counts', to='api.company')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='audit_log_daily_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['company', 'day'], name='api_auditlo_company_4c5d5e_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'day', 'action', 'model_name', 'user'), name='uniq_audit_daily_count')],
+            },
+        ),
+        migrations.RunPython(add_rls_policy, drop_rls_policy),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,231 @@
+# Convert api_auditlog to a table range-partitioned by month on "timestamp".
+#
+# PostgreSQL only — every other backend keeps the plain table and the
+# retention job falls back to range deletes (see api/services/audit_partitions.py).
+#
+# Django still models AuditLog with a single-column primary key; on the
+# partitioned table the real key is (id, timestamp) because PostgreSQL
+# requires the partition key in every unique constraint. Nothing references
+# AuditLog by foreign key, so the ORM is unaffected.
+#
+# The migration is non-atomic and runs in three steps:
+#
+#   1. One short transaction renames the table to api_auditlog_unpartitioned
+#      and builds the partitioned table in its place, with monthly partitions
+#      covering the whole legacy range plus a DEFAULT partition. Indexes,
+#      foreign keys and row-level security policies are recreated on the new
+#      parent under their original names, so new writes land there at once
+#      and later migrations still find them.
+#   2. Legacy rows are moved across BACKFILL_BATCH rows at a time in primary
+#      key (so insertion, so timestamp) order, each batch in its own
+#      transaction. No lock outlives a batch, and each batch frees its rows
+#      from the legacy table as it copies them.
+#   3. The emptied legacy table is dropped.
+#
+# An interrupted run resumes at step 2 when migrate is run again.
+from django.conf import settings
+from django.db import migrations, transaction
+from django.utils import timezone
+
+TABLE = 'api_auditlog'
+LEGACY = 'api_auditlog_unpartitioned'
+SEQUENCE = 'api_auditlog_partitioned_id_seq'
+MONTHS_AHEAD = 2
+BACKFILL_BATCH = 10000
+
+
+def _month_floor(dt):
+    local = timezone.localtime(dt)
+    return local.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_month(dt):
+    if dt.month == 12:
+        return dt.replace(year=dt.year + 1, month=1)
+    return dt.replace(month=dt.month + 1)
+
+
+def _capture_table_objects(cursor, table):
+    """Read index DDL, policies and RLS flags so they can be replayed."""
+    cursor.execute(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE tablename = %s AND indexname NOT LIKE %s",
+        [table, '%pkey'],
+    )
+    indexes = cursor.fetchall()
+    cursor.execute(
+        "SELECT policyname, permissive, roles, cmd, qual, with_check "
+        "FROM pg_policies WHERE tablename = %s",
+        [table],
+    )
+    policies = cursor.fetchall()
+    cursor.execute(
+        "SELECT relrowsecurity, relforcerowsecurity FROM pg_class "
+        "WHERE relname = %s AND relkind IN ('r', 'p')",
+        [table],
+    )
+    rls_flags = cursor.fetchone() or (False, False)
+    return indexes, policies, rls_flags
+
+
+def _replay_table_objects(cursor, to_table, indexes, policies, rls_flags):
+    # Captured before the rename, so the DDL already targets to_table.
+    for _, indexdef in indexes:
+        cursor.execute(indexdef)
+    enabled, forced = rls_flags
+    if enabled:
+        cursor.execute(f'ALTER TABLE {to_table} ENABLE ROW LEVEL SECURITY')
+    if forced:
+        cursor.execute(f'ALTER TABLE {to_table} FORCE ROW LEVEL SECURITY')
+    for name, permissive, roles, cmd, qual, with_check in policies:
+        roles_sql = ', '.join(roles) if roles else 'public'
+        sql = f'CREATE POLICY {name} ON {to_table} AS {permissive} FOR {cmd} TO {roles_sql}'
+        if qual:
+            sql += f' USING ({qual})'
+        if with_check:
+            sql += f' WITH CHECK ({with_check})'
+        cursor.execute(sql)
+
+
+def _add_foreign_keys(cursor, table):
+    user_table = settings.AUTH_USER_MODEL.replace('.', '_').lower()
+    cursor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_company_id_fk '
+        f'FOREIGN KEY (company_id) REFERENCES api_company (id) '
+        f'DEFERRABLE INITIALLY DEFERRED'
+    )
+    cursor.execute(
+        f'ALTER TABLE {table} ADD CONSTRAINT {table}_user_id_fk '
+        f'FOREIGN KEY (user_id) REFERENCES {user_table} (id) '
+        f'DEFERRABLE INITIALLY DEFERRED'
+    )
+
+
+def _exists(cursor, table):
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [table])
+    return cursor.fetchone()[0]
+
+
+def _retire(cursor, indexes):
+    """Rename TABLE to LEGACY and free the names the replacement reuses."""
+    cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {LEGACY}')
+    cursor.execute(f'ALTER INDEX {TABLE}_pkey RENAME TO {LEGACY}_pkey')
+    # The backfill reads the legacy table in primary-key order only.
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX {name}')
+    # Only this migration reads the legacy table from here on; with forced
+    # RLS the owner would see no rows without a company context.
+    cursor.execute(f'ALTER TABLE {LEGACY} NO FORCE ROW LEVEL SECURITY')
+    cursor.execute(f'ALTER TABLE {LEGACY} DISABLE ROW LEVEL SECURITY')
+
+
+def _restart_sequence(cursor, sequence):
+    cursor.execute(f'ALTER TABLE {TABLE} ALTER COLUMN id DROP DEFAULT')
+    cursor.execute(f'CREATE SEQUENCE {sequence} OWNED BY {TABLE}.id')
+    cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+    cursor.execute(
+        f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {LEGACY}), 0) + 1, false)"
+    )
+
+
+def _move_legacy_rows(connection):
+    """Move LEGACY into TABLE in bounded batches, then drop it."""
+    with connection.cursor() as cursor:
+        while True:
+            with transaction.atomic(using=connection.alias):
+                cursor.execute(
+                    f'WITH moved AS ('
+                    f'  DELETE FROM {LEGACY} WHERE id IN ('
+                    f'    SELECT id FROM {LEGACY} ORDER BY id LIMIT %s'
+                    f'  ) RETURNING *'
+                    f') INSERT INTO {TABLE} SELECT * FROM moved',
+                    [BACKFILL_BATCH],
+                )
+            if cursor.rowcount < BACKFILL_BATCH:
+                break
+        cursor.execute(f'DROP TABLE {LEGACY} CASCADE')
+
+
+def partition_auditlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        if _exists(cursor, LEGACY):
+            # A previous run was interrupted mid-backfill.
+            _move_legacy_rows(connection)
+            return
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        indexes, policies, rls_flags = _capture_table_objects(cursor, TABLE)
+        _retire(cursor, indexes)
+
+        cursor.execute(
+            f'CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS) '
+            f'PARTITION BY RANGE ("timestamp")'
+        )
+        # The legacy id default/identity belongs to the legacy table; give
+        # the partitioned table its own sequence continuing from MAX(id).
+        _restart_sequence(cursor, SEQUENCE)
+
+        # Partitions cover the whole legacy range, so the backfill never
+        # parks history in the DEFAULT partition.
+        cursor.execute(f'SELECT MIN("timestamp") FROM {LEGACY}')
+        earliest = cursor.fetchone()[0] or timezone.now()
+        month = _month_floor(earliest)
+        last = _month_floor(timezone.now())
+        for _ in range(MONTHS_AHEAD):
+            last = _add_month(last)
+        while month <= last:
+            upper = _add_month(month)
+            cursor.execute(
+                f'CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {TABLE} '
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+            month = upper
+        cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT')
+
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id, "timestamp")')
+        _add_foreign_keys(cursor, TABLE)
+        _replay_table_objects(cursor, TABLE, indexes, policies, rls_flags)
+
+    _move_legacy_rows(connection)
+
+
+def unpartition_auditlog(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        if _exists(cursor, LEGACY):
+            _move_legacy_rows(connection)
+            return
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        indexes, policies, rls_flags = _capture_table_objects(cursor, TABLE)
+        _retire(cursor, indexes)
+
+        cursor.execute(f'CREATE TABLE {TABLE} (LIKE {LEGACY} INCLUDING DEFAULTS)')
+        _restart_sequence(cursor, f'{TABLE}_id_seq')
+
+        cursor.execute(f'ALTER TABLE {TABLE} ADD PRIMARY KEY (id)')
+        _add_foreign_keys(cursor, TABLE)
+        _replay_table_objects(cursor, TABLE, indexes, policies, rls_flags)
+
+    _move_legacy_rows(connection)
+
+
+class Migration(migrations.Migration):
+
+    # Each step manages its own transactions; see the header comment.
+    atomic = False
+
+    dependencies = [
+        ('api', '0096_auditlog_daily_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_auditlog, unpartition_auditlog),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0097_auditlog_partitioning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRunMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=200)),
+                ('task_id', models.CharField(blank=True, max_length=64)),
+                ('status', models.CharField(choices=[('success', 'Success'), ('failure', 'Failure'), ('retry', 'Retry')], default='success', max_length=20)),
+                ('started_at', models.DateTimeField()),
+                ('duration_ms', models.FloatField(help_text='Wall time of the run')),
+                ('query_count', models.PositiveIntegerField(default=0)),
+                ('query_time_ms', models.FloatField(default=0, help_text='Time spent inside database calls')),
+                ('rows_processed', models.PositiveIntegerField(blank=True, help_text="Rows reported in the task's stats dict, when it has one", null=True)),
+                ('company', models.ForeignKey(blank=True, help_text='Set for per-company runs (company_id kwarg)', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='task_run_metrics', to='api.company')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['task_name', '-started_at'], name='api_taskrun_task_na_7711a9_idx'), models.Index(fields=['started_at'], name='api_taskrun_started_1b1d8d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0098_task_run_metric'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='complianceprofile',
+            name='deadlines_generated_through',
+            field=models.DateField(blank=True, help_text='Recurring deadlines have been generated up to this date', null=True),
+        ),
+    ]
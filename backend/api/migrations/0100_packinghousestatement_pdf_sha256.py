@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0099_complianceprofile_deadlines_generated_through'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='packinghousestatement',
+            name='pdf_sha256',
+            field=models.CharField(blank=True, help_text='SHA-256 of the stored PDF; the ETag when serving it', max_length=64),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:02
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0100_packinghousestatement_pdf_sha256'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonOverviewSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.PositiveSmallIntegerField(help_text='End year of the season (2026 = the 2025-2026 season)')),
+                ('section', models.CharField(max_length=20)),
+                ('commodity', models.CharField(blank=True, help_text="Canonical commodity; '' for the section header row", max_length=50)),
+                ('data', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Section figures; null marks the commodity stale', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_overview_snapshots', to='api.company')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('company', 'season', 'section', 'commodity'), name='uniq_season_overview_snapshot')],
+            },
+        ),
+    ]
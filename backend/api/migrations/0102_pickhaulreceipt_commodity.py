@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0101_seasonoverviewsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pickhaulreceipt',
+            name='commodity',
+            field=models.CharField(blank=True, help_text="Canonical commodity classified from the codes at apply time (UNMAPPED when unknown); '' = not yet classified", max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='pickhaulreceipt',
+            index=models.Index(fields=['company', 'season', 'commodity'], name='api_pickhau_company_050002_idx'),
+        ),
+    ]
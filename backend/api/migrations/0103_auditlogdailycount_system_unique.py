@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:46
+#
+# One counter row per bucket for system entries (no user) too.
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+
+
+def merge_system_duplicates(apps, schema_editor):
+    """Collapse duplicate user-less counters into the oldest row.
+
+    Each duplicate was inserted with count=1 by a concurrent writer and then
+    received every later increment, so the bucket's true count is the
+    largest row plus one for each other duplicate.
+    """
+    AuditLogDailyCount = apps.get_model('api', 'AuditLogDailyCount')
+    duplicates = (
+        AuditLogDailyCount.objects.filter(user__isnull=True)
+        .values('company_id', 'day', 'action', 'model_name')
+        .annotate(rows=Count('id'), keep=Min('id'), largest=Max('count'))
+        .filter(rows__gt=1)
+        .order_by()
+    )
+    for group in duplicates.iterator():
+        bucket = AuditLogDailyCount.objects.filter(
+            company_id=group['company_id'], day=group['day'], action=group['action'],
+            model_name=group['model_name'], user__isnull=True,
+        )
+        bucket.exclude(pk=group['keep']).delete()
+        bucket.filter(pk=group['keep']).update(count=group['largest'] + group['rows'] - 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0102_pickhaulreceipt_commodity'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_system_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='auditlogdailycount',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('company', 'day', 'action', 'model_name'), name='uniq_audit_daily_count_system'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0103_auditlogdailycount_system_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonOverviewGeneration',
+            fields=[
+                ('company', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='season_overview_generation', serialize=False, to='api.company')),
+                ('generation', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
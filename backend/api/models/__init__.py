@@ -24,6 +24,7 @@ from .auth import (
     Invitation,
     PasswordResetToken,
     AuditLog,
+    AuditLogDailyCount,
 )
 
 # -- shared acreage denominator ----------------------------------------------
@@ -143,6 +144,11 @@ from .weather import (
     WeatherCache,
 )
 
+# -- background task monitoring ----------------------------------------------
+from .monitoring import (
+    TaskRunMetric,
+)
+
 # -- compliance / notifications / PHI ----------------------------------------
 from .compliance import (
     ComplianceProfile,
@@ -176,6 +182,8 @@ from .packinghouse import (
     PackinghouseGrowerMapping,
     StatementBatchUpload,
     PackerCommitment,
+    SeasonOverviewSnapshot,
+    SeasonOverviewGeneration,
 )
 
 # -- PUR / tank mix / unified product ----------------------------------------
@@ -215,6 +223,7 @@ __all__ = [
     'RentalProperty', 'RentalUnit', 'Lease', 'RentalCategory',
     'RentalLedgerEntry',
     'CompanyMembership', 'Invitation', 'PasswordResetToken', 'AuditLog',
+    'AuditLogDailyCount',
     # farm
     'Farm', 'FarmParcel', 'CropCategory', 'CropType', 'SeasonType',
     'SeasonTemplate', 'Crop', 'Rootstock', 'Field', 'GrowingCycleStatus',
@@ -237,6 +246,8 @@ __all__ = [
     'WaterAllocation', 'ExtractionReport', 'IrrigationEvent',
     # weather
     'WeatherCache',
+    # monitoring
+    'TaskRunMetric',
     # compliance
     'ComplianceProfile', 'ComplianceDeadline', 'ComplianceAlert',
     'License', 'WPSTrainingRecord', 'CentralPostingLocation',
@@ -248,6 +259,8 @@ __all__ = [
     'PackoutGradeLine', 'PoolSettlement', 'SettlementGradeLine',
     'SettlementDeduction', 'GrowerLedgerEntry', 'PackinghouseStatement',
     'PackinghouseGrowerMapping', 'StatementBatchUpload', 'PackerCommitment',
+    'SeasonOverviewSnapshot',
+    'SeasonOverviewGeneration',
     # pur / tank mix
     'PRODUCT_TYPE_CHOICES', 'SIGNAL_WORD_CHOICES', 'APPLICATOR_TYPE_CHOICES',
     'PUR_STATUS_CHOICES', 'APPLICATION_METHOD_CHOICES',
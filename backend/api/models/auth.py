@@ -734,9 +734,61 @@ class AuditLog(models.Model):
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['company', 'timestamp']),
+            # Keyset pagination in audit_log_list walks (timestamp, id)
+            models.Index(fields=['company', '-timestamp', '-id']),
             models.Index(fields=['user', 'timestamp']),
             models.Index(fields=['model_name', 'object_id']),
         ]
 
     def __str__(self):
         return f"{self.user} {self.action} {self.model_name} at {self.timestamp}"
+
+
+class AuditLogDailyCount(models.Model):
+    """
+    Pre-aggregated AuditLog counts per company, local day, action, record
+    type and user.
+
+    Maintained incrementally as audit entries are written and rebuilt for
+    recent days by a nightly rollup, so the audit statistics endpoint reads
+    a handful of counter rows instead of grouping the full AuditLog table.
+    """
+
+    company = models.ForeignKey(
+        Company,
+        on_delete=models.CASCADE,
+        related_name='audit_log_daily_counts'
+    )
+    day = models.DateField(help_text='Local (TIME_ZONE) calendar day of the entries')
+    action = models.CharField(max_length=20, choices=AuditLog.ACTION_TYPES)
+    model_name = models.CharField(max_length=100)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='audit_log_daily_counts'
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'day']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'day', 'action', 'model_name', 'user'],
+                name='uniq_audit_daily_count',
+            ),
+            # NULLs are distinct in the constraint above, so system entries
+            # (no user) need their own. A partial index rather than
+            # nulls_distinct=False, which SQLite and PostgreSQL < 15 lack.
+            models.UniqueConstraint(
+                fields=['company', 'day', 'action', 'model_name'],
+                condition=models.Q(user__isnull=True),
+                name='uniq_audit_daily_count_system',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} {self.day} {self.action} {self.model_name}: {self.count}"
@@ -121,6 +121,11 @@ class ComplianceProfile(models.Model):
         default=False,
         help_text="True after deadlines have been auto-generated on first dashboard visit"
     )
+    deadlines_generated_through = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Recurring deadlines have been generated up to this date"
+    )
 
     class Meta:
         verbose_name = "Compliance Profile"
@@ -129,6 +134,17 @@ class ComplianceProfile(models.Model):
     def __str__(self):
         return f"Compliance Profile for {self.company.name}"
 
+    def save(self, *args, **kwargs):
+        """Regenerate the full deadline horizon after the requirements change.
+
+        Any full save may have switched a program on, so the next recurring
+        deadline run starts again from today rather than only extending
+        from where it left off.
+        """
+        if not kwargs.get('update_fields'):
+            self.deadlines_generated_through = None
+        super().save(*args, **kwargs)
+
     @property
     def active_regulations(self):
         """Return list of active regulatory requirements."""
@@ -1062,6 +1078,32 @@ class REIPostingRecord(models.Model):
     def __str__(self):
         return f"REI for {self.application or self.event} - Ends {self.rei_end_datetime}"
 
+    @classmethod
+    def bulk_insert(cls, records, source, batch_size=None):
+        """bulk_create(ignore_conflicts=True) that returns how many of the
+        records were actually inserted.
+
+        source is the link the records are keyed on ('application' or
+        'event'). Records whose source already has a posting — created by an
+        overlapping run, say — are looked up in batch_size chunks first and
+        left out of both the insert and the count. ignore_conflicts still
+        covers a posting that lands between that lookup and the insert.
+        """
+        records = list(records)
+        if not records:
+            return 0
+        key = f'{source}_id'
+        source_ids = [getattr(record, key) for record in records]
+        chunk = batch_size or 1000
+        existing = set()
+        for start in range(0, len(source_ids), chunk):
+            existing.update(cls.objects.filter(
+                **{f'{key}__in': source_ids[start:start + chunk]}
+            ).values_list(key, flat=True))
+        new = [record for record in records if getattr(record, key) not in existing]
+        cls.objects.bulk_create(new, batch_size=batch_size, ignore_conflicts=True)
+        return len(new)
+
     # -- Source-agnostic accessors -------------------------------------------
     # Everything downstream (serializers, alerts) should use these instead of
     # reaching through .application directly.
@@ -0,0 +1,56 @@
+from django.db import models
+
+
+# =============================================================================
+# TASK RUN METRICS
+# =============================================================================
+
+class TaskRunMetric(models.Model):
+    """
+    One execution of a Celery task from api.tasks, recorded by the signal
+    handlers in api/tasks/instrumentation.py.
+
+    Read back as percentiles by the task_metrics management command and
+    the Prometheus text endpoint (api/monitoring_views.py).
+    """
+
+    STATUS_CHOICES = [
+        ('success', 'Success'),
+        ('failure', 'Failure'),
+        ('retry', 'Retry'),
+    ]
+
+    task_name = models.CharField(max_length=200)
+    task_id = models.CharField(max_length=64, blank=True)
+    company = models.ForeignKey(
+        'Company',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='task_run_metrics',
+        help_text="Set for per-company runs (company_id kwarg)"
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='success')
+
+    started_at = models.DateTimeField()
+    duration_ms = models.FloatField(help_text="Wall time of the run")
+    query_count = models.PositiveIntegerField(default=0)
+    query_time_ms = models.FloatField(
+        default=0,
+        help_text="Time spent inside database calls"
+    )
+    rows_processed = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Rows reported in the task's stats dict, when it has one"
+    )
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['task_name', '-started_at']),
+            models.Index(fields=['started_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} @ {self.started_at:%Y-%m-%d %H:%M} ({self.duration_ms:.0f} ms)"
@@ -1,3 +1,6 @@
+import hashlib
+
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from decimal import Decimal
@@ -908,6 +911,14 @@ class GrowerLedgerEntry(models.Model):
         return self.debit - self.credit
 
 
+def file_sha256(file):
+    """Hex SHA-256 of a Django File, read in chunks from the start."""
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
 class PackinghouseStatement(models.Model):
     """
     Uploaded PDF statement from packinghouse with AI-extracted data.
@@ -958,6 +969,11 @@ class PackinghouseStatement(models.Model):
     file_size_bytes = models.PositiveIntegerField(
         help_text='File size in bytes'
     )
+    pdf_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text='SHA-256 of the stored PDF; the ETag when serving it'
+    )
 
     # Statement classification
     statement_type = models.CharField(
@@ -1060,6 +1076,13 @@ class PackinghouseStatement(models.Model):
     def __str__(self):
         return f"{self.original_filename} ({self.get_status_display()})"
 
+    def save(self, *args, **kwargs):
+        # Hash new uploads before they go to storage; statements stored
+        # before the field existed are hashed the first time they're served
+        if self.pdf_file and not self.pdf_file._committed and not self.pdf_sha256:
+            self.pdf_sha256 = file_sha256(self.pdf_file)
+        super().save(*args, **kwargs)
+
     @property
     def has_packout_report(self):
         """Check if this statement has generated a PackoutReport."""
@@ -1332,3 +1355,64 @@ class PackerCommitment(models.Model):
     def __str__(self):
         scope = self.field.name if self.field_id else 'default'
         return f'{self.season} {self.commodity} -> {self.packinghouse} ({scope})'
+
+
+class SeasonOverviewSnapshot(models.Model):
+    """One stored section of a company's season overview.
+
+    The season overview is served from these rows rather than rebuilt from
+    receipts, invoices, settlements and ledger entries on every request (see
+    api/services/season_overview.py). Each section has a header row
+    (commodity '') that marks it complete; per-commodity sections add one
+    row per commodity. Writes delete a section's rows, or null out the data
+    of the commodities they touched, and the next read recomputes only what
+    is missing. Recomputed rows are stored only while the company's
+    SeasonOverviewGeneration is unchanged.
+    """
+
+    company = models.ForeignKey(
+        'Company', on_delete=models.CASCADE, related_name='season_overview_snapshots'
+    )
+    season = models.PositiveSmallIntegerField(
+        help_text='End year of the season (2026 = the 2025-2026 season)'
+    )
+    section = models.CharField(max_length=20)
+    commodity = models.CharField(
+        max_length=50, blank=True,
+        help_text="Canonical commodity; '' for the section header row",
+    )
+    data = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder,
+        help_text='Section figures; null marks the commodity stale',
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['company', 'season', 'section', 'commodity'],
+                name='uniq_season_overview_snapshot',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.season} {self.section} {self.commodity or "(header)"}'
+
+
+class SeasonOverviewGeneration(models.Model):
+    """Per-company counter bumped whenever stored overview sections are
+    marked stale.
+
+    A reader stores what it recomputed only if the counter hasn't moved
+    since it read the snapshot, so figures computed while a writer's
+    transaction was still open are never stored as fresh.
+    """
+
+    company = models.OneToOneField(
+        'Company', on_delete=models.CASCADE, primary_key=True,
+        related_name='season_overview_generation',
+    )
+    generation = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.company_id}: {self.generation}'
@@ -243,6 +243,11 @@ class PickHaulReceipt(models.Model):
     extra_12 = models.CharField(max_length=100, blank=True)
     extra_13 = models.CharField(max_length=100, blank=True)
     bins = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    commodity = models.CharField(
+        max_length=50, blank=True,
+        help_text="Canonical commodity classified from the codes at apply time "
+                  "(UNMAPPED when unknown); '' = not yet classified",
+    )
 
     is_active = models.BooleanField(
         default=True,
@@ -276,6 +281,7 @@ class PickHaulReceipt(models.Model):
         indexes = [
             models.Index(fields=['company', 'season', 'block_raw', 'pick_date']),
             models.Index(fields=['company', 'season', 'is_active']),
+            models.Index(fields=['company', 'season', 'commodity']),
         ]
 
     def __str__(self):
@@ -396,6 +396,16 @@ class ApplicationEvent(models.Model):
         self.save(update_fields=['rei_hours', 'phi_days'])
         self.sync_rei_posting()
 
+    def _rei_window(self):
+        """(rei_hours rounded up, REI end) or None when no REI applies."""
+        import math
+        from datetime import timedelta
+
+        if not self.rei_hours or not self.date_started:
+            return None
+        rei_end = self.date_started + timedelta(hours=float(self.rei_hours))
+        return int(math.ceil(float(self.rei_hours))), rei_end
+
     def sync_rei_posting(self):
         """Create/refresh the worker-safety REI posting for this event.
 
@@ -403,24 +413,21 @@ class ApplicationEvent(models.Model):
         long-expired REIs (e.g. historical PDF imports) would flood the
         'REI ended, remove signs' alert stream with noise.
         """
-        import math
-        from datetime import timedelta
-
         from django.utils import timezone
 
         from .compliance import REIPostingRecord
 
         existing = REIPostingRecord.objects.filter(event=self).first()
+        window = self._rei_window()
 
-        if not self.rei_hours or not self.date_started:
+        if window is None:
             # No REI applies; drop a stale posting unless signs were
             # actually posted (that's a real compliance record).
             if existing and not existing.posted_at:
                 existing.delete()
             return None
 
-        rei_end = self.date_started + timedelta(hours=float(self.rei_hours))
-        rei_hours_int = int(math.ceil(float(self.rei_hours)))
+        rei_hours_int, rei_end = window
 
         if existing:
             if (existing.rei_hours != rei_hours_int
@@ -440,6 +447,61 @@ class ApplicationEvent(models.Model):
             posting_compliant=False,
         )
 
+    @classmethod
+    def sync_rei_postings(cls, events):
+        """Batched sync_rei_posting() for many events.
+
+        Applies the same rules with one read of the existing postings and
+        at most one delete, one update and one insert, however many events
+        are passed. Events need only id, rei_hours and date_started loaded.
+        Returns the number of postings created.
+        """
+        from django.utils import timezone
+
+        from .compliance import REIPostingRecord
+
+        events = list(events)
+        if not events:
+            return 0
+
+        existing = {
+            posting.event_id: posting
+            for posting in REIPostingRecord.objects.filter(
+                event_id__in=[event.pk for event in events]
+            )
+        }
+        now = timezone.now()
+        stale, changed, new = [], [], []
+
+        for event in events:
+            posting = existing.get(event.pk)
+            window = event._rei_window()
+            if window is None:
+                if posting and not posting.posted_at:
+                    stale.append(posting.pk)
+                continue
+
+            rei_hours_int, rei_end = window
+            if posting:
+                if (posting.rei_hours != rei_hours_int
+                        or posting.rei_end_datetime != rei_end):
+                    posting.rei_hours = rei_hours_int
+                    posting.rei_end_datetime = rei_end
+                    changed.append(posting)
+            elif rei_end > now:
+                new.append(REIPostingRecord(
+                    event_id=event.pk,
+                    rei_hours=rei_hours_int,
+                    rei_end_datetime=rei_end,
+                    posting_compliant=False,
+                ))
+
+        if stale:
+            REIPostingRecord.objects.filter(pk__in=stale).delete()
+        if changed:
+            REIPostingRecord.objects.bulk_update(changed, ['rei_hours', 'rei_end_datetime'])
+        return REIPostingRecord.bulk_insert(new, 'event')
+
     @property
     def total_cost(self):
         """Sum of tank-mix item costs. None if any item's product has no cost
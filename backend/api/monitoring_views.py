@@ -0,0 +1,60 @@
+"""
+Monitoring endpoints for scrapers, in the Prometheus text format.
+
+GET /api/metrics/tasks/ serves per-task Celery run metrics (see
+api/services/task_metrics.py); GET /api/metrics/dashboards/ serves dashboard
+cache outcome counters (see api/services/dashboard_cache.py). Both sit
+outside the JWT/company stack: scrapers authenticate with
+``Authorization: Bearer <TASK_METRICS_TOKEN>``, and the endpoints are closed
+while that setting is empty.
+"""
+
+import hmac
+from datetime import timedelta
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from .services import dashboard_cache
+from .services.task_metrics import render_prometheus, summarize_task_runs
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Longest trailing window a scrape may ask for.
+MAX_WINDOW_HOURS = 24 * 31
+
+
+def _has_metrics_token(request):
+    expected = getattr(settings, 'TASK_METRICS_TOKEN', '')
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    if not expected or not header.startswith('Bearer '):
+        return False
+    return hmac.compare_digest(header[len('Bearer '):].strip(), expected)
+
+
+@require_GET
+def task_metrics(request):
+    """Prometheus exposition of task runs over the last ``window_hours`` (default 24)."""
+    if not _has_metrics_token(request):
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+
+    try:
+        hours = int(request.GET.get('window_hours', 24))
+    except ValueError:
+        return HttpResponse('window_hours must be an integer\n', status=400, content_type='text/plain')
+    hours = max(1, min(hours, MAX_WINDOW_HOURS))
+
+    summaries = summarize_task_runs(since=timezone.now() - timedelta(hours=hours))
+    return HttpResponse(render_prometheus(summaries), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@require_GET
+def dashboard_cache_metrics(request):
+    """Prometheus exposition of dashboard cache hits, misses and bypasses."""
+    if not _has_metrics_token(request):
+        return HttpResponse('Forbidden\n', status=403, content_type='text/plain')
+
+    body = dashboard_cache.render_prometheus(dashboard_cache.dashboard_cache_stats())
+    return HttpResponse(body, content_type=PROMETHEUS_CONTENT_TYPE)
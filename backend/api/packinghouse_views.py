@@ -12,9 +12,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .view_helpers import CompanyFilteredViewSet
-from django.db.models import Sum, Avg, Count, F, Q, Subquery, OuterRef, DecimalField
+from django.db.models import Sum, Avg, Count, F, Q, Subquery, OuterRef, DecimalField, IntegerField
 from django.db.models.functions import Coalesce
 from django.db import transaction
+from datetime import date
 from decimal import Decimal
 import logging
 import re
@@ -27,17 +28,42 @@ from .models import (
     Harvest, StatementBatchUpload, PackinghouseGrowerMapping, Farm,
     PackerCommitment,
 )
-from .services.settlement_service import finalize_settlement as _finalize_settlement
+from .services.settlement_service import (
+    finalize_settlement as _finalize_settlement,
+    save_extracted_lines,
+    save_packout_grade_lines,
+    save_settlement_lines,
+)
 from .services.season_service import (
     SeasonService, get_citrus_season, parse_legacy_season,
     get_crop_category_for_commodity, parse_season_for_category,
     normalize_commodity
 )
+from .services.dashboard_cache import dashboard_response
 from .services.packinghouse_analytics import PackinghouseAnalyticsService
 
 logger = logging.getLogger(__name__)
 
 
+def _pool_total(model, expression, output_field):
+    """
+    Correlated subquery totalling ``expression`` over ``model`` rows of the
+    outer pool, 0 when there are none.
+    """
+    return Coalesce(
+        Subquery(
+            model.objects.filter(pool=OuterRef('pk'))
+            .order_by()
+            .values('pool')
+            .annotate(total=expression)
+            .values('total'),
+            output_field=output_field,
+        ),
+        0,
+        output_field=output_field,
+    )
+
+
 def _annotate_pool_aggregates(queryset):
     """
     Annotate a Pool queryset with delivery_count, total_bins, and total_weight
@@ -47,30 +73,23 @@ def _annotate_pool_aggregates(queryset):
     - total_bins: packout_reports.bins_this_period if any, else deliveries.bins
     - total_weight: first settlement's total_weight_lbs if any, else deliveries.weight_lbs
     - delivery_count: count of deliveries
+
+    Each total is its own correlated subquery rather than a Sum over joins:
+    joining deliveries and packout reports together multiplies every
+    delivery by every report of the pool before grouping, which both slows
+    the list down and inflates the sums.
     """
     return queryset.annotate(
-        _delivery_count=Count('deliveries', distinct=True),
-        _packout_bins=Coalesce(
-            Sum('packout_reports__bins_this_period'),
-            Decimal('0'),
-            output_field=DecimalField(),
-        ),
-        _delivery_bins=Coalesce(
-            Sum('deliveries__bins'),
-            Decimal('0'),
-            output_field=DecimalField(),
-        ),
+        _delivery_count=_pool_total(PackinghouseDelivery, Count('pk'), IntegerField()),
+        _packout_bins=_pool_total(PackoutReport, Sum('bins_this_period'), DecimalField()),
+        _delivery_bins=_pool_total(PackinghouseDelivery, Sum('bins'), DecimalField()),
         _settlement_weight=Subquery(
             PoolSettlement.objects.filter(
                 pool=OuterRef('pk')
             ).order_by('-statement_date').values('total_weight_lbs')[:1],
             output_field=DecimalField(),
         ),
-        _delivery_weight=Coalesce(
-            Sum('deliveries__weight_lbs'),
-            Decimal('0'),
-            output_field=DecimalField(),
-        ),
+        _delivery_weight=_pool_total(PackinghouseDelivery, Sum('weight_lbs'), DecimalField()),
     )
 
 
@@ -484,11 +503,8 @@ class PackoutReportViewSet(CompanyFilteredViewSet):
         # POST - add grade lines
         serializer = PackoutGradeLineSerializer(data=request.data, many=True)
         if serializer.is_valid():
-            for item in serializer.validated_data:
-                PackoutGradeLine.objects.create(
-                    packout_report=report,
-                    **item
-                )
+            with transaction.atomic():
+                save_packout_grade_lines(report, serializer.validated_data)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -589,12 +605,9 @@ class PoolSettlementViewSet(CompanyFilteredViewSet):
         serializer = SettlementGradeLineSerializer(data=request.data, many=True)
         if serializer.is_valid():
             with transaction.atomic():
-                for item in serializer.validated_data:
-                    SettlementGradeLine.objects.create(
-                        settlement=settlement,
-                        **item
-                    )
-                warnings = _finalize_settlement(settlement)
+                warnings = save_settlement_lines(
+                    settlement, grade_lines=serializer.validated_data
+                )
             return Response({
                 'grade_lines': serializer.data,
                 'warnings': warnings,
@@ -615,12 +628,9 @@ class PoolSettlementViewSet(CompanyFilteredViewSet):
         serializer = SettlementDeductionSerializer(data=request.data, many=True)
         if serializer.is_valid():
             with transaction.atomic():
-                for item in serializer.validated_data:
-                    SettlementDeduction.objects.create(
-                        settlement=settlement,
-                        **item
-                    )
-                warnings = _finalize_settlement(settlement)
+                warnings = save_settlement_lines(
+                    settlement, deductions=serializer.validated_data
+                )
             return Response({
                 'deductions': serializer.data,
                 'warnings': warnings,
@@ -880,14 +890,23 @@ def packinghouse_dashboard(request):
     if not user.current_company:
         return Response({'error': 'No company selected'}, status=400)
 
-    result = PackinghouseAnalyticsService.packinghouse_dashboard(
-        company=user.current_company,
-        season_id=request.query_params.get('season'),
+    season_id = request.query_params.get('season')
+
+    def build():
+        result = PackinghouseAnalyticsService.packinghouse_dashboard(
+            company=user.current_company,
+            season_id=season_id,
+        )
+        # Serialize the queryset fields that the service returns as raw querysets
+        result['recent_deliveries'] = PackinghouseDeliveryListSerializer(result['recent_deliveries'], many=True).data
+        result['recent_packouts'] = PackoutReportListSerializer(result['recent_packouts'], many=True).data
+        return result
+
+    # The default season follows today's date
+    return dashboard_response(
+        request, 'packinghouse', user.current_company_id,
+        {'season': season_id, 'today': date.today()}, build,
     )
-    # Serialize the queryset fields that the service returns as raw querysets
-    result['recent_deliveries'] = PackinghouseDeliveryListSerializer(result['recent_deliveries'], many=True).data
-    result['recent_packouts'] = PackoutReportListSerializer(result['recent_packouts'], many=True).data
-    return Response(result)
 
 
 @api_view(['GET'])
@@ -916,8 +935,11 @@ def season_overview(request):
     cash received, and per-commodity delivered -> settled cards with
     net-to-grower and packer-commitment annotations. Delivery and cash
     sections require the pick & haul permission.
+
+    Served from the stored per-season snapshot; ?fresh=1 rebuilds every
+    section from scratch and re-stores it.
     """
-    from .services.season_overview import build_season_overview
+    from .services.season_overview import stored_season_overview
     from .view_helpers import get_user_company
 
     company = get_user_company(request.user)
@@ -936,9 +958,16 @@ def season_overview(request):
         season = today.year + 1 if today.month >= 10 else today.year
 
     include_pickhaul = request.user.has_permission('view_pick_haul')
+    fresh = request.query_params.get('fresh') in ('1', 'true')
 
-    result = build_season_overview(company, season, include_pickhaul=include_pickhaul)
-    return Response(result)
+    return dashboard_response(
+        request, 'season_overview', company.id,
+        {'season': season, 'include_pickhaul': include_pickhaul},
+        lambda: stored_season_overview(
+            company, season, include_pickhaul=include_pickhaul, fresh=fresh,
+        ),
+        bypass=fresh,
+    )
 
 
 # =============================================================================
@@ -1370,16 +1399,10 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
                             setattr(existing_packout, key, value)
                         existing_packout.save()
 
-                        # Delete and recreate grade lines
-                        PackoutGradeLine.objects.filter(packout_report=existing_packout).delete()
-                        grade_lines_data = extraction_service.get_grade_lines_data(
-                            data_to_use, for_settlement=False
+                        # Replace grade lines
+                        save_extracted_lines(
+                            existing_packout, data_to_use, extraction_service, replace=True
                         )
-                        for line_data in grade_lines_data:
-                            PackoutGradeLine.objects.create(
-                                packout_report=existing_packout,
-                                **line_data
-                            )
 
                         logger.info(f"Updated existing packout report {existing_packout.id} with edited data")
 
@@ -1410,27 +1433,10 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
                             setattr(existing_settlement, key, value)
                         existing_settlement.save()
 
-                        # Delete and recreate grade lines and deductions
-                        SettlementGradeLine.objects.filter(settlement=existing_settlement).delete()
-                        SettlementDeduction.objects.filter(settlement=existing_settlement).delete()
-
-                        grade_lines_data = extraction_service.get_grade_lines_data(
-                            data_to_use, for_settlement=True
+                        # Replace grade lines and deductions
+                        warnings = save_extracted_lines(
+                            existing_settlement, data_to_use, extraction_service, replace=True
                         )
-                        for line_data in grade_lines_data:
-                            SettlementGradeLine.objects.create(
-                                settlement=existing_settlement,
-                                **line_data
-                            )
-
-                        deductions_data = extraction_service.get_deductions_data(data_to_use)
-                        for deduction_data in deductions_data:
-                            SettlementDeduction.objects.create(
-                                settlement=existing_settlement,
-                                **deduction_data
-                            )
-
-                        warnings = _finalize_settlement(existing_settlement)
 
                         logger.info(f"Updated existing settlement {existing_settlement.id} with edited data")
 
@@ -1461,16 +1467,7 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
                     report_data['source_statement'] = statement
 
                     packout_report = PackoutReport.objects.create(**report_data)
-
-                    # Create grade lines
-                    grade_lines_data = extraction_service.get_grade_lines_data(
-                        data_to_use, for_settlement=False
-                    )
-                    for line_data in grade_lines_data:
-                        PackoutGradeLine.objects.create(
-                            packout_report=packout_report,
-                            **line_data
-                        )
+                    save_extracted_lines(packout_report, data_to_use, extraction_service)
 
                     statement.pool = pool
                     statement.field = field
@@ -1496,26 +1493,7 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
                     settlement_data['source_statement'] = statement
 
                     settlement = PoolSettlement.objects.create(**settlement_data)
-
-                    # Create grade lines
-                    grade_lines_data = extraction_service.get_grade_lines_data(
-                        data_to_use, for_settlement=True
-                    )
-                    for line_data in grade_lines_data:
-                        SettlementGradeLine.objects.create(
-                            settlement=settlement,
-                            **line_data
-                        )
-
-                    # Create deductions
-                    deductions_data = extraction_service.get_deductions_data(data_to_use)
-                    for ded_data in deductions_data:
-                        SettlementDeduction.objects.create(
-                            settlement=settlement,
-                            **ded_data
-                        )
-
-                    warnings = _finalize_settlement(settlement)
+                    warnings = save_extracted_lines(settlement, data_to_use, extraction_service)
 
                     statement.pool = pool
                     statement.field = field
@@ -1611,8 +1589,17 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
         """
         Serve the PDF file directly from the backend.
         This proxies the file from cloud storage (R2/S3) to avoid CORS issues.
+
+        Supports Range requests (the browser PDF viewer fetches pages on
+        demand) and If-None-Match against an ETag of the file's SHA-256.
+        With cloud storage and STATEMENT_PDF_REDIRECT_SECONDS set, redirects
+        to a short-lived presigned URL instead of streaming the file.
         """
-        from django.http import FileResponse, HttpResponse
+        from django.conf import settings
+        from django.http import HttpResponse, HttpResponseRedirect
+        from django.utils.cache import get_conditional_response
+        from .models.packinghouse import file_sha256
+        from .view_helpers import ranged_file_response
 
         statement = self.get_object()
         logger.info(f"Serving PDF for statement {statement.id}: {statement.original_filename}")
@@ -1620,17 +1607,49 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
         if not statement.pdf_file:
             return HttpResponse('No PDF file available', status=404)
 
+        filename = statement.original_filename or 'statement.pdf'
+        # Allow the browser to cache the PDF for 1 hour
+        cache_control = 'private, max-age=3600'
+
+        etag = f'"{statement.pdf_sha256}"' if statement.pdf_sha256 else None
+        if etag:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified['ETag'] = etag
+                not_modified['Cache-Control'] = cache_control
+                return not_modified
+
+        redirect_seconds = settings.STATEMENT_PDF_REDIRECT_SECONDS
+        if redirect_seconds and settings.USE_CLOUD_STORAGE:
+            url = statement.pdf_file.storage.url(
+                statement.pdf_file.name,
+                parameters={
+                    'ResponseContentType': 'application/pdf',
+                    'ResponseContentDisposition': f'inline; filename="{filename}"',
+                },
+                expire=redirect_seconds,
+            )
+            response = HttpResponseRedirect(url)
+            # Don't let the browser reuse the redirect after the URL expires
+            response['Cache-Control'] = f'private, max-age={redirect_seconds // 2}'
+            return response
+
         try:
             # Open the file from storage (works with both local and cloud storage)
             pdf_file = statement.pdf_file.open('rb')
-            response = FileResponse(
-                pdf_file,
-                content_type='application/pdf',
-                as_attachment=False,
-                filename=statement.original_filename or 'statement.pdf'
+            if not etag:
+                # Stored before uploads were hashed: hash once and keep it
+                statement.pdf_sha256 = file_sha256(pdf_file)
+                pdf_file.seek(0)
+                PackinghouseStatement.objects.filter(pk=statement.pk).update(
+                    pdf_sha256=statement.pdf_sha256
+                )
+                etag = f'"{statement.pdf_sha256}"'
+            response = ranged_file_response(
+                request, pdf_file, pdf_file.size, 'application/pdf',
+                etag=etag, filename=filename,
             )
-            # Allow the browser to cache the PDF for 1 hour
-            response['Cache-Control'] = 'private, max-age=3600'
+            response['Cache-Control'] = cache_control
             return response
         except Exception as e:
             logger.exception(f"Error serving PDF for statement {statement.id}")
@@ -2144,26 +2163,9 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
                         settlement_data['source_statement'] = statement
 
                         settlement = PoolSettlement.objects.create(**settlement_data)
-
-                        # Create grade lines
-                        grade_lines_data = extraction_service.get_grade_lines_data(
-                            data_to_use, for_settlement=True
+                        settlement_warnings = save_extracted_lines(
+                            settlement, data_to_use, extraction_service
                         )
-                        for line_data in grade_lines_data:
-                            SettlementGradeLine.objects.create(
-                                settlement=settlement,
-                                **line_data
-                            )
-
-                        # Create deductions
-                        deductions_data = extraction_service.get_deductions_data(data_to_use)
-                        for ded_data in deductions_data:
-                            SettlementDeduction.objects.create(
-                                settlement=settlement,
-                                **ded_data
-                            )
-
-                        settlement_warnings = _finalize_settlement(settlement)
 
                         settlement_id = settlement.id
 
@@ -2175,16 +2177,7 @@ class PackinghouseStatementViewSet(CompanyFilteredViewSet):
                         report_data['source_statement'] = statement
 
                         packout_report = PackoutReport.objects.create(**report_data)
-
-                        # Create grade lines
-                        grade_lines_data = extraction_service.get_grade_lines_data(
-                            data_to_use, for_settlement=False
-                        )
-                        for line_data in grade_lines_data:
-                            PackoutGradeLine.objects.create(
-                                packout_report=packout_report,
-                                **line_data
-                            )
+                        save_extracted_lines(packout_report, data_to_use, extraction_service)
 
                         packout_report_id = packout_report.id
 
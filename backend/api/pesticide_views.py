@@ -15,6 +15,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from .pur_reporting import PURReportGenerator
 from .product_import_tool import PesticideProductImporter
@@ -25,11 +26,55 @@ from .models import (
 from .serializers import (
     PesticideProductSerializer, PesticideApplicationSerializer,
 )
-from .view_helpers import get_user_company, require_company
+from .view_helpers import (
+    EXPORT_CHUNK_SIZE, get_user_company, require_company,
+    streaming_csv_response, xlsx_file_response,
+)
 from .audit_utils import AuditLogMixin
 from .permissions import HasCompanyAccess
 
 
+# Column order for the detailed PUR CSV export.
+DETAILED_CSV_HEADERS = [
+    'Application Date',
+    'Farm Name',
+    'Farm Number',
+    'Operator Name',
+    'County',
+    'Field Name',
+    'Field Number',
+    'Section',
+    'Township',
+    'Range',
+    'GPS Latitude',
+    'GPS Longitude',
+    'Acres Treated',
+    'Current Crop',
+    'EPA Registration Number',
+    'Product Name',
+    'Active Ingredients',
+    'Amount Used',
+    'Unit',
+    'Application Method',
+    'Target Pest',
+    'Applicator Name',
+    'Start Time',
+    'End Time',
+    'Temperature (°F)',
+    'Wind Speed (mph)',
+    'Wind Direction',
+    'Restricted Use',
+    'Fumigant',
+    'REI (hours)',
+    'PHI (days)',
+    'Signal Word',
+    'Status',
+    'PUR Submitted',
+    'Submission Date',
+    'Notes'
+]
+
+
 class PesticideProductViewSet(AuditLogMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing pesticide products
@@ -148,9 +193,6 @@ class PesticideProductViewSet(AuditLogMixin, viewsets.ModelViewSet):
         """Export current products to CSV"""
         products = PesticideProduct.objects.all()
 
-        output = io.StringIO()
-        writer = csv.writer(output)
-
         # Headers
         headers = [
             'epa_registration_number', 'product_name', 'manufacturer',
@@ -162,42 +204,40 @@ class PesticideProductViewSet(AuditLogMixin, viewsets.ModelViewSet):
             'formulation_code', 'approved_crops', 'product_status',
             'unit_size', 'cost_per_unit', 'label_url', 'notes', 'active'
         ]
-        writer.writerow(headers)
 
-        # Data rows
-        for product in products:
-            row = [
-                product.epa_registration_number,
-                product.product_name,
-                product.manufacturer,
-                product.active_ingredients,
-                product.formulation_type,
-                product.restricted_use,
-                product.product_type if hasattr(product, 'product_type') else '',
-                product.is_fumigant if hasattr(product, 'is_fumigant') else False,
-                product.signal_word if hasattr(product, 'signal_word') else '',
-                product.rei_hours if hasattr(product, 'rei_hours') else '',
-                product.rei_days if hasattr(product, 'rei_days') else '',
-                product.phi_days if hasattr(product, 'phi_days') else '',
-                product.max_applications_per_season if hasattr(product, 'max_applications_per_season') else '',
-                product.max_rate_per_application if hasattr(product, 'max_rate_per_application') else '',
-                product.max_rate_unit if hasattr(product, 'max_rate_unit') else '',
-                product.california_registration_number if hasattr(product, 'california_registration_number') else '',
-                product.active_status_california if hasattr(product, 'active_status_california') else True,
-                product.formulation_code if hasattr(product, 'formulation_code') else '',
-                product.approved_crops if hasattr(product, 'approved_crops') else '',
-                product.product_status if hasattr(product, 'product_status') else 'active',
-                product.unit_size if hasattr(product, 'unit_size') else '',
-                product.cost_per_unit if hasattr(product, 'cost_per_unit') else '',
-                product.label_url if hasattr(product, 'label_url') else '',
-                product.notes if hasattr(product, 'notes') else '',
-                product.active if hasattr(product, 'active') else True,
-            ]
-            writer.writerow(row)
+        def rows():
+            for product in products.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+                yield [
+                    product.epa_registration_number,
+                    product.product_name,
+                    product.manufacturer,
+                    product.active_ingredients,
+                    product.formulation_type,
+                    product.restricted_use,
+                    product.product_type if hasattr(product, 'product_type') else '',
+                    product.is_fumigant if hasattr(product, 'is_fumigant') else False,
+                    product.signal_word if hasattr(product, 'signal_word') else '',
+                    product.rei_hours if hasattr(product, 'rei_hours') else '',
+                    product.rei_days if hasattr(product, 'rei_days') else '',
+                    product.phi_days if hasattr(product, 'phi_days') else '',
+                    product.max_applications_per_season if hasattr(product, 'max_applications_per_season') else '',
+                    product.max_rate_per_application if hasattr(product, 'max_rate_per_application') else '',
+                    product.max_rate_unit if hasattr(product, 'max_rate_unit') else '',
+                    product.california_registration_number if hasattr(product, 'california_registration_number') else '',
+                    product.active_status_california if hasattr(product, 'active_status_california') else True,
+                    product.formulation_code if hasattr(product, 'formulation_code') else '',
+                    product.approved_crops if hasattr(product, 'approved_crops') else '',
+                    product.product_status if hasattr(product, 'product_status') else 'active',
+                    product.unit_size if hasattr(product, 'unit_size') else '',
+                    product.cost_per_unit if hasattr(product, 'cost_per_unit') else '',
+                    product.label_url if hasattr(product, 'label_url') else '',
+                    product.notes if hasattr(product, 'notes') else '',
+                    product.active if hasattr(product, 'active') else True,
+                ]
 
-        response = HttpResponse(output.getvalue(), content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="pesticide_products_export.csv"'
-        return response
+        return streaming_csv_response(
+            rows(), 'pesticide_products_export.csv', header=headers
+        )
 
 
 class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
@@ -310,15 +350,12 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
                 'validation': validation
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Generate CSV
-        csv_content = generator.generate_csv()
-
-        # Create response
-        response = HttpResponse(csv_content, content_type='text/csv')
-        filename = f"PUR_Report_{start_date}_to_{end_date}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        # Stream the CSV
+        return streaming_csv_response(
+            generator.iter_pur_rows(),
+            f"PUR_Report_{start_date}_to_{end_date}.csv",
+            header=generator.PUR_FIELDS,
+        )
 
     @action(detail=False, methods=['post'])
     def pur_summary(self, request):
@@ -416,73 +453,29 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
 
     def _export_official_pur_csv(self, generator, start_date, end_date):
         """Export using existing official California PUR format"""
-        csv_content = generator.generate_csv()
-
-        response = HttpResponse(csv_content, content_type='text/csv')
         filename = f"PUR_Official_{start_date or 'all'}_to_{end_date or 'all'}_{datetime.now().strftime('%Y%m%d')}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return streaming_csv_response(
+            generator.iter_pur_rows(), filename, header=generator.PUR_FIELDS
+        )
 
 
     def _export_pur_csv_detailed(self, queryset, start_date, end_date):
         """Export detailed CSV with all available fields"""
-        import csv
-
-        response = HttpResponse(content_type='text/csv')
-
         date_range = ""
         if start_date and end_date:
             date_range = f"_{start_date}_to_{end_date}"
 
         filename = f"PUR_Detailed{date_range}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        writer = csv.writer(response)
-
-        # Detailed header
-        writer.writerow([
-            'Application Date',
-            'Farm Name',
-            'Farm Number',
-            'Operator Name',
-            'County',
-            'Field Name',
-            'Field Number',
-            'Section',
-            'Township',
-            'Range',
-            'GPS Latitude',
-            'GPS Longitude',
-            'Acres Treated',
-            'Current Crop',
-            'EPA Registration Number',
-            'Product Name',
-            'Active Ingredients',
-            'Amount Used',
-            'Unit',
-            'Application Method',
-            'Target Pest',
-            'Applicator Name',
-            'Start Time',
-            'End Time',
-            'Temperature (°F)',
-            'Wind Speed (mph)',
-            'Wind Direction',
-            'Restricted Use',
-            'Fumigant',
-            'REI (hours)',
-            'PHI (days)',
-            'Signal Word',
-            'Status',
-            'PUR Submitted',
-            'Submission Date',
-            'Notes'
-        ])
 
-        # Write data
-        for app in queryset:
-            writer.writerow([
+        return streaming_csv_response(
+            self._detailed_csv_rows(queryset), filename, header=DETAILED_CSV_HEADERS
+        )
+
+    @staticmethod
+    def _detailed_csv_rows(queryset):
+        """Yield one detailed CSV row per application, chunk by chunk."""
+        for app in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield [
                 app.application_date.strftime('%m/%d/%Y'),
                 app.field.farm.name,
                 app.field.farm.farm_number or '',
@@ -519,18 +512,18 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
                 'Yes' if app.submitted_to_pur else 'No',
                 app.pur_submission_date.strftime('%m/%d/%Y') if app.pur_submission_date else '',
                 app.notes or ''
-            ])
-
-        return response
+            ]
 
 
     def _export_pur_excel(self, queryset, start_date, end_date):
-        """Export detailed Excel with formatting and summary"""
-        wb = Workbook()
+        """
+        Export detailed Excel with formatting and summary.
 
-        # === OFFICIAL PUR FORMAT SHEET ===
-        ws_pur = wb.active
-        ws_pur.title = "Official PUR Format"
+        Built with a write-only workbook: rows stream from the database in
+        chunks and are flushed to disk as they are appended, so memory use
+        does not grow with the number of applications.
+        """
+        wb = Workbook(write_only=True)
 
         # Use PURReportGenerator for official format
         generator = PURReportGenerator(queryset)
@@ -542,29 +535,43 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
         border_side = Side(style='thin', color='000000')
         border = Border(left=border_side, right=border_side, top=border_side, bottom=border_side)
 
-        # Write official PUR headers
-        for col_num, field_name in enumerate(generator.PUR_FIELDS, 1):
-            cell = ws_pur.cell(row=1, column=col_num)
-            cell.value = field_name.replace('_', ' ').title()
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = border
-
-        # Write official PUR data
-        for row_num, app in enumerate(queryset, 2):
-            row_data = generator._application_to_pur_row(app)
-            for col_num, field_name in enumerate(generator.PUR_FIELDS, 1):
-                cell = ws_pur.cell(row=row_num, column=col_num)
-                cell.value = row_data.get(field_name, '')
+        def header_row(ws, headers):
+            cells = []
+            for value in headers:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.fill = header_fill
+                cell.font = header_font
+                cell.alignment = header_alignment
                 cell.border = border
+                cells.append(cell)
+            return cells
 
-        # Auto-size columns for PUR sheet
+        def bordered_row(ws, values):
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(ws, value=value)
+                cell.border = border
+                cells.append(cell)
+            return cells
+
+        def styled(ws, value, font):
+            cell = WriteOnlyCell(ws, value=value)
+            cell.font = font
+            return cell
+
+        # === OFFICIAL PUR FORMAT SHEET ===
+        # Write-only sheets need widths and panes set before the first row.
+        ws_pur = wb.create_sheet("Official PUR Format")
         for col in range(1, len(generator.PUR_FIELDS) + 1):
             ws_pur.column_dimensions[chr(64 + col)].width = 15
-
         ws_pur.freeze_panes = 'A2'
 
+        ws_pur.append(header_row(
+            ws_pur, [name.replace('_', ' ').title() for name in generator.PUR_FIELDS]
+        ))
+        for row_data in generator.iter_pur_rows():
+            ws_pur.append(bordered_row(ws_pur, row_data))
+
         # === DETAILED DATA SHEET ===
         ws_detail = wb.create_sheet("Detailed Data")
 
@@ -576,18 +583,15 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
             'Restricted', 'REI', 'PHI', 'Status', 'Notes'
         ]
 
-        # Write headers
-        for col_num, header in enumerate(detail_headers, 1):
-            cell = ws_detail.cell(row=1, column=col_num)
-            cell.value = header
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = border
-
-        # Write data
-        for row_num, app in enumerate(queryset, 2):
-            data = [
+        for col_num in range(1, len(detail_headers) + 1):
+            col_letter = chr(64 + col_num)
+            ws_detail.column_dimensions[col_letter].width = 12
+        ws_detail.freeze_panes = 'A2'
+
+        ws_detail.append(header_row(ws_detail, detail_headers))
+
+        for app in generator.iter_applications():
+            ws_detail.append(bordered_row(ws_detail, [
                 app.application_date.strftime('%m/%d/%Y'),
                 app.field.farm.name,
                 app.field.farm.farm_number or '',
@@ -614,123 +618,77 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
                 app.product.phi_days or '',
                 app.get_status_display(),
                 app.notes or ''
-            ]
-
-            for col_num, value in enumerate(data, 1):
-                cell = ws_detail.cell(row=row_num, column=col_num)
-                cell.value = value
-                cell.border = border
-
-        # Auto-size columns
-        for col_num in range(1, len(detail_headers) + 1):
-            col_letter = chr(64 + col_num)
-            ws_detail.column_dimensions[col_letter].width = 12
-
-        ws_detail.freeze_panes = 'A2'
+            ]))
 
         # === SUMMARY SHEET ===
         ws_summary = wb.create_sheet("Summary & Validation")
         ws_summary.column_dimensions['A'].width = 30
         ws_summary.column_dimensions['B'].width = 20
 
-        # Title
-        ws_summary['A1'] = "PUR Report Summary"
-        ws_summary['A1'].font = Font(bold=True, size=14)
+        section_font = Font(bold=True, size=12)
 
-        row = 3
+        # Title
+        ws_summary.append([styled(ws_summary, "PUR Report Summary", Font(bold=True, size=14))])
+        ws_summary.append([])
 
         # Report Info
-        ws_summary[f'A{row}'] = "Report Generated:"
-        ws_summary[f'B{row}'] = datetime.now().strftime('%m/%d/%Y %H:%M:%S')
-        row += 1
-
+        ws_summary.append(["Report Generated:", datetime.now().strftime('%m/%d/%Y %H:%M:%S')])
         if start_date:
-            ws_summary[f'A{row}'] = "Start Date:"
-            ws_summary[f'B{row}'] = start_date
-            row += 1
-
+            ws_summary.append(["Start Date:", start_date])
         if end_date:
-            ws_summary[f'A{row}'] = "End Date:"
-            ws_summary[f'B{row}'] = end_date
-            row += 1
-
-        row += 1
+            ws_summary.append(["End Date:", end_date])
+        ws_summary.append([])
 
         # Statistics
-        ws_summary[f'A{row}'] = "STATISTICS"
-        ws_summary[f'A{row}'].font = Font(bold=True, size=12)
-        row += 1
-
-        ws_summary[f'A{row}'] = "Total Applications:"
-        ws_summary[f'B{row}'] = queryset.count()
-        row += 1
-
-        ws_summary[f'A{row}'] = "Total Acres Treated:"
-        ws_summary[f'B{row}'] = queryset.aggregate(Sum('acres_treated'))['acres_treated__sum'] or 0
-        row += 1
-
-        ws_summary[f'A{row}'] = "Unique Farms:"
-        ws_summary[f'B{row}'] = queryset.values('field__farm').distinct().count()
-        row += 1
-
-        ws_summary[f'A{row}'] = "Unique Fields:"
-        ws_summary[f'B{row}'] = queryset.values('field').distinct().count()
-        row += 1
-
-        ws_summary[f'A{row}'] = "Unique Products:"
-        ws_summary[f'B{row}'] = queryset.values('product').distinct().count()
-        row += 2
+        ws_summary.append([styled(ws_summary, "STATISTICS", section_font)])
+        ws_summary.append(["Total Applications:", queryset.count()])
+        ws_summary.append([
+            "Total Acres Treated:",
+            queryset.aggregate(Sum('acres_treated'))['acres_treated__sum'] or 0,
+        ])
+        ws_summary.append(["Unique Farms:", queryset.values('field__farm').distinct().count()])
+        ws_summary.append(["Unique Fields:", queryset.values('field').distinct().count()])
+        ws_summary.append(["Unique Products:", queryset.values('product').distinct().count()])
+        ws_summary.append([])
 
         # Validation Results
         validation = generator.validate_for_pur()
 
-        ws_summary[f'A{row}'] = "VALIDATION RESULTS"
-        ws_summary[f'A{row}'].font = Font(bold=True, size=12)
-        row += 1
-
-        ws_summary[f'A{row}'] = "Ready for PUR Submission:"
-        ws_summary[f'B{row}'] = "YES" if validation['valid'] else "NO"
-        ws_summary[f'B{row}'].font = Font(
-            color="00FF00" if validation['valid'] else "FF0000",
-            bold=True
-        )
-        row += 2
+        ws_summary.append([styled(ws_summary, "VALIDATION RESULTS", section_font)])
+        ws_summary.append([
+            "Ready for PUR Submission:",
+            styled(
+                ws_summary,
+                "YES" if validation['valid'] else "NO",
+                Font(color="00FF00" if validation['valid'] else "FF0000", bold=True),
+            ),
+        ])
+        ws_summary.append([])
 
         if validation['errors']:
-            ws_summary[f'A{row}'] = "ERRORS (Must Fix):"
-            ws_summary[f'A{row}'].font = Font(bold=True, color="FF0000")
-            row += 1
+            ws_summary.append([styled(ws_summary, "ERRORS (Must Fix):", Font(bold=True, color="FF0000"))])
+            error_font = Font(color="FF0000")
             for error in validation['errors']:
-                ws_summary[f'A{row}'] = error
-                ws_summary[f'A{row}'].font = Font(color="FF0000")
-                row += 1
-            row += 1
+                ws_summary.append([styled(ws_summary, error, error_font)])
+            ws_summary.append([])
 
         if validation['warnings']:
-            ws_summary[f'A{row}'] = "WARNINGS (Recommended):"
-            ws_summary[f'A{row}'].font = Font(bold=True, color="FFA500")
-            row += 1
+            ws_summary.append([styled(ws_summary, "WARNINGS (Recommended):", Font(bold=True, color="FFA500"))])
+            warning_font = Font(color="FFA500")
             for warning in validation['warnings']:
-                ws_summary[f'A{row}'] = warning
-                ws_summary[f'A{row}'].font = Font(color="FFA500")
-                row += 1
+                ws_summary.append([styled(ws_summary, warning, warning_font)])
 
         # Status breakdown
-        row += 2
-        ws_summary[f'A{row}'] = "STATUS BREAKDOWN"
-        ws_summary[f'A{row}'].font = Font(bold=True, size=12)
-        row += 1
+        ws_summary.append([])
+        ws_summary.append([])
+        ws_summary.append([styled(ws_summary, "STATUS BREAKDOWN", section_font)])
 
         status_counts = queryset.values('status').annotate(count=Count('id'))
         for status_data in status_counts:
-            ws_summary[f'A{row}'] = status_data['status'].replace('_', ' ').title()
-            ws_summary[f'B{row}'] = status_data['count']
-            row += 1
-
-        # Save to response
-        output = io.BytesIO()
-        wb.save(output)
-        output.seek(0)
+            ws_summary.append([
+                status_data['status'].replace('_', ' ').title(),
+                status_data['count'],
+            ])
 
         date_range = ""
         if start_date and end_date:
@@ -738,13 +696,7 @@ class PesticideApplicationViewSet(AuditLogMixin, viewsets.ModelViewSet):
 
         filename = f"PUR_Report{date_range}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
-        response = HttpResponse(
-            output.getvalue(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
-
-        return response
+        return xlsx_file_response(wb, filename)
 
 
     # Also add the validation and summary endpoints from existing file
@@ -31,6 +31,7 @@ from .pickhaul_serializers import (
     PickHaulInvoiceSerializer, PickHaulManualPickSerializer,
     PickHaulReceiptSerializer, PickHaulSyncBatchSerializer,
 )
+from .services.dashboard_cache import dashboard_response
 from .services.pickhaul import BundleRejected, apply_bundle, run_post_change
 from .services.pickhaul.config import AGING_DAYS
 from .view_helpers import CompanyFilteredViewSet, get_user_company
@@ -344,7 +345,8 @@ class PickHaulHarvestActivityView(APIView):
 
     Portal receipts + manual picks, block-grouped, each carrying its share of
     the matched contractor invoices. This is what the Harvest & Packing
-    section's Harvests tab renders: receipts ARE the harvest record.
+    section's Harvests tab renders: receipts ARE the harvest record. Cached
+    per company data version, which every applied sync batch bumps.
     """
 
     permission_classes = [IsAuthenticated, HasCompanyAccess, HasPermission]
@@ -355,7 +357,10 @@ class PickHaulHarvestActivityView(APIView):
 
         company = get_user_company(request.user)
         season = _season_param(request, company)
-        return Response(harvest_activity(company, season))
+        return dashboard_response(
+            request, 'harvest_activity', company.id, {'season': season},
+            lambda: harvest_activity(company, season),
+        )
 
 
 class PickHaulEntitiesView(APIView):
@@ -493,7 +498,7 @@ class PickHaulChargeAckView(APIView):
                 'created_by': request.user,
             },
         )
-        run_post_change(company, charge.season)
+        run_post_change(company, charge.season, changed=('ack',))
         return Response(
             {'status': 'acked', 'reason': ack.reason},
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
@@ -509,7 +514,7 @@ class PickHaulChargeAckView(APIView):
         if not deleted:
             return Response({'detail': 'No ack to remove.'},
                             status=status.HTTP_404_NOT_FOUND)
-        run_post_change(company, charge.season)
+        run_post_change(company, charge.season, changed=('ack',))
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -11,14 +11,15 @@ PUR Requirements Reference:
 
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
-import csv
-from io import StringIO
-from django.db.models import Q, Sum, Count
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
 from django.http import HttpResponse
 
+from .view_helpers import EXPORT_CHUNK_SIZE, iter_csv
+
 
 class PURReportGenerator:
     """
@@ -87,6 +88,27 @@ class PURReportGenerator:
         self.validation_errors = []
         self.validation_warnings = []
     
+    # Columns the PUR checks read, fetched in one joined query.
+    VALIDATION_COLUMNS = (
+        'id', 'application_date', 'start_time', 'end_time',
+        'field_id', 'field__farm_id', 'field__county',
+        'product_id', 'product__epa_registration_number', 'product__restricted_use',
+        'amount_used', 'unit_of_measure', 'acres_treated',
+        'applicator_name', 'application_method',
+    )
+    
+    # Columns _application_to_pur_row reads; the rest are deferred so wide
+    # field/farm/product rows aren't loaded for every exported line.
+    PUR_ROW_COLUMNS = (
+        'application_date', 'start_time', 'end_time', 'amount_used',
+        'unit_of_measure', 'acres_treated', 'application_method',
+        'applicator_name', 'applicator_license_no',
+        'field__field_number', 'field__county', 'field__current_crop',
+        'field__farm__address', 'field__farm__operator_name', 'field__farm__name',
+        'product__epa_registration_number', 'product__product_name',
+        'product__active_ingredients', 'product__restricted_use',
+    )
+    
     def validate_for_pur(self) -> Dict[str, Any]:
         """
         Validate applications to ensure they meet PUR requirements.
@@ -97,50 +119,9 @@ class PURReportGenerator:
         errors = []
         warnings = []
         
-        for app in self.applications:
-            app_id = f"Application #{app.id}"
-            
-            # Required field checks
-            if not app.application_date:
-                errors.append(f"{app_id}: Missing application date")
-            
-            if not app.field:
-                errors.append(f"{app_id}: Missing field/site information")
-            elif not app.field.farm:
-                errors.append(f"{app_id}: Field missing farm information")
-            
-            if not app.product:
-                errors.append(f"{app_id}: Missing pesticide product")
-            elif not app.product.epa_registration_number:
-                errors.append(f"{app_id}: Product missing EPA registration number")
-            
-            if not app.amount_used or app.amount_used <= 0:
-                errors.append(f"{app_id}: Missing or invalid amount used")
-            
-            if not app.unit_of_measure:
-                errors.append(f"{app_id}: Missing unit of measure")
-            
-            if not app.acres_treated or app.acres_treated <= 0:
-                errors.append(f"{app_id}: Missing or invalid acres treated")
-            
-            if not app.applicator_name:
-                warnings.append(f"{app_id}: Missing applicator name")
-            
-            if not app.start_time or not app.end_time:
-                warnings.append(f"{app_id}: Missing application time")
-            
-            if not app.application_method:
-                warnings.append(f"{app_id}: Missing application method")
-            
-            # County code validation
-            if app.field and app.field.county:
-                if app.field.county not in self.COUNTY_CODES:
-                    warnings.append(f"{app_id}: County '{app.field.county}' not in standard county codes")
-            
-            # Restricted use verification
-            if app.product and app.product.restricted_use:
-                if not app.applicator_name:
-                    errors.append(f"{app_id}: Restricted use product requires licensed applicator name")
+        for _, app_errors, app_warnings in self.iter_validation_issues():
+            errors.extend(app_errors)
+            warnings.extend(app_warnings)
         
         self.validation_errors = errors
         self.validation_warnings = warnings
@@ -153,6 +134,131 @@ class PURReportGenerator:
             'ready_for_export': len(errors) == 0
         }
     
+    def validation_counts(self) -> Dict[str, Any]:
+        """
+        validate_for_pur() reduced to its counts, without building the
+        message lists.
+        """
+        error_count = warning_count = 0
+        for _, app_errors, app_warnings in self.iter_validation_issues():
+            error_count += len(app_errors)
+            warning_count += len(app_warnings)
+        return {
+            'valid': error_count == 0,
+            'error_count': error_count,
+            'warning_count': warning_count,
+            'ready_for_export': error_count == 0,
+        }
+    
+    def iter_validation_issues(self):
+        """
+        Yield (application_id, errors, warnings) for each application that
+        fails at least one PUR check.
+        
+        The checks are pushed into the WHERE clause so only failing rows
+        come back, as flat values with no related objects loaded per row.
+        """
+        rows = self.applications.filter(self._issue_filter()).values(
+            *self.VALIDATION_COLUMNS
+        )
+        for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            errors, warnings = self._check_row(row)
+            yield row['id'], errors, warnings
+    
+    def _issue_filter(self) -> Q:
+        """Q matching applications that would produce an error or warning."""
+        def blank(name):
+            return Q(**{f'{name}__isnull': True}) | Q(**{name: ''})
+        
+        return (
+            Q(application_date__isnull=True)
+            | Q(field__isnull=True) | Q(field__farm__isnull=True)
+            | Q(product__isnull=True) | blank('product__epa_registration_number')
+            | Q(amount_used__isnull=True) | Q(amount_used__lte=0)
+            | blank('unit_of_measure')
+            | Q(acres_treated__isnull=True) | Q(acres_treated__lte=0)
+            | blank('applicator_name')
+            | Q(start_time__isnull=True) | Q(end_time__isnull=True)
+            | blank('application_method')
+            | (~blank('field__county') & ~Q(field__county__in=list(self.COUNTY_CODES)))
+        )
+    
+    def _check_row(self, row):
+        """Error and warning messages for one VALIDATION_COLUMNS row."""
+        app_id = f"Application #{row['id']}"
+        errors = []
+        warnings = []
+        
+        # Required field checks
+        if not row['application_date']:
+            errors.append(f"{app_id}: Missing application date")
+        
+        if not row['field_id']:
+            errors.append(f"{app_id}: Missing field/site information")
+        elif not row['field__farm_id']:
+            errors.append(f"{app_id}: Field missing farm information")
+        
+        if not row['product_id']:
+            errors.append(f"{app_id}: Missing pesticide product")
+        elif not row['product__epa_registration_number']:
+            errors.append(f"{app_id}: Product missing EPA registration number")
+        
+        if not row['amount_used'] or row['amount_used'] <= 0:
+            errors.append(f"{app_id}: Missing or invalid amount used")
+        
+        if not row['unit_of_measure']:
+            errors.append(f"{app_id}: Missing unit of measure")
+        
+        if not row['acres_treated'] or row['acres_treated'] <= 0:
+            errors.append(f"{app_id}: Missing or invalid acres treated")
+        
+        if not row['applicator_name']:
+            warnings.append(f"{app_id}: Missing applicator name")
+        
+        if not row['start_time'] or not row['end_time']:
+            warnings.append(f"{app_id}: Missing application time")
+        
+        if not row['application_method']:
+            warnings.append(f"{app_id}: Missing application method")
+        
+        # County code validation
+        county = row['field__county']
+        if row['field_id'] and county and county not in self.COUNTY_CODES:
+            warnings.append(f"{app_id}: County '{county}' not in standard county codes")
+        
+        # Restricted use verification
+        if row['product_id'] and row['product__restricted_use'] and not row['applicator_name']:
+            errors.append(f"{app_id}: Restricted use product requires licensed applicator name")
+        
+        return errors, warnings
+    
+    def iter_applications(self):
+        """
+        Iterate applications with their field, farm and product joined in,
+        fetched from the database in chunks so exports of any size run in
+        constant memory.
+        """
+        return self.applications.select_related(
+            'field', 'field__farm', 'product'
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    
+    def iter_pur_rows(self):
+        """Yield each application as a list of values in PUR_FIELDS order."""
+        apps = self.applications.select_related(
+            'field', 'field__farm', 'product'
+        ).only(*self.PUR_ROW_COLUMNS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        for app in apps:
+            row = self._application_to_pur_row(app)
+            yield [row[name] for name in self.PUR_FIELDS]
+    
+    def iter_csv(self):
+        """
+        Yield the PUR report as CSV lines, header first.
+        
+        Feed this to a StreamingHttpResponse rather than joining it.
+        """
+        return iter_csv(self.iter_pur_rows(), header=self.PUR_FIELDS)
+    
     def generate_csv(self) -> str:
         """
         Generate PUR report in CSV format.
@@ -160,15 +266,7 @@ class PURReportGenerator:
         Returns:
             CSV string ready for submission
         """
-        output = StringIO()
-        writer = csv.DictWriter(output, fieldnames=self.PUR_FIELDS)
-        writer.writeheader()
-        
-        for app in self.applications:
-            row = self._application_to_pur_row(app)
-            writer.writerow(row)
-        
-        return output.getvalue()
+        return ''.join(self.iter_csv())
     
     def _application_to_pur_row(self, app) -> Dict[str, str]:
         """
@@ -223,41 +321,62 @@ class PURReportGenerator:
         """
         Generate a summary report for review before submission.
         
+        Totals and the date range come from a single aggregate query (see
+        summary_totals()); the breakdowns are one GROUP BY each.
+        
         Returns:
             Dictionary with summary statistics
         """
-        from django.db.models import Sum, Count, Q
-        
-        summary = {
-            'report_period': self._get_date_range(),
-            'total_applications': self.applications.count(),
-            'total_acres_treated': self.applications.aggregate(Sum('acres_treated'))['acres_treated__sum'] or 0,
-            'unique_products': self.applications.values('product').distinct().count(),
-            'unique_fields': self.applications.values('field').distinct().count(),
-            'restricted_use_applications': self.applications.filter(
-                product__restricted_use=True
-            ).count(),
-            'by_county': self._summarize_by_county(),
-            'by_product': self._summarize_by_product(),
-            'by_month': self._summarize_by_month(),
-        }
-        
+        summary = self.summary_totals()
+        summary['by_county'] = self._summarize_by_county()
+        summary['by_product'] = self._summarize_by_product()
+        summary['by_month'] = self._summarize_by_month()
         return summary
     
-    def _get_date_range(self) -> Dict[str, str]:
+    def summary_totals(self) -> Dict[str, Any]:
+        """
+        The totals and date range of generate_summary_report(), without the
+        breakdowns, in one aggregate query.
+        
+        unique_products and unique_fields count distinct product and field
+        ids, as the previous values(...).distinct().count() queries did
+        (both links are required, so there is no NULL to count).
+        """
+        totals = self.applications.aggregate(
+            total_applications=Count('id'),
+            total_acres_treated=Sum('acres_treated'),
+            unique_products=Count('product', distinct=True),
+            unique_fields=Count('field', distinct=True),
+            restricted_use_applications=Count('id', filter=Q(product__restricted_use=True)),
+            first_date=Min('application_date'),
+            last_date=Max('application_date'),
+        )
+        
+        return {
+            'report_period': self._get_date_range(totals['first_date'], totals['last_date']),
+            'total_applications': totals['total_applications'],
+            'total_acres_treated': totals['total_acres_treated'] or 0,
+            'unique_products': totals['unique_products'],
+            'unique_fields': totals['unique_fields'],
+            'restricted_use_applications': totals['restricted_use_applications'],
+        }
+    
+    def _get_date_range(self, start=None, end=None) -> Dict[str, str]:
         """Get the date range covered by applications."""
-        dates = self.applications.values_list('application_date', flat=True)
-        if dates:
+        if start is None or end is None:
+            bounds = self.applications.aggregate(
+                start=Min('application_date'), end=Max('application_date')
+            )
+            start, end = bounds['start'], bounds['end']
+        if start and end:
             return {
-                'start': min(dates).strftime('%m/%d/%Y'),
-                'end': max(dates).strftime('%m/%d/%Y')
+                'start': start.strftime('%m/%d/%Y'),
+                'end': end.strftime('%m/%d/%Y')
             }
         return {'start': '', 'end': ''}
     
     def _summarize_by_county(self) -> List[Dict[str, Any]]:
         """Summarize applications by county."""
-        from django.db.models import Count, Sum
-        
         summary = []
         counties = self.applications.values('field__county').annotate(
             count=Count('id'),
@@ -275,8 +394,6 @@ class PURReportGenerator:
     
     def _summarize_by_product(self) -> List[Dict[str, Any]]:
         """Summarize applications by product."""
-        from django.db.models import Count, Sum
-        
         summary = []
         products = self.applications.values(
             'product__product_name',
@@ -298,9 +415,6 @@ class PURReportGenerator:
     
     def _summarize_by_month(self) -> List[Dict[str, Any]]:
         """Summarize applications by month."""
-        from django.db.models import Count
-        from django.db.models.functions import TruncMonth
-        
         summary = []
         months = self.applications.annotate(
             month=TruncMonth('application_date')
@@ -1,14 +1,12 @@
 """
 PUR views — ViewSets for Product, Applicator, ApplicationEvent, and PUR import pipeline.
 """
-import csv
 import io
 import uuid
 import logging
 from decimal import Decimal
-from django.db.models import Q, Sum, Count
+from django.db.models import Prefetch, Q, Sum, Count
 from django.db.models.functions import TruncMonth
-from django.http import HttpResponse
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
@@ -25,7 +23,10 @@ from .pur_serializers import (
     ApplicationEventDetailSerializer,
     ApplicationEventCreateSerializer,
 )
-from .view_helpers import get_user_company, require_company, CompanyFilteredViewSet
+from .view_helpers import (
+    EXPORT_CHUNK_SIZE, CompanyFilteredViewSet, get_user_company, require_company,
+    streaming_csv_response,
+)
 from .audit_utils import AuditLogMixin
 from .permissions import HasCompanyAccess
 
@@ -348,7 +349,13 @@ class ApplicationEventViewSet(CompanyFilteredViewSet):
 
     @action(detail=False, methods=['post'])
     def export_pur_csv(self, request):
-        """Export application events as PUR-formatted CSV."""
+        """
+        Export application events as PUR-formatted CSV.
+
+        Streams one row per tank-mix item (or one bare row for an event
+        with none), reading events in chunks with their items prefetched
+        per chunk so memory stays flat for a full-year export.
+        """
         start_date = request.data.get('start_date')
         end_date = request.data.get('end_date')
         farm_id = request.data.get('farm_id')
@@ -361,75 +368,66 @@ class ApplicationEventViewSet(CompanyFilteredViewSet):
         if farm_id:
             queryset = queryset.filter(farm_id=farm_id)
 
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = (
-            f'attachment; filename="PUR_Report_{start_date}_to_{end_date}.csv"'
+        return streaming_csv_response(
+            _pur_event_rows(queryset),
+            f"PUR_Report_{start_date}_to_{end_date}.csv",
+            header=PUR_EVENT_CSV_HEADERS,
         )
 
-        writer = csv.writer(response)
-        writer.writerow([
-            'PUR Number', 'Application Date', 'Farm Name', 'Site ID',
-            'County', 'Section', 'Township', 'Range',
-            'Applicator', 'Applicator ID',
-            'Product Name', 'EPA Reg Number', 'Active Ingredient',
-            'Amount Applied', 'Amount Unit', 'Rate', 'Rate Unit',
-            'Treated Acres', 'Application Method',
-            'Commodity', 'Permit Number',
-            'Wind MPH', 'Temperature F',
-            'Comments',
-        ])
 
-        for evt in queryset:
-            items = evt.tank_mix_items.select_related('product').all()
-            if not items.exists():
-                # Write a row even with no products
-                writer.writerow([
-                    evt.pur_number or '',
-                    evt.date_started.strftime('%m/%d/%Y') if evt.date_started else '',
-                    evt.farm.name if evt.farm else '',
-                    evt.site_id or '',
-                    evt.county or '',
-                    evt.section or '', evt.township or '', evt.range_field or '',
-                    evt.applied_by or '',
-                    evt.applicator.applicator_id if evt.applicator else '',
-                    '', '', '',
-                    '', '', '', '',
-                    float(evt.treated_area_acres or 0),
-                    evt.application_method or '',
-                    evt.commodity_name or '',
-                    evt.permit_number or '',
-                    evt.wind_velocity_mph or '',
-                    evt.temperature_start_f or '',
-                    evt.comments or '',
-                ])
-            else:
-                for item in items:
-                    writer.writerow([
-                        evt.pur_number or '',
-                        evt.date_started.strftime('%m/%d/%Y') if evt.date_started else '',
-                        evt.farm.name if evt.farm else '',
-                        evt.site_id or '',
-                        evt.county or '',
-                        evt.section or '', evt.township or '', evt.range_field or '',
-                        evt.applied_by or '',
-                        evt.applicator.applicator_id if evt.applicator else '',
-                        item.product.product_name,
-                        item.product.epa_registration_number or '',
-                        item.product.active_ingredient or '',
-                        float(item.total_amount or 0),
-                        item.amount_unit or '',
-                        float(item.rate or 0),
-                        item.rate_unit or '',
-                        float(evt.treated_area_acres or 0),
-                        evt.application_method or '',
-                        evt.commodity_name or '',
-                        evt.permit_number or '',
-                        evt.wind_velocity_mph or '',
-                        evt.temperature_start_f or '',
-                        evt.comments or '',
-                    ])
-
-        return response
+PUR_EVENT_CSV_HEADERS = [
+    'PUR Number', 'Application Date', 'Farm Name', 'Site ID',
+    'County', 'Section', 'Township', 'Range',
+    'Applicator', 'Applicator ID',
+    'Product Name', 'EPA Reg Number', 'Active Ingredient',
+    'Amount Applied', 'Amount Unit', 'Rate', 'Rate Unit',
+    'Treated Acres', 'Application Method',
+    'Commodity', 'Permit Number',
+    'Wind MPH', 'Temperature F',
+    'Comments',
+]
+
+
+def _pur_event_rows(queryset):
+    """Yield PUR CSV rows for ``queryset`` of ApplicationEvents."""
+    queryset = queryset.select_related('farm', 'applicator').prefetch_related(None).prefetch_related(
+        Prefetch('tank_mix_items', queryset=TankMixItem.objects.select_related('product'))
+    )
+    for evt in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        event_head = [
+            evt.pur_number or '',
+            evt.date_started.strftime('%m/%d/%Y') if evt.date_started else '',
+            evt.farm.name if evt.farm else '',
+            evt.site_id or '',
+            evt.county or '',
+            evt.section or '', evt.township or '', evt.range_field or '',
+            evt.applied_by or '',
+            evt.applicator.applicator_id if evt.applicator else '',
+        ]
+        event_tail = [
+            float(evt.treated_area_acres or 0),
+            evt.application_method or '',
+            evt.commodity_name or '',
+            evt.permit_number or '',
+            evt.wind_velocity_mph or '',
+            evt.temperature_start_f or '',
+            evt.comments or '',
+        ]
+        items = list(evt.tank_mix_items.all())
+        if not items:
+            # Write a row even with no products
+            yield event_head + ['', '', '', '', '', '', ''] + event_tail
+            continue
+        for item in items:
+            yield event_head + [
+                item.product.product_name,
+                item.product.epa_registration_number or '',
+                item.product.active_ingredient or '',
+                float(item.total_amount or 0),
+                item.amount_unit or '',
+                float(item.rate or 0),
+                item.rate_unit or '',
+            ] + event_tail
 
 
 # =============================================================================
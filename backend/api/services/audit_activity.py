@@ -0,0 +1,273 @@
+"""
+Audit activity counters — pre-aggregated AuditLog statistics.
+
+The audit statistics endpoint is polled by the admin dashboard. Grouping the
+full AuditLog table five ways on every poll gets slower as the table grows,
+so counts are kept in AuditLogDailyCount, keyed by
+(company, local day, action, model_name, user):
+
+  * record_audit_entry()   — bumps the counter for one new entry; wired to
+                             AuditLog post_save in api/signals.py, so it runs
+                             in the writer's transaction.
+  * release_user_counters() — folds a deleted user's counters into the
+                             system rows; wired to User pre_delete.
+  * rollup_daily_counts()  — rebuilds counters for a day range straight from
+                             AuditLog. Run nightly (and by the
+                             rollup_audit_counts command for backfills) to
+                             heal anything the signal missed, e.g. bulk_create.
+                             api_auditlog forces row-level security, so the
+                             rebuild runs one company at a time under that
+                             company's RLS context.
+
+Days are calendar days in settings.TIME_ZONE, which is also how the
+statistics endpoint interprets start_date/end_date. Ranges whose bounds fall
+on local midnight can therefore be answered exactly from counters;
+anything finer falls back to the raw queries in statistics_from_logs().
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from api.models import AuditLog, AuditLogDailyCount, Company
+from api.rls_middleware import RLSContextManager
+
+
+# How many trailing days the statistics response charts as daily activity.
+DAILY_ACTIVITY_DAYS = 7
+
+# Top-N cut-offs for the by_model / by_user breakdowns.
+TOP_N = 10
+
+
+def _counter_key(log):
+    return {
+        'company_id': log.company_id,
+        'day': timezone.localdate(log.timestamp),
+        'action': log.action,
+        'model_name': log.model_name,
+        'user_id': log.user_id,
+    }
+
+
+def record_audit_entry(log):
+    """Increment the daily counter covering ``log``."""
+    key = _counter_key(log)
+    counters = AuditLogDailyCount.objects.filter(**key)
+    if counters.update(count=F('count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            AuditLogDailyCount.objects.create(count=1, **key)
+    except IntegrityError:
+        # Another writer created the row between our update and insert.
+        counters.update(count=F('count') + 1)
+
+
+def release_user_counters(user_id):
+    """
+    Fold a user's counters into the system (no user) rows before the user
+    is deleted. The user FK is SET_NULL, which would otherwise turn each
+    counter into a second system row for its bucket.
+    """
+    user_counters = AuditLogDailyCount.objects.filter(user_id=user_id)
+    same_bucket = {
+        'company_id': OuterRef('company_id'), 'day': OuterRef('day'),
+        'action': OuterRef('action'), 'model_name': OuterRef('model_name'),
+    }
+    matching_user = user_counters.filter(**same_bucket)
+    matching_system = AuditLogDailyCount.objects.filter(user__isnull=True, **same_bucket)
+
+    with transaction.atomic():
+        AuditLogDailyCount.objects.filter(
+            Exists(matching_user), user__isnull=True,
+        ).update(count=F('count') + Subquery(matching_user.values('count')[:1]))
+        user_counters.filter(Exists(matching_system)).delete()
+        user_counters.update(user=None)
+
+
+def rollup_daily_counts(start_day, end_day, company=None):
+    """
+    Rebuild counters for local days ``start_day``..``end_day`` inclusive
+    from AuditLog, for ``company`` or every company. Returns the number of
+    counter rows written.
+    """
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min), tz)
+
+    if company is not None:
+        company_ids = [company.pk]
+    else:
+        company_ids = Company.objects.order_by('pk').values_list('pk', flat=True)
+
+    written = 0
+    for company_id in company_ids:
+        with RLSContextManager(company_id):
+            written += _rollup_company(company_id, start, end, start_day, end_day)
+    return written
+
+
+def _rollup_company(company_id, start, end, start_day, end_day):
+    logs = AuditLog.objects.filter(company_id=company_id, timestamp__gte=start, timestamp__lt=end)
+    grouped = (
+        logs.annotate(day=TruncDate('timestamp', tzinfo=timezone.get_current_timezone()))
+        .values('day', 'action', 'model_name', 'user_id')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        _lock_counters()
+        AuditLogDailyCount.objects.filter(
+            company_id=company_id, day__gte=start_day, day__lte=end_day,
+        ).delete()
+        created = AuditLogDailyCount.objects.bulk_create(
+            [
+                AuditLogDailyCount(
+                    company_id=company_id,
+                    day=row['day'],
+                    action=row['action'],
+                    model_name=row['model_name'],
+                    user_id=row['user_id'],
+                    count=row['n'],
+                )
+                for row in grouped
+            ],
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def _lock_counters():
+    """
+    Keep record_audit_entry() out of the counters until the rebuild commits.
+
+    Writers that already bumped a counter are waited for, so their entries
+    are in the grouped read; later ones block, then increment the rebuilt
+    rows instead of inserting a duplicate the bulk insert would collide
+    with. SQLite serialises writers already.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'LOCK TABLE {AuditLogDailyCount._meta.db_table} IN SHARE ROW EXCLUSIVE MODE'
+        )
+
+
+def day_bounds(start, end):
+    """
+    Map the statistics endpoint's [start, end) datetimes onto whole local
+    days. Returns (first_day, last_day) — either may be None for an open
+    bound — or None when a bound is not on local midnight and counters
+    cannot answer the range exactly.
+    """
+    days = []
+    for bound in (start, end):
+        if bound is None:
+            days.append(None)
+            continue
+        local = timezone.localtime(bound)
+        if local.time() != time.min:
+            return None
+        days.append(local.date())
+    first_day, end_day = days
+    last_day = end_day - timedelta(days=1) if end_day else None
+    return first_day, last_day
+
+
+def _daily_activity_start():
+    return timezone.localdate() - timedelta(days=DAILY_ACTIVITY_DAYS - 1)
+
+
+def _action_stats(rows):
+    actions = dict(AuditLog.ACTION_TYPES)
+    return [
+        {
+            'action': item['action'],
+            'action_display': actions.get(item['action'], item['action']),
+            'count': item['count'],
+        }
+        for item in rows
+    ]
+
+
+def _user_stats(rows):
+    return [
+        {
+            'email': item['user__email'] or 'System',
+            'name': f"{item['user__first_name'] or ''} {item['user__last_name'] or ''}".strip() or 'System',
+            'count': item['count'],
+        }
+        for item in rows
+    ]
+
+
+def statistics_from_logs(queryset):
+    """Compute the statistics payload by grouping AuditLog rows directly."""
+    tz = timezone.get_current_timezone()
+    since = timezone.make_aware(datetime.combine(_daily_activity_start(), time.min), tz)
+
+    action_counts = queryset.values('action').annotate(
+        count=Count('id')
+    ).order_by('-count', 'action')
+
+    model_counts = queryset.values('model_name').annotate(
+        count=Count('id')
+    ).order_by('-count', 'model_name')[:TOP_N]
+
+    user_counts = queryset.values('user__email', 'user__first_name', 'user__last_name').annotate(
+        count=Count('id')
+    ).order_by('-count', 'user__email')[:TOP_N]
+
+    daily_counts = queryset.filter(timestamp__gte=since).annotate(
+        day=TruncDate('timestamp', tzinfo=tz)
+    ).values('day').annotate(count=Count('id')).order_by('day')
+
+    return {
+        'total_count': queryset.count(),
+        'by_action': _action_stats(action_counts),
+        'by_model': list(model_counts),
+        'by_user': _user_stats(user_counts),
+        'daily_activity': list(daily_counts),
+    }
+
+
+def statistics_from_counters(company, first_day=None, last_day=None):
+    """
+    Compute the statistics payload from AuditLogDailyCount for local days
+    ``first_day``..``last_day`` inclusive (None = unbounded).
+    """
+    counters = AuditLogDailyCount.objects.filter(company=company)
+    if first_day:
+        counters = counters.filter(day__gte=first_day)
+    if last_day:
+        counters = counters.filter(day__lte=last_day)
+
+    action_counts = counters.values('action').annotate(
+        count=Sum('count')
+    ).order_by('-count', 'action')
+
+    model_counts = counters.values('model_name').annotate(
+        count=Sum('count')
+    ).order_by('-count', 'model_name')[:TOP_N]
+
+    user_counts = counters.values('user__email', 'user__first_name', 'user__last_name').annotate(
+        count=Sum('count')
+    ).order_by('-count', 'user__email')[:TOP_N]
+
+    daily_counts = counters.filter(day__gte=_daily_activity_start()).values(
+        'day'
+    ).annotate(count=Sum('count')).order_by('day')
+
+    return {
+        'total_count': counters.aggregate(total=Sum('count'))['total'] or 0,
+        'by_action': _action_stats(action_counts),
+        'by_model': list(model_counts),
+        'by_user': _user_stats(user_counts),
+        'daily_activity': list(daily_counts),
+    }
@@ -0,0 +1,315 @@
+"""
+AuditLog partition maintenance and retention tiers.
+
+On PostgreSQL api_auditlog is range-partitioned by local calendar month
+(migration 0097), one child table per month named api_auditlog_pYYYY_MM plus
+a DEFAULT partition. Every audit view filters on company and timestamp, so a
+query for a recent window is pruned to the recent partitions.
+
+Two tiers:
+
+  hot   — months newer than AUDIT_LOG_RETENTION_MONTHS stay in the database.
+  cold  — older months are written to gzip-compressed JSONL files in the
+          configured default storage (R2/S3 in production, MEDIA_ROOT
+          locally) under AUDIT_ARCHIVE_PREFIX, then removed from the
+          database. On PostgreSQL that is a DETACH + DROP of the month's
+          partition; old rows left in the DEFAULT partition and other
+          backends (SQLite in dev/tests) fall back to a range DELETE.
+
+On PostgreSQL a month is read straight from its partition (or the DEFAULT
+partition) rather than through api_auditlog, whose forced row-level
+security would hide every row from the maintenance task: it runs with no
+company context. The partitions carry no policies of their own. Rows are
+only removed when the number leaving the database matches the number
+archived; otherwise the month is left in place and an error is logged.
+
+Daily counters (AuditLogDailyCount) are not archived, so audit statistics
+keep covering archived months.
+
+ensure_partitions() and archive_partitions() are run by the
+maintain_audit_partitions beat task and the manage_audit_partitions command.
+"""
+
+import gzip
+import json
+import logging
+import re
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+TABLE = AuditLog._meta.db_table
+PARTITION_RE = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+
+AUDIT_ARCHIVE_PREFIX = 'audit_archive'
+
+# Rows fetched per round-trip while writing an archive file.
+ARCHIVE_CHUNK_SIZE = 5000
+
+
+class ArchiveMismatch(Exception):
+    """The rows about to be removed don't match the rows archived."""
+
+
+@dataclass
+class ArchivedMonth:
+    month: str          # 'YYYY-MM'
+    rows: int
+    path: str           # storage name of the .jsonl.gz file
+
+
+def retention_months():
+    return getattr(settings, 'AUDIT_LOG_RETENTION_MONTHS', 24)
+
+
+def months_ahead():
+    return getattr(settings, 'AUDIT_LOG_PARTITION_MONTHS_AHEAD', 2)
+
+
+def is_partitioned():
+    """True when api_auditlog is a PostgreSQL partitioned table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def month_start(year, month):
+    """Local midnight on the first of the month."""
+    return timezone.make_aware(datetime(year, month, 1))
+
+
+def shift_month(year, month, delta):
+    index = year * 12 + (month - 1) + delta
+    return index // 12, index % 12 + 1
+
+
+def partition_name(year, month):
+    return f'{TABLE}_p{year:04d}_{month:02d}'
+
+
+def existing_partitions():
+    """(year, month) tuples for the monthly partitions currently attached."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    found = []
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            found.append((int(match.group(1)), int(match.group(2))))
+    return sorted(found)
+
+
+def ensure_partitions(ahead=None):
+    """
+    Create monthly partitions from the current month through ``ahead``
+    months out. Rows that already landed in the DEFAULT partition for a
+    new month are moved into it. Returns the partition names created; a
+    no-op returning [] on unpartitioned backends.
+    """
+    if not is_partitioned():
+        return []
+
+    ahead = months_ahead() if ahead is None else ahead
+    today = timezone.localdate()
+    existing = set(existing_partitions())
+    created = []
+
+    for offset in range(ahead + 1):
+        year, month = shift_month(today.year, today.month, offset)
+        if (year, month) in existing:
+            continue
+        created.append(_create_partition(year, month))
+
+    return created
+
+
+def _create_partition(year, month):
+    name = partition_name(year, month)
+    lower = month_start(year, month)
+    upper = month_start(*shift_month(year, month, 1))
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Build the table standalone, move any DEFAULT-partition rows for
+        # the range into it, then attach — attaching validates DEFAULT no
+        # longer holds rows in the new range.
+        cursor.execute(f'CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS ('
+            f'  DELETE FROM {TABLE}_default'
+            f'  WHERE "timestamp" >= %s AND "timestamp" < %s RETURNING *'
+            f') INSERT INTO {name} SELECT * FROM moved',
+            [lower, upper],
+        )
+        cursor.execute(
+            f'ALTER TABLE {TABLE} ATTACH PARTITION {name} '
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    logger.info(f"Created audit log partition {name}")
+    return name
+
+
+def archive_partitions(retention=None, storage=None):
+    """
+    Move every month older than ``retention`` months to cold storage.
+
+    Each month is written to ``<AUDIT_ARCHIVE_PREFIX>/YYYY/<table>_YYYY_MM.jsonl.gz``
+    before its rows leave the database. Returns a list of ArchivedMonth,
+    one per month that held rows.
+    """
+    retention = retention_months() if retention is None else retention
+    storage = storage or default_storage
+
+    today = timezone.localdate()
+    cutoff = shift_month(today.year, today.month, -retention)
+    partitioned = is_partitioned()
+
+    if partitioned:
+        partitions = {ym for ym in existing_partitions() if ym < cutoff}
+        # Rows outside every monthly partition sit in DEFAULT and are
+        # archived by range like an unpartitioned table.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT MIN("timestamp") FROM {TABLE}_default WHERE "timestamp" < %s',
+                [month_start(*cutoff)],
+            )
+            earliest = cursor.fetchone()[0]
+    else:
+        partitions = set()
+        earliest = AuditLog.objects.order_by('timestamp').values_list(
+            'timestamp', flat=True
+        ).first()
+
+    months = set(partitions)
+    if earliest is not None:
+        local = timezone.localtime(earliest)
+        ym = (local.year, local.month)
+        while ym < cutoff:
+            months.add(ym)
+            ym = shift_month(*ym, 1)
+
+    archived = []
+    for year, month in sorted(months):
+        if not partitioned:
+            source = None
+        elif (year, month) in partitions:
+            source = partition_name(year, month)
+        else:
+            source = f'{TABLE}_default'
+        try:
+            result = _archive_month(year, month, storage, source)
+        except ArchiveMismatch as exc:
+            logger.error(f"Audit log {year:04d}-{month:02d} left in place: {exc}")
+            continue
+        if result is not None:
+            archived.append(result)
+    return archived
+
+
+def _archive_month(year, month, storage, source):
+    """
+    Archive one month and remove it from the database.
+
+    ``source`` is the table the month is read from on PostgreSQL — its
+    partition, which is dropped, or the DEFAULT partition, which is range
+    deleted — or None to go through the AuditLog model.
+    """
+    lower = month_start(year, month)
+    upper = month_start(*shift_month(year, month, 1))
+    if source is None:
+        rows = AuditLog.objects.filter(timestamp__gte=lower, timestamp__lt=upper)
+        chunks = _model_rows(rows)
+    else:
+        chunks = _table_rows(source, lower, upper)
+
+    count = 0
+    with tempfile.TemporaryFile() as tmp:
+        with gzip.GzipFile(fileobj=tmp, mode='wb') as gz:
+            for row in chunks:
+                gz.write(json.dumps(row, cls=DjangoJSONEncoder).encode())
+                gz.write(b'\n')
+                count += 1
+        path = None
+        if count:
+            tmp.seek(0)
+            filename = f'{TABLE}_{year:04d}_{month:02d}.jsonl.gz'
+            path = storage.save(
+                f'{AUDIT_ARCHIVE_PREFIX}/{year:04d}/{filename}',
+                File(tmp, name=filename),
+            )
+
+    # Only drop rows once the archive is safely stored, and only as many as
+    # it holds: a mismatch rolls the removal back.
+    with transaction.atomic():
+        if source is None:
+            removed, _ = rows.delete()
+        elif source == f'{TABLE}_default':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'DELETE FROM {source} WHERE "timestamp" >= %s AND "timestamp" < %s',
+                    [lower, upper],
+                )
+                removed = cursor.rowcount
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {source}')
+                cursor.execute(f'SELECT count(*) FROM {source}')
+                removed = cursor.fetchone()[0]
+                cursor.execute(f'DROP TABLE {source}')
+        if removed != count:
+            raise ArchiveMismatch(
+                f'{count} rows archived to {path} but {removed} would be removed'
+            )
+
+    if not count:
+        return None
+    logger.info(f"Archived {count} audit log entries for {year:04d}-{month:02d} to {path}")
+    return ArchivedMonth(month=f'{year:04d}-{month:02d}', rows=count, path=path)
+
+
+def _model_rows(rows):
+    return rows.order_by('timestamp', 'id').values().iterator(chunk_size=ARCHIVE_CHUNK_SIZE)
+
+
+def _table_rows(table, lower, upper):
+    """Rows of ``table`` in [lower, upper) as dicts, keyset-paged by (timestamp, id)."""
+    after = None
+    while True:
+        sql = f'SELECT * FROM {table} WHERE "timestamp" >= %s AND "timestamp" < %s'
+        params = [lower, upper]
+        if after is not None:
+            sql += ' AND ("timestamp", id) > (%s, %s)'
+            params += after
+        sql += ' ORDER BY "timestamp", id LIMIT %s'
+        params.append(ARCHIVE_CHUNK_SIZE)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            batch = cursor.fetchall()
+        for values in batch:
+            yield dict(zip(columns, values))
+        if len(batch) < ARCHIVE_CHUNK_SIZE:
+            return
+        last = batch[-1]
+        after = [last[columns.index('timestamp')], last[columns.index('id')]]
@@ -0,0 +1,246 @@
+"""
+Per-company response cache for the read-heavy dashboards.
+
+Every company has a data version held in the cache. Saving or deleting a row
+of a model listed in DATA_VERSION_SOURCES bumps the owning company's version
+once the transaction commits (see api/signals.py); code that writes those
+models in bulk calls invalidate_company_dashboards() itself. Dashboard
+payloads are cached under keys that embed the version, so a reader can only
+ever be served a payload built at the version it just read: a write moves
+every later reader to a new key instead of relying on deletes reaching the
+right entries. Superseded entries are never read again and expire after
+DASHBOARD_CACHE_TIMEOUT.
+
+Requests sending ``X-Dashboard-Cache: bypass`` rebuild and re-store the
+payload. Responses carry ``X-Dashboard-Cache: hit|miss|bypass|off``, and
+per-dashboard outcome counters are exposed at /api/metrics/dashboards/.
+The counters live in the configured cache, so they are shared across
+workers with Redis and per process with LocMem.
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+DATA_VERSION_PREFIX = 'finch:data-version'
+DASHBOARD_PREFIX = 'finch:dashboard'
+STATS_PREFIX = 'finch:dashboard-stats'
+
+# Cached dashboards, by the name used in cache keys and metrics.
+DASHBOARDS = (
+    'analytics',
+    'season',
+    'multi_crop_season',
+    'packinghouse',
+    'sgma',
+    'season_overview',
+    'harvest_activity',
+)
+
+OUTCOMES = ('hit', 'miss', 'bypass')
+
+BYPASS_HEADER = 'HTTP_X_DASHBOARD_CACHE'
+RESPONSE_HEADER = 'X-Dashboard-Cache'
+
+# Models whose writes change dashboard figures, with the attribute path from
+# an instance to its company id.
+DATA_VERSION_SOURCES = {
+    'api.Farm': 'company_id',
+    'api.Field': 'farm.company_id',
+    'api.PesticideApplication': 'field.farm.company_id',
+    'api.ApplicationEvent': 'company_id',
+    'api.TankMixItem': 'application_event.company_id',
+    'api.Harvest': 'field.farm.company_id',
+    'api.HarvestLoad': 'harvest.field.farm.company_id',
+    'api.HarvestLabor': 'harvest.field.farm.company_id',
+    'api.LaborContractor': 'company_id',
+    'api.WaterSource': 'farm.company_id',
+    'api.WaterTest': 'water_source.farm.company_id',
+    'api.WellReading': 'water_source.farm.company_id',
+    'api.WaterAllocation': 'water_source.farm.company_id',
+    'api.ComplianceDeadline': 'company_id',
+    'api.SeasonTemplate': 'company_id',
+    'api.Crop': 'company_id',
+    'api.Packinghouse': 'company_id',
+    'api.Pool': 'packinghouse.company_id',
+    'api.PackinghouseDelivery': 'pool.packinghouse.company_id',
+    'api.PackoutReport': 'pool.packinghouse.company_id',
+    'api.PackoutGradeLine': 'packout_report.pool.packinghouse.company_id',
+    'api.PoolSettlement': 'pool.packinghouse.company_id',
+    'api.SettlementGradeLine': 'settlement.pool.packinghouse.company_id',
+    'api.SettlementDeduction': 'settlement.pool.packinghouse.company_id',
+    'api.GrowerLedgerEntry': 'packinghouse.company_id',
+    'api.PackerCommitment': 'company_id',
+    'api.PickHaulReceipt': 'company_id',
+    'api.PickHaulManualPick': 'company_id',
+    'api.PickHaulInvoice': 'company_id',
+    'api.PickHaulInvoiceReceipt': 'invoice.company_id',
+    'api.PickHaulDirectCharge': 'company_id',
+    'api.LegalEntity': 'company_id',
+}
+
+
+def _version_key(company_id):
+    return f'{DATA_VERSION_PREFIX}:{company_id}'
+
+
+def _seed_version():
+    # Milliseconds since the epoch: a version key lost to eviction or a
+    # cache flush restarts above every version issued before it, so old
+    # payload keys can't be reached again.
+    return int(time.time() * 1000)
+
+
+def get_data_version(company_id):
+    """Current data version for a company, initialising it if missing."""
+    key = _version_key(company_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _seed_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(company_id):
+    """Invalidate every cached dashboard payload for the company."""
+    key = _version_key(company_id)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _seed_version(), timeout=None)
+        return cache.get(key)
+
+
+def invalidate_company_dashboards(company_id):
+    """
+    Bump the company's data version when the current transaction commits
+    (immediately outside one). Bumping on commit keeps a concurrent reader
+    from caching pre-commit figures under the new version.
+    """
+    if company_id and settings.DASHBOARD_CACHE_TIMEOUT:
+        transaction.on_commit(lambda: bump_data_version(company_id))
+
+
+def company_id_for(instance):
+    """Company id of a DATA_VERSION_SOURCES instance, or None."""
+    path = DATA_VERSION_SOURCES.get(instance._meta.label)
+    if not path:
+        return None
+    return resolve_path(instance, path)
+
+
+def resolve_path(instance, path):
+    """
+    Follow a dotted attribute path ('harvest.field.farm.company_id') from
+    instance, or None where a link is empty.
+
+    Related objects already loaded on the instance are used as they are.
+    From the first one that isn't, the rest of the path is read in one
+    query keyed on its ``*_id`` column, instead of fetching every
+    intermediate row on each save.
+    """
+    *relations, attr = path.split('.')
+    value = instance
+    for n, name in enumerate(relations):
+        field = value._meta.get_field(name)
+        if not field.is_cached(value):
+            related_id = getattr(value, field.attname)
+            if related_id is None:
+                return None
+            return field.related_model._base_manager.filter(pk=related_id).values_list(
+                '__'.join(relations[n + 1:] + [attr]), flat=True,
+            ).first()
+        value = getattr(value, name)
+        if value is None:
+            return None
+    return getattr(value, attr)
+
+
+def dashboard_cache_key(name, company_id, params):
+    digest = hashlib.md5(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    version = get_data_version(company_id)
+    return f'{DASHBOARD_PREFIX}:{name}:{company_id}:{version}:{digest}'
+
+
+def _record(name, outcome):
+    key = f'{STATS_PREFIX}:{name}:{outcome}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def dashboard_cache_stats():
+    """Outcome counters per dashboard: {name: {'hit': n, 'miss': n, 'bypass': n}}."""
+    keys = {
+        f'{STATS_PREFIX}:{name}:{outcome}': (name, outcome)
+        for name in DASHBOARDS for outcome in OUTCOMES
+    }
+    found = cache.get_many(list(keys))
+    stats = {name: dict.fromkeys(OUTCOMES, 0) for name in DASHBOARDS}
+    for key, (name, outcome) in keys.items():
+        stats[name][outcome] = found.get(key, 0)
+    return stats
+
+
+def render_prometheus(stats):
+    """Prometheus text format (version 0.0.4) for dashboard_cache_stats()."""
+    name = 'finch_dashboard_cache_requests_total'
+    lines = [
+        f'# HELP {name} Dashboard requests by cache outcome.',
+        f'# TYPE {name} counter',
+    ]
+    for dashboard, outcomes in stats.items():
+        for outcome, count in outcomes.items():
+            lines.append(f'{name}{{dashboard="{dashboard}",outcome="{outcome}"}} {count}')
+
+    name = 'finch_dashboard_cache_hit_ratio'
+    lines += [
+        f'# HELP {name} Share of dashboard requests served from cache.',
+        f'# TYPE {name} gauge',
+    ]
+    for dashboard, outcomes in stats.items():
+        served = sum(outcomes.values())
+        ratio = outcomes['hit'] / served if served else 0
+        lines.append(f'{name}{{dashboard="{dashboard}"}} {ratio:.4f}')
+    return '\n'.join(lines) + '\n'
+
+
+def cached_dashboard(name, company_id, params, build, bypass=False):
+    """
+    Payload for (name, company, params) at the company's current data
+    version, and the outcome: 'hit', 'miss', 'bypass' or 'off' (caching
+    disabled). ``build()`` runs on anything but a hit and its result is
+    stored. ``params`` must identify everything the payload depends on
+    besides the company's data (date window, filters, permissions).
+    """
+    timeout = settings.DASHBOARD_CACHE_TIMEOUT
+    if not timeout:
+        return build(), 'off'
+    key = dashboard_cache_key(name, company_id, params)
+    payload = None if bypass else cache.get(key)
+    if payload is not None:
+        outcome = 'hit'
+    else:
+        outcome = 'bypass' if bypass else 'miss'
+        payload = build()
+        cache.set(key, payload, timeout)
+    _record(name, outcome)
+    return payload, outcome
+
+
+def dashboard_response(request, name, company_id, params, build, bypass=False):
+    """cached_dashboard() as a DRF Response, honouring the bypass header."""
+    bypass = bypass or request.META.get(BYPASS_HEADER, '').lower() == 'bypass'
+    payload, outcome = cached_dashboard(name, company_id, params, build, bypass=bypass)
+    response = Response(payload)
+    response[RESPONSE_HEADER] = outcome
+    return response
@@ -12,6 +12,10 @@ from .spray_planning import (
     SprayWindow,
     SprayRecommendation,
 )
+from .spray_windows import (
+    ForecastBlock,
+    detect_spray_windows,
+)
 from .harvest_planning import (
     HarvestPlanningService,
     HarvestReadiness,
@@ -22,6 +26,8 @@ __all__ = [
     'SprayPlanningService',
     'SprayWindow',
     'SprayRecommendation',
+    'ForecastBlock',
+    'detect_spray_windows',
     # Harvest planning
     'HarvestPlanningService',
     'HarvestReadiness',
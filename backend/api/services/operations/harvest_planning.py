@@ -19,10 +19,10 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 
 from django.db import models
-from django.db.models import Sum, Avg, Count, Q, F, Max
+from django.db.models import Sum, Avg, Count, Q, F
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
@@ -101,6 +101,8 @@ class HarvestScheduleItem:
     estimated_hours: Optional[float]
     crew_size_recommended: Optional[int]
     notes: List[str] = field(default_factory=list)
+    crew_name: Optional[str] = None
+    finish_date: Optional[date] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -113,6 +115,8 @@ class HarvestScheduleItem:
             'estimated_hours': self.estimated_hours,
             'crew_size_recommended': self.crew_size_recommended,
             'notes': self.notes,
+            'crew_name': self.crew_name,
+            'finish_date': self.finish_date.isoformat() if self.finish_date else None,
         }
 
 
@@ -193,6 +197,12 @@ class HarvestPlanningService:
         'hours_per_day': 8,           # Working hours per day
     }
 
+    # Scheduling weight per priority: heavier blocks are pulled earlier
+    PRIORITY_WEIGHTS = {'high': 3.0, 'medium': 2.0, 'low': 1.0}
+
+    # Days of pesticide applications considered for PHI clearance
+    PHI_LOOKBACK_DAYS = 90
+
     def __init__(self, company_id: Optional[int] = None):
         """
         Initialize the service.
@@ -224,6 +234,8 @@ class HarvestPlanningService:
         Assess harvest readiness for all fields (or fields on a specific farm).
 
         Returns comprehensive status including PHI clearance for each field.
+        Fields, recent applications and yield history are loaded in three
+        queries however many fields there are.
 
         Args:
             farm_id: Optional farm ID to filter by
@@ -232,45 +244,44 @@ class HarvestPlanningService:
         Returns:
             List of HarvestReadiness objects
         """
-        from api.models import Field
-
         if proposed_harvest_date is None:
             proposed_harvest_date = date.today()
 
-        queryset = Field.objects.filter(active=True).select_related('farm')
-
-        if farm_id:
-            queryset = queryset.filter(farm_id=farm_id)
-
-        if self.company_id:
-            queryset = queryset.filter(farm__company_id=self.company_id)
+        fields = list(self._active_fields(farm_id))
+        field_ids = [f.id for f in fields]
+        applications = self._phi_applications(field_ids)
+        clear_dates = self._phi_clear_dates(field_ids, applications)
+        historical = self._historical_yields(
+            [f.id for f in fields if not self._tree_count(f)]
+        )
 
         results = []
 
-        for field in queryset:
-            # Get PHI clearance
-            phi_result = self.compliance_service.calculate_phi_clearance(
-                field_id=field.id,
-                proposed_harvest_date=proposed_harvest_date
-            )
+        for field in fields:
+            earliest_harvest = clear_dates[field.id]
+            phi_clear = earliest_harvest <= proposed_harvest_date
+            blocking_apps = [
+                (product_name, application_date)
+                for application_date, phi_days, product_name in applications.get(field.id, [])
+                if application_date + timedelta(days=phi_days) > proposed_harvest_date
+            ]
 
             # Estimate yield
-            yield_estimate = self.estimate_field_yield(field.id)
+            yield_estimate = self._estimate_yield(field, historical.get(field.id))
 
             # Determine blocking issues
             blocking_issues = []
             advisory_notes = []
 
-            if not phi_result.is_clear:
+            if not phi_clear:
                 blocking_issues.append(
-                    f"PHI not clear until {phi_result.earliest_harvest_date.strftime('%m/%d/%Y')}"
+                    f"PHI not clear until {earliest_harvest.strftime('%m/%d/%Y')}"
                 )
-                if phi_result.blocking_applications:
-                    for app in phi_result.blocking_applications:
-                        advisory_notes.append(
-                            f"Blocked by {app.get('product_name', 'Unknown')} "
-                            f"applied {app.get('application_date', 'Unknown')}"
-                        )
+                for product_name, application_date in blocking_apps:
+                    advisory_notes.append(
+                        f"Blocked by {product_name or 'Unknown'} "
+                        f"applied {application_date.isoformat()}"
+                    )
 
             # Check for other readiness factors
             if not field.current_crop:
@@ -287,8 +298,8 @@ class HarvestPlanningService:
                 variety=getattr(field, 'variety', None),
                 total_acres=float(field.total_acres or 0),
                 is_ready=is_ready,
-                phi_clear=phi_result.is_clear,
-                phi_clear_date=phi_result.earliest_harvest_date,
+                phi_clear=phi_clear,
+                phi_clear_date=earliest_harvest,
                 estimated_yield_bins=yield_estimate.estimated_total_bins,
                 estimated_yield_per_acre=yield_estimate.estimated_bins_per_acre,
                 blocking_issues=blocking_issues,
@@ -307,102 +318,100 @@ class HarvestPlanningService:
 
     def get_harvest_schedule_recommendation(
         self,
-        farm_id: int,
+        farm_id: Optional[int],
         start_date: date,
         end_date: date,
-        available_crew_size: Optional[int] = None
+        available_crew_size: Optional[int] = None,
+        crews: Optional[List[Dict[str, Any]]] = None,
+        delivery_capacity_bins: Union[None, int, Dict[date, float]] = None
     ) -> Dict[str, Any]:
         """
-        Recommend harvest scheduling based on multiple factors.
+        Recommend a harvest schedule across crews and days.
 
-        Considers:
-        - PHI clearance dates
-        - Crop maturity indicators
-        - Weather forecast
-        - Labor/equipment availability
-        - Buyer commitments
+        Readiness (PHI clearance) and yield estimates for every field are
+        batch-loaded, then HarvestScheduler assigns each field to a crew
+        and start day within the crews' daily hours and the packinghouse's
+        daily intake.
 
         Args:
-            farm_id: ID of the farm
+            farm_id: ID of the farm (None for every farm of the company)
             start_date: Start of scheduling window
             end_date: End of scheduling window
-            available_crew_size: Available crew size (default: 8)
+            available_crew_size: Size of the single default crew (default: 8)
+            crews: Optional crews as dicts with 'name', 'size' and optional
+                'hours_per_day' and 'unavailable_dates' (dates); overrides
+                available_crew_size
+            delivery_capacity_bins: Bins the packinghouse accepts per day,
+                either one number or a {date: bins} dict (default: no cap)
 
         Returns:
             Dictionary with schedule recommendation and details
         """
+        from .harvest_scheduling import Crew, HarvestScheduler
+
         if available_crew_size is None:
             available_crew_size = self.PRODUCTIVITY['default_crew_size']
-
-        # Get readiness for all fields
-        readiness_list = self.assess_harvest_readiness(
-            farm_id=farm_id,
-            proposed_harvest_date=start_date
+        if not crews:
+            crews = [{'name': 'Crew 1', 'size': available_crew_size}]
+
+        crew_list = [
+            Crew(
+                name=crew.get('name') or f'Crew {n}',
+                size=int(crew['size']),
+                hours_per_day=float(crew.get('hours_per_day') or self.PRODUCTIVITY['hours_per_day']),
+                unavailable_dates=frozenset(crew.get('unavailable_dates') or ()),
+            )
+            for n, crew in enumerate(crews, start=1)
+        ]
+        bins_per_picker_hour = self.PRODUCTIVITY['bins_per_picker_hour']
+
+        blocks, not_ready = self._load_schedule_blocks(farm_id, start_date, end_date)
+        scheduler = HarvestScheduler(
+            crew_list, start_date, end_date, bins_per_picker_hour,
+            delivery_capacity=delivery_capacity_bins,
         )
+        result = scheduler.solve(blocks)
 
         schedule_items = []
-        total_bins = 0
-        total_hours = 0
-
-        # Calculate daily capacity
-        daily_capacity_bins = (
-            available_crew_size *
-            self.PRODUCTIVITY['hours_per_day'] *
-            self.PRODUCTIVITY['bins_per_picker_hour']
-        )
-
-        current_date = start_date
-        remaining_capacity_today = daily_capacity_bins
-
-        for readiness in readiness_list:
-            if not readiness.is_ready and readiness.phi_clear_date > end_date:
-                # Skip fields that won't be ready in time
-                continue
-
-            # Determine when to schedule this field
-            schedule_date = max(current_date, readiness.phi_clear_date)
-
-            if schedule_date > end_date:
-                continue
-
-            estimated_bins = readiness.estimated_yield_bins or (
-                readiness.total_acres * self.DEFAULT_YIELDS['default']['bins_per_acre']
-            )
-
-            # Calculate time needed
-            estimated_hours = estimated_bins / self.PRODUCTIVITY['bins_per_picker_hour']
-            estimated_days = estimated_hours / self.PRODUCTIVITY['hours_per_day']
-
-            # Determine priority
-            priority = 'medium'
-            notes = []
-
-            if readiness.phi_clear_date == date.today():
-                priority = 'high'
-                notes.append('PHI clears today')
-            elif not readiness.is_ready:
-                priority = 'low'
-                notes.append(f'Wait for PHI clearance on {readiness.phi_clear_date.strftime("%m/%d")}')
-
-            schedule_item = HarvestScheduleItem(
-                field_id=readiness.field_id,
-                field_name=readiness.field_name,
-                recommended_date=schedule_date,
-                priority=priority,
-                estimated_bins=round(estimated_bins, 1),
-                estimated_hours=round(estimated_hours, 1),
-                crew_size_recommended=available_crew_size,
+        for assignment in result.assignments:
+            block = assignment.block
+            notes = list(block.notes)
+            if len(assignment.daily_bins) > 1:
+                notes.append(f'{len(assignment.daily_bins)} picking days')
+            schedule_items.append(HarvestScheduleItem(
+                field_id=block.field_id,
+                field_name=block.field_name,
+                recommended_date=assignment.start_date,
+                priority=block.priority,
+                estimated_bins=round(block.bins, 1),
+                estimated_hours=round(block.bins / bins_per_picker_hour, 1),
+                crew_size_recommended=assignment.crew.size,
                 notes=notes,
-            )
-            schedule_items.append(schedule_item)
-
-            total_bins += estimated_bins
-            total_hours += estimated_hours
+                crew_name=assignment.crew.name,
+                finish_date=assignment.finish_date,
+            ))
 
         # Sort by date and priority
         priority_order = {'high': 0, 'medium': 1, 'low': 2}
         schedule_items.sort(key=lambda x: (x.recommended_date, priority_order.get(x.priority, 1)))
 
+        total_bins = sum(item.estimated_bins for item in schedule_items)
+        total_hours = sum(item.estimated_hours for item in schedule_items)
+        total_crew_size = sum(crew.size for crew in crew_list)
+        daily_capacity_bins = sum(
+            crew.size * crew.hours_per_day * bins_per_picker_hour for crew in crew_list
+        )
+
+        unscheduled = [
+            {
+                'field_id': block.field_id,
+                'field_name': block.field_name,
+                'estimated_bins': round(block.bins, 1),
+                'reason': 'Not enough crew or delivery capacity in the window',
+            }
+            for block in result.unscheduled
+        ] + not_ready
+
         return {
             'farm_id': farm_id,
             'schedule_period': {
@@ -415,15 +424,145 @@ class HarvestPlanningService:
                 'ready_now': len([s for s in schedule_items if s.priority in ('high', 'medium')]),
                 'total_estimated_bins': round(total_bins, 1),
                 'total_estimated_hours': round(total_hours, 1),
-                'estimated_days_needed': round(total_hours / self.PRODUCTIVITY['hours_per_day'], 1),
+                'estimated_days_needed': round(
+                    total_hours / total_crew_size / self.PRODUCTIVITY['hours_per_day'], 1
+                ) if total_crew_size else None,
+                'unscheduled_fields': len(unscheduled),
             },
             'crew_info': {
-                'available_crew_size': available_crew_size,
+                'available_crew_size': total_crew_size,
                 'daily_capacity_bins': round(daily_capacity_bins, 1),
+                'crews': [
+                    {'name': crew.name, 'size': crew.size, 'hours_per_day': crew.hours_per_day}
+                    for crew in crew_list
+                ],
+                'delivery_capacity_bins': (
+                    {d.isoformat(): bins for d, bins in delivery_capacity_bins.items()}
+                    if isinstance(delivery_capacity_bins, dict) else delivery_capacity_bins
+                ),
             },
             'schedule': [item.to_dict() for item in schedule_items],
+            'unscheduled': unscheduled,
         }
 
+    def _load_schedule_blocks(
+        self,
+        farm_id: Optional[int],
+        start_date: date,
+        end_date: date
+    ) -> Tuple[List['ScheduleBlock'], List[Dict[str, Any]]]:
+        """
+        Schedule blocks for every active field, in a fixed number of queries.
+
+        Returns the blocks and, separately, fields whose PHI clears after
+        ``end_date``.
+        """
+        from .harvest_scheduling import ScheduleBlock
+
+        fields = list(self._active_fields(farm_id))
+        field_ids = [f.id for f in fields]
+        clear_dates = self._phi_clear_dates(field_ids)
+        historical = self._historical_yields(
+            [f.id for f in fields if not self._tree_count(f)]
+        )
+        today = date.today()
+
+        blocks = []
+        not_ready = []
+        for f in fields:
+            phi_clear_date = clear_dates.get(f.id, today)
+            estimate = self._estimate_yield(f, historical.get(f.id))
+            bins = estimate.estimated_total_bins or (
+                float(f.total_acres or 0) * self.DEFAULT_YIELDS['default']['bins_per_acre']
+            )
+
+            if phi_clear_date > end_date:
+                not_ready.append({
+                    'field_id': f.id,
+                    'field_name': f.name,
+                    'estimated_bins': round(bins, 1),
+                    'reason': f'PHI not clear until {phi_clear_date.strftime("%m/%d/%Y")}',
+                })
+                continue
+
+            notes = []
+            if phi_clear_date == today:
+                priority = 'high'
+                notes.append('PHI clears today')
+            elif phi_clear_date > start_date:
+                priority = 'low'
+                notes.append(f'Wait for PHI clearance on {phi_clear_date.strftime("%m/%d")}')
+            else:
+                priority = 'medium'
+
+            blocks.append(ScheduleBlock(
+                field_id=f.id,
+                field_name=f.name,
+                bins=bins,
+                release_date=phi_clear_date,
+                weight=self.PRIORITY_WEIGHTS[priority],
+                priority=priority,
+                notes=notes,
+            ))
+        return blocks, not_ready
+
+    def _active_fields(self, farm_id: Optional[int] = None):
+        """Active fields of the farm (or company) with their farm loaded."""
+        from api.models import Field
+
+        queryset = Field.objects.filter(active=True).select_related('farm')
+        if farm_id:
+            queryset = queryset.filter(farm_id=farm_id)
+        if self.company_id:
+            queryset = queryset.filter(farm__company_id=self.company_id)
+        return queryset
+
+    def _phi_applications(self, field_ids: List[int]) -> Dict[int, List[Tuple[date, int, str]]]:
+        """
+        (application_date, phi_days, product_name) of applications with a
+        PHI in the lookback window, newest first, per field, in one query.
+        """
+        from api.models import PesticideApplication
+
+        if not field_ids:
+            return {}
+        rows = PesticideApplication.objects.filter(
+            field_id__in=field_ids,
+            application_date__gte=date.today() - timedelta(days=self.PHI_LOOKBACK_DAYS),
+            product__phi_days__gt=0,
+        ).order_by('-application_date').values_list(
+            'field_id', 'application_date', 'product__phi_days', 'product__product_name'
+        )
+
+        applications = {}
+        for field_id, application_date, phi_days, product_name in rows:
+            applications.setdefault(field_id, []).append(
+                (application_date, phi_days, product_name)
+            )
+        return applications
+
+    def _phi_clear_dates(
+        self,
+        field_ids: List[int],
+        applications: Optional[Dict[int, List[Tuple[date, int, str]]]] = None
+    ) -> Dict[int, date]:
+        """
+        Earliest harvest date per field from PHI of applications in the
+        lookback window, never before today, in one query (none when the
+        _phi_applications() rows are passed in). Matches
+        PesticideComplianceService.calculate_phi_clearance.
+        """
+        if applications is None:
+            applications = self._phi_applications(field_ids)
+        today = date.today()
+        clear_dates = dict.fromkeys(field_ids, today)
+        for field_id, rows in applications.items():
+            for application_date, phi_days, _product_name in rows:
+                clear_date = application_date + timedelta(days=phi_days)
+                if clear_date > clear_dates[field_id]:
+                    clear_dates[field_id] = clear_date
+        return clear_dates
+
     # =========================================================================
     # YIELD ESTIMATION
     # =========================================================================
@@ -444,7 +583,7 @@ class HarvestPlanningService:
         Returns:
             YieldEstimate with estimation details
         """
-        from api.models import Field, Harvest
+        from api.models import Field
 
         try:
             field = Field.objects.get(id=field_id)
@@ -459,6 +598,39 @@ class HarvestPlanningService:
                 notes=['Field not found']
             )
 
+        historical_avg = None
+        if not self._tree_count(field):
+            historical_avg = self._historical_yields([field.id]).get(field.id)
+        return self._estimate_yield(field, historical_avg)
+
+    def _historical_yields(self, field_ids: List[int]) -> Dict[int, float]:
+        """Average historical bins per acre per field, in one query."""
+        from api.models import Harvest
+
+        if not field_ids:
+            return {}
+        rows = Harvest.objects.filter(
+            field_id__in=field_ids
+        ).values('field_id').annotate(
+            avg_bins_per_acre=Avg(
+                F('total_bins') / F('acres_harvested'),
+                filter=Q(acres_harvested__gt=0, total_bins__gt=0)
+            )
+        ).order_by()
+        return {
+            row['field_id']: float(row['avg_bins_per_acre'])
+            for row in rows if row['avg_bins_per_acre']
+        }
+
+    @staticmethod
+    def _tree_count(field) -> Optional[int]:
+        return getattr(field, 'tree_count', None) or getattr(field, 'estimated_trees', None)
+
+    def _estimate_yield(self, field, historical_avg: Optional[float]) -> YieldEstimate:
+        """
+        Yield estimate for a loaded field given its historical average bins
+        per acre (None when there is no usable history).
+        """
         notes = []
         factors = {}
         method = 'default'
@@ -476,7 +648,7 @@ class HarvestPlanningService:
         defaults = self.DEFAULT_YIELDS.get(crop_key, self.DEFAULT_YIELDS['default'])
 
         # Try to get tree count
-        tree_count = getattr(field, 'tree_count', None) or getattr(field, 'estimated_trees', None)
+        tree_count = self._tree_count(field)
 
         if tree_count and tree_count > 0:
             # Tree-based estimation
@@ -490,38 +662,26 @@ class HarvestPlanningService:
             factors['bins_per_tree'] = bins_per_tree
             notes.append(f"Based on {tree_count} trees × {bins_per_tree} bins/tree")
 
-        else:
-            # Try historical data
-            historical = Harvest.objects.filter(
-                field_id=field_id
-            ).aggregate(
-                avg_bins_per_acre=Avg(
-                    F('total_bins') / F('acres_harvested'),
-                    filter=Q(acres_harvested__gt=0, total_bins__gt=0)
-                ),
-                last_yield=Max('total_bins')
-            )
-
-            if historical['avg_bins_per_acre']:
-                method = 'historical'
-                estimated_per_acre = float(historical['avg_bins_per_acre'])
-                estimated_total = estimated_per_acre * float(field.total_acres) if field.total_acres else None
-                confidence = 0.6
+        elif historical_avg:
+            method = 'historical'
+            estimated_per_acre = historical_avg
+            estimated_total = estimated_per_acre * float(field.total_acres) if field.total_acres else None
+            confidence = 0.6
 
-                factors['historical_avg'] = estimated_per_acre
-                notes.append(f"Based on historical average yield")
+            factors['historical_avg'] = estimated_per_acre
+            notes.append(f"Based on historical average yield")
 
-            else:
-                # Fall back to defaults
-                estimated_per_acre = defaults['bins_per_acre']
-                estimated_total = estimated_per_acre * float(field.total_acres) if field.total_acres else None
+        else:
+            # Fall back to defaults
+            estimated_per_acre = defaults['bins_per_acre']
+            estimated_total = estimated_per_acre * float(field.total_acres) if field.total_acres else None
 
-                factors['default_rate'] = defaults['bins_per_acre']
-                factors['crop_type'] = crop_key
-                notes.append(f"Using default estimate for {crop_key}")
+            factors['default_rate'] = defaults['bins_per_acre']
+            factors['crop_type'] = crop_key
+            notes.append(f"Using default estimate for {crop_key}")
 
         return YieldEstimate(
-            field_id=field_id,
+            field_id=field.id,
             field_name=field.name,
             estimation_method=method,
             estimated_total_bins=round(estimated_total, 1) if estimated_total else None,
@@ -167,6 +167,9 @@ class SprayPlanningService:
         # Find spray windows for a farm
         windows = service.find_spray_windows(farm_id=1, days_ahead=7)
 
+        # Or for every farm of the company in one call
+        by_farm = SprayPlanningService(company_id=1).find_company_spray_windows()
+
         # Evaluate current conditions
         result = service.evaluate_spray_conditions(farm_id=1)
 
@@ -177,44 +180,6 @@ class SprayPlanningService:
                 print(f"Issue: {issue}")
     """
 
-    # Spray condition thresholds (based on EPA/UC Davis guidelines)
-    THRESHOLDS = {
-        'wind': {
-            'good_min': 3,      # mph - below this, inversion risk
-            'good_max': 10,     # mph - ideal spray conditions
-            'fair_max': 15,     # mph - acceptable but watch for drift
-            # Above fair_max is poor
-        },
-        'temperature': {
-            'good_min': 50,     # °F
-            'good_max': 85,     # °F
-            'fair_min': 40,     # °F
-            'fair_max': 95,     # °F
-            # Outside fair range is poor
-        },
-        'humidity': {
-            'good_min': 40,     # %
-            'good_max': 70,     # %
-            'fair_min': 30,     # %
-            'fair_max': 80,     # %
-            # Outside fair range is poor
-        },
-        'rain': {
-            'good_hours': 6,    # No rain expected within 6 hours
-            'fair_hours': 3,    # Rain expected within 6 hours is fair
-            # Rain within 3 hours is poor
-        }
-    }
-
-    # Scoring weights
-    SCORE_WEIGHTS = {
-        'wind': 25,
-        'temperature': 25,
-        'humidity': 20,
-        'inversion_risk': 15,
-        'rain': 15,
-    }
-
     def __init__(self, company_id: Optional[int] = None):
         """
         Initialize the service.
@@ -247,8 +212,8 @@ class SprayPlanningService:
         """
         Find suitable spray windows in the upcoming forecast.
 
-        Analyzes weather forecast to identify periods with suitable
-        conditions for spray operations.
+        Scores each step of the farm's hourly forecast (read through
+        WeatherCache) and reports runs of suitable steps as windows.
 
         Args:
             farm_id: ID of the farm
@@ -272,57 +237,44 @@ class SprayPlanningService:
             return []
 
         try:
-            lat = float(farm.gps_latitude)
-            lon = float(farm.gps_longitude)
-            forecast = self.weather_service.get_forecast(lat, lon)
+            forecast = self.weather_service.get_farm_forecast(farm)
         except Exception as e:
             logger.error(f"Failed to get forecast for farm {farm_id}: {e}")
             return []
 
-        windows = []
-        daily_forecasts = forecast.get('daily', [])[:days_ahead]
-
-        for day_forecast in daily_forecasts:
-            # Assess conditions for this day
-            day_date = datetime.strptime(day_forecast['date'], '%Y-%m-%d').date()
-
-            conditions = {
-                'temperature_high': day_forecast.get('high'),
-                'temperature_low': day_forecast.get('low'),
-                'wind_speed': day_forecast.get('wind_speed'),
-                'humidity': day_forecast.get('humidity'),
-                'rain_chance': day_forecast.get('rain_chance', 0),
-                'conditions': day_forecast.get('conditions'),
-            }
-
-            # Calculate score
-            score, rating, notes = self._score_conditions(conditions, application_method)
-
-            if rating in ('good', 'fair'):
-                # Create spray window for this day
-                # Assume spray hours are 6 AM to 6 PM
-                start_dt = timezone.make_aware(datetime.combine(day_date, datetime.min.time().replace(hour=6)))
-                end_dt = timezone.make_aware(datetime.combine(day_date, datetime.min.time().replace(hour=18)))
+        windows = self._detect_windows(
+            {farm.id: forecast}, days_ahead, application_method, min_window_hours
+        )
+        return windows.get(farm.id, [])
 
-                # Calculate confidence based on how far out the forecast is
-                days_out = (day_date - date.today()).days
-                confidence = max(0.5, 1.0 - (days_out * 0.1))
+    def find_company_spray_windows(
+        self,
+        days_ahead: int = 7,
+        application_method: str = 'ground',
+        min_window_hours: float = 2.0
+    ) -> Dict[int, List[SprayWindow]]:
+        """
+        Find spray windows for every active farm of the company at once.
 
-                window = SprayWindow(
-                    start_datetime=start_dt,
-                    end_datetime=end_dt,
-                    confidence=confidence,
-                    conditions=conditions,
-                    rating=rating,
-                    score=score,
-                    notes=notes
-                )
-                windows.append(window)
+        Forecasts come from WeatherCache in one query (stale ones are
+        refetched) and all farms are scored together by the columnar
+        engine in spray_windows.
 
-        # Sort by score (best first)
-        windows.sort(key=lambda w: w.score, reverse=True)
+        Returns:
+            {farm_id: [SprayWindow, ...]} sorted by score (best first) for
+            each farm with a forecast. Farms without coordinates or whose
+            forecast could not be fetched are absent.
+        """
+        from api.models import Farm
 
-        return windows
+        farms = Farm.objects.filter(
+            company_id=self.company_id,
+            active=True,
+            gps_latitude__isnull=False,
+            gps_longitude__isnull=False,
+        )
+        forecasts = self.weather_service.get_farm_forecasts(farms)
+        return self._detect_windows(forecasts, days_ahead, application_method, min_window_hours)
 
     def evaluate_spray_conditions(
         self,
@@ -540,87 +492,25 @@ class SprayPlanningService:
     # PRIVATE HELPER METHODS
     # =========================================================================
 
-    def _score_conditions(
+    def _detect_windows(
         self,
-        conditions: Dict[str, Any],
-        application_method: str = 'ground'
-    ) -> tuple:
-        """
-        Score weather conditions for spray operations.
-
-        Returns:
-            Tuple of (score, rating, notes)
-        """
-        total_score = 0
-        notes = []
-
-        # Wind scoring (25 points)
-        wind = conditions.get('wind_speed', 0)
-        if self.THRESHOLDS['wind']['good_min'] <= wind <= self.THRESHOLDS['wind']['good_max']:
-            total_score += 25
-        elif wind < self.THRESHOLDS['wind']['good_min']:
-            total_score += 5
-            notes.append(f'Low wind ({wind} mph) - inversion risk')
-        elif wind <= self.THRESHOLDS['wind']['fair_max']:
-            total_score += 15
-            notes.append(f'Moderate wind ({wind} mph) - watch for drift')
-        else:
-            notes.append(f'High wind ({wind} mph) - not recommended')
-
-        # Temperature scoring (25 points)
-        temp_high = conditions.get('temperature_high', 70)
-        temp_low = conditions.get('temperature_low', 50)
-        avg_temp = (temp_high + temp_low) / 2 if temp_high and temp_low else 70
-
-        if self.THRESHOLDS['temperature']['good_min'] <= avg_temp <= self.THRESHOLDS['temperature']['good_max']:
-            total_score += 25
-        elif self.THRESHOLDS['temperature']['fair_min'] <= avg_temp <= self.THRESHOLDS['temperature']['fair_max']:
-            total_score += 15
-        else:
-            notes.append(f'Temperature ({avg_temp}°F avg) outside optimal range')
-
-        # Humidity scoring (20 points)
-        humidity = conditions.get('humidity', 50)
-        if self.THRESHOLDS['humidity']['good_min'] <= humidity <= self.THRESHOLDS['humidity']['good_max']:
-            total_score += 20
-        elif self.THRESHOLDS['humidity']['fair_min'] <= humidity <= self.THRESHOLDS['humidity']['fair_max']:
-            total_score += 12
-        else:
-            notes.append(f'Humidity ({humidity}%) outside optimal range')
-
-        # Rain scoring (15 points)
-        rain_chance = conditions.get('rain_chance', 0)
-        if rain_chance <= 10:
-            total_score += 15
-        elif rain_chance <= 30:
-            total_score += 10
-            notes.append(f'{rain_chance}% chance of rain')
-        elif rain_chance <= 50:
-            total_score += 5
-            notes.append(f'{rain_chance}% chance of rain - may wash off product')
-        else:
-            notes.append(f'{rain_chance}% chance of rain - not recommended')
-
-        # Inversion risk (15 points) - estimate from wind speed
-        if wind >= self.THRESHOLDS['wind']['good_min']:
-            total_score += 15
-        elif wind >= 2:
-            total_score += 8
-        else:
-            notes.append('Calm conditions - temperature inversion possible')
-
-        # Adjust for aerial application (more restrictive)
-        if application_method == 'aerial':
-            if wind > 8:
-                total_score -= 10
-                notes.append('Wind too high for aerial application')
-
-        # Determine rating
-        if total_score >= 75:
-            rating = 'good'
-        elif total_score >= 50:
-            rating = 'fair'
-        else:
-            rating = 'poor'
-
-        return total_score, rating, notes
+        forecasts: Dict[int, Dict[str, Any]],
+        days_ahead: int,
+        application_method: str,
+        min_window_hours: float
+    ) -> Dict[int, List[SprayWindow]]:
+        """Run the hourly window engine over {farm_id: forecast} from now on."""
+        from .spray_windows import ForecastBlock, detect_spray_windows
+
+        now = timezone.now()
+        start = int(now.timestamp())
+        block = ForecastBlock.from_forecasts(
+            forecasts, start=start, end=start + days_ahead * 86400
+        )
+        return detect_spray_windows(
+            block,
+            self.weather_service.THRESHOLDS,
+            application_method=application_method,
+            min_window_hours=min_window_hours,
+            now=now,
+        )
@@ -0,0 +1,266 @@
+"""
+Columnar spray window detection over hourly forecasts.
+
+Forecast steps for every farm in a company are concatenated into one set of
+parallel columns (ForecastBlock). Each spray factor is graded over a whole
+column at a time against WeatherService.THRESHOLDS, the grades are combined
+per step, and runs of consecutive qualifying steps on the same farm become
+SprayWindow objects. A company with hundreds of farms is scored in a single
+pass instead of one forecast at a time.
+
+A step qualifies when no factor is poor; window scores average the step
+scores, using the same points per factor as
+WeatherService.assess_spray_conditions.
+"""
+
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime
+from operator import sub
+from typing import Any, Dict, List, Optional
+
+from django.utils import timezone
+
+from .spray_planning import SprayWindow
+
+POOR, FAIR, GOOD = 0, 1, 2
+
+# Points per factor indexed by grade (poor, fair, good); they total 100.
+FACTOR_POINTS = {
+    'wind': (0, 15, 25),
+    'temperature': (0, 15, 25),
+    'humidity': (0, 12, 20),
+    'inversion': (0, 8, 15),
+    'rain': (0, 8, 15),
+}
+
+# Aerial applications are held to a lower wind ceiling than ground rigs (mph)
+AERIAL_WIND_MAX = 8
+
+COLUMNS = ('temperature', 'humidity', 'wind_speed', 'dewpoint', 'rain')
+
+
+@dataclass
+class ForecastBlock:
+    """
+    Forecast steps for many farms as parallel columns, farm after farm.
+
+    Farm ``farm_ids[n]`` owns rows ``offsets[n]:offsets[n + 1]``. ``dt`` is
+    the step start in epoch seconds and ``step`` its length in seconds; the
+    weather columns use WeatherService units (°F, %, mph, mm of rain).
+    """
+    farm_ids: List[int] = field(default_factory=list)
+    offsets: List[int] = field(default_factory=lambda: [0])
+    dt: List[int] = field(default_factory=list)
+    step: List[int] = field(default_factory=list)
+    temperature: List[float] = field(default_factory=list)
+    humidity: List[float] = field(default_factory=list)
+    wind_speed: List[float] = field(default_factory=list)
+    dewpoint: List[float] = field(default_factory=list)
+    rain: List[float] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.dt)
+
+    def spans(self):
+        """(farm_id, first_row, end_row) for every farm in the block."""
+        return zip(self.farm_ids, self.offsets, self.offsets[1:])
+
+    def add(self, farm_id: int, hourly: Dict[str, Any], start: Optional[int] = None,
+            end: Optional[int] = None):
+        """
+        Append one farm's ``hourly`` forecast columns (as produced by
+        WeatherService.get_forecast), keeping the steps that overlap
+        [start, end) when bounds are given.
+        """
+        dt = hourly.get('dt') or []
+        step = int(hourly.get('step_hours', 1) * 3600)
+        first = bisect_right(dt, start - step) if start is not None else 0
+        last = bisect_left(dt, end) if end is not None else len(dt)
+        last = max(first, last)
+
+        self.farm_ids.append(farm_id)
+        self.dt.extend(dt[first:last])
+        self.step.extend([step] * (last - first))
+        for name in COLUMNS:
+            getattr(self, name).extend(hourly[name][first:last])
+        self.offsets.append(len(self.dt))
+
+    @classmethod
+    def from_forecasts(cls, forecasts: Dict[int, Dict[str, Any]], start: Optional[int] = None,
+                       end: Optional[int] = None) -> 'ForecastBlock':
+        """Block for {farm_id: forecast}; forecasts without hourly data are skipped."""
+        block = cls()
+        for farm_id, forecast in forecasts.items():
+            hourly = forecast.get('hourly')
+            if hourly:
+                block.add(farm_id, hourly, start, end)
+        return block
+
+
+def grade_band(values, good_min, good_max, fair_min, fair_max) -> List[int]:
+    """Grade every value against a good band inside a wider fair band."""
+    return [
+        GOOD if good_min <= v <= good_max
+        else FAIR if fair_min <= v <= fair_max
+        else POOR
+        for v in values
+    ]
+
+
+def grade_floor(values, good_min, fair_min) -> List[int]:
+    """Grade every value against good and fair lower bounds."""
+    return [GOOD if v >= good_min else FAIR if v >= fair_min else POOR for v in values]
+
+
+def hours_until_rain(block: ForecastBlock) -> List[float]:
+    """
+    Hours from the start of each step to the next step with rain on the
+    same farm: 0 for a wet step, infinity when no rain is forecast.
+    """
+    result = [math.inf] * len(block)
+    dt, rain = block.dt, block.rain
+    for _farm_id, first, end in block.spans():
+        next_rain = None
+        for i in range(end - 1, first - 1, -1):
+            if rain[i] > 0:
+                next_rain = dt[i]
+            if next_rain is not None:
+                result[i] = (next_rain - dt[i]) / 3600
+    return result
+
+
+def grade_block(block: ForecastBlock, thresholds: Dict[str, Dict[str, float]],
+                application_method: str = 'ground',
+                rain_eta: Optional[List[float]] = None) -> Dict[str, List[int]]:
+    """
+    Grade column per factor in FACTOR_POINTS for every step in the block.
+    ``rain_eta`` is hours_until_rain(block) when the caller already has it.
+    """
+    if rain_eta is None:
+        rain_eta = hours_until_rain(block)
+    wind = thresholds['wind']
+    good_max, fair_max = wind['good_max'], wind['fair_max']
+    if application_method == 'aerial':
+        good_max = min(good_max, AERIAL_WIND_MAX)
+        fair_max = min(fair_max, AERIAL_WIND_MAX)
+    temperature = thresholds['temperature']
+    humidity = thresholds['humidity']
+    inversion = thresholds['inversion']
+    rain_hours = thresholds['rain_hours']
+
+    return {
+        # Calm air is poor: drift rides temperature inversions
+        'wind': grade_band(block.wind_speed, wind['good_min'], good_max, wind['good_min'], fair_max),
+        'temperature': grade_band(
+            block.temperature, temperature['good_min'], temperature['good_max'],
+            temperature['fair_min'], temperature['fair_max'],
+        ),
+        'humidity': grade_band(
+            block.humidity, humidity['good_min'], humidity['good_max'],
+            humidity['fair_min'], humidity['fair_max'],
+        ),
+        'inversion': grade_floor(
+            map(sub, block.temperature, block.dewpoint),
+            inversion['good_diff'], inversion['fair_diff'],
+        ),
+        # Rain inside rain_hours['good'] is poor, inside rain_hours['fair'] fair
+        'rain': grade_floor(rain_eta, rain_hours['fair'], rain_hours['good']),
+    }
+
+
+def detect_spray_windows(
+    block: ForecastBlock,
+    thresholds: Dict[str, Dict[str, float]],
+    application_method: str = 'ground',
+    min_window_hours: float = 2.0,
+    now: Optional[datetime] = None,
+) -> Dict[int, List[SprayWindow]]:
+    """
+    Spray windows for every farm in the block, best score first.
+
+    A window is a run of consecutive steps where no factor is poor; windows
+    shorter than ``min_window_hours`` are dropped. Steps already under way
+    start at ``now``. Every farm in the block gets a key, even with no
+    windows.
+    """
+    now = now or timezone.now()
+    now_ts = int(now.timestamp())
+    today = timezone.localdate(now)
+
+    rain_eta = hours_until_rain(block)
+    grades = grade_block(block, thresholds, application_method, rain_eta)
+    # POOR is 0, so a step qualifies when all of its grades are truthy
+    qualifying = list(map(all, zip(*grades.values())))
+    scores = list(map(sum, zip(*(
+        [FACTOR_POINTS[name][g] for g in column] for name, column in grades.items()
+    ))))
+    tz = timezone.get_current_timezone()
+
+    dt, step = block.dt, block.step
+    windows = {}
+    for farm_id, first, end in block.spans():
+        farm_windows = []
+        i = first
+        while i < end:
+            if not qualifying[i]:
+                i += 1
+                continue
+            j = i + 1
+            while j < end and qualifying[j] and dt[j] == dt[j - 1] + step[j - 1]:
+                j += 1
+            start_ts = max(dt[i], now_ts)
+            end_ts = dt[j - 1] + step[j - 1]
+            if (end_ts - start_ts) / 3600 >= min_window_hours:
+                farm_windows.append(
+                    _build_window(block, grades, scores, rain_eta, i, j, start_ts, end_ts, today, tz)
+                )
+            i = j
+        farm_windows.sort(key=lambda w: w.score, reverse=True)
+        windows[farm_id] = farm_windows
+    return windows
+
+
+def _build_window(block, grades, scores, rain_eta, i, j, start_ts, end_ts, today, tz) -> SprayWindow:
+    start = datetime.fromtimestamp(start_ts, tz=tz)
+    end = datetime.fromtimestamp(end_ts, tz=tz)
+
+    temps = block.temperature[i:j]
+    winds = block.wind_speed[i:j]
+    humidity = block.humidity[i:j]
+    spread = min(map(sub, temps, block.dewpoint[i:j]))
+    after_end = rain_eta[j - 1] - (end_ts - block.dt[j - 1]) / 3600
+    score = round(sum(scores[i:j]) / (j - i))
+
+    notes = []
+    if FAIR in grades['wind'][i:j]:
+        notes.append(f'Moderate wind (up to {max(winds):.0f} mph) - watch for drift')
+    if FAIR in grades['temperature'][i:j]:
+        notes.append(f'Temperature {min(temps):.0f}-{max(temps):.0f}°F - outside optimal range at times')
+    if FAIR in grades['humidity'][i:j]:
+        notes.append(f'Humidity {min(humidity):.0f}-{max(humidity):.0f}% - outside optimal range at times')
+    if FAIR in grades['inversion'][i:j]:
+        notes.append(f'Moderate inversion risk (temperature-dewpoint spread {spread:.1f}°F)')
+    if FAIR in grades['rain'][i:j]:
+        notes.append(f'Rain forecast {max(after_end, 0):.0f} hours after window - check rainfast period')
+
+    days_out = (start.date() - today).days
+    return SprayWindow(
+        start_datetime=start,
+        end_datetime=end,
+        confidence=max(0.5, 1.0 - (days_out * 0.1)),
+        conditions={
+            'temperature_min': round(min(temps), 1),
+            'temperature_max': round(max(temps), 1),
+            'wind_speed_min': round(min(winds), 1),
+            'wind_speed_max': round(max(winds), 1),
+            'humidity_min': round(min(humidity)),
+            'humidity_max': round(max(humidity)),
+            'dewpoint_spread_min': round(spread, 1),
+            'hours_until_rain': None if math.isinf(after_end) else round(max(after_end, 0), 1),
+        },
+        rating='good' if score >= 75 else 'fair',
+        score=score,
+        notes=notes,
+    )
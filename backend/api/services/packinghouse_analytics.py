@@ -9,10 +9,11 @@ from collections import defaultdict
 from datetime import date
 from decimal import Decimal
 
+from django.db import connection
 from django.db.models import (
-    Avg, Count, Max, Q, Sum, DecimalField,
+    Avg, Count, F, Q, Sum, DecimalField, Window,
 )
-from django.db.models.functions import Coalesce
+from django.db.models.functions import Coalesce, RowNumber
 
 from api.models import (
     Harvest, Packinghouse, PackinghouseDelivery, PackoutGradeLine,
@@ -26,6 +27,38 @@ from api.services.season_service import (
 )
 
 
+def latest_per_group(queryset, group_by, order_by):
+    """
+    The first row of ``queryset`` in each ``group_by`` group, ordered by
+    ``order_by`` (ties broken by the newest pk), as a queryset of the same
+    model that can be filtered further or used as a subquery.
+
+    PostgreSQL picks the rows with DISTINCT ON; other backends (SQLite)
+    number each group's rows with a ROW_NUMBER() window and keep row 1.
+    Either way it is one statement however many groups there are.
+    """
+    ordering = [*order_by, '-pk']
+    if connection.vendor == 'postgresql':
+        latest = queryset.order_by(*group_by, *ordering).distinct(*group_by)
+    else:
+        latest = queryset.annotate(
+            _group_row=Window(
+                RowNumber(),
+                partition_by=[F(field) for field in group_by],
+                order_by=ordering,
+            ),
+        ).filter(_group_row=1)
+    return queryset.model._default_manager.filter(pk__in=latest.values('pk'))
+
+
+def grade_lines_by_report(grade_lines):
+    """Packout grade lines grouped into {packout_report_id: [lines]} in one pass."""
+    by_report = defaultdict(list)
+    for line in grade_lines:
+        by_report[line.packout_report_id].append(line)
+    return by_report
+
+
 class PackinghouseAnalyticsService:
     """Pure business-logic helpers for packinghouse analytics endpoints."""
 
@@ -477,32 +510,22 @@ class PackinghouseAnalyticsService:
         if commodity:
             filters &= Q(pool__commodity__icontains=commodity)
 
-        latest_reports = PackoutReport.objects.filter(
-            filters
-        ).values('field').annotate(latest_date=Max('report_date'))
-
-        report_filter = Q()
-        for item in latest_reports:
-            report_filter |= Q(field_id=item['field'], report_date=item['latest_date'])
-
-        reports = []
-        if report_filter:
-            reports = list(
-                PackoutReport.objects.filter(report_filter)
-                .select_related('field', 'pool')
-                .order_by('field_id')
+        reports = list(
+            latest_per_group(
+                PackoutReport.objects.filter(filters, field__isnull=False),
+                ['field'], ['-report_date'],
             )
+            .select_related('field', 'pool')
+            .order_by('field_id')
+        )
 
-        pool_field_pairs = [(r.pool_id, r.field_id) for r in reports]
         settlement_lookup = {}
-        if pool_field_pairs:
-            settlement_filter = Q()
-            for pool_id, field_id in pool_field_pairs:
-                settlement_filter |= Q(pool_id=pool_id, field_id=field_id)
-            for s in PoolSettlement.objects.filter(settlement_filter).order_by('pool_id', 'field_id', '-statement_date'):
-                key = (s.pool_id, s.field_id)
-                if key not in settlement_lookup:
-                    settlement_lookup[key] = s
+        if reports:
+            settlements = latest_per_group(
+                PoolSettlement.objects.filter(filters, field__isnull=False),
+                ['pool', 'field'], ['-statement_date'],
+            )
+            settlement_lookup = {(s.pool_id, s.field_id): s for s in settlements}
 
         results = []
         for report in reports:
@@ -612,15 +635,14 @@ class PackinghouseAnalyticsService:
         if commodity:
             filters &= Q(pool__commodity__icontains=commodity)
 
-        # Latest packout report per field (with field)
-        latest_with_field = PackoutReport.objects.filter(
-            filters, field__isnull=False
-        ).values('field').annotate(latest_date=Max('report_date'))
-
-        # Latest packout report per pool (no field)
-        latest_without_field = PackoutReport.objects.filter(
-            filters, field__isnull=True
-        ).values('pool').annotate(latest_date=Max('report_date'))
+        # Latest packout report per field (with field) and per pool (no field)
+        reports = PackoutReport.objects.filter(filters)
+        latest_field_reports = latest_per_group(
+            reports.filter(field__isnull=False), ['field'], ['-report_date'],
+        )
+        latest_pool_reports = latest_per_group(
+            reports.filter(field__isnull=True), ['pool'], ['-report_date'],
+        )
 
         groups = defaultdict(lambda: {'total_quantity': Decimal('0'), 'sizes': defaultdict(lambda: {
             'quantity': Decimal('0'),
@@ -631,8 +653,8 @@ class PackinghouseAnalyticsService:
         })})
         all_sizes = set()
 
-        def process_report(report, prefetched_lines):
-            lines = [gl for gl in prefetched_lines if gl.packout_report_id == report.id and gl.size]
+        def process_report(report, lines):
+            lines = [gl for gl in lines if gl.size]
             if not lines:
                 return
 
@@ -664,34 +686,19 @@ class PackinghouseAnalyticsService:
                 groups[gid]['group_id'] = gid if isinstance(gid, int) else 0
                 groups[gid]['group_name'] = gname
 
-        # Batch-fetch reports
-        field_report_filter = Q()
-        for item in latest_with_field:
-            field_report_filter |= Q(field_id=item['field'], report_date=item['latest_date'])
-
-        pool_report_filter = Q()
-        for item in latest_without_field:
-            pool_report_filter |= Q(pool_id=item['pool'], field__isnull=True, report_date=item['latest_date'])
-
-        field_reports = list(
-            PackoutReport.objects.filter(field_report_filter)
-            .select_related('field__farm', 'pool')
-        ) if field_report_filter else []
-
-        pool_reports = list(
-            PackoutReport.objects.filter(pool_report_filter)
-            .select_related('pool')
-        ) if pool_report_filter else []
-
-        all_reports = field_reports + pool_reports
-
-        report_ids = [r.id for r in all_reports]
-        all_grade_lines = list(
-            PackoutGradeLine.objects.filter(packout_report_id__in=report_ids).exclude(size='')
-        ) if report_ids else []
+        all_reports = (
+            list(latest_field_reports.select_related('field__farm', 'pool'))
+            + list(latest_pool_reports.select_related('pool'))
+        )
+        lines_by_report = grade_lines_by_report(
+            PackoutGradeLine.objects.filter(
+                Q(packout_report__in=latest_field_reports.values('pk'))
+                | Q(packout_report__in=latest_pool_reports.values('pk'))
+            ).exclude(size='')
+        ) if all_reports else {}
 
         for report in all_reports:
-            process_report(report, all_grade_lines)
+            process_report(report, lines_by_report.get(report.id, ()))
 
         # Build response
         results = []
@@ -726,16 +733,21 @@ class PackinghouseAnalyticsService:
     # -----------------------------------------------------------------
     @staticmethod
     def size_pricing(company, season=None, packinghouse_id=None, commodity=None, group_by='none'):
-        filters = Q(settlement__pool__packinghouse__company=company)
+        filters = Q(pool__packinghouse__company=company)
         if season:
-            filters &= Q(settlement__pool__season=season)
+            filters &= Q(pool__season=season)
         if packinghouse_id:
-            filters &= Q(settlement__pool__packinghouse_id=packinghouse_id)
+            filters &= Q(pool__packinghouse_id=packinghouse_id)
         if commodity:
-            filters &= Q(settlement__pool__commodity__icontains=commodity)
+            filters &= Q(pool__commodity__icontains=commodity)
 
+        # Only the latest statement per pool and field, so a reissued
+        # settlement doesn't count its grade lines twice
+        settlements = latest_per_group(
+            PoolSettlement.objects.filter(filters), ['pool', 'field'], ['-statement_date'],
+        )
         grade_lines = SettlementGradeLine.objects.filter(
-            filters
+            settlement__in=settlements.values('pk')
         ).exclude(size='').select_related(
             'settlement__field__farm',
             'settlement__pool'
@@ -1714,25 +1726,27 @@ class PackinghouseAnalyticsService:
             'total_revenue': Decimal('0'),
         }))
 
-        for season in seasons_list:
-            filters = Q(
-                settlement__pool__packinghouse__company=company,
-                settlement__pool__season=season,
-            )
-            if packinghouse_id:
-                filters &= Q(settlement__pool__packinghouse_id=packinghouse_id)
-            if commodity:
-                filters &= Q(settlement__pool__commodity__icontains=commodity)
-            if grade:
-                filters &= Q(grade__icontains=grade)
-
-            grade_lines = SettlementGradeLine.objects.filter(filters).exclude(size='')
+        filters = Q(pool__packinghouse__company=company, pool__season__in=seasons_list)
+        if packinghouse_id:
+            filters &= Q(pool__packinghouse_id=packinghouse_id)
+        if commodity:
+            filters &= Q(pool__commodity__icontains=commodity)
+        settlements = latest_per_group(
+            PoolSettlement.objects.filter(filters), ['pool', 'field'], ['-statement_date'],
+        )
 
-            for line in grade_lines:
-                key = (line.grade, line.size)
-                entry = grade_size_data[key][season]
-                entry['total_quantity'] += line.quantity or Decimal('0')
-                entry['total_revenue'] += line.total_amount or Decimal('0')
+        grade_lines = SettlementGradeLine.objects.filter(
+            settlement__in=settlements.values('pk')
+        ).exclude(size='')
+        if grade:
+            grade_lines = grade_lines.filter(grade__icontains=grade)
+
+        for line_grade, size, season, quantity, total_amount in grade_lines.values_list(
+            'grade', 'size', 'settlement__pool__season', 'quantity', 'total_amount',
+        ):
+            entry = grade_size_data[(line_grade, size)][season]
+            entry['total_quantity'] += quantity or Decimal('0')
+            entry['total_revenue'] += total_amount or Decimal('0')
 
         grade_sizes = []
         for (grade_val, size), season_data in grade_size_data.items():
@@ -1966,17 +1980,14 @@ class PackinghouseAnalyticsService:
                 'insight': 'No field-level settlement data available.',
             }
 
-        pool_field_pairs = set((s.pool_id, s.field_id) for s in settlements)
-        packout_filter = Q()
-        for pool_id, field_id in pool_field_pairs:
-            packout_filter |= Q(pool_id=pool_id, field_id=field_id)
-
-        packout_lookup = {}
-        if packout_filter:
-            for pr in PackoutReport.objects.filter(packout_filter).order_by('pool_id', 'field_id', '-report_date'):
-                key = (pr.pool_id, pr.field_id)
-                if key not in packout_lookup:
-                    packout_lookup[key] = pr
+        packouts = latest_per_group(
+            PackoutReport.objects.filter(
+                pool__in=PoolSettlement.objects.filter(settlement_filters).values('pool'),
+                field__isnull=False,
+            ),
+            ['pool', 'field'], ['-report_date'],
+        )
+        packout_lookup = {(pr.pool_id, pr.field_id): pr for pr in packouts}
 
         data_points = []
         for s in settlements:
@@ -689,11 +689,12 @@ Return ONLY the JSON object, no additional text."""
                 'grade': (line.get('grade') or 'UNKNOWN')[:20],
                 'size': (line.get('size') or '')[:10],  # Handle None values, truncate to model max_length
                 'unit_of_measure': (line.get('unit') or 'CARTON')[:20],
-                'block_id': (line.get('block_id') or '')[:20],
             }
 
             if for_settlement:
+                # Packout grade lines have no block breakdown
                 line_data.update({
+                    'block_id': (line.get('block_id') or '')[:20],
                     'quantity': self._to_decimal(line.get('quantity'), default=Decimal('0')),
                     'percent_of_total': self._to_decimal(line.get('percent'), default=Decimal('0')),
                     'fob_rate': self._to_decimal(line.get('fob_rate'), default=Decimal('0')),
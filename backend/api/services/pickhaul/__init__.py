@@ -5,8 +5,8 @@ Public entry points:
     apply_bundle(company, payload, token)   -> dict   (sync.py)
     run_reconciliation(company, season)     -> dict   (reconcile.py)
     relink_invoice(invoice)                 -> int    (linking.py)
-    run_platform_gates(company, season, batch=None) -> dict (checks.py)
-    run_post_change(company, season)        -> dict   (orchestration below)
+    run_platform_gates(company, season, batch=None, changed=None) -> dict (checks.py)
+    run_post_change(company, season, changed=None) -> dict (orchestration below)
 
 The matcher and gate logic are ports of the local pipeline's reconcile.py and
 checks.py (Pick & Haul Automation). Structure is kept deliberately parallel so
@@ -19,14 +19,18 @@ from .reconcile import run_reconciliation
 from .checks import run_platform_gates
 
 
-def run_post_change(company, season):
+def run_post_change(company, season, changed=None):
     """Everything that must re-run after an invoice create/update/delete.
 
     Scope-wide on purpose: charge allocation (`used`) is global per account,
     so one edited invoice can change another invoice's match. Cheap at this
-    scale (~160 charges, ~120 invoices per season).
+    scale (~160 charges, ~120 invoices per season). ``changed`` names the
+    edited row types (see checks.ROW_TYPES) to re-run only the gates that
+    read them, plus those reading the matches reconciliation rewrites.
     """
     relink_season(company, season)
     recon = run_reconciliation(company, season)
-    gates = run_platform_gates(company, season)
+    if changed is not None:
+        changed = {*changed, 'match'}
+    gates = run_platform_gates(company, season, changed=changed)
     return {'reconciliation': recon, 'platform_gates': gates}
@@ -13,45 +13,56 @@ than keyed directly, as manual picks are) are labelled as such.
 from collections import defaultdict
 from decimal import Decimal
 
-from django.db.models import Count, Sum
+from django.db.models import Count, F, Q, Sum, Window
 
 from api.models import (
     PickHaulDirectCharge, PickHaulInvoice, PickHaulInvoiceReceipt,
     PickHaulManualPick, PickHaulReceipt,
 )
 
+# Columns of the allocation table, one entry per invoice-receipt link
+LINK_COLUMNS = (
+    'receipt_id', 'receipt__bins', 'invoice_id', 'invoice__kind', 'invoice__amount',
+    'invoice__invoice_no', 'invoice__contractor', 'invoice_bins', 'invoice_receipts',
+)
+
 
 def _allocate_invoice_costs(company, season):
     """Per-receipt {receipt_id: {'PICK': Decimal, 'HAUL': Decimal}} plus the
-    invoice references behind each receipt, allocated proportional to bins."""
+    invoice references behind each receipt, allocated proportional to bins.
+
+    Each invoice's total bins and receipt count are attached to its links by
+    window functions, so allocation is a single pass over the link rows with
+    no per-invoice grouping in Python and no model instances.
+    """
     costs = defaultdict(lambda: {'PICK': Decimal('0'), 'HAUL': Decimal('0')})
     refs = defaultdict(list)
 
+    per_invoice = {'partition_by': [F('invoice_id')]}
     links = (
         PickHaulInvoiceReceipt.objects.filter(
             invoice__company=company, invoice__season=season,
             invoice__amount__isnull=False,
         )
-        .select_related('invoice', 'receipt')
+        .annotate(
+            invoice_bins=Window(Sum('receipt__bins'), **per_invoice),
+            invoice_receipts=Window(Count('id'), **per_invoice),
+        )
+        .order_by('invoice_id', 'pk')
+        .values_list(*LINK_COLUMNS)
     )
-    by_invoice = defaultdict(list)
-    for link in links:
-        by_invoice[link.invoice].append(link.receipt)
-
-    for invoice, receipts in by_invoice.items():
-        total_bins = sum((r.bins or Decimal('0')) for r in receipts)
-        for receipt in receipts:
-            if total_bins > 0:
-                share = (invoice.amount or Decimal('0')) * (receipt.bins or Decimal('0')) / total_bins
-            else:
-                share = (invoice.amount or Decimal('0')) / len(receipts)
-            costs[receipt.pk][invoice.kind] += share
-            refs[receipt.pk].append({
-                'kind': invoice.kind,
-                'invoice_no': invoice.invoice_no,
-                'contractor': invoice.contractor,
-                'invoice_id': invoice.pk,
-            })
+    for receipt_id, bins, invoice_id, kind, amount, invoice_no, contractor, total_bins, n in links:
+        if total_bins and total_bins > 0:
+            share = amount * (bins or Decimal('0')) / total_bins
+        else:
+            share = amount / n
+        costs[receipt_id][kind] += share
+        refs[receipt_id].append({
+            'kind': kind,
+            'invoice_no': invoice_no,
+            'contractor': contractor,
+            'invoice_id': invoice_id,
+        })
     return costs, refs
 
 
@@ -59,33 +70,27 @@ def season_money_stats(company, season):
     """Season-wide money summary shared by the Deliveries view and the
     season overview: invoice + manual costs, the chase list total (grower-
     paid invoices only), and gate-11 unmatched house charges."""
-    invoice_totals = {
-        row['kind']: row['total']
-        for row in PickHaulInvoice.objects.filter(
-            company=company, season=season, amount__isnull=False,
-        ).values('kind').annotate(total=Sum('amount'))
-    }
-    manual_cost = PickHaulManualPick.objects.filter(
-        company=company, season=season, count_cost=True,
-    ).aggregate(t=Sum('cost'))['t'] or Decimal('0')
-    manual_haul = PickHaulManualPick.objects.filter(
-        company=company, season=season, count_haul=True,
-    ).aggregate(t=Sum('haul_cost'))['t'] or Decimal('0')
-
-    owed = PickHaulInvoice.objects.filter(
-        company=company, season=season, billing='direct',
-        date_emailed__isnull=False, charge_posted__isnull=True,
-    ).aggregate(total=Sum('amount'), n=Count('id'))
+    owed = Q(billing='direct', date_emailed__isnull=False, charge_posted__isnull=True)
+    invoices = PickHaulInvoice.objects.filter(company=company, season=season).aggregate(
+        pick=Sum('amount', filter=Q(kind='PICK')),
+        haul=Sum('amount', filter=Q(kind='HAUL')),
+        owed_total=Sum('amount', filter=owed),
+        owed_count=Count('id', filter=owed),
+    )
+    manual = PickHaulManualPick.objects.filter(company=company, season=season).aggregate(
+        cost=Sum('cost', filter=Q(count_cost=True)),
+        haul=Sum('haul_cost', filter=Q(count_haul=True)),
+    )
     unmatched = PickHaulDirectCharge.objects.filter(
         company=company, season=season, kind__in=('PICK', 'HAUL'),
         debit__gt=0, match__isnull=True, ack__isnull=True,
     ).aggregate(total=Sum('debit'), n=Count('id'))
 
     return {
-        'pick_cost': (invoice_totals.get('PICK') or Decimal('0')) + manual_cost,
-        'haul_cost': (invoice_totals.get('HAUL') or Decimal('0')) + manual_haul,
-        'owed_total': owed['total'] or Decimal('0'),
-        'owed_count': owed['n'] or 0,
+        'pick_cost': (invoices['pick'] or Decimal('0')) + (manual['cost'] or Decimal('0')),
+        'haul_cost': (invoices['haul'] or Decimal('0')) + (manual['haul'] or Decimal('0')),
+        'owed_total': invoices['owed_total'] or Decimal('0'),
+        'owed_count': invoices['owed_count'] or 0,
         'unmatched_charges': {
             'rows': unmatched['n'] or 0,
             'total': unmatched['total'] or Decimal('0'),
@@ -93,9 +98,22 @@ def season_money_stats(company, season):
     }
 
 
+RECEIPT_COLUMNS = (
+    'id', 'receipt_no', 'pick_date', 'pick_date_raw', 'bins', 'is_active',
+    'block_raw', 'packinghouse__short_code', 'entity__short_code',
+)
+MANUAL_PICK_COLUMNS = (
+    'id', 'sheet', 'ranch', 'block', 'pick_date', 'date_label', 'varietal',
+    'bins', 'lbs', 'cost', 'haul_cost', 'count_cost', 'count_haul',
+    'harvester', 'invoice_no', 'packinghouse__short_code', 'entity__short_code',
+)
+
+
 def harvest_activity(company, season):
-    """The season's deliveries grouped by block, plus the money summary."""
+    """The season's deliveries grouped by block and by house, plus the money
+    summary."""
     costs, refs = _allocate_invoice_costs(company, season)
+    no_cost = {'PICK': Decimal('0'), 'HAUL': Decimal('0')}
 
     blocks = {}
 
@@ -112,53 +130,66 @@ def harvest_activity(company, season):
 
     receipts = PickHaulReceipt.objects.filter(
         company=company, season=season,
-    ).select_related('packinghouse', 'entity').order_by('block_raw', 'pick_date')
-    for r in receipts:
-        pick = costs[r.pk]['PICK']
-        haul = costs[r.pk]['HAUL']
-        bucket = block_bucket(r.packinghouse.short_code, r.entity.short_code, r.block_raw)
-        if r.is_active:
-            bucket['bins'] += r.bins or Decimal('0')
+    ).order_by('block_raw', 'pick_date').values_list(*RECEIPT_COLUMNS)
+    for (receipt_id, receipt_no, pick_date, pick_date_raw, bins, is_active,
+         block_raw, house_code, entity_code) in receipts:
+        allocated = costs.get(receipt_id, no_cost)
+        pick = allocated['PICK']
+        haul = allocated['HAUL']
+        bucket = block_bucket(house_code, entity_code, block_raw)
+        if is_active:
+            bucket['bins'] += bins or Decimal('0')
             bucket['pick_cost'] += pick
             bucket['haul_cost'] += haul
         bucket['deliveries'].append({
-            'id': r.pk, 'kind': 'receipt',
-            'receipt_no': r.receipt_no,
-            'pick_date': r.pick_date,
-            'pick_date_raw': r.pick_date_raw,
-            'bins': r.bins,
+            'id': receipt_id, 'kind': 'receipt',
+            'receipt_no': receipt_no,
+            'pick_date': pick_date,
+            'pick_date_raw': pick_date_raw,
+            'bins': bins,
             'pick_cost': pick or None,
             'haul_cost': haul or None,
             'cost_basis': 'allocated' if (pick or haul) else None,
-            'invoice_refs': refs.get(r.pk, []),
-            'is_active': r.is_active,
+            'invoice_refs': refs.get(receipt_id, []),
+            'is_active': is_active,
         })
 
     picks = PickHaulManualPick.objects.filter(
         company=company, season=season,
-    ).select_related('packinghouse', 'entity').order_by('sheet', 'row_no')
+    ).order_by('sheet', 'row_no').values(*MANUAL_PICK_COLUMNS)
     for p in picks:
-        label = ' · '.join(x for x in (p.ranch, p.block) if x) or p.sheet
-        bucket = block_bucket(p.packinghouse.short_code, p.entity.short_code, label)
-        bucket['bins'] += p.bins or Decimal('0')
-        if p.count_cost:
-            bucket['pick_cost'] += p.cost or Decimal('0')
-        if p.count_haul:
-            bucket['haul_cost'] += p.haul_cost or Decimal('0')
+        label = ' · '.join(x for x in (p['ranch'], p['block']) if x) or p['sheet']
+        bucket = block_bucket(p['packinghouse__short_code'], p['entity__short_code'], label)
+        bucket['bins'] += p['bins'] or Decimal('0')
+        if p['count_cost']:
+            bucket['pick_cost'] += p['cost'] or Decimal('0')
+        if p['count_haul']:
+            bucket['haul_cost'] += p['haul_cost'] or Decimal('0')
         bucket['deliveries'].append({
-            'id': p.pk, 'kind': 'manual',
-            'sheet': p.sheet,
-            'pick_date': p.pick_date,
-            'date_label': p.date_label,
-            'varietal': p.varietal,
-            'bins': p.bins, 'lbs': p.lbs,
-            'pick_cost': p.cost, 'haul_cost': p.haul_cost,
+            'id': p['id'], 'kind': 'manual',
+            'sheet': p['sheet'],
+            'pick_date': p['pick_date'],
+            'date_label': p['date_label'],
+            'varietal': p['varietal'],
+            'bins': p['bins'], 'lbs': p['lbs'],
+            'pick_cost': p['cost'], 'haul_cost': p['haul_cost'],
             'cost_basis': 'keyed',
-            'count_cost': p.count_cost, 'count_haul': p.count_haul,
-            'harvester': p.harvester, 'invoice_no': p.invoice_no,
+            'count_cost': p['count_cost'], 'count_haul': p['count_haul'],
+            'harvester': p['harvester'], 'invoice_no': p['invoice_no'],
             'is_active': True,
         })
 
+    houses = {}
+    for b in blocks.values():
+        house = houses.setdefault(b['house_code'], {
+            'house_code': b['house_code'], 'blocks': 0, 'bins': Decimal('0'),
+            'pick_cost': Decimal('0'), 'haul_cost': Decimal('0'),
+        })
+        house['blocks'] += 1
+        house['bins'] += b['bins']
+        house['pick_cost'] += b['pick_cost']
+        house['haul_cost'] += b['haul_cost']
+
     # ---- season money summary -------------------------------------------
     money = season_money_stats(company, season)
     pick_cost = money['pick_cost']
@@ -183,4 +214,5 @@ def harvest_activity(company, season):
             'unmatched_charges': money['unmatched_charges'],
         },
         'blocks': ordered,
+        'houses': sorted(houses.values(), key=lambda h: -h['bins']),
     }
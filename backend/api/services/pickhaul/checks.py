@@ -11,20 +11,26 @@ no invoice allocated against them. Locally these were invisible: gate 8 starts
 from invoices, and a posted charge with nothing keyed has no invoice to age.
 At the time of the port that blind spot held $360,108 across 48 rows.
 
+Every gate is a pure function over one SeasonSnapshot, so a run reads each
+of the season's tables once however many gates it covers.
+
 Severities:
     error  something is wrong with the data
     warn   worth a human look
     info   informational
 """
 
+from collections import defaultdict
 from datetime import date
+from functools import cached_property
 
 from django.db import transaction
-from django.db.models import Count, Sum
+from django.db.models import Count, Q
 from django.utils import timezone
 
 from api.models import (
-    PickHaulCheckResult, PickHaulDirectCharge, PickHaulInvoice, PickHaulReceipt,
+    PickHaulCheckResult, PickHaulDirectCharge, PickHaulInvoice,
+    PickHaulInvoiceReceipt, PickHaulReceipt,
 )
 from .config import AGING_DAYS, PER_BIN_BANDS, SELF_HAULING_CONTRACTOR
 
@@ -37,6 +43,89 @@ GATE_NAMES = {
     11: 'unmatched-charges',
 }
 
+# The row types each gate reads. run_platform_gates(changed=...) re-runs only
+# the gates whose inputs changed; reconciliation rewrites 'match' rows and
+# relinking rewrites 'link' rows, so callers name those too when they ran.
+ROW_TYPES = ('receipt', 'invoice', 'link', 'charge', 'match', 'ack')
+GATE_INPUTS = {
+    5: {'receipt', 'invoice', 'link'},
+    6: {'receipt', 'invoice', 'link'},
+    7: {'receipt', 'invoice', 'link'},
+    8: {'invoice', 'match'},
+    10: {'invoice', 'link'},
+    11: {'charge', 'match', 'ack'},
+}
+
+INVOICE_COLUMNS = (
+    'id', 'kind', 'contractor', 'invoice_no', 'amount', 'block_raw',
+    'date_from', 'date_to', 'billing', 'date_emailed', 'charge_posted',
+    'packinghouse_id', 'entity_id',
+)
+
+
+class SeasonSnapshot:
+    """The season's pick & haul rows, read once and shared by every gate.
+
+    Each table loads on first use with a single query, so a run of every
+    gate reads invoices, links, receipts and charges once each, and a run
+    of a few gates reads only what those need. Accounts are
+    (packinghouse_id, entity_id) pairs.
+    """
+
+    def __init__(self, company, season):
+        self.company = company
+        self.season = season
+
+    @cached_property
+    def invoices(self):
+        """The season's invoices as value dicts, in model order."""
+        return list(
+            PickHaulInvoice.objects.filter(company=self.company, season=self.season)
+            .values(*INVOICE_COLUMNS)
+        )
+
+    @cached_property
+    def receipts(self):
+        """{account: [receipt value dicts]} for the season."""
+        by_account = defaultdict(list)
+        rows = PickHaulReceipt.objects.filter(
+            company=self.company, season=self.season,
+        ).order_by('id').values('id', 'packinghouse_id', 'entity_id', 'block_raw', 'bins', 'is_active')
+        for r in rows:
+            by_account[(r['packinghouse_id'], r['entity_id'])].append(r)
+        return dict(by_account)
+
+    @cached_property
+    def links(self):
+        """(invoice_id, invoice kind, receipt_id, receipt bins) for every link
+        touching the season's invoices or receipts."""
+        return list(
+            PickHaulInvoiceReceipt.objects.filter(
+                Q(invoice__company=self.company, invoice__season=self.season)
+                | Q(receipt__company=self.company, receipt__season=self.season)
+            ).order_by('id').values_list('invoice_id', 'invoice__kind', 'receipt_id', 'receipt__bins')
+        )
+
+    @cached_property
+    def receipts_by_invoice(self):
+        by_invoice = defaultdict(list)
+        for invoice_id, _kind, receipt_id, bins in self.links:
+            by_invoice[invoice_id].append((receipt_id, bins))
+        return by_invoice
+
+    @cached_property
+    def unmatched_charges(self):
+        """{account: [debits]} of PICK/HAUL charges with no invoice matched
+        and no acknowledgment."""
+        by_account = defaultdict(list)
+        rows = PickHaulDirectCharge.objects.filter(
+            company=self.company, season=self.season, kind__in=('PICK', 'HAUL'),
+            debit__gt=0, match__isnull=True, ack__isnull=True,
+        ).order_by('id').values_list('packinghouse_id', 'entity_id', 'debit')
+        for packinghouse_id, entity_id, debit in rows:
+            by_account[(packinghouse_id, entity_id)].append(debit)
+        return dict(by_account)
+
 
 def _finding(gate, severity, detail, packinghouse_id=None, entity_id=None,
              subject=None, invoice_id=None):
@@ -48,55 +137,49 @@ def _finding(gate, severity, detail, packinghouse_id=None, entity_id=None,
     }
 
 
-def gate5_orphan_invoices(company, season):
+def gate5_orphan_invoices(company, season, snapshot=None):
     """An invoice that covers no receipts is either mistyped or premature.
 
     Scoped to accounts that have receipts this season — the no-portal houses
     have no receipts by definition, and their costs live in manual picks.
     """
+    snapshot = snapshot or SeasonSnapshot(company, season)
     out = []
-    accounts_with_receipts = set(
-        PickHaulReceipt.objects.filter(company=company, season=season)
-        .values_list('packinghouse_id', 'entity_id')
-    )
-    qs = PickHaulInvoice.objects.filter(
-        company=company, season=season, receipt_links__isnull=True,
-    ).select_related('packinghouse', 'entity')
-    for inv in qs:
-        if (inv.packinghouse_id, inv.entity_id) not in accounts_with_receipts:
+    for inv in snapshot.invoices:
+        if inv['id'] in snapshot.receipts_by_invoice:
+            continue
+        if (inv['packinghouse_id'], inv['entity_id']) not in snapshot.receipts:
             continue
-        amount = inv.amount or 0
+        amount = inv['amount'] or 0
         out.append(_finding(
             5, 'error',
-            f'{inv.kind} invoice {inv.contractor} #{inv.invoice_no} '
+            f"{inv['kind']} invoice {inv['contractor']} #{inv['invoice_no']} "
             f'${amount:,.2f} matches no receipts '
-            f'(block {inv.block_raw!r}, {inv.date_from}..{inv.date_to})',
-            packinghouse_id=inv.packinghouse_id, entity_id=inv.entity_id,
-            subject=str(inv.invoice_no), invoice_id=inv.pk,
+            f"(block {inv['block_raw']!r}, {inv['date_from']}..{inv['date_to']})",
+            packinghouse_id=inv['packinghouse_id'], entity_id=inv['entity_id'],
+            subject=str(inv['invoice_no']), invoice_id=inv['id'],
         ))
     return out
 
 
-def gate6_bin_coverage(company, season):
+def gate6_bin_coverage(company, season, snapshot=None):
     """Every receipt with bins should end up covered by a pick invoice eventually."""
+    snapshot = snapshot or SeasonSnapshot(company, season)
     out = []
-    covered_ids = set(
-        PickHaulReceipt.objects.filter(
-            company=company, season=season,
-            invoice_links__invoice__kind='PICK',
-        ).values_list('id', flat=True)
-    )
+    covered_ids = {
+        receipt_id for _invoice_id, kind, receipt_id, _bins in snapshot.links
+        if kind == 'PICK'
+    }
     groups = {}
-    receipts = PickHaulReceipt.objects.filter(
-        company=company, season=season, is_active=True,
-    ).values('id', 'packinghouse_id', 'entity_id', 'block_raw', 'bins')
-    for r in receipts:
-        key = (r['packinghouse_id'], r['entity_id'], r['block_raw'])
-        bins = r['bins'] or 0
-        g = groups.setdefault(key, {'bins': 0, 'uncovered': 0})
-        g['bins'] += bins
-        if r['id'] not in covered_ids:
-            g['uncovered'] += bins
+    for (ph_id, ent_id), receipts in snapshot.receipts.items():
+        for r in receipts:
+            if not r['is_active']:
+                continue
+            bins = r['bins'] or 0
+            g = groups.setdefault((ph_id, ent_id, r['block_raw']), {'bins': 0, 'uncovered': 0})
+            g['bins'] += bins
+            if r['id'] not in covered_ids:
+                g['uncovered'] += bins
     for (ph_id, ent_id, block), g in sorted(groups.items(), key=lambda kv: str(kv[0])):
         if not g['uncovered']:
             continue
@@ -110,153 +193,168 @@ def gate6_bin_coverage(company, season):
     return out
 
 
-def gate7_per_bin_sanity(company, season):
+def gate7_per_bin_sanity(company, season, snapshot=None):
     """Cost per bin outside a plausible band usually means a typo or a bad link."""
+    snapshot = snapshot or SeasonSnapshot(company, season)
     out = []
-    invoices = PickHaulInvoice.objects.filter(
-        company=company, season=season,
-    ).annotate(linked_bins=Sum('receipt_links__receipt__bins'))
-    for inv in invoices:
-        bins = inv.linked_bins or 0
-        amount = inv.amount or 0
+    for inv in snapshot.invoices:
+        bins = sum(
+            (b for _receipt_id, b in snapshot.receipts_by_invoice.get(inv['id'], ())
+             if b is not None),
+            0,
+        )
+        amount = inv['amount'] or 0
         if not bins or not amount:
             continue
         per_bin = amount / bins
-        lo, hi = PER_BIN_BANDS.get(inv.kind, (0, None))
+        lo, hi = PER_BIN_BANDS.get(inv['kind'], (0, None))
         if hi is not None and not (lo <= per_bin <= hi):
             out.append(_finding(
                 7, 'warn',
-                f'{inv.kind} {inv.contractor} #{inv.invoice_no} works out to '
+                f"{inv['kind']} {inv['contractor']} #{inv['invoice_no']} works out to "
                 f'${per_bin:,.2f}/bin (${amount:,.2f} over {bins:.1f} bins), '
                 f'outside the ${lo:g}-${hi:g} band',
-                packinghouse_id=inv.packinghouse_id, entity_id=inv.entity_id,
-                subject=str(inv.invoice_no), invoice_id=inv.pk,
+                packinghouse_id=inv['packinghouse_id'], entity_id=inv['entity_id'],
+                subject=str(inv['invoice_no']), invoice_id=inv['id'],
             ))
     return out
 
 
-def gate8_reimbursement_aging(company, season, today=None):
+def gate8_reimbursement_aging(company, season, today=None, snapshot=None):
     """Invoices emailed to the house that it has not yet charged back.
 
     This is the question the workbook's 'Date Rec from PH' column was trying
     to answer by eye. Predicate faithful to the local gate: keys on
     ``date_emailed``, not ``date_paid``.
     """
+    snapshot = snapshot or SeasonSnapshot(company, season)
     out = []
     today = today or date.today()
-    qs = PickHaulInvoice.objects.filter(
-        company=company, season=season, billing='direct',
-        charge_posted__isnull=True, date_emailed__isnull=False,
-    ).order_by('date_emailed')
-    for inv in qs:
-        age = (today - inv.date_emailed).days
+    outstanding = sorted(
+        (inv for inv in snapshot.invoices
+         if inv['billing'] == 'direct' and inv['charge_posted'] is None
+         and inv['date_emailed'] is not None),
+        key=lambda inv: inv['date_emailed'],
+    )
+    for inv in outstanding:
+        age = (today - inv['date_emailed']).days
         if age >= AGING_DAYS:
-            amount = inv.amount or 0
+            amount = inv['amount'] or 0
             out.append(_finding(
                 8, 'warn',
-                f'{inv.kind} {inv.contractor} #{inv.invoice_no} '
-                f'${amount:,.2f} emailed {inv.date_emailed} '
+                f"{inv['kind']} {inv['contractor']} #{inv['invoice_no']} "
+                f"${amount:,.2f} emailed {inv['date_emailed']} "
                 f'({age} days ago) with no matching Direct Charge yet',
-                packinghouse_id=inv.packinghouse_id, entity_id=inv.entity_id,
-                subject=str(inv.invoice_no), invoice_id=inv.pk,
+                packinghouse_id=inv['packinghouse_id'], entity_id=inv['entity_id'],
+                subject=str(inv['invoice_no']), invoice_id=inv['id'],
             ))
     return out
 
 
-def gate10_hauling_cover(company, season):
+def gate10_hauling_cover(company, season, snapshot=None):
     """Mark's rule: Magana hauls; MCM does not, so Ortiz hauls for them.
 
     A picked load with nobody billed for moving it is either an invoice not
     yet entered or one attached to the wrong receipts.
     """
+    snapshot = snapshot or SeasonSnapshot(company, season)
     out = []
-    picks = PickHaulInvoice.objects.filter(
-        company=company, season=season, kind='PICK',
-    ).exclude(contractor__icontains=SELF_HAULING_CONTRACTOR)
-    for inv in picks:
-        if not inv.contractor:
+    season_hauls = {inv['id'] for inv in snapshot.invoices if inv['kind'] == 'HAUL'}
+    hauled_ids = {
+        receipt_id for invoice_id, _kind, receipt_id, _bins in snapshot.links
+        if invoice_id in season_hauls
+    }
+    self_hauling = SELF_HAULING_CONTRACTOR.lower()
+    for inv in snapshot.invoices:
+        if inv['kind'] != 'PICK' or self_hauling in (inv['contractor'] or '').lower():
+            continue
+        if not inv['contractor']:
             out.append(_finding(
                 10, 'warn',
-                f'pick invoice #{inv.invoice_no} ${inv.amount or 0:,.2f} has '
+                f"pick invoice #{inv['invoice_no']} ${inv['amount'] or 0:,.2f} has "
                 f'no contractor recorded',
-                packinghouse_id=inv.packinghouse_id, entity_id=inv.entity_id,
-                subject=str(inv.invoice_no), invoice_id=inv.pk,
+                packinghouse_id=inv['packinghouse_id'], entity_id=inv['entity_id'],
+                subject=str(inv['invoice_no']), invoice_id=inv['id'],
             ))
             continue
-        receipt_ids = list(inv.receipt_links.values_list('receipt_id', flat=True))
-        haul_rows = 0
-        if receipt_ids:
-            haul_rows = PickHaulInvoice.objects.filter(
-                company=company, season=season, kind='HAUL',
-                receipt_links__receipt_id__in=receipt_ids,
-            ).count()
-        if not haul_rows:
+        receipts = snapshot.receipts_by_invoice.get(inv['id'], ())
+        if not any(receipt_id in hauled_ids for receipt_id, _bins in receipts):
             out.append(_finding(
                 10, 'info',
-                f'{inv.contractor} pick #{inv.invoice_no} '
-                f'${inv.amount or 0:,.2f} on {inv.block_raw} '
-                f'({inv.date_from}) has no hauling invoice against the same '
-                f'receipts - {inv.contractor} does not haul, so an Ortiz '
+                f"{inv['contractor']} pick #{inv['invoice_no']} "
+                f"${inv['amount'] or 0:,.2f} on {inv['block_raw']} "
+                f"({inv['date_from']}) has no hauling invoice against the same "
+                f"receipts - {inv['contractor']} does not haul, so an Ortiz "
                 f'invoice should cover it',
-                packinghouse_id=inv.packinghouse_id, entity_id=inv.entity_id,
-                subject=str(inv.invoice_no), invoice_id=inv.pk,
+                packinghouse_id=inv['packinghouse_id'], entity_id=inv['entity_id'],
+                subject=str(inv['invoice_no']), invoice_id=inv['id'],
             ))
     return out
 
 
-def gate11_unmatched_charges(company, season):
+def gate11_unmatched_charges(company, season, snapshot=None):
     """House-posted PICK/HAUL charges with no invoice allocated against them.
 
     The house says we owe (or already deducted) this money and nothing in the
     invoice register accounts for it. One finding per account, because the fix
     is per-account: key the missing invoices or dispute the charge.
     """
+    snapshot = snapshot or SeasonSnapshot(company, season)
     out = []
-    groups = (
-        PickHaulDirectCharge.objects.filter(
-            company=company, season=season, kind__in=('PICK', 'HAUL'),
-            debit__gt=0, match__isnull=True, ack__isnull=True,
-        )
-        .values('packinghouse_id', 'entity_id')
-        .annotate(rows=Count('id'), total=Sum('debit'))
-        .order_by('packinghouse_id', 'entity_id')
-    )
-    for g in groups:
+    for (ph_id, ent_id), debits in sorted(snapshot.unmatched_charges.items()):
         out.append(_finding(
             11, 'warn',
-            f"{g['rows']} house-posted charge row(s) totalling ${g['total']:,.2f} have "
+            f"{len(debits)} house-posted charge row(s) totalling ${sum(debits):,.2f} have "
             f"no contractor invoice against them - the house billed this, and "
             f"nothing in the register accounts for it",
-            packinghouse_id=g['packinghouse_id'], entity_id=g['entity_id'],
+            packinghouse_id=ph_id, entity_id=ent_id,
         ))
     return out
 
 
-ALL_GATES = [
-    gate5_orphan_invoices,
-    gate6_bin_coverage,
-    gate7_per_bin_sanity,
-    gate8_reimbursement_aging,
-    gate10_hauling_cover,
-    gate11_unmatched_charges,
-]
+GATES = {
+    5: gate5_orphan_invoices,
+    6: gate6_bin_coverage,
+    7: gate7_per_bin_sanity,
+    8: gate8_reimbursement_aging,
+    10: gate10_hauling_cover,
+    11: gate11_unmatched_charges,
+}
+ALL_GATES = list(GATES.values())
+
+
+def gates_for(changed):
+    """Numbers of the gates that read any of the changed row types."""
+    unknown = set(changed) - set(ROW_TYPES)
+    if unknown:
+        raise ValueError(f'Unknown row type(s): {", ".join(sorted(unknown))}')
+    return [gate for gate, inputs in GATE_INPUTS.items() if inputs & set(changed)]
 
 
 @transaction.atomic
-def run_platform_gates(company, season, batch=None):
-    """Run all platform gates and persist the findings.
+def run_platform_gates(company, season, batch=None, changed=None):
+    """Run the platform gates over one season snapshot and persist the findings.
 
     Platform findings are current-state, not history: each run replaces the
     previous platform-origin rows for the scope. (Local findings append per
-    batch — they describe a specific file pull.)
+    batch — they describe a specific file pull.) With ``changed`` (row types
+    from ROW_TYPES) only the gates reading those rows re-run and replace
+    their own findings; the rest stand. The returned counts always cover
+    every current platform finding.
     """
+    gates = list(GATES) if changed is None else gates_for(changed)
+    snapshot = SeasonSnapshot(company, season)
     findings = []
-    for gate in ALL_GATES:
-        findings.extend(gate(company, season))
+    for gate in gates:
+        findings.extend(GATES[gate](company, season, snapshot=snapshot))
 
-    PickHaulCheckResult.objects.filter(
+    stored = PickHaulCheckResult.objects.filter(
         company=company, season=season, origin='platform',
-    ).delete()
+    )
+    if changed is None:
+        stored.delete()
+    else:
+        stored.filter(gate__in=gates).delete()
 
     now = timezone.now()
     PickHaulCheckResult.objects.bulk_create([
@@ -270,8 +368,17 @@ def run_platform_gates(company, season, batch=None):
         for f in findings
     ])
 
+    if changed is None:
+        severities = defaultdict(int)
+        for f in findings:
+            severities[f['severity']] += 1
+    else:
+        severities = dict(
+            stored.order_by().values('severity').annotate(n=Count('id'))
+            .values_list('severity', 'n')
+        )
     return {
-        'errors': sum(1 for f in findings if f['severity'] == 'error'),
-        'warns': sum(1 for f in findings if f['severity'] == 'warn'),
-        'infos': sum(1 for f in findings if f['severity'] == 'info'),
+        'errors': severities.get('error', 0),
+        'warns': severities.get('warn', 0),
+        'infos': severities.get('info', 0),
     }
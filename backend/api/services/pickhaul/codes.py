@@ -4,9 +4,23 @@ The local pipeline speaks in short codes (house 'SLA', entity 'FF'). The
 platform speaks in Packinghouse and LegalEntity rows. The only code that
 differs is FF: the local pipeline calls Finch Farms LLC 'FF', the platform's
 LegalEntity seed calls it 'FFLLC'.
+
+Receipt commodity codes ('LEM', 'NA', ...) are classified here too: each
+receipt stores its canonical commodity, filled when a bundle is applied,
+so season rollups group on that column in SQL instead of normalizing every
+row's codes in Python.
 """
 
+from collections import defaultdict
+
+from django.db.models import Q
+
 from api.models import LegalEntity, Packinghouse
+from api.services.season_service import COMMODITY_ALIASES, normalize_commodity
+
+UNMAPPED = 'UNMAPPED'
+
+_KNOWN_COMMODITIES = frozenset(COMMODITY_ALIASES)
 
 # local pipeline entity code -> platform LegalEntity.short_code
 ENTITY_CODE_MAP = {
@@ -69,3 +83,38 @@ def build_resolvers(company):
         return ent
 
     return resolve_house, resolve_entity
+
+
+def code_commodity(raw):
+    """Canonical commodity for a receipt/pick/pool commodity string, or UNMAPPED."""
+    canonical = normalize_commodity(raw) if raw else UNMAPPED
+    if canonical in _KNOWN_COMMODITIES:
+        return canonical
+    return UNMAPPED
+
+
+def receipt_commodity(commodity_code, variety_code):
+    """Canonical commodity for a receipt's codes; the commodity code wins."""
+    return code_commodity(commodity_code or variety_code or '')
+
+
+def classify_receipts(receipts, reclassify=False):
+    """Store the canonical commodity on receipts, one UPDATE per commodity.
+
+    Only unclassified rows are touched unless reclassify=True (after
+    COMMODITY_ALIASES changes). Codes are classified once per distinct
+    (commodity_code, variety_code) pair. Returns the number of rows changed.
+    """
+    if not reclassify:
+        receipts = receipts.filter(commodity='')
+    pairs = defaultdict(list)
+    for code, variety in receipts.values_list('commodity_code', 'variety_code').distinct():
+        pairs[receipt_commodity(code, variety)].append(Q(commodity_code=code, variety_code=variety))
+
+    changed = 0
+    for commodity, matches in pairs.items():
+        where = Q()
+        for match in matches:
+            where |= match
+        changed += receipts.filter(where).exclude(commodity=commodity).update(commodity=commodity)
+    return changed
@@ -12,6 +12,7 @@ the rule are removed. ``manual`` and ``migrated`` links are never touched.
 """
 
 from api.models import PickHaulInvoice, PickHaulInvoiceReceipt, PickHaulReceipt
+from api.services.dashboard_cache import invalidate_company_dashboards
 
 
 def _rule_receipt_ids(invoice):
@@ -59,6 +60,11 @@ def relink_invoice(invoice):
         PickHaulInvoiceReceipt(invoice=invoice, receipt_id=rid, assigned='rule')
         for rid in sorted(to_add)
     ])
+    if stale or to_add:
+        # bulk_create skips the signals behind both caches
+        from api.services.season_overview import invalidate_season_overview
+        invalidate_season_overview(invoice.company_id, invoice.season, sections=('costs',))
+        invalidate_company_dashboards(invoice.company_id)
     return len(to_add) - len(stale)
 
 
@@ -35,6 +35,7 @@ from itertools import combinations
 from django.db import transaction
 
 from api.models import PickHaulChargeMatch, PickHaulDirectCharge, PickHaulInvoice
+from api.services.dashboard_cache import invalidate_company_dashboards
 from .config import (
     AMOUNT_TOLERANCE, BILL_SLACK_DAYS, LAG_OUTLIER_DAYS,
     MAX_SUBSET_ROWS, MAX_SUBSET_SIZE,
@@ -275,6 +276,12 @@ def run_reconciliation(company, season):
         lag = {'n': len(ordered), 'median': ordered[len(ordered) // 2],
                'min': ordered[0], 'max': ordered[-1]}
 
+    # Derived invoice columns were rewritten with update(), which skips the
+    # signals that invalidate cached dashboards and the stored overview.
+    invalidate_company_dashboards(company.id)
+    from api.services.season_overview import invalidate_season_overview
+    invalidate_season_overview(company.id, season, sections=('money',))
+
     total = sum(a['invoices'] for a in summary)
     matched_total = sum(a['matched'] for a in summary)
     return {
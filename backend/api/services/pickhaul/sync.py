@@ -30,7 +30,7 @@ from api.models import (
     PickHaulSyncBatch,
 )
 from .checks import run_platform_gates
-from .codes import UnknownCode, build_resolvers
+from .codes import UnknownCode, build_resolvers, classify_receipts, receipt_commodity
 from .linking import relink_season
 from .reconcile import run_reconciliation
 
@@ -43,6 +43,9 @@ RECEIPT_FIELDS = (
     'extra_12', 'extra_13', 'bins', 'is_active',
 )
 
+# Receipt fields the season overview's delivered and houses sections read
+OVERVIEW_RECEIPT_FIELDS = {'commodity', 'bins', 'is_active'}
+
 
 class BundleRejected(Exception):
     """The bundle was refused; a rejected batch row records why."""
@@ -168,12 +171,19 @@ def _validate(company, payload):
 # ------------------------------------------------------------------ upserts --
 
 def _upsert_receipts(company, batch, rows, resolve_house, resolve_entity):
+    """Returns (stats, the canonical commodities of receipts whose overview
+    figures changed, before and after)."""
+    season_receipts = PickHaulReceipt.objects.filter(company=company, season=batch.season)
+    # Receipts stored before the commodity column are classified in bulk
+    # here, not counted below as updates of their own.
+    classify_receipts(season_receipts)
     existing = {
         (r.packinghouse_id, r.entity_id, r.receipt_no): r
-        for r in PickHaulReceipt.objects.filter(company=company, season=batch.season)
+        for r in season_receipts
     }
     stats = {'created': 0, 'updated': 0, 'unchanged': 0,
              'deactivated': 0, 'reactivated': 0}
+    touched = set()
 
     for row in rows:
         ph = resolve_house(row.get('house'))
@@ -195,6 +205,7 @@ def _upsert_receipts(company, batch, rows, resolve_house, resolve_entity):
             'bins': _dec(row.get('bins')),
             'is_active': bool(row.get('is_active', True)),
         }
+        values['commodity'] = receipt_commodity(values['commodity_code'], values['variety_code'])
 
         key = (ph.pk, ent.pk, str(row['receipt_no']))
         current = existing.get(key)
@@ -205,12 +216,19 @@ def _upsert_receipts(company, batch, rows, resolve_house, resolve_entity):
                 first_seen_batch=batch, last_seen_batch=batch, **values,
             )
             stats['created'] += 1
+            touched.add(values['commodity'])
             continue
 
         changed = [f for f in RECEIPT_FIELDS if getattr(current, f) != values[f]]
         if changed:
+            # The commodity follows the codes; it never changes on its own
+            if current.commodity != values['commodity']:
+                changed.append('commodity')
             if 'is_active' in changed:
                 stats['deactivated' if not values['is_active'] else 'reactivated'] += 1
+            if OVERVIEW_RECEIPT_FIELDS.intersection(changed):
+                touched.add(receipt_commodity(current.commodity_code, current.variety_code))
+                touched.add(values['commodity'])
             for f in changed:
                 setattr(current, f, values[f])
             current.last_seen_batch = batch
@@ -219,7 +237,7 @@ def _upsert_receipts(company, batch, rows, resolve_house, resolve_entity):
         else:
             PickHaulReceipt.objects.filter(pk=current.pk).update(last_seen_batch=batch)
             stats['unchanged'] += 1
-    return stats
+    return stats, touched
 
 
 def _insert_charges(company, batch, rows, resolve_house, resolve_entity):
@@ -358,10 +376,11 @@ def apply_bundle(company, payload, token=None, kind='push'):
         # this transaction.
         resolve_house, resolve_entity = build_resolvers(company)
         batch = _record('applied')
+        receipt_stats, touched = _upsert_receipts(
+            company, batch, payload.get('receipts') or [],
+            resolve_house, resolve_entity)
         applied = {
-            'receipts': _upsert_receipts(
-                company, batch, payload.get('receipts') or [],
-                resolve_house, resolve_entity),
+            'receipts': receipt_stats,
             'direct_charges': _insert_charges(
                 company, batch, payload.get('direct_charges') or [],
                 resolve_house, resolve_entity),
@@ -372,9 +391,26 @@ def apply_bundle(company, payload, token=None, kind='push'):
         applied['local_checks_recorded'] = _record_local_checks(
             company, batch, meta, resolve_house, resolve_entity)
 
+        if touched:
+            from api.services.season_overview import invalidate_season_overview
+            invalidate_season_overview(
+                company.id, batch.season, sections=('delivered', 'houses'),
+                commodities=touched,
+            )
+            # Invoice costs are spread over receipts by bins
+            invalidate_season_overview(company.id, batch.season, sections=('costs',))
+
         relink_season(company, batch.season)
         reconciliation = run_reconciliation(company, batch.season)
-        platform_gates = run_platform_gates(company, batch.season, batch=batch)
+        # Reconciliation always rewrites matches; links move only with receipts
+        changed = {'match'}
+        if receipt_stats['created'] or receipt_stats['updated']:
+            changed |= {'receipt', 'link'}
+        if applied['direct_charges']['created']:
+            changed.add('charge')
+        platform_gates = run_platform_gates(
+            company, batch.season, batch=batch, changed=changed,
+        )
 
         result = {
             'applied': applied,
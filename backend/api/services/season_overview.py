@@ -12,74 +12,146 @@ net-to-grower = settlement net return − allocated pick & haul cost, emitted
 only where both sides exist. Cash received rolls up ledger entries
 (advances / pool closes / payments) plus reimbursements actually received on
 grower-paid invoices.
+
+The overview is served from a stored snapshot per (company, season) — see
+SeasonOverviewSnapshot. Each section (delivered, costs, houses,
+settlements, money, cash) is stored separately, and writes mark only the
+sections they feed stale: settlement saves the settlements section, ledger
+entries cash received, and apply_bundle the delivered bins and houses of
+just the commodities whose receipts changed. Commitments are one small
+query and are always read live. build_season_overview() is the full
+rebuild the snapshot must always agree with; ``?fresh=1`` on the endpoint
+serves (and re-stores) it.
+
+Marking sections stale also bumps the company's SeasonOverviewGeneration.
+A reader only stores what it recomputed if the generation is still the one
+it read before computing, so figures read while a writer was mid-transaction
+are recomputed on the next read rather than stored as fresh.
 """
 
 from collections import defaultdict
 from decimal import Decimal
 
-from django.db.models import Count, Sum
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
 
 from api.models import (
     GrowerLedgerEntry, PackerCommitment, PickHaulInvoice,
     PickHaulInvoiceReceipt, PickHaulManualPick, PickHaulReceipt,
-    Pool, PoolSettlement,
+    Pool, PoolSettlement, SeasonOverviewGeneration, SeasonOverviewSnapshot,
 )
+from api.services.dashboard_cache import resolve_path
 from api.services.pickhaul.activity import season_money_stats
+from api.services.pickhaul.codes import UNMAPPED, code_commodity, receipt_commodity
 from api.services.season_service import (
     get_crop_category_for_commodity,
     get_primary_unit_for_commodity,
-    normalize_commodity,
     season_int_to_label,
     season_label_to_int,
 )
 
-UNMAPPED = 'UNMAPPED'
-
-
-def _receipt_commodity(receipt):
-    """Best-effort canonical commodity for a receipt row."""
-    raw = receipt.commodity_code or receipt.variety_code or ''
-    canonical = normalize_commodity(raw)
-    if canonical in _known_canonicals():
-        return canonical
-    return UNMAPPED
+# Stored sections: per-commodity ones hold one row per commodity, season-wide
+# ones a single header row.
+COMMODITY_SECTIONS = ('delivered', 'costs', 'houses', 'settlements')
+SEASON_SECTIONS = ('money', 'cash')
+SECTIONS = COMMODITY_SECTIONS + SEASON_SECTIONS
+PICKHAUL_SECTIONS = ('delivered', 'costs', 'houses', 'money', 'cash')
+
+# Sections that can be recomputed for a subset of commodities. Invoice costs
+# are spread across every commodity an invoice covers, so they are not.
+PARTIAL_SECTIONS = ('delivered', 'houses')
+
+# Models whose writes change stored sections, with the attribute path from an
+# instance to its company id. Receipts are sync-owned: apply_bundle marks the
+# commodities it touched itself, and relink/reconcile mark the sections their
+# bulk writes feed.
+SEASON_OVERVIEW_SOURCES = {
+    'api.Packinghouse': ('company_id', ('houses',)),
+    'api.Pool': ('packinghouse.company_id', ('settlements', 'cash')),
+    'api.PoolSettlement': ('pool.packinghouse.company_id', ('settlements',)),
+    'api.GrowerLedgerEntry': ('packinghouse.company_id', ('cash',)),
+    'api.PickHaulManualPick': ('company_id', ('delivered', 'costs', 'houses', 'money')),
+    'api.PickHaulInvoice': ('company_id', ('costs', 'money', 'cash')),
+    'api.PickHaulInvoiceReceipt': ('invoice.company_id', ('costs',)),
+    'api.PickHaulDirectCharge': ('company_id', ('money',)),
+}
+
+# Keys holding Decimals in stored section data (stored as strings)
+_DECIMAL_KEYS = frozenset({
+    'bins', 'settled_bins', 'settled_lbs', 'net_return',
+    'pick_cost', 'haul_cost', 'owed_total', 'total',
+    'advances', 'pool_close', 'payments', 'reimbursements',
+})
+
+
+def _commodity_groups(queryset, *fields, prefix='', **aggregates):
+    """``queryset.values(commodity, *fields).annotate(**aggregates)`` rows,
+    grouped in SQL on the receipts' stored canonical commodity (reached
+    through ``prefix``). Receipts stored before the column was filled are
+    grouped by their codes instead and classified once per distinct pair,
+    so results don't depend on classify_pickhaul_receipts having run."""
+    commodity = f'{prefix}commodity'
+    rows = list(queryset.values(commodity, *fields).annotate(**aggregates).order_by())
+    if all(row[commodity] for row in rows):
+        return rows
+
+    code, variety = f'{prefix}commodity_code', f'{prefix}variety_code'
+    rows = [row for row in rows if row[commodity]]
+    unclassified = (
+        queryset.filter(**{commodity: ''})
+        .values(code, variety, *fields).annotate(**aggregates).order_by()
+    )
+    for row in unclassified:
+        row[commodity] = receipt_commodity(row.pop(code), row.pop(variety))
+        rows.append(row)
+    return rows
+
+
+def _pick_groups(company, season, *fields, **aggregates):
+    """Manual picks grouped by varietal (plus fields), with the varietal
+    classified once per distinct value as 'commodity'."""
+    rows = (
+        PickHaulManualPick.objects.filter(company=company, season=season)
+        .values('varietal', *fields).annotate(**aggregates).order_by()
+    )
+    for row in rows:
+        row['commodity'] = code_commodity((row.pop('varietal') or '').strip())
+        yield row
 
 
-_KNOWN = None
+def _active_receipts(company, season, commodities=None):
+    """Active receipts for the season; with ``commodities``, only those of
+    these commodities plus any not yet classified."""
+    receipts = PickHaulReceipt.objects.filter(
+        company=company, season=season, is_active=True,
+    )
+    if commodities is None:
+        return receipts
+    return receipts.filter(Q(commodity__in=commodities) | Q(commodity=''))
 
 
-def _known_canonicals():
-    global _KNOWN
-    if _KNOWN is None:
-        from api.services.season_service import COMMODITY_ALIASES
-        _KNOWN = set(COMMODITY_ALIASES.keys())
-    return _KNOWN
+def _only(out, commodities):
+    if commodities is None:
+        return out
+    return {commodity: value for commodity, value in out.items() if commodity in commodities}
 
 
-def _delivered_by_commodity(company, season):
+def _delivered_by_commodity(company, season, commodities=None):
     """{commodity: {'bins': Decimal, 'deliveries': int}} from active receipts
     plus manual picks."""
     out = defaultdict(lambda: {'bins': Decimal('0'), 'deliveries': 0})
 
-    receipts = PickHaulReceipt.objects.filter(
-        company=company, season=season, is_active=True,
-    ).only('commodity_code', 'variety_code', 'bins')
-    for r in receipts:
-        bucket = out[_receipt_commodity(r)]
-        bucket['bins'] += r.bins or Decimal('0')
-        bucket['deliveries'] += 1
-
-    picks = PickHaulManualPick.objects.filter(company=company, season=season)
-    for p in picks:
-        raw = (p.varietal or '').strip()
-        canonical = normalize_commodity(raw) if raw else UNMAPPED
-        if canonical not in _known_canonicals():
-            canonical = UNMAPPED
-        bucket = out[canonical]
-        bucket['bins'] += p.bins or Decimal('0')
-        bucket['deliveries'] += 1
+    groups = _commodity_groups(
+        _active_receipts(company, season, commodities),
+        bins=Sum('bins'), deliveries=Count('id'),
+    )
+    picks = _pick_groups(company, season, bins=Sum('bins'), deliveries=Count('id'))
+    for row in [*groups, *picks]:
+        bucket = out[row['commodity']]
+        bucket['bins'] += row['bins'] or Decimal('0')
+        bucket['deliveries'] += row['deliveries']
 
-    return out
+    return _only(out, commodities)
 
 
 def _cost_by_commodity(company, season):
@@ -91,21 +163,21 @@ def _cost_by_commodity(company, season):
     links = PickHaulInvoiceReceipt.objects.filter(
         invoice__company=company, invoice__season=season,
         invoice__amount__isnull=False,
-    ).select_related('invoice', 'receipt')
-
-    by_invoice = defaultdict(list)
-    for link in links:
-        by_invoice[link.invoice].append(link.receipt)
-
-    linked_invoice_ids = set()
-    for invoice, receipts in by_invoice.items():
-        linked_invoice_ids.add(invoice.pk)
-        amount = invoice.amount or Decimal('0')
-        total_bins = sum((r.bins or Decimal('0')) for r in receipts)
+    )
+    # invoice id -> (amount, {commodity: bins of its linked receipts})
+    invoices = {}
+    for row in _commodity_groups(
+        links, 'invoice_id', 'invoice__amount', prefix='receipt__', bins=Sum('receipt__bins'),
+    ):
+        _, per_commodity_bins = invoices.setdefault(
+            row['invoice_id'], (row['invoice__amount'], defaultdict(lambda: Decimal('0'))),
+        )
+        per_commodity_bins[row['receipt__commodity']] += row['bins'] or Decimal('0')
+
+    for invoice_id in sorted(invoices):
+        amount, per_commodity_bins = invoices[invoice_id]
+        total_bins = sum(per_commodity_bins.values())
         if total_bins > 0:
-            per_commodity_bins = defaultdict(lambda: Decimal('0'))
-            for r in receipts:
-                per_commodity_bins[_receipt_commodity(r)] += r.bins or Decimal('0')
             for commodity, bins in per_commodity_bins.items():
                 out[commodity] += amount * bins / total_bins
         else:
@@ -113,19 +185,19 @@ def _cost_by_commodity(company, season):
 
     unlinked = PickHaulInvoice.objects.filter(
         company=company, season=season, amount__isnull=False,
-    ).exclude(pk__in=linked_invoice_ids)
-    for inv in unlinked:
-        out[UNMAPPED] += inv.amount or Decimal('0')
-
-    for p in PickHaulManualPick.objects.filter(company=company, season=season):
-        raw = (p.varietal or '').strip()
-        canonical = normalize_commodity(raw) if raw else UNMAPPED
-        if canonical not in _known_canonicals():
-            canonical = UNMAPPED
-        if p.count_cost and p.cost:
-            out[canonical] += p.cost
-        if p.count_haul and p.haul_cost:
-            out[canonical] += p.haul_cost
+    ).exclude(pk__in=invoices).aggregate(t=Sum('amount'))['t']
+    if unlinked is not None:
+        out[UNMAPPED] += unlinked
+
+    for row in _pick_groups(
+        company, season,
+        cost=Sum('cost', filter=Q(count_cost=True) & ~Q(cost=0)),
+        haul=Sum('haul_cost', filter=Q(count_haul=True) & ~Q(haul_cost=0)),
+    ):
+        if row['cost'] is not None:
+            out[row['commodity']] += row['cost']
+        if row['haul'] is not None:
+            out[row['commodity']] += row['haul']
 
     return out
 
@@ -141,9 +213,7 @@ def _settlements_by_commodity(company, season):
     for s in settlements:
         if season_label_to_int(s.pool.season) != season:
             continue
-        commodity = normalize_commodity(s.pool.commodity or '')
-        if commodity not in _known_canonicals():
-            commodity = UNMAPPED
+        commodity = code_commodity(s.pool.commodity or '')
         bucket = out.setdefault(commodity, {
             'settlements': 0,
             'settled_bins': Decimal('0'),
@@ -158,24 +228,17 @@ def _settlements_by_commodity(company, season):
     return out
 
 
-def _actual_houses_by_commodity(company, season):
+def _actual_houses_by_commodity(company, season, commodities=None):
     """{commodity: [house short codes seen on receipts/manual picks]}"""
     out = defaultdict(set)
-    receipts = PickHaulReceipt.objects.filter(
-        company=company, season=season, is_active=True,
-    ).select_related('packinghouse')
-    for r in receipts:
-        code = r.packinghouse.short_code or r.packinghouse.name
-        out[_receipt_commodity(r)].add(code)
-    for p in PickHaulManualPick.objects.filter(
-        company=company, season=season,
-    ).select_related('packinghouse'):
-        raw = (p.varietal or '').strip()
-        canonical = normalize_commodity(raw) if raw else UNMAPPED
-        if canonical not in _known_canonicals():
-            canonical = UNMAPPED
-        out[canonical].add(p.packinghouse.short_code or p.packinghouse.name)
-    return out
+    house = ('packinghouse__short_code', 'packinghouse__name')
+    groups = _commodity_groups(
+        _active_receipts(company, season, commodities), *house, n=Count('id'),
+    )
+    picks = _pick_groups(company, season, *house, n=Count('id'))
+    for row in [*groups, *picks]:
+        out[row['commodity']].add(row['packinghouse__short_code'] or row['packinghouse__name'])
+    return _only(out, commodities)
 
 
 def _cash_received(company, season):
@@ -243,19 +306,42 @@ def _commitments_by_commodity(company, season):
     return out
 
 
+_SECTION_BUILDERS = {
+    'delivered': _delivered_by_commodity,
+    'costs': _cost_by_commodity,
+    'houses': _actual_houses_by_commodity,
+    'settlements': _settlements_by_commodity,
+    'money': season_money_stats,
+    'cash': _cash_received,
+}
+
+
+def _section_names(include_pickhaul):
+    return ('settlements',) + (PICKHAUL_SECTIONS if include_pickhaul else ())
+
+
 def build_season_overview(company, season, include_pickhaul=True):
-    """The composed season picture. Without pick & haul permission the
-    delivery/cash sections are omitted and settlement data stands alone."""
+    """The composed season picture, rebuilt from scratch. Without pick & haul
+    permission the delivery/cash sections are omitted and settlement data
+    stands alone."""
+    sections = {
+        name: _SECTION_BUILDERS[name](company, season)
+        for name in _section_names(include_pickhaul)
+    }
+    return _compose(company, season, sections, include_pickhaul)
+
+
+def _compose(company, season, sections, include_pickhaul):
     result = {'season': season}
 
-    settlements = _settlements_by_commodity(company, season)
+    settlements = sections['settlements']
 
     if include_pickhaul:
-        money = season_money_stats(company, season)
-        delivered = _delivered_by_commodity(company, season)
-        costs = _cost_by_commodity(company, season)
-        actual_houses = _actual_houses_by_commodity(company, season)
-        cash = _cash_received(company, season)
+        money = sections['money']
+        delivered = sections['delivered']
+        costs = sections['costs']
+        actual_houses = sections['houses']
+        cash = sections['cash']
 
         bins_delivered = sum(d['bins'] for d in delivered.values())
         deliveries = sum(d['deliveries'] for d in delivered.values())
@@ -355,3 +441,185 @@ def build_season_overview(company, season, include_pickhaul=True):
     result['commodities'] = cards
     result['has_settlement_data'] = bool(settlements)
     return result
+
+
+# ------------------------------------------------------------- snapshot --
+
+def stored_season_overview(company, season, include_pickhaul=True, fresh=False):
+    """build_season_overview() served from the stored snapshot.
+
+    Only sections (or, for delivered/houses, commodities) marked stale since
+    they were stored are recomputed, and the results are written back. With
+    fresh=True every section is rebuilt and re-stored.
+    """
+    names = _section_names(include_pickhaul)
+    stored = defaultdict(dict)
+    generation = None
+    rows = SeasonOverviewSnapshot.objects.filter(
+        company=company, season=season, section__in=names,
+    ).annotate(generation=Subquery(
+        SeasonOverviewGeneration.objects.filter(
+            company=OuterRef('company'),
+        ).values('generation')
+    ))
+    for row in rows:
+        generation = row.generation
+        if not fresh:
+            stored[row.section][row.commodity] = row.data
+    if generation is None:
+        generation = SeasonOverviewGeneration.objects.get_or_create(
+            company=company,
+        )[0].generation
+
+    sections = {}
+    rebuilt = []
+    refreshed = {}
+    for name in names:
+        entries = stored.get(name, {})
+        header = entries.pop('', None)
+        stale = {commodity for commodity, data in entries.items() if data is None}
+        if header is None or (stale and name not in PARTIAL_SECTIONS):
+            sections[name] = _SECTION_BUILDERS[name](company, season)
+            rebuilt.append(name)
+        elif name in SEASON_SECTIONS:
+            sections[name] = _decode(name, header)
+        else:
+            section = {
+                commodity: _decode(name, data)
+                for commodity, data in entries.items() if data is not None
+            }
+            if stale:
+                partial = _SECTION_BUILDERS[name](company, season, commodities=stale)
+                refreshed[name] = (stale, partial)
+                section.update(partial)
+            sections[name] = section
+
+    if rebuilt or refreshed:
+        _store_sections(company, season, generation, sections, rebuilt, refreshed)
+
+    return _compose(company, season, sections, include_pickhaul)
+
+
+def _store_sections(company, season, generation, sections, rebuilt, refreshed):
+    """
+    Write rebuilt sections in full and refreshed commodities in place —
+    unless the company's generation has moved past the one the sections were
+    computed under, in which case they may predate a write and are dropped.
+    """
+    rows = []
+    for name in rebuilt:
+        if name in SEASON_SECTIONS:
+            rows.append(_snapshot_row(company, season, name, '', sections[name]))
+            continue
+        rows.append(_snapshot_row(company, season, name, '', {}))
+        rows.extend(
+            _snapshot_row(company, season, name, commodity, _encode(name, value))
+            for commodity, value in sections[name].items()
+        )
+
+    gone = Q(pk__in=[])
+    for name, (stale, partial) in refreshed.items():
+        rows.extend(
+            _snapshot_row(company, season, name, commodity, _encode(name, value))
+            for commodity, value in partial.items()
+        )
+        # Commodities with nothing left in the section lose their row
+        gone |= Q(section=name, commodity__in=stale - set(partial))
+
+    snapshot = SeasonOverviewSnapshot.objects.filter(company=company, season=season)
+    with transaction.atomic():
+        current = SeasonOverviewGeneration.objects.select_for_update().filter(
+            company=company,
+        ).values_list('generation', flat=True).first()
+        if current != generation:
+            return
+        snapshot.filter(Q(section__in=rebuilt) | gone).delete()
+        SeasonOverviewSnapshot.objects.bulk_create(
+            rows, update_conflicts=True,
+            unique_fields=['company', 'season', 'section', 'commodity'],
+            update_fields=['data', 'updated_at'],
+        )
+
+
+def _snapshot_row(company, season, section, commodity, data):
+    return SeasonOverviewSnapshot(
+        company=company, season=season, section=section,
+        commodity=commodity, data=data,
+    )
+
+
+def _encode(section, value):
+    if section == 'houses':
+        return sorted(value)
+    return value
+
+
+def _decode(section, data):
+    if section == 'costs':
+        return Decimal(data)
+    if section == 'houses':
+        return set(data)
+    return _decimals(data)
+
+
+def _decimals(data):
+    return {
+        key: Decimal(value) if key in _DECIMAL_KEYS
+        else _decimals(value) if isinstance(value, dict)
+        else value
+        for key, value in data.items()
+    }
+
+
+def invalidate_season_overview(company_id, season=None, sections=SECTIONS, commodities=None):
+    """
+    Mark stored overview sections stale for a company — in every season when
+    season is None. With a season and commodities, only those commodities of
+    the given sections are marked, and the next read recomputes just them
+    (for PARTIAL_SECTIONS) instead of the whole section.
+
+    Marked straight away, so the writer's own transaction reads fresh
+    figures, and again on commit, so a reader that stored pre-commit figures
+    in between doesn't keep them.
+    """
+    if not company_id:
+        return
+    sections = tuple(sections)
+    commodities = None if commodities is None else tuple(commodities)
+    _mark_stale(company_id, season, sections, commodities)
+    transaction.on_commit(lambda: _mark_stale(company_id, season, sections, commodities))
+
+
+def _mark_stale(company_id, season, sections, commodities):
+    # Bumped first: a reader storing sections holds this row, so the bump
+    # waits for its write and the deletes below land after it. With no row
+    # yet, no reader has a generation to store under.
+    SeasonOverviewGeneration.objects.filter(company_id=company_id).update(
+        generation=F('generation') + 1,
+    )
+    if commodities is None:
+        rows = SeasonOverviewSnapshot.objects.filter(
+            company_id=company_id, section__in=sections,
+        )
+        if season is not None:
+            rows = rows.filter(season=season)
+        rows.delete()
+        return
+    SeasonOverviewSnapshot.objects.bulk_create(
+        [
+            SeasonOverviewSnapshot(
+                company_id=company_id, season=season, section=section,
+                commodity=commodity, data=None,
+            )
+            for section in sections for commodity in commodities
+        ],
+        update_conflicts=True,
+        unique_fields=['company', 'season', 'section', 'commodity'],
+        update_fields=['data', 'updated_at'],
+    )
+
+
+def season_overview_scope(instance):
+    """Company id whose stored overview a SEASON_OVERVIEW_SOURCES write affects."""
+    path, _ = SEASON_OVERVIEW_SOURCES[instance._meta.label]
+    return resolve_path(instance, path)
@@ -6,12 +6,29 @@ Provides consistent season handling across the application for different crop ty
 - Deciduous/Nuts: Calendar year or crop-specific windows
 - Row crops: Multiple cycles per year
 - Vines: Mar-Nov growing season
+
+Resolved season configs are memoised per process (see "Season config cache"
+below) for at most SEASON_CONFIG_CACHE_TIMEOUT seconds. Entries are also
+checked against per-company season versions in the cache, which saves of
+SeasonTemplate, Field, Crop and Company bump (api/signals.py). With a shared
+cache (CACHE_URL) every worker drops a stale entry on its next read; with the
+default per-process cache other workers only see the change once their entry
+ages out.
 """
 
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date, timedelta
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from api.services.dashboard_cache import resolve_path
 
 
 @dataclass
@@ -40,6 +57,115 @@ class SeasonPeriod:
         }
 
 
+# =============================================================================
+# Season config cache
+# =============================================================================
+
+SEASON_VERSION_PREFIX = 'finch:season-version'
+SYSTEM_SCOPE = 'system'
+SEASON_CONFIG_CACHE_SIZE = 4096
+
+# Models whose writes change resolved season configs, with the attribute path
+# from an instance to its company id. A None company (system templates and
+# crops) bumps the system version, which every entry depends on.
+SEASON_CONFIG_SOURCES = {
+    'api.SeasonTemplate': 'company_id',
+    'api.Crop': 'company_id',
+    'api.Field': 'farm.company_id',
+    'api.Company': 'pk',
+}
+
+# key -> (((version key, version), ...), config, expires), least recently used
+# first; expires is on the time.monotonic() clock
+_season_configs: 'OrderedDict[tuple, tuple]' = OrderedDict()
+_season_configs_lock = threading.Lock()
+
+
+def _season_version_key(scope) -> str:
+    return f'{SEASON_VERSION_PREFIX}:{scope}'
+
+
+def _season_versions(keys: Iterable[str]) -> Dict[str, int]:
+    """Current versions for the given keys, initialising any that are missing."""
+    keys = list(keys)
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Milliseconds since the epoch, as for dashboard data versions
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            versions[key] = cache.get(key)
+    return versions
+
+
+def _bump_season_version(scope):
+    key = _season_version_key(scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+
+
+def invalidate_season_configs(company_id: Optional[int] = None):
+    """
+    Drop memoised season configs for a company, or for every company when
+    company_id is None (system templates and crops).
+
+    The version is bumped straight away, so the writer's own transaction
+    resolves fresh configs, and again on commit, so a worker that cached
+    pre-commit rows in between doesn't keep them.
+    """
+    scope = company_id or SYSTEM_SCOPE
+    _bump_season_version(scope)
+    transaction.on_commit(lambda: _bump_season_version(scope))
+
+
+def season_config_scope(instance) -> Optional[int]:
+    """Company id whose season configs a SEASON_CONFIG_SOURCES write affects."""
+    return resolve_path(instance, SEASON_CONFIG_SOURCES[instance._meta.label])
+
+
+def _cached_config(key, versions: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    entry = _season_configs.get(key)
+    if entry is None:
+        return None
+    dependencies, config, expires = entry
+    if expires <= time.monotonic() or any(versions.get(k) != v for k, v in dependencies):
+        return None
+    with _season_configs_lock:
+        if key in _season_configs:
+            _season_configs.move_to_end(key)
+    return config
+
+
+def _store_config(key, dependencies, config):
+    timeout = settings.SEASON_CONFIG_CACHE_TIMEOUT
+    if not timeout:
+        return
+    with _season_configs_lock:
+        _season_configs[key] = (tuple(dependencies), config, time.monotonic() + timeout)
+        _season_configs.move_to_end(key)
+        while len(_season_configs) > SEASON_CONFIG_CACHE_SIZE:
+            _season_configs.popitem(last=False)
+
+
+def clear_season_config_cache():
+    """Empty this process's memoised season configs."""
+    with _season_configs_lock:
+        _season_configs.clear()
+
+
+def _template_config(template) -> Dict[str, Any]:
+    return {
+        'start_month': template.start_month,
+        'start_day': template.start_day,
+        'duration_months': template.duration_months,
+        'crosses_calendar_year': template.crosses_calendar_year,
+        'label_format': template.label_format,
+        'template_id': template.id,
+        'season_type': template.season_type,
+    }
+
+
 class SeasonService:
     """
     Centralized service for all season-related calculations.
@@ -380,6 +506,36 @@ class SeasonService:
             is_current=(start_date <= date.today() <= end_date)
         )
 
+    def get_seasons_for_fields(
+        self,
+        field_ids: Iterable[int],
+        target_date: Optional[date] = None
+    ) -> Dict[int, SeasonPeriod]:
+        """
+        Get the season containing target_date for each of several fields.
+
+        Resolves every uncached field with one query instead of one
+        get_current_season() call per field.
+
+        Args:
+            field_ids: Field IDs
+            target_date: Date to determine seasons for (default: today)
+
+        Returns:
+            Dict of field ID to SeasonPeriod; unknown fields get the
+            calendar year fallback
+        """
+        if target_date is None:
+            target_date = date.today()
+        today = date.today()
+
+        seasons = {}
+        for field_id, config in self._get_field_configs(field_ids, None).items():
+            season = self._calculate_season(target_date, config)
+            season.is_current = season.contains(today)
+            seasons[field_id] = season
+        return seasons
+
     def _get_season_config(
         self,
         field_id: Optional[int],
@@ -402,62 +558,115 @@ class SeasonService:
         Returns:
             Configuration dict with season parameters
         """
-        # Try to get from database first
         if field_id:
-            try:
-                from api.models import Field
-                field = Field.objects.select_related('crop').get(id=field_id)
-
-                # Check if season_template field exists (migration may not have run)
-                template = None
-                if hasattr(field, 'season_template'):
-                    template = field.season_template
-
-                if not template and field.crop:
-                    if hasattr(field.crop, 'season_template'):
-                        template = field.crop.season_template
-                    if not template and field.crop.category:
-                        crop_category = field.crop.category
-
-                if template:
-                    return {
-                        'start_month': template.start_month,
-                        'start_day': template.start_day,
-                        'duration_months': template.duration_months,
-                        'crosses_calendar_year': template.crosses_calendar_year,
-                        'label_format': template.label_format,
-                        'template_id': template.id,
-                        'season_type': template.season_type,
-                    }
-            except Exception:
-                # Field not found or other error - fall through to defaults
-                pass
+            return dict(self._get_field_configs([field_id], crop_category)[field_id])
+        return dict(self._get_category_config(crop_category))
 
-        # Try to get SeasonTemplate from database by category
+    def _get_field_configs(
+        self,
+        field_ids: Iterable[int],
+        crop_category: Optional[str]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Season configs by field ID, loading uncached fields in one query."""
+        field_ids = set(field_ids)
+        keys = {
+            field_id: ('field', self.company_id, field_id, crop_category)
+            for field_id in field_ids
+        }
+        scope_keys = self._scope_version_keys()
+        version_keys = set(scope_keys)
+        for key in keys.values():
+            entry = _season_configs.get(key)
+            if entry:
+                version_keys.update(k for k, _ in entry[0])
+        versions = _season_versions(version_keys)
+
+        configs = {}
+        for field_id, key in keys.items():
+            config = _cached_config(key, versions)
+            if config is not None:
+                configs[field_id] = config
+        missing = field_ids - configs.keys()
+        if not missing:
+            return configs
+
+        try:
+            from api.models import Field
+            fields = list(
+                Field.objects.filter(id__in=missing).select_related(
+                    'farm', 'season_template', 'crop__season_template',
+                )
+            )
+        except Exception:
+            # Database not ready or other error - fall through to defaults
+            fields = []
+
+        versions.update(_season_versions(
+            _season_version_key(field.farm.company_id or SYSTEM_SCOPE) for field in fields
+        ))
+        for field in fields:
+            template = field.season_template
+            category = crop_category
+            if not template and field.crop:
+                template = field.crop.season_template
+                if not template and field.crop.category:
+                    category = field.crop.category
+
+            if template:
+                config = _template_config(template)
+            else:
+                config = self._get_category_config(category)
+
+            dependency_keys = scope_keys | {
+                _season_version_key(field.farm.company_id or SYSTEM_SCOPE),
+            }
+            _store_config(
+                keys[field.id], [(k, versions[k]) for k in dependency_keys], config,
+            )
+            configs[field.id] = config
+
+        # Unknown fields aren't memoised: nothing would invalidate the entry
+        # once a field with that ID is created for another company.
+        for field_id in missing - configs.keys():
+            configs[field_id] = self._get_category_config(crop_category)
+        return configs
+
+    def _get_category_config(self, crop_category: Optional[str]) -> Dict[str, Any]:
+        """Season config for a crop category: company or system template, else built-in."""
         if crop_category:
+            key = ('category', self.company_id, crop_category)
+            dependency_keys = self._scope_version_keys()
+            versions = _season_versions(dependency_keys)
+            config = _cached_config(key, versions)
+            if config is not None:
+                return config
+
+            config = None
             try:
-                from api.models import SeasonTemplate, Company
-                company = None
-                if self.company_id:
-                    company = Company.objects.filter(id=self.company_id).first()
-
-                template = SeasonTemplate.get_for_category(crop_category, company)
+                from api.models import SeasonTemplate
+                template = SeasonTemplate.get_for_category(crop_category, self.company_id)
                 if template:
-                    return {
-                        'start_month': template.start_month,
-                        'start_day': template.start_day,
-                        'duration_months': template.duration_months,
-                        'crosses_calendar_year': template.crosses_calendar_year,
-                        'label_format': template.label_format,
-                        'template_id': template.id,
-                        'season_type': template.season_type,
-                    }
+                    config = _template_config(template)
             except Exception:
                 # Database not ready, SeasonTemplate doesn't exist, or other error
                 # Fall through to built-in defaults
                 pass
+            if config is None:
+                config = self._default_config(crop_category)
+            _store_config(key, [(k, versions[k]) for k in dependency_keys], config)
+            return config
+
+        return self._default_config(crop_category)
+
+    def _scope_version_keys(self) -> set:
+        """Version keys every config resolved by this service depends on."""
+        return {
+            _season_version_key(SYSTEM_SCOPE),
+            _season_version_key(self.company_id or SYSTEM_SCOPE),
+        }
 
-        # Fall back to built-in category defaults
+    def _default_config(self, crop_category: Optional[str]) -> Dict[str, Any]:
+        """Built-in category defaults, with the calendar year fallback."""
         category_key = (crop_category or 'other').lower()
         if category_key in self.DEFAULT_SEASON_CONFIGS:
             config = self.DEFAULT_SEASON_CONFIGS[category_key].copy()
@@ -605,9 +814,32 @@ for _canonical, _aliases in COMMODITY_ALIASES.items():
     for _alias in _aliases:
         _COMMODITY_LOOKUP[_alias.upper()] = _canonical
 
+# Keywords for get_crop_category_for_commodity, checked in order
+_CATEGORY_KEYWORDS = (
+    ('subtropical', ('AVOCADO', 'SUBTROPICAL')),
+    ('citrus', (
+        'LEMON', 'ORANGE', 'NAVEL', 'VALENCIA',
+        'TANGERINE', 'MANDARIN', 'GRAPEFRUIT', 'CITRUS', 'LIME',
+    )),
+    ('nut', ('ALMOND', 'WALNUT', 'PISTACHIO')),
+    ('vine', ('GRAPE', 'WINE')),
+)
+
+# Unseen raw strings resolved per process by the lookups below
+COMMODITY_LOOKUP_CACHE_SIZE = 1024
+
 logger = __import__('logging').getLogger(__name__)
 
 
+@lru_cache(maxsize=COMMODITY_LOOKUP_CACHE_SIZE)
+def _match_commodity(cleaned: str) -> Optional[str]:
+    """Canonical name for a cleaned string by substring match, or None."""
+    for keyword, canonical in _COMMODITY_LOOKUP.items():
+        if keyword in cleaned:
+            return canonical
+    return None
+
+
 def normalize_commodity(raw: str) -> str:
     """
     Normalize a free-text commodity string to a canonical name.
@@ -622,6 +854,11 @@ def normalize_commodity(raw: str) -> str:
         normalize_commodity('LEMON') -> 'LEMONS'
         normalize_commodity('SESPE') -> 'SESPE' (with warning)
     """
+    # Exact portal spellings skip the string cleanup entirely
+    canonical = _COMMODITY_LOOKUP.get(raw)
+    if canonical is not None:
+        return canonical
+
     cleaned = (raw or '').strip().upper()
     if not cleaned:
         return cleaned
@@ -631,9 +868,9 @@ def normalize_commodity(raw: str) -> str:
         return _COMMODITY_LOOKUP[cleaned]
 
     # Substring match fallback (e.g., "CALIFORNIA HASS AVOCADO" contains "AVOCADO")
-    for keyword, canonical in _COMMODITY_LOOKUP.items():
-        if keyword in cleaned:
-            return canonical
+    canonical = _match_commodity(cleaned)
+    if canonical is not None:
+        return canonical
 
     # Unknown — return as-is with warning
     logger.warning(
@@ -643,6 +880,23 @@ def normalize_commodity(raw: str) -> str:
     return cleaned
 
 
+def _category_for(upper: str) -> str:
+    for category, keywords in _CATEGORY_KEYWORDS:
+        if any(keyword in upper for keyword in keywords):
+            return category
+    return 'citrus'  # Default to citrus for unknown commodities
+
+
+# Categories for every canonical name and alias; other strings go through
+# the LRU below
+_CATEGORY_LOOKUP = {name: _category_for(name) for name in _COMMODITY_LOOKUP}
+
+
+@lru_cache(maxsize=COMMODITY_LOOKUP_CACHE_SIZE)
+def _category_for_unseen(commodity_string: str) -> str:
+    return _category_for(commodity_string.upper())
+
+
 def get_crop_category_for_commodity(commodity_string: str) -> str:
     """
     Map a free-text commodity string (e.g. 'LEMONS', 'HASS AVOCADOS')
@@ -652,20 +906,30 @@ def get_crop_category_for_commodity(commodity_string: str) -> str:
 
     Returns: 'citrus', 'subtropical', 'nut', 'vine', or 'citrus' (default fallback).
     """
-    upper = (commodity_string or '').upper()
-    if any(c in upper for c in ['AVOCADO', 'SUBTROPICAL']):
-        return 'subtropical'
-    elif any(c in upper for c in [
-        'LEMON', 'ORANGE', 'NAVEL', 'VALENCIA',
-        'TANGERINE', 'MANDARIN', 'GRAPEFRUIT', 'CITRUS', 'LIME'
-    ]):
-        return 'citrus'
-    elif any(c in upper for c in ['ALMOND', 'WALNUT', 'PISTACHIO']):
-        return 'nut'
-    elif any(c in upper for c in ['GRAPE', 'WINE']):
-        return 'vine'
-    else:
-        return 'citrus'  # Default to citrus for unknown commodities
+    category = _CATEGORY_LOOKUP.get(commodity_string)
+    if category is None:
+        category = _category_for_unseen(commodity_string or '')
+    return category
+
+
+_UNIT_INFO = {
+    'subtropical': {
+        'unit': 'LBS',
+        'label_singular': 'Lb',
+        'label_plural': 'Lbs',
+        'db_field': 'total_weight_lbs',
+        'delivery_db_field': 'weight_lbs',
+        'net_per_field': 'net_per_lb',
+    },
+}
+_DEFAULT_UNIT_INFO = {
+    'unit': 'BIN',
+    'label_singular': 'Bin',
+    'label_plural': 'Bins',
+    'db_field': 'total_bins',
+    'delivery_db_field': 'bins',
+    'net_per_field': 'net_per_bin',
+}
 
 
 def get_primary_unit_for_commodity(commodity: str) -> dict:
@@ -683,23 +947,8 @@ def get_primary_unit_for_commodity(commodity: str) -> dict:
         - net_per_field: 'net_per_lb' or 'net_per_bin'
     """
     category = get_crop_category_for_commodity(commodity)
-    if category == 'subtropical':
-        return {
-            'unit': 'LBS',
-            'label_singular': 'Lb',
-            'label_plural': 'Lbs',
-            'db_field': 'total_weight_lbs',
-            'delivery_db_field': 'weight_lbs',
-            'net_per_field': 'net_per_lb',
-        }
-    return {
-        'unit': 'BIN',
-        'label_singular': 'Bin',
-        'label_plural': 'Bins',
-        'db_field': 'total_bins',
-        'delivery_db_field': 'bins',
-        'net_per_field': 'net_per_bin',
-    }
+    # A copy: callers put this in API payloads and may add to it
+    return dict(_UNIT_INFO.get(category, _DEFAULT_UNIT_INFO))
 
 
 # Map crop_variety choice values to commodity strings for unit resolution
@@ -735,10 +984,18 @@ def get_commodity_from_crop_variety(crop_variety: str) -> str:
     return CROP_VARIETY_TO_COMMODITY.get(crop_variety, 'OTHER')
 
 
+# Commodity (uppercase) -> crop_variety values, in CROP_VARIETY_TO_COMMODITY order
+_VARIETIES_BY_COMMODITY = {}
+for _variety, _commodity in CROP_VARIETY_TO_COMMODITY.items():
+    _VARIETIES_BY_COMMODITY.setdefault(_commodity.upper(), []).append(_variety)
+_VARIETIES_BY_COMMODITY = {
+    _commodity: tuple(_varieties) for _commodity, _varieties in _VARIETIES_BY_COMMODITY.items()
+}
+
+
 def get_varieties_for_commodity(commodity: str) -> list:
     """Get all crop_variety values that map to a given commodity string."""
-    upper = commodity.upper()
-    return [k for k, v in CROP_VARIETY_TO_COMMODITY.items() if v.upper() == upper]
+    return list(_VARIETIES_BY_COMMODITY.get(commodity.upper(), ()))
 
 
 def get_primary_unit_for_crop_variety(crop_variety: str) -> dict:
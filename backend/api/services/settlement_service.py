@@ -1,11 +1,11 @@
 """
-Settlement finalization service.
+Settlement finalization and statement line persistence.
 
 Extracted from packinghouse_views.py to keep view logic thin and make
 these helpers independently testable.
 """
 from decimal import Decimal
-from django.db.models import Sum
+from django.db.models import Q, Sum
 from django.db.models.functions import Coalesce
 import logging
 
@@ -26,15 +26,13 @@ def reconcile_settlement_from_grade_lines(settlement):
     warnings = []
     update_fields = []
 
-    # Sum LBS grade lines
-    lbs_total = SettlementGradeLine.objects.filter(
-        settlement=settlement, unit_of_measure='LBS'
-    ).aggregate(total=Coalesce(Sum('quantity'), Decimal('0')))['total']
-
-    # Sum BIN grade lines
-    bins_total = SettlementGradeLine.objects.filter(
-        settlement=settlement, unit_of_measure='BIN'
-    ).aggregate(total=Coalesce(Sum('quantity'), Decimal('0')))['total']
+    # Sum LBS and BIN grade lines in one pass
+    totals = SettlementGradeLine.objects.filter(settlement=settlement).aggregate(
+        lbs=Coalesce(Sum('quantity', filter=Q(unit_of_measure='LBS')), Decimal('0')),
+        bins=Coalesce(Sum('quantity', filter=Q(unit_of_measure='BIN')), Decimal('0')),
+    )
+    lbs_total = totals['lbs']
+    bins_total = totals['bins']
 
     # Reconcile LBS
     if lbs_total and lbs_total > 0:
@@ -205,6 +203,77 @@ def finalize_settlement(settlement):
     return warnings
 
 
+def save_packout_grade_lines(report, lines, replace=False):
+    """
+    Write PackoutGradeLine rows for a packout report in one bulk insert.
+
+    ``lines`` are field dicts, already validated (serializer data or the
+    output of PDFExtractionService.get_grade_lines_data). With replace=True
+    the report's existing lines are deleted first. Returns the created lines.
+    """
+    from api.models import PackoutGradeLine
+    from api.services.dashboard_cache import company_id_for, invalidate_company_dashboards
+
+    if replace:
+        PackoutGradeLine.objects.filter(packout_report=report).delete()
+    created = PackoutGradeLine.objects.bulk_create(
+        PackoutGradeLine(packout_report=report, **line) for line in lines
+    )
+    # bulk_create skips the save signals that keep dashboards current
+    invalidate_company_dashboards(company_id_for(report))
+    return created
+
+
+def save_settlement_lines(settlement, grade_lines=(), deductions=(), replace=False):
+    """
+    Write SettlementGradeLine and SettlementDeduction rows for a settlement
+    with one bulk insert per type, then finalize the settlement once.
+
+    ``grade_lines`` and ``deductions`` are validated field dicts. With
+    replace=True the settlement's existing lines and deductions are deleted
+    first. Returns the finalize_settlement() warnings.
+    Must be called inside a transaction.atomic() block.
+    """
+    from api.models import SettlementDeduction, SettlementGradeLine
+    from api.services.dashboard_cache import company_id_for, invalidate_company_dashboards
+
+    if replace:
+        SettlementGradeLine.objects.filter(settlement=settlement).delete()
+        SettlementDeduction.objects.filter(settlement=settlement).delete()
+    SettlementGradeLine.objects.bulk_create(
+        SettlementGradeLine(settlement=settlement, **line) for line in grade_lines
+    )
+    SettlementDeduction.objects.bulk_create(
+        SettlementDeduction(settlement=settlement, **deduction) for deduction in deductions
+    )
+    invalidate_company_dashboards(company_id_for(settlement))
+    return finalize_settlement(settlement)
+
+
+def save_extracted_lines(record, extracted_data, extraction_service, replace=False):
+    """
+    Persist the lines of a confirmed statement for its PackoutReport or
+    PoolSettlement. The extracted data is normalised once per line type and
+    written in bulk. Returns settlement warnings (always empty for packout
+    reports). Must be called inside a transaction.atomic() block.
+    """
+    from api.models import PoolSettlement
+
+    if isinstance(record, PoolSettlement):
+        return save_settlement_lines(
+            record,
+            extraction_service.get_grade_lines_data(extracted_data, for_settlement=True),
+            extraction_service.get_deductions_data(extracted_data),
+            replace=replace,
+        )
+    save_packout_grade_lines(
+        record,
+        extraction_service.get_grade_lines_data(extracted_data, for_settlement=False),
+        replace=replace,
+    )
+    return []
+
+
 def auto_update_pool_status(pool):
     """
     Automatically update a pool's status to 'settled' when all packed
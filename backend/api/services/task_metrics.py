@@ -0,0 +1,134 @@
+"""
+Read side of the Celery task instrumentation.
+
+TaskRunMetric rows (written by api/tasks/instrumentation.py) are summarised
+per task over a trailing window — run/failure counts, p50/p95 wall time
+and query counts, database time and rows processed — for the task_metrics
+management command, and rendered in the Prometheus text exposition format
+for the /api/metrics/tasks/ endpoint.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+
+from api.models import TaskRunMetric
+
+DEFAULT_WINDOW = timedelta(days=1)
+
+METRIC_PREFIX = 'finch_task'
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile (0 <= q <= 1) of an ascending list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize_task_runs(since=None, task_name=None):
+    """
+    Per-task summaries of runs started at or after ``since`` (default: the
+    last DEFAULT_WINDOW). Returns a list of dicts sorted by task name.
+    """
+    since = since or timezone.now() - DEFAULT_WINDOW
+    runs = TaskRunMetric.objects.filter(started_at__gte=since)
+    if task_name:
+        runs = runs.filter(task_name=task_name)
+
+    grouped = defaultdict(list)
+    for row in runs.order_by().values_list(
+        'task_name', 'status', 'duration_ms', 'query_count',
+        'query_time_ms', 'rows_processed', 'started_at',
+    ).iterator():
+        grouped[row[0]].append(row)
+
+    summaries = []
+    for name in sorted(grouped):
+        rows = grouped[name]
+        durations = sorted(r[2] for r in rows)
+        queries = sorted(r[3] for r in rows)
+        status_counts = defaultdict(int)
+        for r in rows:
+            status_counts[r[1]] += 1
+        summaries.append({
+            'task': name,
+            'runs': len(rows),
+            'status_counts': dict(status_counts),
+            'failures': status_counts.get('failure', 0),
+            'p50_ms': percentile(durations, 0.5),
+            'p95_ms': percentile(durations, 0.95),
+            'max_ms': durations[-1],
+            'total_ms': sum(durations),
+            'p50_queries': percentile(queries, 0.5),
+            'p95_queries': percentile(queries, 0.95),
+            'total_queries': sum(queries),
+            'total_query_ms': sum(r[4] for r in rows),
+            'total_rows': sum(r[5] or 0 for r in rows),
+            'last_run': max(r[6] for r in rows),
+        })
+    return summaries
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def render_prometheus(summaries):
+    """Prometheus text format (version 0.0.4) for summarize_task_runs()."""
+    p = METRIC_PREFIX
+    lines = []
+
+    def family(name, kind, help_text):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    family(f'{p}_runs', 'gauge', 'Task runs in the window by outcome.')
+    for s in summaries:
+        for status, count in sorted(s['status_counts'].items()):
+            lines.append(f'{p}_runs{_labels(task=s["task"], status=status)} {count}')
+
+    family(f'{p}_duration_seconds', 'summary', 'Task wall time in the window.')
+    for s in summaries:
+        task = s['task']
+        lines.append(f'{p}_duration_seconds{_labels(task=task, quantile="0.5")} {s["p50_ms"] / 1000:.6f}')
+        lines.append(f'{p}_duration_seconds{_labels(task=task, quantile="0.95")} {s["p95_ms"] / 1000:.6f}')
+        lines.append(f'{p}_duration_seconds_sum{_labels(task=task)} {s["total_ms"] / 1000:.6f}')
+        lines.append(f'{p}_duration_seconds_count{_labels(task=task)} {s["runs"]}')
+
+    family(f'{p}_db_queries', 'summary', 'Database queries per task run in the window.')
+    for s in summaries:
+        task = s['task']
+        lines.append(f'{p}_db_queries{_labels(task=task, quantile="0.5")} {s["p50_queries"]:g}')
+        lines.append(f'{p}_db_queries{_labels(task=task, quantile="0.95")} {s["p95_queries"]:g}')
+        lines.append(f'{p}_db_queries_sum{_labels(task=task)} {s["total_queries"]}')
+        lines.append(f'{p}_db_queries_count{_labels(task=task)} {s["runs"]}')
+
+    family(f'{p}_db_seconds', 'gauge', 'Time spent in database calls in the window.')
+    for s in summaries:
+        lines.append(f'{p}_db_seconds{_labels(task=s["task"])} {s["total_query_ms"] / 1000:.6f}')
+
+    family(f'{p}_rows_processed', 'gauge', 'Rows reported processed in the window.')
+    for s in summaries:
+        lines.append(f'{p}_rows_processed{_labels(task=s["task"])} {s["total_rows"]}')
+
+    family(f'{p}_last_run_timestamp_seconds', 'gauge', 'Start time of the latest run.')
+    for s in summaries:
+        lines.append(
+            f'{p}_last_run_timestamp_seconds{_labels(task=s["task"])} {s["last_run"].timestamp():.0f}'
+        )
+
+    return '\n'.join(lines) + '\n'
+
+
+def prune_task_runs(older_than):
+    """Delete runs started before ``older_than``; returns the count removed."""
+    deleted, _ = TaskRunMetric.objects.filter(started_at__lt=older_than).delete()
+    return deleted
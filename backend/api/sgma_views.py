@@ -17,6 +17,7 @@ from rest_framework.permissions import IsAuthenticated
 from .permissions import HasCompanyAccess
 from .audit_utils import AuditLogMixin
 from .view_helpers import get_user_company, require_company, CompanyFilteredViewSet
+from .services.dashboard_cache import dashboard_response
 from .models import (
     Farm, Field, WaterSource, WellReading, MeterCalibration,
     WaterAllocation, ExtractionReport, IrrigationEvent,
@@ -1026,7 +1027,17 @@ def sgma_dashboard(request):
         )
     else:
         wells = WaterSource.objects.filter(source_type="well")
+        return Response(_build_sgma_dashboard(wells))
 
+    # Water year, reporting period and calibration windows follow today's date
+    return dashboard_response(
+        request, 'sgma', user.current_company_id, {'today': date.today()},
+        lambda: _build_sgma_dashboard(wells),
+    )
+
+
+def _build_sgma_dashboard(wells):
+    """SGMA dashboard payload for a set of wells."""
     water_year = get_current_water_year()
     wy_dates = get_water_year_dates(water_year)
     current_period = get_current_reporting_period()
@@ -1161,7 +1172,7 @@ def sgma_dashboard(request):
 
     recent_readings_data = WellReadingListSerializer(recent_readings, many=True).data
 
-    return Response({
+    return {
         'total_wells': total_wells,
         'active_wells': active_wells,
         'wells_with_ami': wells_with_ami,
@@ -1189,4 +1200,4 @@ def sgma_dashboard(request):
 
         'water_year': water_year,
         'as_of_date': str(date.today())
-    })
+    }
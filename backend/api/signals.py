@@ -2,10 +2,16 @@
 Django Signals
 
 - Auto-create PHI compliance checks when harvests are created
+- Maintain daily audit activity counters as AuditLog entries are written
+  and users are deleted
+- Bump per-company data versions that key the dashboard cache
+- Bump per-company season versions that key memoised season configs
+- Mark stored season overview sections stale
 """
 
 import logging
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 logger = logging.getLogger(__name__)
@@ -44,3 +50,119 @@ def create_phi_compliance_check(sender, instance, created, **kwargs):
 
     except Exception as e:
         logger.error(f"Error creating PHI compliance check for Harvest #{instance.id}: {e}")
+
+
+# =============================================================================
+# AUDIT LOG SIGNALS
+# =============================================================================
+
+@receiver(post_save, sender='api.AuditLog')
+def count_audit_log_entry(sender, instance, created, **kwargs):
+    """
+    Keep AuditLogDailyCount in step with new audit entries.
+
+    Runs inside the writer's transaction so a rolled-back entry never
+    leaves a counted row behind. The nightly rollup repairs anything
+    written without signals (bulk_create, raw SQL).
+    """
+    if not created:
+        return
+
+    from api.services.audit_activity import record_audit_entry
+
+    record_audit_entry(instance)
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def release_deleted_user_audit_counts(sender, instance, **kwargs):
+    """Merge the user's audit counters into the system rows first."""
+    from api.services.audit_activity import release_user_counters
+
+    release_user_counters(instance.pk)
+
+
+# =============================================================================
+# DASHBOARD CACHE SIGNALS
+# =============================================================================
+
+def bump_company_data_version(sender, instance, raw=False, **kwargs):
+    """Invalidate the owning company's cached dashboards after a write commits."""
+    if raw or not settings.DASHBOARD_CACHE_TIMEOUT:
+        return
+
+    from api.services.dashboard_cache import company_id_for, invalidate_company_dashboards
+
+    invalidate_company_dashboards(company_id_for(instance))
+
+
+def _connect_data_version_signals():
+    from api.services.dashboard_cache import DATA_VERSION_SOURCES
+
+    for label in DATA_VERSION_SOURCES:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                bump_company_data_version, sender=label,
+                dispatch_uid=f'data-version:{signal is post_save}:{label}',
+            )
+
+
+_connect_data_version_signals()
+
+
+# =============================================================================
+# SEASON CONFIG SIGNALS
+# =============================================================================
+
+def bump_season_config_version(sender, instance, raw=False, **kwargs):
+    """Drop memoised season configs that the written row may have changed."""
+    if raw:
+        return
+
+    from api.services.season_service import invalidate_season_configs, season_config_scope
+
+    invalidate_season_configs(season_config_scope(instance))
+
+
+def _connect_season_config_signals():
+    from api.services.season_service import SEASON_CONFIG_SOURCES
+
+    for label in SEASON_CONFIG_SOURCES:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                bump_season_config_version, sender=label,
+                dispatch_uid=f'season-version:{signal is post_save}:{label}',
+            )
+
+
+_connect_season_config_signals()
+
+
+# =============================================================================
+# SEASON OVERVIEW SIGNALS
+# =============================================================================
+
+def mark_season_overview_stale(sender, instance, raw=False, **kwargs):
+    """Mark the stored season overview sections the written row feeds stale."""
+    if raw:
+        return
+
+    from api.services.season_overview import (
+        SEASON_OVERVIEW_SOURCES, invalidate_season_overview, season_overview_scope,
+    )
+
+    _, sections = SEASON_OVERVIEW_SOURCES[instance._meta.label]
+    invalidate_season_overview(season_overview_scope(instance), sections=sections)
+
+
+def _connect_season_overview_signals():
+    from api.services.season_overview import SEASON_OVERVIEW_SOURCES
+
+    for label in SEASON_OVERVIEW_SOURCES:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                mark_season_overview_stale, sender=label,
+                dispatch_uid=f'season-overview:{signal is post_save}:{label}',
+            )
+
+
+_connect_season_overview_signals()
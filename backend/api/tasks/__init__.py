@@ -12,3 +12,16 @@ from .compliance_tasks import (
     cleanup_old_alerts,
     check_phi_compliance_for_upcoming_harvests,
 )
+
+# Per-company fan-out chord callback
+from .fanout import merge_company_stats
+
+# Task run metrics: signal handlers plus retention
+from . import instrumentation
+from .monitoring_tasks import prune_task_run_metrics
+
+# Audit log housekeeping tasks
+from .audit_tasks import (
+    rollup_audit_daily_counts,
+    maintain_audit_partitions,
+)
@@ -0,0 +1,61 @@
+"""
+Celery tasks for audit log housekeeping.
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def rollup_audit_daily_counts(days=2):
+    """
+    Nightly task to rebuild AuditLogDailyCount for the last ``days`` local
+    days (yesterday and the day before by default).
+
+    The post_save counter handles normal writes; this repairs entries
+    created without signals and keeps counters provably equal to AuditLog.
+
+    Returns:
+        Dictionary with processing statistics
+    """
+    from api.services.audit_activity import rollup_daily_counts
+
+    last_day = timezone.localdate() - timedelta(days=1)
+    first_day = last_day - timedelta(days=days - 1)
+    rows = rollup_daily_counts(first_day, last_day)
+
+    stats = {
+        'first_day': first_day.isoformat(),
+        'last_day': last_day.isoformat(),
+        'counter_rows': rows,
+    }
+    logger.info(f"Audit daily count rollup complete: {stats}")
+    return stats
+
+
+@shared_task
+def maintain_audit_partitions():
+    """
+    Monthly task to keep AuditLog partitions ahead of the calendar and move
+    months past the retention window to compressed archives.
+
+    Returns:
+        Dictionary with processing statistics
+    """
+    from api.services.audit_partitions import archive_partitions, ensure_partitions
+
+    created = ensure_partitions()
+    archived = archive_partitions()
+
+    stats = {
+        'partitions_created': created,
+        'months_archived': [a.month for a in archived],
+        'rows_archived': sum(a.rows for a in archived),
+    }
+    logger.info(f"Audit partition maintenance complete: {stats}")
+    return stats
@@ -11,10 +11,12 @@ These tasks run on schedules to:
 """
 
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, time, timedelta
 from celery import shared_task
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Case, Q, Value, When
+
+from .fanout import fan_out_by_company, run_for_company
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +117,12 @@ def _create_deadline_alert(deadline, priority, alert_type):
     )
 
 
+RECURRING_DEADLINE_STATS = {
+    'companies_processed': 0,
+    'deadlines_created': 0,
+}
+
+
 @shared_task
 def generate_recurring_deadlines(company_id: int = None):
     """
@@ -126,178 +134,168 @@ def generate_recurring_deadlines(company_id: int = None):
     3. Only creates deadlines that don't already exist
 
     Args:
-        company_id: Optional - process single company, or all if None
+        company_id: Optional - process single company, or fan out one
+            subtask per company with a profile if None
 
     Returns:
         Dictionary with generation statistics
     """
-    from api.models import ComplianceProfile, ComplianceDeadline, Company
-
-    stats = {
-        'companies_processed': 0,
-        'deadlines_created': 0,
-    }
+    from api.models import ComplianceProfile
 
-    today = timezone.now().date()
-    one_year_out = today + timedelta(days=365)
-
-    # Get profiles to process
-    if company_id:
-        profiles = ComplianceProfile.objects.filter(company_id=company_id)
-    else:
-        profiles = ComplianceProfile.objects.all()
-
-    profiles = profiles.select_related('company')
-
-    for profile in profiles:
-        stats['companies_processed'] += 1
-        company = profile.company
+    if company_id is None:
+        return fan_out_by_company(
+            generate_recurring_deadlines,
+            ComplianceProfile.objects.values_list('company_id', flat=True),
+            RECURRING_DEADLINE_STATS,
+        )
+    return run_for_company(
+        generate_recurring_deadlines, company_id, _generate_recurring_deadlines_for_company
+    )
 
-        # PUR Monthly Reporting (California)
-        if profile.requires_pur_reporting and profile.primary_state == 'CA':
-            created = _generate_monthly_pur_deadlines(company, today, one_year_out)
-            stats['deadlines_created'] += created
 
-        # SGMA Semi-Annual Reporting
-        if profile.primary_state == 'CA':
-            created = _generate_sgma_deadlines(company, today, one_year_out)
-            stats['deadlines_created'] += created
+# Days ahead recurring deadlines are generated for.
+RECURRING_DEADLINE_HORIZON_DAYS = 365
 
-        # WPS Annual Training
-        if profile.requires_wps_compliance:
-            created = _generate_wps_training_deadlines(company, today, one_year_out)
-            stats['deadlines_created'] += created
 
-        # Water Testing (quarterly)
-        created = _generate_water_testing_deadlines(company, today, one_year_out)
-        stats['deadlines_created'] += created
+def _generate_recurring_deadlines_for_company(company_id):
+    """
+    Extend the company's recurring deadlines out to the horizon.
 
-    logger.info(f"Recurring deadline generation complete: {stats}")
-    return stats
+    The profile's deadlines_generated_through records how far a previous
+    run got, so a weekly run only fills in the days that have come into the
+    horizon since. The desired deadlines for that span are checked against
+    existing rows with one query on their names and only the missing ones
+    are inserted, in one bulk_create.
+    """
+    from api.models import ComplianceDeadline, ComplianceProfile
+    from api.services.dashboard_cache import invalidate_company_dashboards
 
+    stats = dict(RECURRING_DEADLINE_STATS)
 
-def _generate_monthly_pur_deadlines(company, start_date, end_date):
-    """Generate monthly PUR reporting deadlines."""
-    from api.models import ComplianceDeadline
+    today = timezone.now().date()
+    horizon = today + timedelta(days=RECURRING_DEADLINE_HORIZON_DAYS)
 
-    created = 0
-    current = start_date.replace(day=10)  # PUR due by 10th of following month
+    profiles = ComplianceProfile.objects.filter(company_id=company_id)
 
-    if current <= start_date:
-        current = (current.replace(day=1) + timedelta(days=32)).replace(day=10)
+    for profile in profiles:
+        stats['companies_processed'] += 1
 
-    while current <= end_date:
-        # Check if deadline already exists
-        reporting_month = (current.replace(day=1) - timedelta(days=1)).strftime('%B %Y')
-        deadline_name = f"PUR Report - {reporting_month}"
+        generated_through = profile.deadlines_generated_through
+        start_date = today
+        if generated_through and generated_through >= today:
+            start_date = generated_through + timedelta(days=1)
+        if start_date > horizon:
+            continue
 
-        exists = ComplianceDeadline.objects.filter(
-            company=company,
-            name=deadline_name,
-        ).exists()
+        desired = {
+            fields['name']: fields
+            for fields in _recurring_deadlines(profile, start_date, horizon)
+        }
+        existing = set(ComplianceDeadline.objects.filter(
+            company_id=profile.company_id, name__in=list(desired),
+        ).values_list('name', flat=True))
 
-        if not exists:
-            ComplianceDeadline.objects.create(
-                company=company,
-                name=deadline_name,
-                description=f"Submit Pesticide Use Report for {reporting_month} to County Agricultural Commissioner",
-                category='reporting',
-                due_date=current,
-                frequency='monthly',
-                warning_days=7,
-                auto_generated=True,
+        missing = []
+        for name, fields in desired.items():
+            if name in existing:
+                continue
+            deadline = ComplianceDeadline(
+                company_id=profile.company_id, auto_generated=True, **fields
             )
-            created += 1
+            deadline._update_status()  # bulk_create bypasses save()
+            missing.append(deadline)
 
-        # Move to next month
-        current = (current.replace(day=1) + timedelta(days=32)).replace(day=10)
+        if missing:
+            ComplianceDeadline.objects.bulk_create(missing)
+            invalidate_company_dashboards(profile.company_id)
+            stats['deadlines_created'] += len(missing)
 
-    return created
+        ComplianceProfile.objects.filter(pk=profile.pk).update(
+            deadlines_generated_through=horizon
+        )
 
+    logger.info(f"Recurring deadline generation complete for company {company_id}: {stats}")
+    return stats
 
-def _generate_sgma_deadlines(company, start_date, end_date):
-    """Generate semi-annual SGMA reporting deadlines."""
-    from api.models import ComplianceDeadline
 
-    created = 0
-    year = start_date.year
+def _recurring_deadlines(profile, start_date, end_date):
+    """Field values of every deadline the profile requires from start_date to end_date."""
+    # PUR Monthly Reporting (California)
+    if profile.requires_pur_reporting and profile.primary_state == 'CA':
+        yield from _monthly_pur_deadlines(start_date, end_date)
 
-    # SGMA reports typically due January 15 and July 15
-    deadlines_to_check = []
+    # SGMA Semi-Annual Reporting
+    if profile.primary_state == 'CA':
+        yield from _sgma_deadlines(start_date, end_date)
 
-    for y in range(year, end_date.year + 1):
-        from datetime import date
-        deadlines_to_check.append((date(y, 1, 15), f"July-December {y-1}"))
-        deadlines_to_check.append((date(y, 7, 15), f"January-June {y}"))
+    # WPS Annual Training
+    if profile.requires_wps_compliance:
+        yield from _wps_training_deadlines(start_date, end_date)
 
-    for due_date, period in deadlines_to_check:
-        if start_date <= due_date <= end_date:
-            deadline_name = f"SGMA Extraction Report - {period}"
+    # Water Testing (quarterly)
+    yield from _water_testing_deadlines(start_date, end_date)
 
-            exists = ComplianceDeadline.objects.filter(
-                company=company,
-                name=deadline_name,
-            ).exists()
 
-            if not exists:
-                ComplianceDeadline.objects.create(
-                    company=company,
-                    name=deadline_name,
-                    description=f"Submit groundwater extraction report for {period} to GSA",
-                    category='reporting',
-                    due_date=due_date,
-                    frequency='semi_annual',
-                    warning_days=14,
-                    auto_generated=True,
-                )
-                created += 1
+def _monthly_pur_deadlines(start_date, end_date):
+    """Monthly PUR reporting deadlines."""
+    current = start_date.replace(day=10)  # PUR due by 10th of following month
 
-    return created
+    if current < start_date:
+        current = (current.replace(day=1) + timedelta(days=32)).replace(day=10)
 
+    while current <= end_date:
+        reporting_month = (current.replace(day=1) - timedelta(days=1)).strftime('%B %Y')
+        yield {
+            'name': f"PUR Report - {reporting_month}",
+            'description': f"Submit Pesticide Use Report for {reporting_month} to County Agricultural Commissioner",
+            'category': 'reporting',
+            'due_date': current,
+            'frequency': 'monthly',
+            'warning_days': 7,
+        }
 
-def _generate_wps_training_deadlines(company, start_date, end_date):
-    """Generate annual WPS training deadlines."""
-    from api.models import ComplianceDeadline
+        # Move to next month
+        current = (current.replace(day=1) + timedelta(days=32)).replace(day=10)
 
-    created = 0
-    year = start_date.year
 
-    for y in range(year, end_date.year + 1):
-        from datetime import date
+def _sgma_deadlines(start_date, end_date):
+    """Semi-annual SGMA reporting deadlines."""
+    # SGMA reports typically due January 15 and July 15
+    for y in range(start_date.year, end_date.year + 1):
+        for due_date, period in (
+            (date(y, 1, 15), f"July-December {y-1}"),
+            (date(y, 7, 15), f"January-June {y}"),
+        ):
+            if start_date <= due_date <= end_date:
+                yield {
+                    'name': f"SGMA Extraction Report - {period}",
+                    'description': f"Submit groundwater extraction report for {period} to GSA",
+                    'category': 'reporting',
+                    'due_date': due_date,
+                    'frequency': 'semi_annual',
+                    'warning_days': 14,
+                }
+
+
+def _wps_training_deadlines(start_date, end_date):
+    """Annual WPS training deadlines."""
+    for y in range(start_date.year, end_date.year + 1):
         # Training should be completed by end of February
         due_date = date(y, 2, 28)
 
         if start_date <= due_date <= end_date:
-            deadline_name = f"WPS Annual Training - {y}"
-
-            exists = ComplianceDeadline.objects.filter(
-                company=company,
-                name=deadline_name,
-            ).exists()
-
-            if not exists:
-                ComplianceDeadline.objects.create(
-                    company=company,
-                    name=deadline_name,
-                    description=f"Complete annual Worker Protection Standard training for all workers and handlers",
-                    category='training',
-                    due_date=due_date,
-                    frequency='annual',
-                    warning_days=30,
-                    auto_generated=True,
-                )
-                created += 1
-
-    return created
-
-
-def _generate_water_testing_deadlines(company, start_date, end_date):
-    """Generate quarterly water testing deadlines."""
-    from api.models import ComplianceDeadline
-
-    created = 0
-    year = start_date.year
-
+            yield {
+                'name': f"WPS Annual Training - {y}",
+                'description': "Complete annual Worker Protection Standard training for all workers and handlers",
+                'category': 'training',
+                'due_date': due_date,
+                'frequency': 'annual',
+                'warning_days': 30,
+            }
+
+
+def _water_testing_deadlines(start_date, end_date):
+    """Quarterly water testing deadlines."""
     quarters = [
         (3, 15, 'Q1'),   # Q1 testing due March 15
         (6, 15, 'Q2'),   # Q2 testing due June 15
@@ -305,37 +303,35 @@ def _generate_water_testing_deadlines(company, start_date, end_date):
         (12, 15, 'Q4'),  # Q4 testing due December 15
     ]
 
-    for y in range(year, end_date.year + 1):
-        from datetime import date
+    for y in range(start_date.year, end_date.year + 1):
         for month, day, quarter in quarters:
             due_date = date(y, month, day)
 
             if start_date <= due_date <= end_date:
-                deadline_name = f"Water Quality Testing - {quarter} {y}"
+                yield {
+                    'name': f"Water Quality Testing - {quarter} {y}",
+                    'description': f"Complete quarterly water quality testing for {quarter} {y}",
+                    'category': 'testing',
+                    'due_date': due_date,
+                    'frequency': 'quarterly',
+                    'warning_days': 14,
+                }
+
 
-                exists = ComplianceDeadline.objects.filter(
-                    company=company,
-                    name=deadline_name,
-                ).exists()
+# Rows per UPDATE ... WHERE id IN (...) and per bulk_create statement in
+# the expiration sweeps.
+EXPIRATION_BATCH_SIZE = 1000
 
-                if not exists:
-                    ComplianceDeadline.objects.create(
-                        company=company,
-                        name=deadline_name,
-                        description=f"Complete quarterly water quality testing for {quarter} {y}",
-                        category='testing',
-                        due_date=due_date,
-                        frequency='quarterly',
-                        warning_days=14,
-                        auto_generated=True,
-                    )
-                    created += 1
 
-    return created
+LICENSE_EXPIRATION_STATS = {
+    'licenses_checked': 0,
+    'alerts_created': 0,
+    'expired_count': 0,
+}
 
 
 @shared_task
-def check_license_expirations():
+def check_license_expirations(company_id: int = None):
     """
     Daily task to check license expirations and generate alerts.
 
@@ -345,23 +341,58 @@ def check_license_expirations():
     - 30 days before expiration (critical priority)
     - On expiration date (critical)
 
+    Args:
+        company_id: Optional - check one company, or fan out one subtask
+            per company with open licenses if None
+
     Returns:
         Dictionary with processing statistics
     """
-    from api.models import License, ComplianceAlert
+    from api.models import License
+
+    if company_id is None:
+        return fan_out_by_company(
+            check_license_expirations,
+            License.objects.filter(
+                status__in=['active', 'expiring_soon']
+            ).values_list('company_id', flat=True).distinct(),
+            LICENSE_EXPIRATION_STATS,
+        )
+    return run_for_company(
+        check_license_expirations, company_id, _check_license_expirations_for_company
+    )
+
+
+def _check_license_expirations_for_company(company_id):
+    """
+    Sweep the company's open licenses in a fixed number of queries.
+
+    Licenses are read once for stats and alerts. Status changes are
+    conditional UPDATEs over the date buckets rather than per-license
+    writes, licenses already alerted today are read in one query and the
+    new alerts go in with bulk_create.
+    """
+    from api.models import ComplianceAlert, License
 
     today = timezone.now().date()
-    stats = {
-        'licenses_checked': 0,
-        'alerts_created': 0,
-        'expired_count': 0,
-    }
+    stats = dict(LICENSE_EXPIRATION_STATS)
 
     # Get active/expiring_soon licenses
-    licenses = License.objects.filter(
-        status__in=['active', 'expiring_soon']
-    ).select_related('company', 'user')
+    open_licenses = License.objects.filter(
+        company_id=company_id,
+        status__in=['active', 'expiring_soon'],
+    )
+    licenses = list(open_licenses.select_related('user'))
 
+    # Licenses with an active alert from today
+    alerted = set(ComplianceAlert.objects.filter(
+        company_id=company_id,
+        related_object_type='License',
+        is_active=True,
+        created_at__date=today,
+    ).values_list('related_object_id', flat=True))
+
+    alerts = []
     for license in licenses:
         stats['licenses_checked'] += 1
 
@@ -370,46 +401,54 @@ def check_license_expirations():
 
         days_until_expiry = (license.expiration_date - today).days
 
-        # Update license status
         if days_until_expiry < 0:
-            if license.status != 'expired':
-                license.status = 'expired'
-                license.save(update_fields=['status'])
-                stats['expired_count'] += 1
-                _create_license_alert(license, 'critical', 'expired', days_until_expiry)
-                stats['alerts_created'] += 1
+            priority, alert_type = 'critical', 'expired'
         elif days_until_expiry <= 30:
-            if license.status != 'expiring_soon':
-                license.status = 'expiring_soon'
-                license.save(update_fields=['status'])
-            _create_license_alert(license, 'critical', 'expiring_30', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority, alert_type = 'critical', 'expiring_30'
         elif days_until_expiry <= 60:
-            _create_license_alert(license, 'high', 'expiring_60', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority, alert_type = 'high', 'expiring_60'
         elif days_until_expiry <= 90:
-            _create_license_alert(license, 'medium', 'expiring_90', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority, alert_type = 'medium', 'expiring_90'
+        else:
+            continue
 
-    logger.info(f"License expiration check complete: {stats}")
+        if license.id not in alerted:
+            alerted.add(license.id)
+            alerts.append(_license_alert(license, priority, alert_type, days_until_expiry))
+
+    stats['expired_count'] = open_licenses.filter(
+        expiration_date__lt=today,
+    ).update(status='expired')
+
+    # Active licenses due within 30 days get the status save() would derive:
+    # expiring_soon (pending_renewal once a renewal is under way) inside the
+    # license's own reminder window, so one UPDATE per window length.
+    expiring = open_licenses.filter(
+        status='active',
+        expiration_date__gte=today,
+        expiration_date__lte=today + timedelta(days=30),
+    )
+    windows = expiring.values_list('renewal_reminder_days', flat=True).distinct().order_by()
+    for reminder_days in list(windows):
+        expiring.filter(
+            renewal_reminder_days=reminder_days,
+            expiration_date__lte=today + timedelta(days=reminder_days),
+        ).update(status=Case(
+            When(renewal_in_progress=True, then=Value('pending_renewal')),
+            default=Value('expiring_soon'),
+        ))
+
+    ComplianceAlert.objects.bulk_create(alerts, batch_size=EXPIRATION_BATCH_SIZE)
+    stats['alerts_created'] += len(alerts)
+
+    logger.info(f"License expiration check complete for company {company_id}: {stats}")
     return stats
 
 
-def _create_license_alert(license, priority, alert_type, days):
-    """Helper to create a license expiration alert."""
+def _license_alert(license, priority, alert_type, days):
+    """Unsaved license expiration alert."""
     from api.models import ComplianceAlert
 
-    # Check if similar alert already exists today
-    existing = ComplianceAlert.objects.filter(
-        related_object_type='License',
-        related_object_id=license.id,
-        is_active=True,
-        created_at__date=timezone.now().date(),
-    ).exists()
-
-    if existing:
-        return None
-
     user_name = license.user.get_full_name() if license.user else 'Company'
 
     if alert_type == 'expired':
@@ -419,8 +458,8 @@ def _create_license_alert(license, priority, alert_type, days):
         title = f"License Expiring: {license.get_license_type_display()}"
         message = f"{user_name}'s {license.get_license_type_display()} (#{license.license_number}) expires in {days} days on {license.expiration_date}."
 
-    return ComplianceAlert.objects.create(
-        company=license.company,
+    return ComplianceAlert(
+        company_id=license.company_id,
         alert_type='license_expiring',
         priority=priority,
         title=title,
@@ -432,31 +471,71 @@ def _create_license_alert(license, priority, alert_type, days):
     )
 
 
+WPS_TRAINING_EXPIRATION_STATS = {
+    'records_checked': 0,
+    'alerts_created': 0,
+    'expired_count': 0,
+}
+
+
 @shared_task
-def check_wps_training_expirations():
+def check_wps_training_expirations(company_id: int = None):
     """
     Daily task to check WPS training expirations and generate alerts.
 
     WPS training typically expires annually. Generates alerts at
     90, 60, and 30 days before expiration.
 
+    Args:
+        company_id: Optional - check one company, or fan out one subtask
+            per company with current training records if None
+
     Returns:
         Dictionary with processing statistics
     """
-    from api.models import WPSTrainingRecord, ComplianceAlert
+    from api.models import WPSTrainingRecord
+
+    if company_id is None:
+        today = timezone.now().date()
+        return fan_out_by_company(
+            check_wps_training_expirations,
+            WPSTrainingRecord.objects.exclude(
+                expiration_date__lt=today
+            ).values_list('company_id', flat=True).distinct(),
+            WPS_TRAINING_EXPIRATION_STATS,
+        )
+    return run_for_company(
+        check_wps_training_expirations, company_id, _check_wps_training_expirations_for_company
+    )
+
+
+def _check_wps_training_expirations_for_company(company_id):
+    """
+    Sweep the company's current training records in a fixed number of
+    queries: records alerted in the last week are read in one query and
+    the new alerts go in with bulk_create.
+    """
+    from api.models import ComplianceAlert, WPSTrainingRecord
 
     today = timezone.now().date()
-    stats = {
-        'records_checked': 0,
-        'alerts_created': 0,
-        'expired_count': 0,
-    }
+    stats = dict(WPS_TRAINING_EXPIRATION_STATS)
 
     # Get non-expired training records
-    records = WPSTrainingRecord.objects.exclude(
+    records = WPSTrainingRecord.objects.filter(
+        company_id=company_id,
+    ).exclude(
         expiration_date__lt=today
-    ).select_related('company', 'trainee_user')
+    ).select_related('trainee_user')
 
+    # Records with an active alert from the last week
+    alerted = set(ComplianceAlert.objects.filter(
+        company_id=company_id,
+        related_object_type='WPSTrainingRecord',
+        is_active=True,
+        created_at__gte=timezone.now() - timedelta(days=7),
+    ).values_list('related_object_id', flat=True))
+
+    alerts = []
     for record in records:
         stats['records_checked'] += 1
 
@@ -467,37 +546,30 @@ def check_wps_training_expirations():
 
         if days_until_expiry < 0:
             stats['expired_count'] += 1
-            _create_training_alert(record, 'critical', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority = 'critical'
         elif days_until_expiry <= 30:
-            _create_training_alert(record, 'high', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority = 'high'
         elif days_until_expiry <= 60:
-            _create_training_alert(record, 'medium', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority = 'medium'
         elif days_until_expiry <= 90:
-            _create_training_alert(record, 'low', days_until_expiry)
-            stats['alerts_created'] += 1
+            priority = 'low'
+        else:
+            continue
 
-    logger.info(f"WPS training expiration check complete: {stats}")
-    return stats
+        if record.id not in alerted:
+            alerted.add(record.id)
+            alerts.append(_training_alert(record, priority, days_until_expiry))
 
+    ComplianceAlert.objects.bulk_create(alerts, batch_size=EXPIRATION_BATCH_SIZE)
+    stats['alerts_created'] += len(alerts)
 
-def _create_training_alert(record, priority, days):
-    """Helper to create a training expiration alert."""
-    from api.models import ComplianceAlert
+    logger.info(f"WPS training expiration check complete for company {company_id}: {stats}")
+    return stats
 
-    # Check if similar alert already exists this week
-    week_ago = timezone.now() - timedelta(days=7)
-    existing = ComplianceAlert.objects.filter(
-        related_object_type='WPSTrainingRecord',
-        related_object_id=record.id,
-        is_active=True,
-        created_at__gte=week_ago,
-    ).exists()
 
-    if existing:
-        return None
+def _training_alert(record, priority, days):
+    """Unsaved training expiration alert."""
+    from api.models import ComplianceAlert
 
     trainee_name = record.trainee_user.get_full_name() if record.trainee_user else record.trainee_name
     training_type = record.get_training_type_display()
@@ -509,8 +581,8 @@ def _create_training_alert(record, priority, days):
         title = f"Training Expiring: {trainee_name}"
         message = f"{trainee_name}'s {training_type} training expires in {days} days on {record.expiration_date}."
 
-    return ComplianceAlert.objects.create(
-        company=record.company,
+    return ComplianceAlert(
+        company_id=record.company_id,
         alert_type='training_expiring',
         priority=priority,
         title=title,
@@ -631,31 +703,84 @@ def send_compliance_reminder_emails():
     return stats
 
 
+# Columns copied into each application row of a monthly PUR draft.
+PUR_REPORT_COLUMNS = (
+    'application_date', 'field__farm__name', 'field__name',
+    'product__product_name', 'product__epa_registration_number',
+    'amount_used', 'unit_of_measure', 'acres_treated', 'application_method',
+)
+
+
+def _pur_report_rows(applications):
+    """Yield monthly PUR draft rows from flat values, read in chunks."""
+    from api.view_helpers import EXPORT_CHUNK_SIZE
+
+    rows = applications.order_by('application_date', 'id').values(*PUR_REPORT_COLUMNS)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            'date': row['application_date'].isoformat(),
+            'farm': row['field__farm__name'],
+            'field': row['field__name'],
+            'product': row['product__product_name'],
+            'epa_reg_no': row['product__epa_registration_number'],
+            'amount_used': str(row['amount_used']) if row['amount_used'] is not None else None,
+            'unit_of_measure': row['unit_of_measure'],
+            'acres_treated': str(row['acres_treated']) if row['acres_treated'] is not None else None,
+            'application_method': row['application_method'],
+        }
+
+
+MONTHLY_PUR_REPORT_STATS = {
+    'reports_generated': 0,
+    'companies_skipped': 0,
+}
+
+
+def _pur_reporting_profiles():
+    from api.models import ComplianceProfile
+
+    return ComplianceProfile.objects.filter(
+        requires_pur_reporting=True,
+        primary_state='CA',
+    )
+
+
 @shared_task
 def auto_generate_monthly_pur_report(company_id: int = None):
     """
     Auto-generate draft PUR report on the 1st of each month.
 
     Creates a ComplianceReport with status 'draft' containing
-    all pesticide applications from the previous month.
+    all pesticide applications from the previous month, plus the
+    PURReportGenerator summary totals and validation counts so
+    reviewers see whether it needs fixing before submission. The
+    messages themselves come from validate_for_pur() when the
+    report is reviewed.
 
     Args:
-        company_id: Optional - generate for single company, or all if None
+        company_id: Optional - generate for single company, or fan out
+            one subtask per PUR-reporting company if None
 
     Returns:
         Dictionary with generation statistics
     """
-    from api.models import (
-        Company, ComplianceProfile, ComplianceReport,
-        PesticideApplication
+    if company_id is None:
+        return fan_out_by_company(
+            auto_generate_monthly_pur_report,
+            _pur_reporting_profiles().values_list('company_id', flat=True),
+            MONTHLY_PUR_REPORT_STATS,
+        )
+    return run_for_company(
+        auto_generate_monthly_pur_report, company_id, _generate_monthly_pur_report_for_company
     )
-    from django.db.models import Sum, Count
+
+
+def _generate_monthly_pur_report_for_company(company_id):
+    from api.models import ComplianceReport, PesticideApplication
+    from api.pur_reporting import PURReportGenerator
 
     today = timezone.now().date()
-    stats = {
-        'reports_generated': 0,
-        'companies_skipped': 0,
-    }
+    stats = dict(MONTHLY_PUR_REPORT_STATS)
 
     # Determine reporting period (previous month)
     if today.month == 1:
@@ -665,20 +790,9 @@ def auto_generate_monthly_pur_report(company_id: int = None):
 
     period_end = today.replace(day=1) - timedelta(days=1)
 
-    # Get companies requiring PUR
-    if company_id:
-        profiles = ComplianceProfile.objects.filter(
-            company_id=company_id,
-            requires_pur_reporting=True,
-            primary_state='CA',
-        )
-    else:
-        profiles = ComplianceProfile.objects.filter(
-            requires_pur_reporting=True,
-            primary_state='CA',
-        )
-
-    profiles = profiles.select_related('company')
+    profiles = _pur_reporting_profiles().filter(
+        company_id=company_id
+    ).select_related('company')
 
     for profile in profiles:
         company = profile.company
@@ -700,28 +814,22 @@ def auto_generate_monthly_pur_report(company_id: int = None):
             field__farm__company=company,
             application_date__gte=period_start,
             application_date__lte=period_end,
-        ).select_related('field', 'field__farm', 'product')
+        )
+        generator = PURReportGenerator(applications)
+        rows = list(_pur_report_rows(applications))
+        summary = generator.summary_totals()
+        # JSONField can't hold Decimal
+        summary['total_acres_treated'] = float(summary['total_acres_treated'])
 
         # Build report data
         report_data = {
             'reporting_period': f"{period_start.strftime('%B %Y')}",
-            'total_applications': applications.count(),
-            'applications': [],
+            'total_applications': len(rows),
+            'applications': rows,
+            'summary': summary,
+            'validation': generator.validation_counts(),
         }
 
-        for app in applications:
-            report_data['applications'].append({
-                'date': app.application_date.isoformat(),
-                'farm': app.field.farm.name if app.field and app.field.farm else None,
-                'field': app.field.name if app.field else None,
-                'product': app.product.product_name if app.product else None,
-                'epa_reg_no': app.product.epa_registration_number if app.product else None,
-                'amount_used': str(app.amount_used) if app.amount_used is not None else None,
-                'unit_of_measure': app.unit_of_measure,
-                'acres_treated': str(app.acres_treated) if app.acres_treated is not None else None,
-                'application_method': app.application_method,
-            })
-
         # Create the report
         ComplianceReport.objects.create(
             company=company,
@@ -735,10 +843,14 @@ def auto_generate_monthly_pur_report(company_id: int = None):
         stats['reports_generated'] += 1
         logger.info(f"Generated draft PUR report for {company.name}")
 
-    logger.info(f"PUR report generation complete: {stats}")
+    logger.info(f"PUR report generation complete for company {company_id}: {stats}")
     return stats
 
 
+# Rows inserted per bulk_create statement when backfilling REI postings.
+REI_POSTING_BATCH_SIZE = 1000
+
+
 @shared_task
 def generate_rei_posting_records():
     """
@@ -747,11 +859,16 @@ def generate_rei_posting_records():
     Checks for applications without REI posting records and creates them.
     Calculates REI end time based on product REI hours.
 
+    End times for every pending application are computed in one pass over
+    flat values and inserted with REIPostingRecord.bulk_insert(), so a
+    posting created concurrently (or by an overlapping run) is skipped
+    rather than failing the batch, and isn't counted in records_created.
+    Events go through the batched ApplicationEvent.sync_rei_postings().
+
     Returns:
         Dictionary with generation statistics
     """
-    from api.models import PesticideApplication, REIPostingRecord
-    from django.db.models import Q
+    from api.models import ApplicationEvent, PesticideApplication, REIPostingRecord
 
     stats = {
         'applications_checked': 0,
@@ -760,54 +877,54 @@ def generate_rei_posting_records():
 
     # Get applications without REI posting records
     # that have a product with REI > 0
-    applications = PesticideApplication.objects.filter(
+    pending = PesticideApplication.objects.filter(
         rei_posting__isnull=True,
         product__rei_hours__gt=0,
-    ).select_related('product', 'field')
-
-    for app in applications:
-        stats['applications_checked'] += 1
+    ).order_by().values_list('id', 'application_date', 'start_time', 'product__rei_hours')
 
+    records = []
+    for app_id, application_date, start_time, product_rei_hours in pending:
         # REI clock starts when the application starts; fall back to
         # midnight when no start time was recorded.
-        from datetime import datetime, time
         app_time = timezone.make_aware(
-            datetime.combine(app.application_date, app.start_time or time(0, 0))
+            datetime.combine(application_date, start_time or time(0, 0))
         )
-
-        rei_hours = int(app.product.rei_hours or 0)
-        rei_end = app_time + timedelta(hours=rei_hours)
-
-        REIPostingRecord.objects.create(
-            application=app,
+        rei_hours = int(product_rei_hours or 0)
+        records.append(REIPostingRecord(
+            application_id=app_id,
             rei_hours=rei_hours,
-            rei_end_datetime=rei_end,
+            rei_end_datetime=app_time + timedelta(hours=rei_hours),
             posting_compliant=False,  # Not yet posted
-        )
+        ))
 
-        stats['records_created'] += 1
+    stats['applications_checked'] += len(records)
+    stats['records_created'] += REIPostingRecord.bulk_insert(
+        records, 'application', batch_size=REI_POSTING_BATCH_SIZE,
+    )
 
     # Tank-mix ApplicationEvents: normally synced at save time, but PDF
     # imports set rei_hours directly — backfill any event whose REI is
     # still running and has no posting yet.
-    from api.models import ApplicationEvent
-
-    events = ApplicationEvent.objects.filter(
+    events = list(ApplicationEvent.objects.filter(
         rei_posting__isnull=True,
         rei_hours__gt=0,
-    ).select_related('farm')
+    ).order_by().only('id', 'rei_hours', 'date_started'))
 
-    for event in events:
-        stats['applications_checked'] += 1
-        if event.sync_rei_posting() is not None:
-            stats['records_created'] += 1
+    stats['applications_checked'] += len(events)
+    stats['records_created'] += ApplicationEvent.sync_rei_postings(events)
 
     logger.info(f"REI posting record generation complete: {stats}")
     return stats
 
 
+ACTIVE_REI_STATS = {
+    'records_checked': 0,
+    'alerts_created': 0,
+}
+
+
 @shared_task
-def check_active_reis():
+def check_active_reis(company_id: int = None):
     """
     Check active REI postings and generate alerts when REI is ending soon.
 
@@ -815,21 +932,41 @@ def check_active_reis():
     - REI ending in less than 2 hours
     - REI has ended but posting not removed
 
+    Args:
+        company_id: Optional - check one company, or fan out one subtask
+            per company with active postings if None
+
     Returns:
         Dictionary with processing statistics
     """
-    from api.models import REIPostingRecord, ComplianceAlert
+    from api.models import REIPostingRecord
+
+    if company_id is None:
+        # Postings carry no company of their own; it comes from the
+        # application's farm or the event's farm.
+        active = REIPostingRecord.objects.filter(removed_at__isnull=True)
+        company_ids = set(active.filter(application__isnull=False).values_list(
+            'application__field__farm__company_id', flat=True
+        ))
+        company_ids.update(active.filter(event__isnull=False).values_list(
+            'event__farm__company_id', flat=True
+        ))
+        return fan_out_by_company(check_active_reis, company_ids, ACTIVE_REI_STATS)
+    return run_for_company(check_active_reis, company_id, _check_active_reis_for_company)
+
+
+def _check_active_reis_for_company(company_id):
+    from api.models import REIPostingRecord
 
     now = timezone.now()
     two_hours_from_now = now + timedelta(hours=2)
-    stats = {
-        'records_checked': 0,
-        'alerts_created': 0,
-    }
+    stats = dict(ACTIVE_REI_STATS)
 
     # Get active REI postings (not yet removed) — both legacy applications
     # and tank-mix events
     active_reis = REIPostingRecord.objects.filter(
+        Q(application__field__farm__company_id=company_id)
+        | Q(event__farm__company_id=company_id),
         removed_at__isnull=True,
     ).select_related(
         'application',
@@ -851,7 +988,7 @@ def check_active_reis():
             _create_rei_alert(rei, 'medium', 'ending_soon')
             stats['alerts_created'] += 1
 
-    logger.info(f"Active REI check complete: {stats}")
+    logger.info(f"Active REI check complete for company {company_id}: {stats}")
     return stats
 
 
@@ -1038,8 +1175,17 @@ def cleanup_old_alerts(days_old: int = 90):
     return {'deleted_alerts': deleted}
 
 
+PHI_UPCOMING_HARVEST_STATS = {
+    'harvests_checked': 0,
+    'compliant': 0,
+    'warning': 0,
+    'non_compliant': 0,
+    'alerts_created': 0,
+}
+
+
 @shared_task
-def check_phi_compliance_for_upcoming_harvests():
+def check_phi_compliance_for_upcoming_harvests(company_id: int = None):
     """
     Daily task to check PHI compliance for harvests scheduled in the next 7 days.
 
@@ -1048,25 +1194,43 @@ def check_phi_compliance_for_upcoming_harvests():
     2. Run PHI compliance check for each
     3. Generate alerts for non-compliant harvests
 
+    Args:
+        company_id: Optional - check one company, or fan out one subtask
+            per company with upcoming harvests if None
+
     Returns:
         Dictionary with processing statistics
     """
-    from api.models import Harvest, PHIComplianceCheck, ComplianceAlert
+    from api.models import Harvest
+
+    if company_id is None:
+        today = date.today()
+        return fan_out_by_company(
+            check_phi_compliance_for_upcoming_harvests,
+            Harvest.objects.filter(
+                harvest_date__gte=today,
+                harvest_date__lte=today + timedelta(days=7),
+            ).values_list('field__farm__company_id', flat=True).distinct(),
+            PHI_UPCOMING_HARVEST_STATS,
+        )
+    return run_for_company(
+        check_phi_compliance_for_upcoming_harvests, company_id,
+        _check_phi_compliance_for_company,
+    )
+
+
+def _check_phi_compliance_for_company(company_id):
+    from api.models import Harvest, PHIComplianceCheck
     from api.services.compliance.phi_compliance import FSMAPHIComplianceService
 
     today = date.today()
     week_ahead = today + timedelta(days=7)
 
-    stats = {
-        'harvests_checked': 0,
-        'compliant': 0,
-        'warning': 0,
-        'non_compliant': 0,
-        'alerts_created': 0,
-    }
+    stats = dict(PHI_UPCOMING_HARVEST_STATS)
 
     # Find upcoming harvests without PHI checks
     upcoming_harvests = Harvest.objects.filter(
+        field__farm__company_id=company_id,
         harvest_date__gte=today,
         harvest_date__lte=week_ahead,
     ).select_related('field', 'field__farm', 'field__farm__company')
@@ -1095,7 +1259,7 @@ def check_phi_compliance_for_upcoming_harvests():
             _create_phi_alert(harvest, phi_check, 'critical')
             stats['alerts_created'] += 1
 
-    logger.info(f"PHI compliance check for upcoming harvests complete: {stats}")
+    logger.info(f"PHI compliance check for upcoming harvests complete for company {company_id}: {stats}")
     return stats
 
 
@@ -0,0 +1,149 @@
+"""
+Per-company fan-out for the compliance beat schedule.
+
+Each compliance beat task accepts an optional ``company_id``. Called without
+one (as beat does) it only works out which companies have something to do
+and dispatches a chord: a group of one subtask per company, whose stats
+dicts are summed by ``merge_company_stats`` into the same shape the task
+used to return for the whole run. A big tenant now occupies one worker slot
+for its own subtask instead of holding up every other company, and each
+subtask gets the full task time limit to itself.
+
+Each per-company run holds a lock keyed by task and company, so a run that
+overlaps the previous one — a slow beat cycle, a manual retry, or a view
+calling the task synchronously — skips companies still being processed
+rather than processing them twice. Skips are counted as
+``companies_locked`` in the merged stats. On PostgreSQL the lock is a
+session advisory lock, visible to every worker and web process and
+released by the database if its holder dies; other backends fall back to
+the default cache.
+
+Under CELERY_TASK_ALWAYS_EAGER (tests, local scripts) the chord runs inline
+and the dispatcher returns the merged stats directly.
+"""
+
+import logging
+import uuid
+from contextlib import contextmanager
+
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = 'company-task-lock'
+
+# Locks held by this process. Advisory locks are re-entrant within a
+# session, so a nested attempt has to be refused here.
+_held = set()
+
+
+def _lock_timeout():
+    # Never outlive a worker that died mid-run by more than one hard limit.
+    return getattr(settings, 'CELERY_TASK_TIME_LIMIT', 30 * 60)
+
+
+@contextmanager
+def company_lock(task_name, company_id):
+    """
+    Hold the per-company lock for ``task_name`` while the block runs.
+
+    Yields True when the lock was acquired, False when another run holds
+    it. The lock is only released by the run that took it.
+    """
+    key = f'{LOCK_PREFIX}:{task_name}:{company_id}'
+    if key in _held:
+        yield False
+        return
+    backend_lock = _advisory_lock if connection.vendor == 'postgresql' else _cache_lock
+    with backend_lock(key) as acquired:
+        if not acquired:
+            yield False
+            return
+        _held.add(key)
+        try:
+            yield True
+        finally:
+            _held.discard(key)
+
+
+@contextmanager
+def _advisory_lock(key):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(hashtextextended(%s, 0))', [key])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(hashtextextended(%s, 0))', [key])
+
+
+@contextmanager
+def _cache_lock(key):
+    token = uuid.uuid4().hex
+    acquired = cache.add(key, token, timeout=_lock_timeout())
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+def is_locked_out(stats):
+    """True when ``run_for_company`` skipped the company because it was locked."""
+    return bool(stats.get('companies_locked'))
+
+
+def run_for_company(task, company_id, func):
+    """
+    Run ``func(company_id)`` under the company lock and return its stats.
+
+    Returns ``{'companies_locked': 1}`` without calling ``func`` when an
+    overlapping run already holds the lock.
+    """
+    with company_lock(task.name, company_id) as acquired:
+        if not acquired:
+            logger.info(f"{task.name}: company {company_id} already being processed; skipping")
+            return {'companies_locked': 1}
+        return func(company_id)
+
+
+def fan_out_by_company(task, company_ids, empty_stats):
+    """
+    Dispatch ``task(company_id=...)`` for each company as a chord whose
+    callback sums the per-company stats.
+
+    ``empty_stats`` is returned as-is when there is nothing to dispatch.
+    Returns the merged stats when running eagerly, otherwise a summary of
+    what was dispatched.
+    """
+    company_ids = sorted({cid for cid in company_ids if cid is not None})
+    if not company_ids:
+        logger.info(f"{task.name}: no companies to process")
+        return dict(empty_stats)
+
+    header = group(task.s(company_id=cid) for cid in company_ids)
+    result = chord(header)(
+        merge_company_stats.s(task_name=task.name, empty_stats=empty_stats)
+    )
+
+    if task.app.conf.task_always_eager:
+        return result.get()
+
+    logger.info(f"{task.name}: dispatched {len(company_ids)} per-company subtasks")
+    return {'companies_dispatched': len(company_ids), 'chord_id': result.id}
+
+
+@shared_task
+def merge_company_stats(results, task_name, empty_stats=None):
+    """Chord callback: sum per-company stats dicts key by key."""
+    merged = dict(empty_stats or {})
+    for stats in results:
+        for key, value in (stats or {}).items():
+            merged[key] = merged.get(key, 0) + value
+    logger.info(f"{task_name} complete across {len(results)} companies: {merged}")
+    return merged
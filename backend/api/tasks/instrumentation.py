@@ -0,0 +1,121 @@
+"""
+Per-run instrumentation for every Celery task in api.tasks.
+
+Connected to Celery's task_prerun/task_postrun signals, so each run is
+measured without touching the task bodies:
+
+  - wall time of the run
+  - database query count and time spent in the database, via a
+    connection execute wrapper installed for the duration of the run
+  - rows processed, read from the stats dict the task returns (see
+    rows_processed())
+
+One TaskRunMetric row is written per run. Recording failures are logged
+and never affect the task. Direct calls (``task()``) bypass Celery's tracer
+and are not recorded; worker runs and eager ``apply()`` runs are.
+"""
+
+import logging
+import threading
+import time
+
+from celery.signals import task_postrun, task_prerun
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTED_PREFIX = 'api.tasks.'
+
+# Stats-dict key suffixes that count rows, in order of preference: a task
+# that reports both "licenses_checked" and "alerts_created" worked through
+# the licenses.
+ROW_KEY_SUFFIXES = ('_checked', '_processed', '_created', '_generated')
+
+_state = threading.local()
+
+
+class QueryTimer:
+    """Connection execute wrapper counting queries and their total time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def rows_processed(result):
+    """
+    Rows a run worked through, taken from its stats dict.
+
+    An explicit ``rows_processed`` key wins; otherwise the values of the
+    first ROW_KEY_SUFFIXES group present are summed. None when the task
+    returns no dict or no matching key.
+    """
+    if not isinstance(result, dict):
+        return None
+    if isinstance(result.get('rows_processed'), int):
+        return result['rows_processed']
+    for suffix in ROW_KEY_SUFFIXES:
+        values = [
+            value for key, value in result.items()
+            if key.endswith(suffix) and isinstance(value, int) and not isinstance(value, bool)
+        ]
+        if values:
+            return sum(values)
+    return None
+
+
+def _runs():
+    if not hasattr(_state, 'runs'):
+        _state.runs = {}
+    return _state.runs
+
+
+@task_prerun.connect
+def start_task_run(sender=None, task_id=None, task=None, **kwargs):
+    if not task or not task.name.startswith(INSTRUMENTED_PREFIX):
+        return
+    timer = QueryTimer()
+    connection.execute_wrappers.append(timer)
+    _runs()[task_id] = (timezone.now(), time.perf_counter(), timer)
+
+
+@task_postrun.connect
+def finish_task_run(sender=None, task_id=None, task=None, kwargs=None,
+                    retval=None, state=None, **extra):
+    run = _runs().pop(task_id, None)
+    if run is None:
+        return
+    started_at, started, timer = run
+    duration = time.perf_counter() - started
+    if timer in connection.execute_wrappers:
+        connection.execute_wrappers.remove(timer)
+
+    status = {'SUCCESS': 'success', 'RETRY': 'retry'}.get(state, 'failure')
+    try:
+        from api.models import TaskRunMetric
+
+        # Savepoint so a failed insert can't break a surrounding transaction
+        # (eager runs inside a request or test).
+        with transaction.atomic():
+            TaskRunMetric.objects.create(
+                task_name=task.name,
+                task_id=task_id or '',
+                company_id=(kwargs or {}).get('company_id'),
+                status=status,
+                started_at=started_at,
+                duration_ms=duration * 1000,
+                query_count=timer.count,
+                query_time_ms=timer.seconds * 1000,
+                rows_processed=rows_processed(retval) if status == 'success' else None,
+            )
+    except Exception:
+        logger.exception(f"Could not record run metrics for {task.name}")
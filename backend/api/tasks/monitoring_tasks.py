@@ -0,0 +1,31 @@
+"""
+Celery tasks for task-run metric housekeeping.
+"""
+
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def prune_task_run_metrics(days: int = None):
+    """
+    Daily task to delete TaskRunMetric rows older than
+    TASK_METRIC_RETENTION_DAYS (or ``days`` when given).
+
+    Returns:
+        Dictionary with processing statistics
+    """
+    from api.services.task_metrics import prune_task_runs
+
+    days = days or getattr(settings, 'TASK_METRIC_RETENTION_DAYS', 30)
+    deleted = prune_task_runs(timezone.now() - timedelta(days=days))
+
+    stats = {'metrics_deleted': deleted}
+    logger.info(f"Task run metric pruning complete: {stats}")
+    return stats
@@ -0,0 +1,166 @@
+"""
+Tests for the analytics dashboard endpoint: figures, a fixed query count,
+and the per-company data-version cache.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import HarvestLabor, HarvestLoad, LaborContractor, WaterTest
+from api.services.dashboard_cache import bump_data_version, get_data_version
+from api.tests.factories import TestDataFactory
+
+URL = '/api/analytics/dashboard/'
+WINDOW = {'start_date': '2026-01-01', 'end_date': '2026-12-31'}
+
+
+class AnalyticsDashboardTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.farm = self.factory.create_farm(self.company)
+        self.contractor = LaborContractor.objects.create(
+            company=self.company, company_name='Valley Crews',
+        )
+
+    def _harvested_field(self, crop='navel_orange', bins=100, revenue='5000', cost='1200'):
+        field = self.factory.create_field(self.farm)
+        harvest = self.factory.create_harvest(
+            field, harvest_date=date(2026, 3, 10), crop_variety=crop,
+            total_bins=bins, acres_harvested=Decimal('10.00'),
+        )
+        HarvestLoad.objects.create(harvest=harvest, bins=bins, total_revenue=Decimal(revenue))
+        # Two crews from one contractor on the same harvest
+        for _ in range(2):
+            HarvestLabor.objects.create(
+                harvest=harvest, contractor=self.contractor, crew_name='A',
+                total_hours=Decimal('5'), total_labor_cost=Decimal(cost) / 2,
+            )
+        return field
+
+    def _get(self, **params):
+        response = self.client.get(URL, {**WINDOW, **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('_error', response.data)
+        return response.data
+
+    def test_figures(self):
+        self._harvested_field(crop='navel_orange', bins=100, revenue='5000', cost='1200')
+        self._harvested_field(crop='lemon', bins=50, revenue='1000', cost='1500')
+        field = self.factory.create_field(self.farm)
+        self.factory.create_application(
+            field, application_date=date(2026, 2, 5), status='complete', submitted_to_pur=True,
+        )
+        self.factory.create_application(
+            field, application_date=date(2026, 2, 6), status='pending_signature',
+        )
+        source = self.factory.create_water_source(farm=self.farm, test_frequency_days=90)
+        for status in ('pass', 'pass', 'fail'):
+            WaterTest.objects.create(
+                water_source=source, test_date=date(2026, 1, 15),
+                test_type='microbial', status=status,
+            )
+
+        data = self._get()
+
+        financial = data['financial']
+        self.assertEqual(financial['total_revenue'], 6000.0)
+        self.assertEqual(financial['total_labor_cost'], 2700.0)
+        self.assertEqual(financial['total_labor_hours'], 20.0)
+        self.assertEqual(financial['cost_per_bin'], 18.0)
+        self.assertEqual(data['harvests']['total_bins'], 150)
+        self.assertEqual(
+            [(c['crop'], c['revenue'], c['bins']) for c in data['harvests']['by_crop']],
+            [('navel_orange', 5000.0, 100), ('lemon', 1000.0, 50)],
+        )
+        self.assertEqual(data['contractors'], [{
+            'name': 'Valley Crews', 'bins': 150, 'cost': 2700.0, 'hours': 20.0,
+            'cost_per_bin': 18.0, 'bins_per_hour': 7.5,
+        }])
+        self.assertEqual(
+            {k: data['applications'][k] for k in ('total', 'pending', 'complete', 'submitted_to_pur')},
+            {'total': 2, 'pending': 1, 'complete': 1, 'submitted_to_pur': 1},
+        )
+        self.assertEqual(data['applications']['by_month'][1], {'month': 'Feb', 'count': 2})
+        self.assertEqual(data['water']['tests_total'], 3)
+        self.assertEqual(data['water']['tests_passed'], 2)
+        self.assertEqual(data['water']['tests_failed'], 1)
+        self.assertEqual(data['water']['tests_due_soon'], 1)
+        self.assertEqual(data['fields']['total'], 3)
+        self.assertEqual(
+            [(f['bins'], f['profit']) for f in data['fields']['all_performance']],
+            [(100, 3800.0), (50, -500.0)],
+        )
+        self.assertEqual(
+            data['fields']['needs_attention'][0]['issue'],
+            'Low yield (5.0 vs avg 7.5), Negative profit',
+        )
+
+    def test_query_count_does_not_grow_with_fields_or_crops(self):
+        self._harvested_field()
+        with CaptureQueriesContext(connection) as small:
+            self._get()
+
+        for i in range(8):
+            self._harvested_field(crop=f'crop-{i}')
+        with CaptureQueriesContext(connection) as large:
+            data = self._get()
+
+        self.assertEqual(len(data['fields']['all_performance']), 9)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        # 2 for the user's company, 11 for the dashboard
+        self.assertLessEqual(len(large.captured_queries), 13)
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=60)
+class AnalyticsDashboardCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.field = self.factory.create_field(self.factory.create_farm(self.company))
+
+    def _bins(self, **params):
+        return self.client.get(URL, {**WINDOW, **params}).data['harvests']['total_bins']
+
+    def test_warm_request_skips_dashboard_queries(self):
+        with CaptureQueriesContext(connection) as cold:
+            self._bins()
+        with CaptureQueriesContext(connection) as warm:
+            self._bins()
+
+        self.assertLess(len(warm.captured_queries), len(cold.captured_queries) - 8)
+
+    def test_write_invalidates_after_commit(self):
+        self.assertEqual(self._bins(), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.factory.create_harvest(self.field, harvest_date=date(2026, 5, 1), total_bins=40)
+
+        self.assertEqual(self._bins(), 40)
+
+    def test_key_includes_window_and_filters(self):
+        self.factory.create_harvest(self.field, harvest_date=date(2026, 5, 1), total_bins=40)
+        bump_data_version(self.company.id)
+
+        self.assertEqual(self._bins(), 40)
+        self.assertEqual(self._bins(end_date='2026-04-30'), 0)
+        self.assertEqual(self._bins(farm_id=self.factory.create_farm(self.company).id), 0)
+
+    def test_versions_are_per_company(self):
+        other = self.factory.create_company()
+        before = get_data_version(other.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.factory.create_harvest(self.field, harvest_date=date.today() - timedelta(days=1))
+
+        self.assertEqual(get_data_version(other.id), before)
@@ -0,0 +1,173 @@
+"""
+Tests for AuditLog retention tiers.
+
+On SQLite these cover the unpartitioned fallback: cold months are archived
+to gzip JSONL in storage and range-deleted, while recent months and the
+daily counters are left alone. Tests that need the partitioned PostgreSQL
+table skip themselves elsewhere. There, rows are written and checked under
+the company's RLS context while archival runs without one, as the Celery
+task does.
+"""
+
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import AuditLog, AuditLogDailyCount
+from api.rls_middleware import RLSContextManager
+from api.services import audit_partitions
+from api.tests.factories import TestDataFactory
+
+
+class AuditPartitionHelperTests(TestCase):
+
+    def test_shift_month_wraps_years(self):
+        self.assertEqual(audit_partitions.shift_month(2025, 11, 3), (2026, 2))
+        self.assertEqual(audit_partitions.shift_month(2025, 1, -1), (2024, 12))
+        self.assertEqual(audit_partitions.shift_month(2025, 6, -24), (2023, 6))
+
+    def test_partition_name(self):
+        self.assertEqual(
+            audit_partitions.partition_name(2026, 3), 'api_auditlog_p2026_03'
+        )
+
+    def test_month_start_is_local_midnight(self):
+        start = timezone.localtime(audit_partitions.month_start(2026, 7))
+        self.assertEqual((start.day, start.hour, start.minute), (1, 0, 0))
+
+    def test_ensure_partitions_is_noop_without_partitioning(self):
+        if audit_partitions.is_partitioned():
+            self.skipTest('api_auditlog is partitioned')
+        self.assertFalse(audit_partitions.is_partitioned())
+        self.assertEqual(audit_partitions.ensure_partitions(), [])
+
+
+class AuditArchiveTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.storage_dir = tempfile.mkdtemp()
+        self.storage = FileSystemStorage(location=self.storage_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.storage_dir, ignore_errors=True)
+
+    def _log_at(self, when, **kwargs):
+        with RLSContextManager(self.company.id):
+            log = AuditLog.objects.create(
+                user=self.user, company=self.company, action='update',
+                model_name='Farm', **kwargs,
+            )
+            AuditLog.objects.filter(pk=log.pk).update(timestamp=when)
+        return log
+
+    def _remaining_ids(self):
+        with RLSContextManager(self.company.id):
+            return set(AuditLog.objects.values_list('id', flat=True))
+
+    def _old_partition(self):
+        """Attach a monthly partition past a 12 month retention."""
+        if not audit_partitions.is_partitioned():
+            self.skipTest('needs the partitioned PostgreSQL table')
+        today = timezone.localdate()
+        year, month = audit_partitions.shift_month(today.year, today.month, -14)
+        if (year, month) not in audit_partitions.existing_partitions():
+            audit_partitions._create_partition(year, month)
+        return year, month
+
+    def _flush_deferred_checks(self):
+        # Rows inserted inside the test transaction leave deferred FK
+        # checks pending, which would block dropping their partition.
+        with connection.cursor() as cursor:
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+    def test_archives_only_months_past_retention(self):
+        now = timezone.now()
+        old = [self._log_at(now - timedelta(days=400 + i), object_id=str(i)) for i in range(3)]
+        recent = self._log_at(now - timedelta(days=10))
+
+        archived = audit_partitions.archive_partitions(retention=12, storage=self.storage)
+
+        self.assertEqual(sum(a.rows for a in archived), 3)
+        self.assertEqual(self._remaining_ids(), {recent.id})
+
+        archived_ids = set()
+        for item in archived:
+            with self.storage.open(item.path) as fh:
+                for line in gzip.decompress(fh.read()).splitlines():
+                    row = json.loads(line)
+                    archived_ids.add(row['id'])
+                    self.assertEqual(row['company_id'], self.company.id)
+        self.assertEqual(archived_ids, {log.id for log in old})
+
+    def test_counters_survive_archival(self):
+        self._log_at(timezone.now() - timedelta(days=500))
+        counted = AuditLogDailyCount.objects.filter(company=self.company).count()
+
+        audit_partitions.archive_partitions(retention=12, storage=self.storage)
+
+        self.assertEqual(
+            AuditLogDailyCount.objects.filter(company=self.company).count(), counted
+        )
+
+    def test_nothing_to_archive(self):
+        log = self._log_at(timezone.now())
+        self.assertEqual(
+            audit_partitions.archive_partitions(retention=12, storage=self.storage), []
+        )
+        self.assertEqual(self._remaining_ids(), {log.id})
+
+    def test_default_partition_rows_are_archived(self):
+        if not audit_partitions.is_partitioned():
+            self.skipTest('needs the partitioned PostgreSQL table')
+        # Older than every monthly partition, so it lands in DEFAULT
+        when = timezone.now() - timedelta(days=365 * 30)
+        stray = self._log_at(when)
+
+        archived = audit_partitions.archive_partitions(retention=12, storage=self.storage)
+
+        self.assertIn(timezone.localtime(when).strftime('%Y-%m'), [a.month for a in archived])
+        self.assertNotIn(stray.pk, self._remaining_ids())
+
+    def test_partition_is_archived_and_dropped(self):
+        year, month = self._old_partition()
+        when = audit_partitions.month_start(year, month) + timedelta(days=3)
+        logs = [self._log_at(when, object_id=str(i)) for i in range(2)]
+        self._flush_deferred_checks()
+
+        archived = audit_partitions.archive_partitions(retention=12, storage=self.storage)
+
+        item = next(a for a in archived if a.month == f'{year:04d}-{month:02d}')
+        with self.storage.open(item.path) as fh:
+            ids = {json.loads(line)['id'] for line in gzip.decompress(fh.read()).splitlines()}
+        self.assertEqual(ids, {log.id for log in logs})
+        self.assertNotIn((year, month), audit_partitions.existing_partitions())
+        self.assertFalse(self._remaining_ids() & ids)
+
+    def test_partition_kept_when_archive_is_short(self):
+        year, month = self._old_partition()
+        when = audit_partitions.month_start(year, month) + timedelta(days=3)
+        logs = [self._log_at(when, object_id=str(i)) for i in range(2)]
+        self._flush_deferred_checks()
+        table_rows = audit_partitions._table_rows
+
+        def drop_first(*args):
+            rows = table_rows(*args)
+            next(rows, None)
+            return rows
+
+        with mock.patch.object(audit_partitions, '_table_rows', side_effect=drop_first):
+            archived = audit_partitions.archive_partitions(retention=12, storage=self.storage)
+
+        self.assertNotIn(f'{year:04d}-{month:02d}', [a.month for a in archived])
+        self.assertIn((year, month), audit_partitions.existing_partitions())
+        self.assertLessEqual({log.id for log in logs}, self._remaining_ids())
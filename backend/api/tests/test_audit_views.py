@@ -0,0 +1,314 @@
+"""
+Tests for the audit log list (cursor mode), streaming export and
+counter-backed statistics endpoints.
+"""
+
+import csv
+import io
+from datetime import datetime, time, timedelta
+
+import openpyxl
+from django.db import IntegrityError, connection, models as db_models, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import AuditLog, AuditLogDailyCount
+from api.rls_middleware import RLSContextManager
+from api.services import audit_activity
+from api.tests.factories import TestDataFactory
+
+
+def _make_logs(company, user, count, base=None):
+    """Create ``count`` audit entries with distinct, descending timestamps."""
+    base = base or timezone.now()
+    logs = AuditLog.objects.bulk_create([
+        AuditLog(
+            user=user, company=company, action='update',
+            model_name='Farm', object_id=str(i), object_repr=f'Farm {i}',
+        )
+        for i in range(count)
+    ])
+    # auto_now_add ignores explicit values on create; set timestamps after.
+    for i, log in enumerate(logs):
+        log.timestamp = base - timedelta(minutes=i)
+    AuditLog.objects.bulk_update(logs, ['timestamp'])
+    return logs
+
+
+class AuditLogCursorPaginationTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+
+    def _walk(self, params):
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get(
+                '/api/audit-logs/', {**params, 'cursor': cursor}
+            )
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.data['results'])
+            if not response.data['has_next']:
+                return seen
+            cursor = response.data['next_cursor']
+
+    def test_cursor_walk_visits_every_row_once_in_order(self):
+        _make_logs(self.company, self.user, 23)
+        expected = list(
+            AuditLog.objects.filter(company=self.company)
+            .order_by('-timestamp', '-id').values_list('id', flat=True)
+        )
+
+        seen = self._walk({'page_size': 5})
+
+        self.assertEqual(seen, expected)
+
+    def test_cursor_walk_handles_timestamp_ties(self):
+        logs = _make_logs(self.company, self.user, 12)
+        AuditLog.objects.filter(id__in=[l.id for l in logs]).update(
+            timestamp=logs[0].timestamp
+        )
+
+        seen = self._walk({'page_size': 5, 'ordering': 'timestamp'})
+
+        self.assertEqual(seen, sorted(l.id for l in logs))
+
+    def test_cursor_mode_respects_filters(self):
+        _make_logs(self.company, self.user, 6)
+        AuditLog.objects.create(
+            user=self.user, company=self.company, action='delete',
+            model_name='Field', object_repr='Gone',
+        )
+
+        seen = self._walk({'page_size': 2, 'action': 'delete'})
+
+        self.assertEqual(len(seen), 1)
+
+    def test_invalid_cursor_returns_400(self):
+        response = self.client.get('/api/audit-logs/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_offset_mode_unchanged(self):
+        _make_logs(self.company, self.user, 7)
+        response = self.client.get('/api/audit-logs/', {'page_size': 5, 'page': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+        self.assertEqual(len(response.data['results']), 2)
+
+
+class AuditLogExportTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        other_company, other_user = self.factory.create_company_with_user()
+        _make_logs(other_company, other_user, 3)
+
+    def test_csv_export_streams_all_rows(self):
+        _make_logs(self.company, self.user, 25)
+
+        response = self.client.get(
+            '/api/audit-logs/export/', {'export_format': 'csv'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0][0], 'Timestamp')
+        self.assertEqual(len(rows) - 1, 25)
+
+    def test_xlsx_export_has_no_row_cap_and_records_count(self):
+        _make_logs(self.company, self.user, 40)
+
+        response = self.client.get('/api/audit-logs/export/')
+
+        self.assertEqual(response.status_code, 200)
+        wb = openpyxl.load_workbook(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(wb['Audit Log'].max_row - 1, 40)
+        self.assertEqual(wb['Export Info']['B4'].value, 40)
+
+        export_log = AuditLog.objects.get(company=self.company, action='export')
+        self.assertEqual(export_log.changes['record_count'], 40)
+
+    def test_invalid_export_format_returns_400(self):
+        response = self.client.get(
+            '/api/audit-logs/export/', {'export_format': 'pdf'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class AuditLogDailyCountTests(TestCase):
+    """Counter-backed statistics must equal grouping AuditLog directly."""
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.other_user = self.factory.create_user(company=self.company)
+        self.client = self.factory.create_authenticated_client(self.user)
+
+        # 60 entries over ~20 days, mixed actions/models/users, written
+        # through create() so the post_save counter runs.
+        now = timezone.now()
+        actions = ['create', 'update', 'delete', 'export']
+        models = ['Farm', 'Field', 'Harvest']
+        for i in range(60):
+            log = AuditLog.objects.create(
+                user=[self.user, self.other_user, None][i % 3],
+                company=self.company,
+                action=actions[i % 4],
+                model_name=models[i % 3 if i % 5 else 0],
+            )
+            # auto_now_add pinned the timestamp to now; move it back and
+            # re-roll those days so counters follow.
+            AuditLog.objects.filter(pk=log.pk).update(
+                timestamp=now - timedelta(hours=7 * i)
+            )
+        audit_activity.rollup_daily_counts(
+            timezone.localdate(now - timedelta(days=30)), timezone.localdate(now)
+        )
+
+    def test_signal_increments_counter(self):
+        before = AuditLogDailyCount.objects.filter(company=self.company).aggregate(
+            n=db_models.Sum('count'))['n']
+        AuditLog.objects.create(
+            user=self.user, company=self.company, action='login', model_name='User',
+        )
+        after = AuditLogDailyCount.objects.filter(company=self.company).aggregate(
+            n=db_models.Sum('count'))['n']
+        self.assertEqual(after, before + 1)
+
+    def test_counters_match_raw_queries_over_date_ranges(self):
+        today = timezone.localdate()
+        ranges = [
+            (None, None),
+            (today - timedelta(days=3), None),
+            (None, today - timedelta(days=5)),
+            (today - timedelta(days=12), today - timedelta(days=2)),
+            (today - timedelta(days=1), today - timedelta(days=1)),
+            (today + timedelta(days=1), today + timedelta(days=4)),
+        ]
+        for first_day, last_day in ranges:
+            with self.subTest(first_day=first_day, last_day=last_day):
+                queryset = AuditLog.objects.filter(company=self.company)
+                if first_day:
+                    queryset = queryset.filter(timestamp__gte=timezone.make_aware(
+                        datetime.combine(first_day, time.min)))
+                if last_day:
+                    queryset = queryset.filter(timestamp__lt=timezone.make_aware(
+                        datetime.combine(last_day + timedelta(days=1), time.min)))
+
+                self.assertEqual(
+                    audit_activity.statistics_from_counters(self.company, first_day, last_day),
+                    audit_activity.statistics_from_logs(queryset),
+                )
+
+    def test_endpoint_uses_counters_for_whole_days(self):
+        today = timezone.localdate()
+        params = {
+            'start_date': (today - timedelta(days=6)).isoformat(),
+            'end_date': today.isoformat(),
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/audit-logs/statistics/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(
+            any('"api_auditlog"' in q['sql'] for q in ctx.captured_queries),
+            "Whole-day statistics should not scan AuditLog",
+        )
+        self.assertGreater(response.data['total_count'], 0)
+
+    def test_sub_day_bounds_fall_back_to_raw(self):
+        start = timezone.localtime() - timedelta(hours=30)
+        response = self.client.get(
+            '/api/audit-logs/statistics/', {'start_date': start.isoformat()}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data['total_count'],
+            AuditLog.objects.filter(company=self.company, timestamp__gte=start).count(),
+        )
+
+    def test_system_entries_share_one_counter(self):
+        today = timezone.localdate()
+        key = {
+            'company': self.company, 'day': today, 'action': 'submit',
+            'model_name': 'PURReport', 'user': None,
+        }
+        for _ in range(2):
+            AuditLog.objects.create(
+                user=None, company=self.company, action='submit', model_name='PURReport',
+            )
+
+        counter = AuditLogDailyCount.objects.get(**key)
+        self.assertEqual(counter.count, 2)
+        # A concurrent writer's insert collides instead of adding a second row
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AuditLogDailyCount.objects.create(count=1, **key)
+
+    def test_deleted_user_counters_fold_into_system_rows(self):
+        before = audit_activity.statistics_from_counters(self.company, None, None)
+        user_id = self.other_user.pk
+
+        self.other_user.delete()
+
+        self.assertFalse(AuditLogDailyCount.objects.filter(user_id=user_id).exists())
+        after = audit_activity.statistics_from_counters(self.company, None, None)
+        self.assertEqual(after['total_count'], before['total_count'])
+        self.assertEqual(
+            after,
+            audit_activity.statistics_from_logs(AuditLog.objects.filter(company=self.company)),
+        )
+
+    def test_releasing_counters_does_not_loop_per_row(self):
+        self.assertGreater(
+            AuditLogDailyCount.objects.filter(user=self.other_user).count(), 3
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            audit_activity.release_user_counters(self.other_user.pk)
+        statements = [q for q in ctx.captured_queries if 'SAVEPOINT' not in q['sql']]
+        self.assertEqual(len(statements), 3)
+
+
+class AuditRollupContextTests(TestCase):
+    """The nightly rollup runs outside any request, with no RLS context."""
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.companies = []
+        for _ in range(2):
+            company, user = self.factory.create_company_with_user()
+            self.companies.append(company)
+            with RLSContextManager(company.id):
+                for user_id in (user.id, user.id, None):
+                    AuditLog.objects.create(
+                        user_id=user_id, company=company, action='update', model_name='Farm',
+                    )
+                AuditLogDailyCount.objects.filter(company=company).delete()
+
+    def test_rollup_rebuilds_every_company(self):
+        today = timezone.localdate()
+
+        written = audit_activity.rollup_daily_counts(today, today)
+
+        self.assertEqual(written, 4)
+        for company in self.companies:
+            with RLSContextManager(company.id):
+                counts = dict(
+                    AuditLogDailyCount.objects.filter(company=company)
+                    .values_list('user_id', 'count')
+                )
+            self.assertEqual(sorted(counts.values()), [1, 2])
+
+    def test_rollup_leaves_no_context_behind(self):
+        today = timezone.localdate()
+        audit_activity.rollup_daily_counts(today, today)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT current_setting('app.current_company_id', true)")
+                self.assertEqual(cursor.fetchone()[0], '')
@@ -0,0 +1,185 @@
+"""
+Tests for the per-company fan-out of the compliance beat tasks.
+
+The test settings run Celery eagerly, so each beat task's group + chord
+executes inline and returns the merged stats.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import (
+    ApplicationEvent, ComplianceAlert, ComplianceDeadline, ComplianceProfile, License,
+    REIPostingRecord, WPSTrainingRecord,
+)
+from api.tasks.compliance_tasks import (
+    check_active_reis,
+    check_license_expirations,
+    check_wps_training_expirations,
+    generate_recurring_deadlines,
+)
+from api.tasks.fanout import company_lock, fan_out_by_company, merge_company_stats
+from api.tests.factories import TestDataFactory
+
+
+class FanOutHelperTests(TestCase):
+
+    def test_merge_sums_per_company_stats(self):
+        merged = merge_company_stats(
+            [{'alerts_created': 2, 'checked': 5}, {'alerts_created': 1, 'companies_locked': 1}],
+            task_name='t', empty_stats={'alerts_created': 0, 'checked': 0},
+        )
+        self.assertEqual(merged, {'alerts_created': 3, 'checked': 5, 'companies_locked': 1})
+
+    def test_no_companies_returns_empty_stats(self):
+        stats = fan_out_by_company(check_license_expirations, [None], {'licenses_checked': 0})
+        self.assertEqual(stats, {'licenses_checked': 0})
+
+    def test_lock_is_exclusive_and_released(self):
+        with company_lock('some.task', 1) as first:
+            with company_lock('some.task', 1) as second:
+                self.assertTrue(first)
+                self.assertFalse(second)
+            with company_lock('some.task', 2) as other_company:
+                self.assertTrue(other_company)
+        with company_lock('some.task', 1) as again:
+            self.assertTrue(again)
+
+
+class ComplianceFanOutTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.companies = [self.factory.create_company() for _ in range(3)]
+        self.today = timezone.now().date()
+
+    def _license(self, company, days_left):
+        license = License.objects.create(
+            company=company,
+            license_type='qal',
+            license_number=f'QAL-{company.id}-{days_left}',
+            issuing_authority='CA DPR',
+            issue_date=self.today - timedelta(days=300),
+            expiration_date=self.today + timedelta(days=days_left),
+        )
+        # save() derives status from the date; start every license open
+        License.objects.filter(pk=license.pk).update(status='active')
+        return license
+
+    def test_license_stats_merge_across_companies(self):
+        self._license(self.companies[0], 20)
+        self._license(self.companies[0], 200)
+        self._license(self.companies[1], 45)
+        self._license(self.companies[2], -3)
+
+        stats = check_license_expirations()
+
+        self.assertEqual(stats, {
+            'licenses_checked': 4,
+            'alerts_created': 3,
+            'expired_count': 1,
+        })
+        self.assertEqual(
+            set(ComplianceAlert.objects.values_list('company_id', flat=True)),
+            {c.id for c in self.companies},
+        )
+
+    def test_locked_company_is_skipped(self):
+        self._license(self.companies[0], 20)
+        self._license(self.companies[1], 20)
+
+        with company_lock(check_license_expirations.name, self.companies[0].id):
+            stats = check_license_expirations()
+
+        self.assertEqual(stats['companies_locked'], 1)
+        self.assertEqual(stats['alerts_created'], 1)
+        self.assertFalse(
+            ComplianceAlert.objects.filter(company=self.companies[0]).exists()
+        )
+
+    def test_single_company_run_ignores_other_companies(self):
+        self._license(self.companies[0], 20)
+        self._license(self.companies[1], 20)
+
+        stats = check_license_expirations(company_id=self.companies[1].id)
+
+        self.assertEqual(stats['licenses_checked'], 1)
+        self.assertEqual(
+            list(ComplianceAlert.objects.values_list('company_id', flat=True)),
+            [self.companies[1].id],
+        )
+
+    def test_wps_training_fans_out(self):
+        for company in self.companies[:2]:
+            WPSTrainingRecord.objects.create(
+                company=company,
+                trainee_name='Pat Worker',
+                training_type='pesticide_safety',
+                training_date=self.today - timedelta(days=340),
+                expiration_date=self.today + timedelta(days=25),
+                trainer_name='Trainer',
+            )
+
+        stats = check_wps_training_expirations()
+
+        self.assertEqual(stats['records_checked'], 2)
+        self.assertEqual(stats['alerts_created'], 2)
+
+    def test_active_reis_route_by_application_and_event_company(self):
+        farm_a = self.factory.create_farm(self.companies[0])
+        field_a = self.factory.create_field(farm_a)
+        farm_b = self.factory.create_farm(self.companies[1])
+        app = self.factory.create_application(field_a)
+        event = ApplicationEvent.objects.create(
+            company=self.companies[1], farm=farm_b,
+            date_started=timezone.now() - timedelta(hours=13),
+            treated_area_acres=Decimal('5.00'),
+        )
+        ended = timezone.now() - timedelta(minutes=5)
+        REIPostingRecord.objects.create(application=app, rei_hours=12, rei_end_datetime=ended)
+        REIPostingRecord.objects.create(event=event, rei_hours=12, rei_end_datetime=ended)
+
+        stats = check_active_reis()
+
+        self.assertEqual(stats, {'records_checked': 2, 'alerts_created': 2})
+        self.assertEqual(
+            set(ComplianceAlert.objects.values_list('company_id', flat=True)),
+            {self.companies[0].id, self.companies[1].id},
+        )
+
+    def test_recurring_deadlines_count_each_company_once(self):
+        for company in self.companies:
+            ComplianceProfile.objects.create(company=company, primary_state='CA')
+
+        stats = generate_recurring_deadlines()
+
+        self.assertEqual(stats['companies_processed'], 3)
+        self.assertGreater(stats['deadlines_created'], 0)
+
+
+class ComplianceDashboardLockTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.profile = ComplianceProfile.objects.create(company=self.company, primary_state='CA')
+        self.client = self.factory.create_authenticated_client(self.user)
+
+    def test_dashboard_reports_generation_already_running(self):
+        with company_lock(generate_recurring_deadlines.name, self.company.id):
+            response = self.client.get('/api/compliance/dashboard/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['deadlines_generating'])
+        self.profile.refresh_from_db()
+        self.assertFalse(self.profile.deadlines_auto_populated)
+
+        response = self.client.get('/api/compliance/dashboard/')
+
+        self.assertFalse(response.data['deadlines_generating'])
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.deadlines_auto_populated)
+        self.assertTrue(ComplianceDeadline.objects.filter(company=self.company).exists())
@@ -0,0 +1,201 @@
+"""
+Tests for the versioned dashboard response cache: hits across the cached
+endpoints, write-driven invalidation, the bypass header and the outcome
+metrics endpoint.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import HarvestLoad, PoolSettlement, SettlementDeduction
+from api.services import dashboard_cache
+from api.services.pickhaul import run_reconciliation
+from api.tests.factories import TestDataFactory
+
+ENDPOINTS = {
+    'analytics': '/api/analytics/dashboard/',
+    'season': '/api/analytics/season-dashboard/',
+    'multi_crop_season': '/api/analytics/multi-crop-seasons/',
+    'packinghouse': '/api/packinghouse-analytics/dashboard/',
+    'sgma': '/api/sgma/dashboard/',
+    'season_overview': '/api/harvest-packing/season-overview/',
+}
+
+
+@override_settings(DASHBOARD_CACHE_TIMEOUT=60)
+class DashboardCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.farm = self.factory.create_farm(self.company)
+        self.field = self.factory.create_field(self.farm)
+
+    def _get(self, name, **params):
+        response = self.client.get(ENDPOINTS[name], params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_every_dashboard_is_served_from_cache_when_warm(self):
+        for name in ENDPOINTS:
+            with self.subTest(dashboard=name):
+                self.assertEqual(self._get(name)['X-Dashboard-Cache'], 'miss')
+                with CaptureQueriesContext(connection) as warm:
+                    response = self._get(name)
+                self.assertEqual(response['X-Dashboard-Cache'], 'hit')
+                # Only authentication and company resolution remain
+                self.assertLessEqual(len(warm.captured_queries), 4)
+
+    def test_settlement_write_invalidates_season_overview(self):
+        pool = self.factory.create_pool(
+            self.factory.create_packinghouse(self.company), season='2025-2026',
+        )
+        self.assertEqual(self._get('season_overview', season=2026).data['commodities'], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PoolSettlement.objects.create(
+                pool=pool, field=self.field, statement_date=date(2026, 3, 1),
+                total_bins=Decimal('400'), total_credits=Decimal('12000'),
+                total_deductions=Decimal('2000'), net_return=Decimal('10000'),
+                amount_due=Decimal('10000'),
+            )
+
+        response = self._get('season_overview', season=2026)
+        self.assertEqual(response['X-Dashboard-Cache'], 'miss')
+        self.assertEqual(response.data['commodities'][0]['settlements'], 1)
+
+    def test_settlement_line_items_bump_the_company_version(self):
+        pool = self.factory.create_pool(
+            self.factory.create_packinghouse(self.company), season='2025-2026',
+        )
+        settlement = PoolSettlement.objects.create(
+            pool=pool, field=self.field, statement_date=date(2026, 3, 1),
+            total_bins=Decimal('400'), total_credits=Decimal('12000'),
+            total_deductions=Decimal('2000'), net_return=Decimal('10000'),
+            amount_due=Decimal('10000'),
+        )
+        before = dashboard_cache.get_data_version(self.company.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SettlementDeduction.objects.create(
+                settlement=settlement, category='packing', description='DOOR CHARGE',
+                quantity=Decimal('400'), rate=Decimal('1.50'), amount=Decimal('600'),
+            )
+
+        self.assertGreater(dashboard_cache.get_data_version(self.company.id), before)
+
+    def test_well_write_invalidates_sgma(self):
+        self.assertEqual(self._get('sgma').data['total_wells'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.factory.create_water_source(farm=self.farm, source_type='well')
+
+        self.assertEqual(self._get('sgma').data['total_wells'], 1)
+
+    def test_uncommitted_write_keeps_current_version(self):
+        self._get('sgma')
+        before = dashboard_cache.get_data_version(self.company.id)
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.factory.create_water_source(farm=self.farm, source_type='well')
+
+        self.assertEqual(dashboard_cache.get_data_version(self.company.id), before)
+
+    def test_other_company_writes_do_not_invalidate(self):
+        self._get('packinghouse')
+        other_company = self.factory.create_company()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.factory.create_pool(self.factory.create_packinghouse(other_company))
+
+        self.assertEqual(self._get('packinghouse')['X-Dashboard-Cache'], 'hit')
+
+    def test_reconciliation_invalidates(self):
+        self._get('season_overview', season=2026)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_reconciliation(self.company, 2026)
+
+        self.assertEqual(
+            self._get('season_overview', season=2026)['X-Dashboard-Cache'], 'miss',
+        )
+
+    def test_bypass_header_rebuilds_and_stores(self):
+        self._get('sgma')
+        # A write that skips signals stays invisible until bypassed
+        well = self.factory.create_water_source(farm=self.farm, source_type='well')
+        type(well).objects.filter(pk=well.pk).update(active=False)
+
+        response = self.client.get(ENDPOINTS['sgma'], HTTP_X_DASHBOARD_CACHE='bypass')
+
+        self.assertEqual(response['X-Dashboard-Cache'], 'bypass')
+        self.assertEqual(response.data['total_wells'], 1)
+        self.assertEqual(self._get('sgma').data['total_wells'], 1)
+
+    def test_params_are_part_of_the_key(self):
+        self._get('packinghouse', season='2025-2026')
+        self.assertEqual(self._get('packinghouse', season='2024-2025')['X-Dashboard-Cache'], 'miss')
+        self.assertEqual(self._get('packinghouse', season='2025-2026')['X-Dashboard-Cache'], 'hit')
+
+    @override_settings(TASK_METRICS_TOKEN='scrape-secret')
+    def test_outcome_metrics(self):
+        self._get('sgma')
+        self._get('sgma')
+        self._get('sgma')
+        self.client.get(ENDPOINTS['sgma'], HTTP_X_DASHBOARD_CACHE='bypass')
+
+        self.assertEqual(
+            dashboard_cache.dashboard_cache_stats()['sgma'],
+            {'hit': 2, 'miss': 1, 'bypass': 1},
+        )
+        self.assertEqual(self.client.get('/api/metrics/dashboards/').status_code, 403)
+        body = self.client.get(
+            '/api/metrics/dashboards/', HTTP_AUTHORIZATION='Bearer scrape-secret',
+        ).content.decode()
+        self.assertIn(
+            'finch_dashboard_cache_requests_total{dashboard="sgma",outcome="hit"} 2', body,
+        )
+        self.assertIn('finch_dashboard_cache_hit_ratio{dashboard="sgma"} 0.5000', body)
+
+
+class DashboardCacheDisabledTests(TestCase):
+
+    def test_disabled_cache_builds_every_time(self):
+        factory = TestDataFactory()
+        company, user = factory.create_company_with_user()
+        client = factory.create_authenticated_client(user)
+
+        response = client.get(ENDPOINTS['sgma'])
+
+        self.assertEqual(response['X-Dashboard-Cache'], 'off')
+
+    def test_company_id_reads_remaining_path_in_one_query(self):
+        factory = TestDataFactory()
+        company = factory.create_company()
+        field = factory.create_field(factory.create_farm(company))
+        harvest = factory.create_harvest(field)
+        load = HarvestLoad.objects.create(
+            harvest=harvest, bins=10,
+        )
+
+        fresh = HarvestLoad.objects.get(pk=load.pk)
+        with CaptureQueriesContext(connection) as cold:
+            self.assertEqual(dashboard_cache.company_id_for(fresh), company.id)
+        # The load was created with its harvest, field and farm loaded
+        with CaptureQueriesContext(connection) as warm:
+            self.assertEqual(dashboard_cache.company_id_for(load), company.id)
+
+        self.assertEqual(len(cold.captured_queries), 1)
+        self.assertEqual(len(warm.captured_queries), 0)
+
+    def test_version_survives_cache_flush_monotonically(self):
+        before = dashboard_cache.get_data_version(1)
+        cache.clear()
+        self.assertGreaterEqual(dashboard_cache.get_data_version(1), before)
@@ -0,0 +1,284 @@
+"""
+Tests for the crew-aware harvest scheduler, the schedule recommendation
+built on it and the batched harvest readiness assessment.
+"""
+
+import io
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.services.operations.harvest_planning import HarvestPlanningService
+from api.services.operations.harvest_scheduling import Crew, HarvestScheduler, ScheduleBlock
+from api.tests.factories import TestDataFactory
+
+START = date(2026, 3, 2)
+END = START + timedelta(days=6)
+
+# 10 pickers x 2.5 bins/hour x 8 hours
+CREW_DAY_BINS = 200
+
+
+def block(field_id, bins, release_offset=0, weight=1.0):
+    return ScheduleBlock(
+        field_id=field_id, field_name=f'Block {field_id}', bins=bins,
+        release_date=START + timedelta(days=release_offset), weight=weight,
+    )
+
+
+def solve(blocks, crews=1, delivery_capacity=None, **crew_kwargs):
+    scheduler = HarvestScheduler(
+        [Crew(name=f'Crew {n}', size=10, **crew_kwargs) for n in range(crews)],
+        START, END, 2.5, delivery_capacity=delivery_capacity,
+    )
+    return scheduler.solve(blocks)
+
+
+class HarvestSchedulerTests(SimpleTestCase):
+
+    def _days(self, result):
+        return {
+            a.block.field_id: (a.crew.name, a.start_date, a.finish_date)
+            for a in result.assignments
+        }
+
+    def test_crews_work_in_parallel(self):
+        result = solve([block(1, 200), block(2, 200)], crews=2)
+
+        days = self._days(result)
+        self.assertEqual({days[1][0], days[2][0]}, {'Crew 0', 'Crew 1'})
+        self.assertEqual(days[1][1:], (START, START))
+        self.assertEqual(days[2][1:], (START, START))
+
+    def test_one_crew_carries_blocks_across_days(self):
+        result = solve([block(1, 300), block(2, 100)])
+
+        self.assertEqual(result.unscheduled, [])
+        self.assertEqual(sum(len(a.daily_bins) for a in result.assignments), 3)
+        finishes = sorted(a.finish_date for a in result.assignments)
+        self.assertEqual(finishes[-1], START + timedelta(days=1))
+
+    def test_release_dates_are_respected(self):
+        result = solve([block(1, 50, release_offset=3)])
+
+        self.assertEqual(result.assignments[0].start_date, START + timedelta(days=3))
+
+    def test_delivery_capacity_is_shared_by_crews(self):
+        result = solve([block(1, 200), block(2, 200)], crews=2, delivery_capacity=250)
+
+        picked = {}
+        for assignment in result.assignments:
+            for day, bins in assignment.daily_bins.items():
+                picked[day] = picked.get(day, 0) + bins
+        self.assertEqual(picked, {START: 250, START + timedelta(days=1): 150})
+
+    def test_crew_days_off(self):
+        result = solve([block(1, 300)], unavailable_dates=frozenset({START + timedelta(days=1)}))
+
+        self.assertEqual(
+            result.assignments[0].daily_bins,
+            {START: 200, START + timedelta(days=2): 100},
+        )
+
+    def test_work_beyond_window_is_unscheduled(self):
+        blocks = [block(n, CREW_DAY_BINS * 3) for n in range(3)]
+
+        result = solve(blocks)
+
+        self.assertEqual(len(result.assignments), 2)
+        self.assertEqual(len(result.unscheduled), 1)
+
+    def test_heavier_blocks_go_first_and_cheapest_order_wins(self):
+        blocks = [block(n, 150, weight=1.0) for n in range(6)] + [block(9, 150, weight=3.0)]
+
+        result = solve(blocks)
+
+        days = self._days(result)
+        self.assertEqual(days[9][1], START)
+        scheduler = HarvestScheduler([Crew(name='Crew 0', size=10)], START, END, 2.5)
+        self.assertEqual(
+            result.cost, min(scheduler.decode(order)[0] for order in scheduler.priority_orders(blocks)),
+        )
+
+
+class HarvestScheduleRecommendationTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company = self.factory.create_company()
+        self.farm = self.factory.create_farm(self.company)
+        self.product = self.factory.create_pesticide_product(phi_days=14)
+        self.service = HarvestPlanningService(company_id=self.company.id)
+        self.today = date.today()
+
+    def _field(self, acres='10.00', phi_applied_days_ago=None, history=False):
+        field = self.factory.create_field(self.farm, total_acres=Decimal(acres))
+        if history:
+            self.factory.create_harvest(
+                field, harvest_date=self.today - timedelta(days=365),
+                acres_harvested=Decimal(acres), total_bins=int(Decimal(acres) * 20),
+            )
+        if phi_applied_days_ago is not None:
+            self.factory.create_application(
+                field, product=self.product,
+                application_date=self.today - timedelta(days=phi_applied_days_ago),
+            )
+        return field
+
+    def _schedule(self, **kwargs):
+        return self.service.get_harvest_schedule_recommendation(
+            farm_id=self.farm.id, start_date=self.today,
+            end_date=self.today + timedelta(days=13), **kwargs,
+        )
+
+    def test_schedule_items_per_crew(self):
+        ready = self._field(history=True)
+        waiting = self._field(phi_applied_days_ago=10)
+        blocked = self._field(phi_applied_days_ago=-30)
+
+        result = self._schedule(crews=[
+            {'name': 'North', 'size': 10},
+            {'name': 'South', 'size': 6},
+        ])
+
+        items = {item['field_id']: item for item in result['schedule']}
+        self.assertEqual(set(items), {ready.id, waiting.id})
+        self.assertEqual(items[ready.id]['estimated_bins'], 200.0)
+        self.assertEqual(items[ready.id]['priority'], 'high')
+        self.assertEqual(items[ready.id]['recommended_date'], self.today.isoformat())
+        self.assertEqual(items[ready.id]['crew_name'], 'North')
+        self.assertEqual(items[waiting.id]['priority'], 'low')
+        self.assertEqual(
+            items[waiting.id]['recommended_date'], (self.today + timedelta(days=4)).isoformat(),
+        )
+        self.assertEqual(
+            [(u['field_id'], u['reason'][:16]) for u in result['unscheduled']],
+            [(blocked.id, 'PHI not clear un')],
+        )
+        self.assertEqual(result['crew_info']['available_crew_size'], 16)
+        self.assertEqual(result['crew_info']['daily_capacity_bins'], 320.0)
+
+    def test_default_single_crew(self):
+        self._field()
+
+        result = self._schedule(available_crew_size=5)
+
+        self.assertEqual(result['crew_info']['crews'], [
+            {'name': 'Crew 1', 'size': 5, 'hours_per_day': 8.0},
+        ])
+        self.assertEqual(result['schedule'][0]['crew_size_recommended'], 5)
+
+    def test_query_count_does_not_grow_with_fields(self):
+        for n in range(2):
+            self._field(phi_applied_days_ago=n, history=True)
+        with CaptureQueriesContext(connection) as small:
+            self._schedule()
+
+        for n in range(10):
+            self._field(phi_applied_days_ago=n, history=bool(n % 2))
+        with CaptureQueriesContext(connection) as large:
+            result = self._schedule()
+
+        summary = result['summary']
+        self.assertEqual(summary['total_fields'] + summary['unscheduled_fields'], 12)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertLessEqual(len(large.captured_queries), 3)
+
+    def test_yield_estimate_matches_bulk_path(self):
+        field = self._field(history=True)
+
+        estimate = self.service.estimate_field_yield(field.id)
+
+        self.assertEqual(estimate.estimation_method, 'historical')
+        self.assertEqual(estimate.estimated_total_bins, 200.0)
+
+
+class HarvestReadinessTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company = self.factory.create_company()
+        self.farm = self.factory.create_farm(self.company)
+        self.service = HarvestPlanningService(company_id=self.company.id)
+        self.today = date.today()
+
+    def _field(self, applications=(), history=False):
+        field = self.factory.create_field(self.farm, total_acres=Decimal('10.00'))
+        if history:
+            self.factory.create_harvest(
+                field, harvest_date=self.today - timedelta(days=365),
+                acres_harvested=Decimal('10.00'), total_bins=180,
+            )
+        for days_ago, phi_days in applications:
+            self.factory.create_application(
+                field,
+                product=self.factory.create_pesticide_product(phi_days=phi_days),
+                application_date=self.today - timedelta(days=days_ago),
+            )
+        return field
+
+    def _build_fields(self):
+        return [
+            self._field(history=True),
+            self._field(applications=[(5, 14), (2, 7)]),
+            self._field(applications=[(20, 14), (3, 0)], history=True),
+            self._field(applications=[(120, 30)]),
+        ]
+
+    def test_matches_per_field_compliance_check(self):
+        fields = self._build_fields()
+        proposed = self.today + timedelta(days=6)
+
+        results = self.service.assess_harvest_readiness(
+            farm_id=self.farm.id, proposed_harvest_date=proposed,
+        )
+
+        by_field = {r.field_id: r for r in results}
+        self.assertEqual(set(by_field), {f.id for f in fields})
+        for field in fields:
+            phi = self.service.compliance_service.calculate_phi_clearance(field.id, proposed)
+            readiness = by_field[field.id]
+            self.assertEqual(readiness.phi_clear, phi.is_clear)
+            self.assertEqual(readiness.phi_clear_date, phi.earliest_harvest_date)
+            estimate = self.service.estimate_field_yield(field.id)
+            self.assertEqual(readiness.estimated_yield_bins, estimate.estimated_total_bins)
+
+        blocked = by_field[fields[1].id]
+        self.assertFalse(blocked.is_ready)
+        self.assertEqual(len(blocked.advisory_notes), 2)
+        self.assertTrue(blocked.advisory_notes[0].startswith('Blocked by'))
+        self.assertEqual(by_field[fields[0].id].estimated_yield_bins, 180.0)
+        self.assertEqual(results[-1].field_id, blocked.field_id)
+
+    def test_query_count_does_not_grow_with_fields(self):
+        self._build_fields()
+        with CaptureQueriesContext(connection) as small:
+            self.service.assess_harvest_readiness()
+
+        for _ in range(3):
+            self._build_fields()
+        with CaptureQueriesContext(connection) as large:
+            results = self.service.assess_harvest_readiness()
+
+        self.assertEqual(len(results), 16)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertLessEqual(len(large.captured_queries), 3)
+
+
+class HarvestScheduleBenchmarkCommandTests(TestCase):
+
+    def test_runs_solver_and_service(self):
+        out = io.StringIO()
+        call_command(
+            'benchmark_harvest_schedule', '--blocks=20', '--db',
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn('20 blocks: 1 crews', output)
+        self.assertIn('get_harvest_schedule_recommendation', output)
+        self.assertIn('rolled back', output)
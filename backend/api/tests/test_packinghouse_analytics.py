@@ -0,0 +1,162 @@
+"""
+Tests for the latest-report-per-group helper and the packinghouse analytics
+built on it: size distribution, size pricing, grade/size price trends,
+pack percent impact and block performance.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.models import (
+    PackoutGradeLine, PackoutReport, PoolSettlement, SettlementGradeLine,
+)
+from api.services.packinghouse_analytics import (
+    PackinghouseAnalyticsService, latest_per_group,
+)
+from api.tests.factories import TestDataFactory
+
+
+class PackinghouseAnalyticsTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company = self.factory.create_company()
+        self.farm = self.factory.create_farm(self.company, name='Home Ranch')
+        self.packinghouse = self.factory.create_packinghouse(self.company)
+        self.pool = self.factory.create_pool(self.packinghouse, season='2025-2026')
+
+    def _field(self, name):
+        return self.factory.create_field(self.farm, name=name)
+
+    def _report(self, field, day, sizes, pool=None, packed=None):
+        report = PackoutReport.objects.create(
+            pool=pool or self.pool, field=field, report_date=date(2026, 3, day),
+            period_start=date(2026, 3, 1), period_end=date(2026, 3, day),
+            bins_this_period=Decimal('10'), bins_cumulative=Decimal('10'),
+            total_packed_percent=packed,
+        )
+        for size, quantity in sizes.items():
+            PackoutGradeLine.objects.create(
+                packout_report=report, grade='SUNKIST', size=size,
+                quantity_this_period=Decimal(quantity), percent_this_period=Decimal('50'),
+            )
+        return report
+
+    def _settlement(self, field, day, lines, pool=None, net_per_bin=None):
+        settlement = PoolSettlement.objects.create(
+            pool=pool or self.pool, field=field, statement_date=date(2026, 6, day),
+            total_credits=Decimal('0'), total_deductions=Decimal('0'),
+            net_return=Decimal('0'), prior_advances=Decimal('0'), amount_due=Decimal('0'),
+            net_per_bin=net_per_bin,
+        )
+        for grade, size, quantity, amount in lines:
+            SettlementGradeLine.objects.create(
+                settlement=settlement, grade=grade, size=size,
+                quantity=Decimal(quantity), percent_of_total=Decimal('50'),
+                fob_rate=Decimal('1'), total_amount=Decimal(amount),
+            )
+        return settlement
+
+    def test_latest_per_group_picks_newest_row_per_group(self):
+        north, south = self._field('North'), self._field('South')
+        self._report(north, 3, {})
+        newest_north = self._report(north, 9, {})
+        newest_south = self._report(south, 5, {})
+        # Same date: the newer row wins
+        tie = self._report(south, 5, {})
+
+        latest = latest_per_group(
+            PackoutReport.objects.all(), ['field'], ['-report_date'],
+        )
+
+        self.assertEqual(
+            sorted(latest.values_list('pk', flat=True)), sorted([newest_north.pk, tie.pk]),
+        )
+        self.assertNotIn(newest_south.pk, latest.values_list('pk', flat=True))
+
+    def test_size_distribution_uses_latest_report_per_field_and_pool(self):
+        north, south = self._field('North'), self._field('South')
+        self._report(north, 3, {'88': '500'})
+        self._report(north, 9, {'88': '60', '72': '40'})
+        self._report(south, 5, {'88': '30'})
+        self._report(None, 2, {'113': '999'})
+        self._report(None, 8, {'113': '10'})
+
+        result = PackinghouseAnalyticsService.size_distribution(self.company, group_by='field')
+
+        groups = {g['group_name']: g for g in result['groups']}
+        self.assertEqual(groups['North']['total_quantity'], Decimal('100'))
+        self.assertEqual(groups['South']['total_quantity'], Decimal('30'))
+        self.assertEqual(groups[self.pool.name]['total_quantity'], Decimal('10'))
+        self.assertEqual(result['all_sizes'], ['72', '88', '113'])
+
+    def test_size_distribution_query_count_is_fixed(self):
+        for n in range(2):
+            self._report(self._field(f'A{n}'), 4, {'88': '10'})
+        with CaptureQueriesContext(connection) as small:
+            PackinghouseAnalyticsService.size_distribution(self.company)
+
+        for n in range(8):
+            self._report(self._field(f'B{n}'), 4, {'88': '10', '72': '5'})
+        with CaptureQueriesContext(connection) as large:
+            result = PackinghouseAnalyticsService.size_distribution(self.company, group_by='field')
+
+        self.assertEqual(len(result['groups']), 10)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_size_pricing_counts_latest_settlement_only(self):
+        field = self._field('North')
+        self._settlement(field, 1, [('SUNKIST', '88', '100', '2000')])
+        self._settlement(field, 20, [('SUNKIST', '88', '120', '3000')])
+        self._settlement(self._field('South'), 5, [('CHOICE', '72', '80', '800')])
+
+        result = PackinghouseAnalyticsService.size_pricing(self.company)
+
+        self.assertEqual(result['totals']['total_quantity'], Decimal('200'))
+        self.assertEqual(result['totals']['total_revenue'], Decimal('3800'))
+        self.assertEqual([s['size'] for s in result['sizes']], ['72', '88'])
+
+    def test_grade_size_price_trends_across_seasons(self):
+        field = self._field('North')
+        last_year = self.factory.create_pool(self.packinghouse, season='2024-2025')
+        self._settlement(field, 1, [('SUNKIST', '88', '100', '1000')], pool=last_year)
+        self._settlement(field, 2, [('SUNKIST', '88', '100', '1500')])
+
+        with CaptureQueriesContext(connection) as ctx:
+            result = PackinghouseAnalyticsService.grade_size_price_trends(self.company)
+
+        self.assertEqual(result['seasons'], ['2025-2026', '2024-2025'])
+        [entry] = result['grade_sizes']
+        self.assertEqual(entry['by_season']['2025-2026']['avg_fob'], 15.0)
+        self.assertEqual(entry['by_season']['2025-2026']['change_vs_prev'], 50.0)
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_pack_percent_impact_pairs_latest_packout(self):
+        fields = [self._field(f'Block {n}') for n in range(3)]
+        for n, field in enumerate(fields):
+            self._report(field, 2, {}, packed=Decimal('50'))
+            self._report(field, 9, {}, packed=Decimal(70 + n * 5))
+            self._settlement(field, 1, [], net_per_bin=Decimal(10 + n * 2))
+
+        result = PackinghouseAnalyticsService.pack_percent_impact(self.company)
+
+        self.assertEqual(
+            [p['pack_percent'] for p in result['data_points']], [70.0, 75.0, 80.0],
+        )
+        self.assertEqual(result['regression']['slope'], 0.4)
+
+    def test_block_performance_pairs_latest_report_and_settlement(self):
+        field = self._field('North')
+        self._report(field, 2, {}, packed=Decimal('60'))
+        self._report(field, 9, {}, packed=Decimal('72'))
+        self._settlement(field, 1, [], net_per_bin=Decimal('9'))
+        self._settlement(field, 15, [], net_per_bin=Decimal('11'))
+
+        [row] = PackinghouseAnalyticsService.block_performance(self.company)
+
+        self.assertEqual(row['pack_percent'], Decimal('72'))
+        self.assertEqual(row['net_per_bin'], Decimal('11'))
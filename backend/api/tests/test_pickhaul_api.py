@@ -6,7 +6,9 @@ from decimal import Decimal
 from django.test import TestCase
 from rest_framework.test import APIClient
 
-from api.models import PickHaulCheckResult, PickHaulInvoice
+from api.models import (
+    PickHaulChargeAck, PickHaulCheckResult, PickHaulDirectCharge, PickHaulInvoice,
+)
 from api.services.pickhaul import run_platform_gates
 from api.services.pickhaul.linking import relink_season
 from api.services.pickhaul.reconcile import run_reconciliation
@@ -236,6 +238,45 @@ class GateTests(TestCase):
         run_platform_gates(self.s.company, SEASON)
         self.assertEqual(self._gate(8).count(), 1)  # replaced, not appended
 
+    def test_gates_share_one_snapshot(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def run():
+            relink_season(self.s.company, SEASON)
+            with CaptureQueriesContext(connection) as ctx:
+                run_platform_gates(self.s.company, SEASON)
+            return len(ctx.captured_queries)
+
+        self.s.receipt('1', pick_date=date(2026, 4, 12))
+        self.s.invoice('1000.00', contractor='MCM')
+        small = run()
+        for n in range(2, 12):
+            self.s.receipt(str(n), pick_date=date(2026, 4, 12), house=self.s.vpoa)
+            self.s.invoice('1000.00', contractor='MCM', house=self.s.vpoa)
+        self.s.charge('500.00')
+        self.assertEqual(run(), small)
+        self.assertEqual(self._gate(10).count(), 11)
+
+    def test_changed_rows_rerun_only_affected_gates(self):
+        self.s.receipt('1', bins='30.0')
+        self.s.charge('455.00')
+        run_platform_gates(self.s.company, SEASON)
+        gate6 = self._gate(6).get()
+        self.assertEqual(self._gate(11).count(), 1)
+
+        PickHaulChargeAck.objects.create(
+            company=self.s.company, charge=PickHaulDirectCharge.objects.get(),
+            reason='house_billed',
+        )
+        counts = run_platform_gates(self.s.company, SEASON, changed=('ack',))
+
+        self.assertEqual(self._gate(11).count(), 0)
+        self.assertEqual(self._gate(6).get().pk, gate6.pk)  # not re-run
+        self.assertEqual(counts, {'errors': 0, 'warns': 0, 'infos': 1})
+        with self.assertRaises(ValueError):
+            run_platform_gates(self.s.company, SEASON, changed=('pull',))
+
 
 class HarvestActivityTests(TestCase):
     """The unified deliveries view: receipts ARE the harvest record."""
@@ -303,6 +344,43 @@ class HarvestActivityTests(TestCase):
         client.force_authenticate(user=worker)
         self.assertEqual(client.get('/api/pickhaul/harvest-activity/').status_code, 403)
 
+    def test_zero_bin_invoice_splits_evenly_and_sums_per_house(self):
+        self.s.receipt('1', bins='0')
+        self.s.receipt('2', bins='0')
+        self.s.receipt('3', block='OTHER', bins='12', house=self.s.vpoa)
+        self.s.invoice('90.00', kind='HAUL', block='SESPE')
+        relink_season(self.s.company, SEASON)
+        data = self._get()
+        sespe = next(b for b in data['blocks'] if b['block'] == 'SESPE')
+        for delivery in sespe['deliveries']:
+            self.assertEqual(Decimal(str(delivery['haul_cost'])), Decimal('45'))
+            self.assertEqual(len(delivery['invoice_refs']), 1)
+        houses = {h['house_code']: h for h in data['houses']}
+        self.assertEqual([h['house_code'] for h in data['houses']], ['VPOA', 'SLA'])
+        self.assertEqual(Decimal(str(houses['SLA']['haul_cost'])), Decimal('90'))
+        self.assertEqual(Decimal(str(houses['VPOA']['bins'])), Decimal('12'))
+        self.assertEqual(houses['VPOA']['blocks'], 1)
+
+    def test_query_count_does_not_grow_with_receipts(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        from api.services.pickhaul.activity import harvest_activity
+
+        def load():
+            relink_season(self.s.company, SEASON)
+            with CaptureQueriesContext(connection) as ctx:
+                harvest_activity(self.s.company, SEASON)
+            return len(ctx.captured_queries)
+
+        self.s.receipt('1', pick_date=date(2026, 4, 11))
+        self.s.invoice('100.00', block='SESPE')
+        small = load()
+        for n in range(2, 30):
+            self.s.receipt(str(n), pick_date=date(2026, 4, 11), house=(self.s.sla, self.s.vpoa)[n % 2])
+        self.s.invoice('250.00', kind='HAUL', block='SESPE')
+        self.assertEqual(load(), small)
+
 
 class AgingSummaryTests(TestCase):
     def setUp(self):
@@ -70,6 +70,36 @@ class ApplyBundleTests(TestCase):
         self.assertEqual(receipt.bins, Decimal('22.0'))
         self.assertEqual(inv.receipt_links.count(), 1)  # link intact, same PK
 
+    def test_receipts_store_classified_commodity(self):
+        apply_bundle(self.s.company, make_bundle(receipts=[
+            bundle_receipt('1'),
+            bundle_receipt('2', commodity_code='', variety_code='NA'),
+            bundle_receipt('3', commodity_code='ZZZ'),
+        ]))
+        self.assertEqual(
+            dict(PickHaulReceipt.objects.values_list('receipt_no', 'commodity')),
+            {'1': 'LEMONS', '2': 'NAVELS', '3': 'UNMAPPED'},
+        )
+
+        apply_bundle(self.s.company, make_bundle(
+            receipts=[bundle_receipt('1', commodity_code='NA')]))
+        self.assertEqual(PickHaulReceipt.objects.get(receipt_no='1').commodity, 'NAVELS')
+
+    def test_unclassified_receipts_are_not_counted_as_updates(self):
+        apply_bundle(self.s.company, make_bundle(
+            receipts=[bundle_receipt('1'), bundle_receipt('2', variety_code='NA')]))
+        # Stored before the commodity column existed
+        PickHaulReceipt.objects.update(commodity='')
+
+        result = apply_bundle(self.s.company, make_bundle(
+            receipts=[bundle_receipt('1'), bundle_receipt('2', variety_code='NA')],
+            generated_at='2026-07-31T06:05:00'))
+
+        self.assertEqual(result['applied']['receipts']['updated'], 0)
+        self.assertEqual(result['applied']['receipts']['unchanged'], 2)
+        self.assertEqual(
+            set(PickHaulReceipt.objects.values_list('commodity', flat=True)), {'LEMONS'})
+
     def test_deactivate_and_reactivate(self):
         apply_bundle(self.s.company, make_bundle(receipts=[bundle_receipt('7')]))
         r2 = apply_bundle(self.s.company, make_bundle(
@@ -0,0 +1,109 @@
+"""
+Tests for the streaming PUR and pesticide export endpoints.
+"""
+
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import ApplicationEvent, Product, TankMixItem
+from api.pur_reporting import PURReportGenerator
+from api.tests.factories import TestDataFactory
+
+
+def _read_csv(response):
+    body = b''.join(response.streaming_content).decode()
+    return list(csv.reader(io.StringIO(body)))
+
+
+class PesticideApplicationExportTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        farm = self.factory.create_farm(self.company)
+        self.field = self.factory.create_field(farm)
+        self.product = self.factory.create_pesticide_product()
+
+    def test_pur_csv_streams_one_row_per_application(self):
+        for _ in range(12):
+            self.factory.create_application(self.field, product=self.product)
+
+        response = self.client.post('/api/applications/export_pur_csv/', {}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = _read_csv(response)
+        self.assertEqual(rows[0], PURReportGenerator.PUR_FIELDS)
+        self.assertEqual(len(rows) - 1, 12)
+
+    def test_streamed_rows_match_generate_csv(self):
+        for _ in range(3):
+            self.factory.create_application(self.field, product=self.product)
+        generator = PURReportGenerator(
+            self.field.applications.all()
+        )
+
+        response = self.client.post('/api/applications/export_pur_csv/', {}, format='json')
+
+        self.assertEqual(
+            b''.join(response.streaming_content).decode(), generator.generate_csv()
+        )
+
+    def test_current_products_export_streams(self):
+        self.factory.create_application(self.field, product=self.product)
+
+        response = self.client.get('/api/products/export_current_products/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertGreaterEqual(len(_read_csv(response)), 1)
+
+
+class ApplicationEventExportTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.farm = self.factory.create_farm(self.company)
+        self.product = Product.objects.create(
+            product_name='Test Mix Product', epa_registration_number='100-1',
+        )
+
+    def _event(self, days_ago, items):
+        event = ApplicationEvent.objects.create(
+            company=self.company,
+            farm=self.farm,
+            date_started=timezone.now() - timedelta(days=days_ago),
+            treated_area_acres=Decimal('10.00'),
+        )
+        for _ in range(items):
+            TankMixItem.objects.create(
+                application_event=event,
+                product=self.product,
+                total_amount=Decimal('5.00'),
+                amount_unit='Ga',
+                rate=Decimal('0.50'),
+                rate_unit='Ga/A',
+            )
+        return event
+
+    def test_one_row_per_tank_mix_item_or_bare_event(self):
+        self._event(3, items=2)
+        self._event(5, items=3)
+        self._event(7, items=0)
+
+        response = self.client.post(
+            '/api/application-events/export_pur_csv/', {}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = _read_csv(response)
+        self.assertEqual(len(rows) - 1, 2 + 3 + 1)
@@ -0,0 +1,165 @@
+"""
+Tests for PURReportGenerator summaries/validation and the monthly PUR task.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import ComplianceProfile, ComplianceReport, PesticideApplication
+from api.pur_reporting import PURReportGenerator
+from api.tasks.compliance_tasks import auto_generate_monthly_pur_report
+from api.tests.factories import TestDataFactory
+
+
+class PURReportGeneratorTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        farm = self.factory.create_farm(self.company)
+        self.field = self.factory.create_field(farm, county='Ventura')
+        self.odd_field = self.factory.create_field(farm, county='Nowhere')
+        self.product = self.factory.create_pesticide_product()
+        self.restricted = self.factory.create_pesticide_product(restricted_use=True)
+
+    def _applications(self):
+        return PesticideApplication.objects.filter(field__farm__company=self.company)
+
+    def test_validation_reports_only_failing_rows(self):
+        for _ in range(5):
+            self.factory.create_application(self.field, product=self.product)
+        bad_amount = self.factory.create_application(
+            self.field, product=self.product, amount_used=Decimal('0')
+        )
+        no_applicator = self.factory.create_application(
+            self.field, product=self.restricted, applicator_name=''
+        )
+        odd_county = self.factory.create_application(self.odd_field, product=self.product)
+
+        generator = PURReportGenerator(self._applications())
+        with self.assertNumQueries(2):
+            result = generator.validate_for_pur()
+
+        self.assertFalse(result['valid'])
+        self.assertEqual(result['applications_count'], 8)
+        self.assertCountEqual(result['errors'], [
+            f"Application #{bad_amount.id}: Missing or invalid amount used",
+            f"Application #{no_applicator.id}: Restricted use product requires licensed applicator name",
+        ])
+        self.assertCountEqual(result['warnings'], [
+            f"Application #{no_applicator.id}: Missing applicator name",
+            f"Application #{odd_county.id}: County 'Nowhere' not in standard county codes",
+        ])
+        self.assertEqual(
+            {app_id for app_id, _, _ in generator.iter_validation_issues()},
+            {bad_amount.id, no_applicator.id, odd_county.id},
+        )
+
+    def test_clean_applications_validate(self):
+        for _ in range(3):
+            self.factory.create_application(self.field, product=self.product)
+
+        result = PURReportGenerator(self._applications()).validate_for_pur()
+
+        self.assertTrue(result['valid'])
+        self.assertEqual(result['warnings'], [])
+
+    def test_summary_totals_from_grouped_queries(self):
+        today = timezone.now().date()
+        for days_ago in (3, 10, 40):
+            self.factory.create_application(
+                self.field, product=self.product,
+                application_date=today - timedelta(days=days_ago),
+            )
+        self.factory.create_application(
+            self.odd_field, product=self.restricted,
+            application_date=today - timedelta(days=5),
+        )
+
+        with self.assertNumQueries(4):
+            summary = PURReportGenerator(self._applications()).generate_summary_report()
+
+        self.assertEqual(summary['total_applications'], 4)
+        self.assertEqual(summary['total_acres_treated'], Decimal('40.00'))
+        self.assertEqual(summary['unique_products'], 2)
+        self.assertEqual(summary['unique_fields'], 2)
+        # Same meaning as the per-column distinct counts they replaced
+        self.assertEqual(
+            summary['unique_products'], self._applications().values('product').distinct().count(),
+        )
+        self.assertEqual(
+            summary['unique_fields'], self._applications().values('field').distinct().count(),
+        )
+        self.assertEqual(summary['restricted_use_applications'], 1)
+        self.assertEqual(summary['report_period'], {
+            'start': (today - timedelta(days=40)).strftime('%m/%d/%Y'),
+            'end': (today - timedelta(days=3)).strftime('%m/%d/%Y'),
+        })
+        self.assertEqual(
+            {row['county']: row['applications'] for row in summary['by_county']},
+            {'Ventura': 3, 'Nowhere': 1},
+        )
+        self.assertEqual(sum(row['applications'] for row in summary['by_month']), 4)
+
+    def test_empty_summary(self):
+        summary = PURReportGenerator(self._applications()).generate_summary_report()
+        self.assertEqual(summary['total_applications'], 0)
+        self.assertEqual(summary['report_period'], {'start': '', 'end': ''})
+
+
+class MonthlyPURReportTaskTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, _ = self.factory.create_company_with_user()
+        ComplianceProfile.objects.create(
+            company=self.company, primary_state='CA', requires_pur_reporting=True,
+        )
+        farm = self.factory.create_farm(self.company)
+        self.field = self.factory.create_field(farm, county='Ventura')
+        self.product = self.factory.create_pesticide_product()
+        self.last_month_end = timezone.now().date().replace(day=1) - timedelta(days=1)
+
+    def test_generates_draft_with_rows_summary_and_validation(self):
+        for day in range(3):
+            self.factory.create_application(
+                self.field, product=self.product,
+                application_date=self.last_month_end - timedelta(days=day),
+            )
+        # Outside the period
+        self.factory.create_application(
+            self.field, product=self.product,
+            application_date=self.last_month_end + timedelta(days=1),
+        )
+
+        stats = auto_generate_monthly_pur_report()
+
+        self.assertEqual(stats['reports_generated'], 1)
+        report = ComplianceReport.objects.get(company=self.company, report_type='pur_monthly')
+        data = report.report_data
+        self.assertEqual(data['total_applications'], 3)
+        self.assertEqual(len(data['applications']), 3)
+        self.assertEqual(data['applications'][0]['field'], self.field.name)
+        self.assertEqual(data['summary']['total_applications'], 3)
+        self.assertNotIn('by_product', data['summary'])
+        self.assertTrue(data['validation']['valid'])
+        # Counts only; the messages are regenerated on review
+        full = PURReportGenerator(PesticideApplication.objects.filter(
+            application_date__lte=self.last_month_end,
+        )).validate_for_pur()
+        self.assertEqual(data['validation'], {
+            'valid': True,
+            'error_count': 0,
+            'warning_count': len(full['warnings']),
+            'ready_for_export': True,
+        })
+
+    def test_skips_companies_with_existing_report(self):
+        auto_generate_monthly_pur_report()
+
+        stats = auto_generate_monthly_pur_report()
+
+        self.assertEqual(stats, {'reports_generated': 0, 'companies_skipped': 1})
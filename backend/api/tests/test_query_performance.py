@@ -11,9 +11,11 @@ below a reasonable upper bound. If a test fails, the assertion message
 dumps the actual SQL for debugging.
 """
 
+import io
 from datetime import date, timedelta
 from decimal import Decimal
 
+from django.core.management import call_command
 from django.db import connection
 from django.test import TestCase
 from django.test.utils import CaptureQueriesContext
@@ -21,9 +23,17 @@ from django.test.utils import CaptureQueriesContext
 from api.models import (
     ComplianceDeadline,
     PackinghouseDelivery,
+    PackinghouseStatement,
+    PackoutGradeLine,
+    PackoutReport,
     PesticideApplication,
+    Pool,
+    PoolSettlement,
+    SettlementDeduction,
+    SettlementGradeLine,
     WaterSource,
 )
+from api.packinghouse_views import _annotate_pool_aggregates
 from api.tests.factories import TestDataFactory
 
 
@@ -303,6 +313,72 @@ class PoolsQueryPerformanceTests(TestCase):
         )
 
 
+class PoolAggregateTotalsTests(TestCase):
+    """Pool list totals must not multiply deliveries by packout reports."""
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.packinghouse = self.factory.create_packinghouse(self.company)
+        self.field = self.factory.create_field(self.factory.create_farm(self.company))
+
+    def _pool(self, deliveries, reports):
+        pool = self.factory.create_pool(self.packinghouse)
+        start = date(2026, 1, 5)
+        PackinghouseDelivery.objects.bulk_create(
+            PackinghouseDelivery(
+                pool=pool, field=self.field, ticket_number=f'{pool.pk}-{n}', delivery_date=start,
+                bins=Decimal('20.00'), weight_lbs=Decimal('18000.00'),
+            )
+            for n in range(deliveries)
+        )
+        PackoutReport.objects.bulk_create(
+            PackoutReport(
+                pool=pool, report_date=start + timedelta(days=n),
+                period_start=start, period_end=start + timedelta(days=n),
+                bins_this_period=Decimal('15.00'), bins_cumulative=Decimal(15 * (n + 1)),
+            )
+            for n in range(reports)
+        )
+        return pool
+
+    def test_totals_with_many_deliveries_and_reports(self):
+        busy = self._pool(deliveries=60, reports=40)
+        undelivered = self._pool(deliveries=0, reports=0)
+        unpacked = self._pool(deliveries=25, reports=0)
+
+        response = self.client.get('/api/pools/')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.data.get('results', response.data)
+        pools = {p['id']: p for p in results}
+        self.assertEqual(pools[busy.id]['delivery_count'], 60)
+        self.assertEqual(Decimal(pools[busy.id]['total_bins']), Decimal('600'))
+        self.assertEqual(pools[undelivered.id]['delivery_count'], 0)
+        self.assertEqual(Decimal(pools[undelivered.id]['total_bins']), 0)
+        self.assertEqual(Decimal(pools[unpacked.id]['total_bins']), Decimal('500'))
+
+        annotated = _annotate_pool_aggregates(Pool.objects.filter(pk=busy.pk)).get()
+        self.assertEqual(annotated.total_weight, Decimal('1080000'))
+        self.assertEqual(annotated.total_bins, Pool.objects.get(pk=busy.pk).total_bins)
+
+    def test_benchmark_command_compares_plans(self):
+        out = io.StringIO()
+        call_command(
+            'benchmark_pool_aggregates', '--pools=2', '--deliveries=5', '--reports=3',
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        self.assertIn('correlated subqueries', output)
+        self.assertIn('joined sums', output)
+        self.assertIn('EXPLAIN', output)
+        # The joined form counts each delivery once per packout report
+        self.assertIn("correlated subqueries (5, Decimal('45", output)
+        self.assertIn('rolled back', output)
+
+
 class PackinghouseDeliveriesQueryPerformanceTests(TestCase):
     """N+1 detection for the /api/packinghouse-deliveries/ endpoint.
 
@@ -611,3 +687,73 @@ class CrossEndpointScalingTests(TestCase):
             f"{count_large} (12 records).\n"
             f"{_query_report(queries_large, 'deliveries 12 records')}"
         )
+
+
+class BatchConfirmQueryPerformanceTests(TestCase):
+    """Confirming statements must not issue a query per grade line or deduction."""
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.packinghouse = self.factory.create_packinghouse(self.company)
+
+    def _statement(self, statement_type, lines):
+        extracted = {
+            'header': {'commodity': 'NAVELS', 'report_date': '2026-04-01'},
+            'summary': {'total_bins': str(10 * lines)},
+            'financials': {
+                'total_credits': str(100 * lines), 'total_deductions': str(5 * lines),
+                'net_return': str(95 * lines),
+            },
+            'grade_lines': [
+                {'grade': 'SUNKIST', 'size': f'{n:03d}', 'unit': 'BIN', 'quantity': 10,
+                 'percent': 1, 'fob_rate': 10, 'total_amount': 100}
+                for n in range(lines)
+            ],
+            'deductions': [
+                {'category': 'packing', 'description': f'CHARGE {n}', 'quantity': 10,
+                 'unit': 'BIN', 'rate': '0.5', 'amount': 5}
+                for n in range(lines)
+            ],
+        }
+        return PackinghouseStatement.objects.create(
+            packinghouse=self.packinghouse, pdf_file='packinghouse_statements/test.pdf',
+            original_filename=f'{statement_type}.pdf', file_size_bytes=1024,
+            statement_type=statement_type, status='extracted', extracted_data=extracted,
+        )
+
+    def _batch_confirm(self, lines):
+        # A fresh pool per batch, so both runs take the same pool status path
+        pool = self.factory.create_pool(self.packinghouse)
+        statements = [
+            self._statement(statement_type, lines)
+            for statement_type in ('settlement', 'settlement', 'packout', 'packout')
+        ]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post('/api/packinghouse-statements/batch-confirm/', {
+                'statements': [{'id': s.id, 'pool_id': pool.id} for s in statements],
+                'save_mappings': False,
+            }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['confirmed'], 4, response.data)
+        return ctx
+
+    def test_batch_confirm_query_count_independent_of_line_count(self):
+        small = self._batch_confirm(lines=2)
+        large = self._batch_confirm(lines=40)
+
+        self.assertEqual(
+            len(small.captured_queries), len(large.captured_queries),
+            _query_report(large.captured_queries, 'batch confirm, 40 lines each'),
+        )
+        self.assertEqual(SettlementGradeLine.objects.count(), 2 * 2 + 2 * 40)
+        self.assertEqual(SettlementDeduction.objects.count(), 2 * 2 + 2 * 40)
+        self.assertEqual(PackoutGradeLine.objects.count(), 2 * 2 + 2 * 40)
+
+    def test_settlement_totals_reconciled_from_bulk_lines(self):
+        self._batch_confirm(lines=12)
+
+        for settlement in PoolSettlement.objects.all():
+            self.assertEqual(settlement.total_bins, Decimal('120'))
+            self.assertEqual(settlement.net_per_bin, Decimal('9.5'))
@@ -2,14 +2,24 @@
 
 from datetime import date
 from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from api.models import (
-    GrowerLedgerEntry, PackerCommitment, Pool, PoolSettlement,
+    GrowerLedgerEntry, PackerCommitment, PickHaulManualPick, PickHaulReceipt,
+    Pool, PoolSettlement, SeasonOverviewSnapshot,
+)
+from api.services.pickhaul import apply_bundle
+from api.services import season_overview
+from api.services.season_overview import build_season_overview, stored_season_overview
+from api.tests.pickhaul_helpers import (
+    SEASON, PickHaulScenario, bundle_receipt, make_bundle,
 )
-from api.services.season_overview import build_season_overview
-from api.tests.pickhaul_helpers import SEASON, PickHaulScenario
 
 
 def _settlement(pool, *, total_bins=None, total_weight_lbs=None,
@@ -151,6 +161,213 @@ class SeasonOverviewServiceTests(TestCase):
         self.assertNotIn('cash_received', result)
 
 
+class SeasonOverviewSnapshotTests(TestCase):
+    """The stored overview must always match build_season_overview()."""
+
+    def setUp(self):
+        self.s = PickHaulScenario()
+        self.pool = Pool.objects.create(
+            packinghouse=self.s.sla, pool_id='LEM-2026', name='Lemon Pool',
+            commodity='LEMONS', season='2025-2026',
+        )
+
+    def _push(self, *receipts):
+        apply_bundle(self.s.company, make_bundle(receipts=receipts))
+
+    def _assert_parity(self):
+        stored = stored_season_overview(self.s.company, SEASON)
+        self.assertEqual(stored, build_season_overview(self.s.company, SEASON))
+        # A second read is served from what the first one stored
+        self.assertEqual(stored_season_overview(self.s.company, SEASON), stored)
+        return stored
+
+    def _rows(self, section):
+        return dict(
+            SeasonOverviewSnapshot.objects.filter(
+                company=self.s.company, season=SEASON, section=section,
+            ).values_list('commodity', 'data')
+        )
+
+    def _seed(self):
+        self._push(
+            bundle_receipt('1001', bins=20.5),
+            bundle_receipt('1002', bins=9.5, house='VPOA'),
+            bundle_receipt('2001', bins=12, commodity_code='NA', variety_code='N'),
+        )
+        invoice = self.s.invoice('700.00')
+        for receipt in PickHaulReceipt.objects.all():
+            invoice.receipt_links.create(receipt=receipt, assigned='manual')
+        PickHaulManualPick.objects.create(
+            company=self.s.company, packinghouse=self.s.sla, entity=self.s.jpf,
+            season=SEASON, varietal='Hass', bins=Decimal('4'), cost=Decimal('80'),
+        )
+        _settlement(self.pool, total_bins=Decimal('25'), net_return=Decimal('4000.00'))
+
+    def test_parity_through_incremental_updates(self):
+        self._seed()
+        self._assert_parity()
+
+        # Bundle: a lemon receipt turns out to be navels, another is voided
+        self._push(
+            bundle_receipt('1001', bins=20.5, commodity_code='NA', variety_code='N'),
+            bundle_receipt('1002', bins=9.5, house='VPOA', is_active=False),
+            bundle_receipt('3001', bins=7, commodity_code='ZZZ', variety_code=''),
+        )
+        self._assert_parity()
+
+        _settlement(self.pool, total_bins=Decimal('5'), net_return=Decimal('600.00'))
+        GrowerLedgerEntry.objects.create(
+            packinghouse=self.s.sla, pool=self.pool, entry_date=date(2026, 1, 10),
+            entry_type='advance', credit=Decimal('2500.00'), debit=Decimal('0'),
+        )
+        result = self._assert_parity()
+
+        navels = _card(result, 'NAVELS')
+        self.assertEqual(navels['delivered_bins'], Decimal('32.5'))
+        self.assertEqual(_card(result, 'LEMONS')['delivered_bins'], None)
+        self.assertEqual(_card(result, 'LEMONS')['settlements'], 2)
+        self.assertEqual(result['cash_received']['advances'], Decimal('2500.00'))
+
+    def test_warm_read_runs_two_queries(self):
+        self._seed()
+        stored_season_overview(self.s.company, SEASON)
+
+        with CaptureQueriesContext(connection) as ctx:
+            stored_season_overview(self.s.company, SEASON)
+
+        # The snapshot rows and the live commitments
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    def test_bundle_marks_only_touched_commodities(self):
+        self._seed()
+        stored_season_overview(self.s.company, SEASON)
+        navels = self._rows('delivered')['NAVELS']
+
+        self._push(bundle_receipt('1003', bins=3))
+
+        delivered = self._rows('delivered')
+        self.assertIsNone(delivered['LEMONS'])
+        self.assertEqual(delivered['NAVELS'], navels)
+        self.assertIn('', self._rows('settlements'))
+        self.assertEqual(self._rows('costs'), {})
+        self._assert_parity()
+
+    def test_ledger_entry_marks_only_cash(self):
+        self._seed()
+        stored_season_overview(self.s.company, SEASON)
+
+        GrowerLedgerEntry.objects.create(
+            packinghouse=self.s.sla, pool=self.pool, entry_date=date(2026, 2, 1),
+            entry_type='pool_close', credit=Decimal('300.00'), debit=Decimal('0'),
+        )
+
+        self.assertEqual(self._rows('cash'), {})
+        for section in ('delivered', 'costs', 'houses', 'settlements', 'money'):
+            self.assertIn('', self._rows(section), section)
+        self.assertEqual(self._assert_parity()['cash_received']['pool_close'], Decimal('300.00'))
+
+    def test_fresh_rebuilds_writes_that_skip_signals(self):
+        self._seed()
+        client = self.s.factory.create_authenticated_client(self.s.owner)
+        url = f'/api/harvest-packing/season-overview/?season={SEASON}'
+        client.get(url)
+        PoolSettlement.objects.update(net_return=Decimal('9999.00'))
+
+        stale = _card(client.get(url).data, 'LEMONS')
+        fresh = _card(client.get(url + '&fresh=1').data, 'LEMONS')
+
+        self.assertEqual(stale['net_return'], Decimal('4000.00'))
+        self.assertEqual(fresh['net_return'], Decimal('9999.00'))
+        self.assertEqual(
+            _card(stored_season_overview(self.s.company, SEASON), 'LEMONS')['net_return'],
+            Decimal('9999.00'),
+        )
+
+    def test_write_during_recompute_is_not_stored_as_fresh(self):
+        self._seed()
+        stored_season_overview(self.s.company, SEASON)
+        GrowerLedgerEntry.objects.create(
+            packinghouse=self.s.sla, pool=self.pool, entry_date=date(2026, 2, 1),
+            entry_type='advance', credit=Decimal('100.00'), debit=Decimal('0'),
+        )
+        compute = season_overview._SECTION_BUILDERS['cash']
+
+        def racing_write(company, season):
+            # Figures read, then a writer lands before the reader stores them
+            figures = compute(company, season)
+            GrowerLedgerEntry.objects.create(
+                packinghouse=self.s.sla, pool=self.pool, entry_date=date(2026, 2, 2),
+                entry_type='advance', credit=Decimal('50.00'), debit=Decimal('0'),
+            )
+            return figures
+
+        with mock.patch.dict(season_overview._SECTION_BUILDERS, cash=racing_write):
+            result = stored_season_overview(self.s.company, SEASON)
+
+        self.assertEqual(result['cash_received']['advances'], Decimal('100.00'))
+        self.assertEqual(self._rows('cash'), {})
+        self.assertEqual(self._assert_parity()['cash_received']['advances'], Decimal('150.00'))
+
+
+class ReceiptCommodityGroupingTests(TestCase):
+    """Receipt rollups group on the stored commodity column in SQL."""
+
+    def setUp(self):
+        self.s = PickHaulScenario()
+
+    def _receipts(self, start, n):
+        invoice = self.s.invoice('900.00')
+        for i in range(start, start + n):
+            code = ('LEM', 'NA', 'ZZZ')[i % 3]
+            receipt = self.s.receipt(str(i), bins='10.0', commodity_code=code)
+            invoice.receipt_links.create(receipt=receipt, assigned='manual')
+
+    def test_query_count_does_not_grow_with_receipts(self):
+        self._receipts(0, 3)
+        call_command('classify_pickhaul_receipts', stdout=StringIO())
+        with CaptureQueriesContext(connection) as small:
+            build_season_overview(self.s.company, SEASON)
+
+        self._receipts(100, 60)
+        call_command('classify_pickhaul_receipts', stdout=StringIO())
+        with CaptureQueriesContext(connection) as large:
+            result = build_season_overview(self.s.company, SEASON)
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(_card(result, 'NAVELS')['deliveries'], 21)
+        self.assertEqual(result['delivery']['bins_delivered'], Decimal('630'))
+
+    def test_unclassified_receipts_match_after_backfill(self):
+        self._receipts(0, 9)
+        self.s.receipt('V1', bins='4.0', commodity_code='', variety_code='NA')
+        self.assertFalse(PickHaulReceipt.objects.exclude(commodity='').exists())
+        before = build_season_overview(self.s.company, SEASON)
+
+        out = StringIO()
+        call_command('classify_pickhaul_receipts', stdout=out)
+
+        self.assertIn('Classified 10 receipts', out.getvalue())
+        self.assertEqual(
+            PickHaulReceipt.objects.get(receipt_no='V1').commodity, 'NAVELS',
+        )
+        self.assertEqual(build_season_overview(self.s.company, SEASON), before)
+        self.assertEqual(_card(before, 'NAVELS')['delivered_bins'], Decimal('34.0'))
+        self.assertEqual(_card(before, 'UNMAPPED')['pickhaul_cost'], Decimal('300.00'))
+
+    def test_reclassify_follows_changed_codes(self):
+        receipt = self.s.receipt('1', commodity_code='LEM')
+        call_command('classify_pickhaul_receipts', stdout=StringIO())
+        PickHaulReceipt.objects.filter(pk=receipt.pk).update(commodity_code='NA')
+
+        call_command('classify_pickhaul_receipts', stdout=StringIO())
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.commodity, 'LEMONS')
+
+        call_command('classify_pickhaul_receipts', '--reclassify', stdout=StringIO())
+        receipt.refresh_from_db()
+        self.assertEqual(receipt.commodity, 'NAVELS')
+
+
 class SeasonOverviewEndpointTests(TestCase):
     def setUp(self):
         self.s = PickHaulScenario()
@@ -1,5 +1,5 @@
 """
-Tests for the season label <-> integer helpers.
+Tests for the season label <-> integer helpers and the commodity lookups.
 
 The pick & haul module stores season as a single integer; the convention is
 that the integer is the END YEAR of the cross-year label ("2025-2026" -> 2026).
@@ -8,6 +8,10 @@ that the integer is the END YEAR of the cross-year label ("2025-2026" -> 2026).
 from django.test import SimpleTestCase
 
 from api.services.season_service import (
+    get_crop_category_for_commodity,
+    get_primary_unit_for_commodity,
+    get_varieties_for_commodity,
+    normalize_commodity,
     season_int_to_label,
     season_label_to_int,
 )
@@ -59,3 +63,34 @@ class RoundTripTests(SimpleTestCase):
                 season_label_to_int(label), 2026,
                 f"round trip failed for {category}: {label}",
             )
+
+
+class CommodityLookupTests(SimpleTestCase):
+    def test_portal_codes_and_free_text(self):
+        self.assertEqual(normalize_commodity('LEM'), 'LEMONS')
+        self.assertEqual(normalize_commodity(' Hass Avocado '), 'AVOCADOS')
+        self.assertEqual(normalize_commodity('CALIFORNIA HASS AVOCADO'), 'AVOCADOS')
+        self.assertEqual(normalize_commodity(''), '')
+
+    def test_unknown_commodity_warns_every_call(self):
+        for _ in range(2):
+            with self.assertLogs('api.services.season_service', level='WARNING'):
+                self.assertEqual(normalize_commodity('sespe'), 'SESPE')
+
+    def test_category_and_unit(self):
+        self.assertEqual(get_crop_category_for_commodity('HASS AVOCADOS'), 'subtropical')
+        self.assertEqual(get_crop_category_for_commodity('walnuts'), 'nut')
+        self.assertEqual(get_crop_category_for_commodity(None), 'citrus')
+        self.assertEqual(get_primary_unit_for_commodity('AVOCADOS')['unit'], 'LBS')
+        self.assertEqual(get_primary_unit_for_commodity('Lemons')['db_field'], 'total_bins')
+
+    def test_returned_unit_info_is_a_copy(self):
+        get_primary_unit_for_commodity('AVOCADOS')['unit'] = 'CHANGED'
+        self.assertEqual(get_primary_unit_for_commodity('AVOCADOS')['unit'], 'LBS')
+
+    def test_varieties_for_commodity(self):
+        self.assertEqual(
+            get_varieties_for_commodity('lemons'),
+            ['meyer_lemon', 'eureka_lemon', 'lisbon_lemon'],
+        )
+        self.assertEqual(get_varieties_for_commodity('SESPE'), [])
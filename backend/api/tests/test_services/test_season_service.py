@@ -0,0 +1,140 @@
+"""
+Tests for SeasonService config resolution: the per-process memo of resolved
+season configs, its invalidation by template/field/crop saves and its expiry,
+and the bulk get_seasons_for_fields() lookup.
+"""
+
+import time
+from datetime import date
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Crop, SeasonTemplate
+from api.services.season_service import SeasonService, clear_season_config_cache
+from api.tests.factories import TestDataFactory
+
+TARGET = date(2026, 1, 15)
+
+
+class SeasonConfigCacheTests(TestCase):
+
+    def setUp(self):
+        clear_season_config_cache()
+        self.factory = TestDataFactory()
+        self.company = self.factory.create_company()
+        self.farm = self.factory.create_farm(self.company)
+        self.service = SeasonService(company_id=self.company.id)
+
+    def _template(self, name, start_month, company=None):
+        return SeasonTemplate.objects.create(
+            name=name, start_month=start_month, duration_months=12,
+            crosses_calendar_year=start_month > 1,
+            label_format='{start_year}-{end_year}' if start_month > 1 else '{start_year}',
+            company=company,
+        )
+
+    def test_warm_field_lookup_runs_no_queries(self):
+        field = self.factory.create_field(
+            self.farm, season_template=self._template('Citrus', 10, self.company),
+        )
+        first = self.service.get_current_season(field_id=field.id, target_date=TARGET)
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = SeasonService(company_id=self.company.id).get_current_season(
+                field_id=field.id, target_date=TARGET,
+            )
+
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual(first, again)
+        self.assertEqual(again.label, '2025-2026')
+
+    def test_warm_category_lookup_runs_no_queries(self):
+        self.service.get_season_date_range('2025-2026', crop_category='citrus')
+
+        with CaptureQueriesContext(connection) as ctx:
+            start, end = self.service.get_season_date_range('2025-2026', crop_category='citrus')
+
+        self.assertEqual(len(ctx.captured_queries), 0)
+        self.assertEqual((start, end), (date(2025, 10, 1), date(2026, 9, 30)))
+
+    def test_field_template_change_invalidates(self):
+        field = self.factory.create_field(self.farm)
+        self.assertEqual(
+            self.service.get_current_season(field_id=field.id, target_date=TARGET).label, '2026',
+        )
+
+        field.season_template = self._template('Avocado', 11, self.company)
+        field.save()
+
+        season = self.service.get_current_season(field_id=field.id, target_date=TARGET)
+        self.assertEqual(season.start_date, date(2025, 11, 1))
+
+    def test_template_and_crop_saves_invalidate(self):
+        template = self._template('Grower Season', 10)
+        crop = Crop.objects.create(name='Navel Orange', category='citrus')
+        field = self.factory.create_field(self.farm, crop=crop)
+        crop.season_template = template
+        crop.save()
+        self.assertEqual(
+            self.service.get_current_season(field_id=field.id, target_date=TARGET).start_date,
+            date(2025, 10, 1),
+        )
+
+        template.start_month = 9
+        template.save()
+
+        self.assertEqual(
+            self.service.get_current_season(field_id=field.id, target_date=TARGET).start_date,
+            date(2025, 9, 1),
+        )
+
+    def test_entries_expire_after_timeout(self):
+        template = self._template('Citrus', 10, self.company)
+        field = self.factory.create_field(self.farm, season_template=template)
+        self.service.get_current_season(field_id=field.id, target_date=TARGET)
+        # A change this worker never hears about, as with a per-process cache
+        SeasonTemplate.objects.filter(pk=template.pk).update(start_month=11)
+
+        cached = self.service.get_current_season(field_id=field.id, target_date=TARGET)
+        later = time.monotonic() + 61
+        with mock.patch('api.services.season_service.time.monotonic', return_value=later):
+            expired = self.service.get_current_season(field_id=field.id, target_date=TARGET)
+
+        self.assertEqual(cached.start_date, date(2025, 10, 1))
+        self.assertEqual(expired.start_date, date(2025, 11, 1))
+
+    @override_settings(SEASON_CONFIG_CACHE_TIMEOUT=0)
+    def test_zero_timeout_disables_memo(self):
+        template = self._template('Citrus', 10, self.company)
+        field = self.factory.create_field(self.farm, season_template=template)
+        self.service.get_current_season(field_id=field.id, target_date=TARGET)
+        SeasonTemplate.objects.filter(pk=template.pk).update(start_month=11)
+
+        season = self.service.get_current_season(field_id=field.id, target_date=TARGET)
+        self.assertEqual(season.start_date, date(2025, 11, 1))
+
+    def test_get_seasons_for_fields(self):
+        citrus = self._template('Citrus', 10, self.company)
+        fields = [
+            self.factory.create_field(self.farm, season_template=citrus) for _ in range(5)
+        ] + [self.factory.create_field(self.farm) for _ in range(5)]
+        ids = [f.id for f in fields]
+
+        with CaptureQueriesContext(connection) as cold:
+            seasons = self.service.get_seasons_for_fields(ids + [0], target_date=TARGET)
+        with CaptureQueriesContext(connection) as warm:
+            again = self.service.get_seasons_for_fields(ids, target_date=TARGET)
+
+        self.assertEqual(len(cold.captured_queries), 1)
+        self.assertEqual(len(warm.captured_queries), 0)
+        self.assertEqual(seasons[ids[0]].label, '2025-2026')
+        self.assertEqual(seasons[ids[-1]].label, '2026')
+        self.assertEqual(seasons[0].label, '2026')
+        for field_id in ids:
+            self.assertEqual(
+                again[field_id],
+                self.service.get_current_season(field_id=field_id, target_date=TARGET),
+            )
@@ -0,0 +1,241 @@
+"""
+Tests for hourly spray window detection: the columnar engine, the
+company-wide service call through WeatherCache, the endpoint and the
+benchmark command.
+"""
+
+import io
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api.models import WeatherCache
+from api.services.operations import ForecastBlock, SprayPlanningService, detect_spray_windows
+from api.tests.factories import TestDataFactory
+from api.weather_service import WeatherService
+
+NOW = datetime(2026, 6, 1, 6, 0, tzinfo=dt_timezone.utc)
+T0 = int(NOW.timestamp())
+
+# One good hour: calm enough for drift, breezy enough to avoid inversions
+GOOD_HOUR = {'temperature': 70, 'humidity': 55, 'wind_speed': 6, 'dewpoint': 55, 'rain': 0}
+
+
+def hourly(hours, **overrides):
+    """``hours`` good one-hour steps from NOW; overrides map index -> field values."""
+    columns = {'step_hours': 1, 'dt': [T0 + n * 3600 for n in range(hours)]}
+    for name, value in GOOD_HOUR.items():
+        columns[name] = [value] * hours
+    for index, values in overrides.items():
+        for name, value in values.items():
+            columns[name][int(index)] = value
+    return columns
+
+
+def detect(forecasts, **kwargs):
+    block = ForecastBlock.from_forecasts(
+        {farm_id: {'hourly': h} for farm_id, h in forecasts.items()}
+    )
+    return detect_spray_windows(block, WeatherService.THRESHOLDS, now=NOW, **kwargs)
+
+
+class SprayWindowEngineTests(SimpleTestCase):
+
+    def test_contiguous_good_hours_form_one_window(self):
+        [window] = detect({1: hourly(8)})[1]
+
+        self.assertEqual(window.start_datetime, NOW)
+        self.assertEqual(window.duration_hours, 8)
+        self.assertEqual((window.rating, window.score), ('good', 100))
+        self.assertEqual(window.notes, [])
+        self.assertEqual(window.conditions['dewpoint_spread_min'], 15)
+        self.assertIsNone(window.conditions['hours_until_rain'])
+
+    def test_poor_hours_split_windows(self):
+        windows = detect({1: hourly(10, **{
+            '3': {'wind_speed': 18},    # too windy
+            '6': {'wind_speed': 1},     # too calm
+        })})[1]
+
+        self.assertEqual(
+            sorted(
+                ((w.start_datetime - NOW).total_seconds() / 3600, w.duration_hours)
+                for w in windows
+            ),
+            [(0, 3), (4, 2), (7, 3)],
+        )
+
+    def test_inversion_from_dewpoint_spread(self):
+        windows = detect({1: hourly(6, **{'2': {'dewpoint': 69}})})[1]
+        self.assertEqual(sorted(w.duration_hours for w in windows), [2, 3])
+
+        [window] = detect({1: hourly(6, **{'2': {'dewpoint': 67}})})[1]
+        self.assertEqual(window.duration_hours, 6)
+        self.assertEqual(window.rating, 'good')
+        self.assertIn('Moderate inversion risk', window.notes[0])
+
+    def test_rain_closes_window_ahead_of_it(self):
+        # Rain at hour 10: hours 5-9 are inside 6h (poor), 0-4 inside 12h (fair)
+        [window] = detect({1: hourly(12, **{'10': {'rain': 2.5}})})[1]
+
+        self.assertEqual(window.duration_hours, 5)
+        self.assertEqual(window.conditions['hours_until_rain'], 5)
+        self.assertTrue(window.notes[0].startswith('Rain forecast 5 hours after window'))
+
+    def test_aerial_has_lower_wind_ceiling(self):
+        forecast = {1: hourly(4, **{'1': {'wind_speed': 9}, '2': {'wind_speed': 9}})}
+
+        self.assertEqual([w.duration_hours for w in detect(forecast)[1]], [4])
+        self.assertEqual(detect(forecast, application_method='aerial')[1], [])
+
+    def test_short_runs_and_gaps(self):
+        forecast = hourly(6)
+        # Missing hour between 2 and 4 breaks the run
+        forecast['dt'][3:] = [t + 3600 for t in forecast['dt'][3:]]
+
+        windows = detect({1: forecast}, min_window_hours=3)[1]
+
+        self.assertEqual([w.duration_hours for w in windows], [3, 3])
+        self.assertEqual(detect({1: forecast}, min_window_hours=4)[1], [])
+
+    def test_farms_are_scored_independently(self):
+        windows = detect({
+            1: hourly(4),
+            2: hourly(4, **{'0': {'humidity': 90}, '1': {'humidity': 90}}),
+            3: hourly(4, **{'3': {'humidity': 75}}),
+        })
+
+        self.assertEqual([w.duration_hours for w in windows[1]], [4])
+        self.assertEqual([w.duration_hours for w in windows[2]], [2])
+        self.assertEqual(windows[3][0].rating, 'good')
+        self.assertLess(windows[3][0].score, 100)
+
+    def test_window_under_way_starts_now(self):
+        block = ForecastBlock.from_forecasts(
+            {1: {'hourly': hourly(6)}}, start=T0 + 90 * 60, end=T0 + 5 * 3600,
+        )
+        now = NOW + timedelta(minutes=90)
+
+        [window] = detect_spray_windows(block, WeatherService.THRESHOLDS, now=now)[1]
+
+        self.assertEqual(len(block), 4)
+        self.assertEqual(window.start_datetime, now)
+        self.assertEqual(window.duration_hours, 3.5)
+
+
+def forecast_payload(hours=48):
+    return {
+        'daily': [],
+        'hourly': hourly(hours),
+        'fetched_at': NOW.isoformat(),
+    }
+
+
+@mock.patch('api.services.operations.spray_planning.timezone.now', return_value=NOW)
+class CompanySprayWindowTests(TestCase):
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+
+    def _farm(self, cached=True, **kwargs):
+        farm = self.factory.create_farm(
+            self.company, gps_latitude=Decimal('34.2'), gps_longitude=Decimal('-119.1'), **kwargs,
+        )
+        if cached:
+            WeatherCache.objects.create(
+                farm=farm, latitude=Decimal('34.2'), longitude=Decimal('-119.1'),
+                weather_data={}, forecast_data=forecast_payload(),
+            )
+        return farm
+
+    @mock.patch.object(WeatherService, 'get_forecast')
+    def test_whole_company_from_cache_in_fixed_queries(self, get_forecast, _now):
+        farms = [self._farm() for _ in range(2)]
+        with CaptureQueriesContext(connection) as small:
+            SprayPlanningService(company_id=self.company.id).find_company_spray_windows()
+
+        farms += [self._farm() for _ in range(6)]
+        self.factory.create_farm(self.company)  # no coordinates
+        with CaptureQueriesContext(connection) as large:
+            windows = SprayPlanningService(
+                company_id=self.company.id
+            ).find_company_spray_windows(days_ahead=1)
+
+        get_forecast.assert_not_called()
+        self.assertEqual(set(windows), {farm.id for farm in farms})
+        self.assertEqual([w.duration_hours for w in windows[farms[0].id]], [24])
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    @mock.patch.object(WeatherService, 'get_forecast')
+    def test_forecast_without_hourly_columns_is_refetched(self, get_forecast, _now):
+        get_forecast.return_value = forecast_payload()
+        farm = self._farm(cached=False)
+        WeatherCache.objects.create(
+            farm=farm, latitude=Decimal('34.2'), longitude=Decimal('-119.1'),
+            weather_data={}, forecast_data={'daily': [], 'fetched_at': NOW.isoformat()},
+        )
+
+        windows = SprayPlanningService().find_spray_windows(farm.id)
+
+        get_forecast.assert_called_once()
+        self.assertEqual(len(windows), 1)
+        self.assertIn('hourly', WeatherCache.objects.get(farm=farm).forecast_data)
+
+    @mock.patch.object(WeatherService, 'get_forecast', side_effect=ValueError('no key'))
+    def test_farms_without_forecast_are_left_out(self, _get_forecast, _now):
+        cached = self._farm()
+        self._farm(cached=False)
+
+        windows = SprayPlanningService(company_id=self.company.id).find_company_spray_windows()
+
+        self.assertEqual(list(windows), [cached.id])
+
+    def test_endpoint_lists_every_farm(self, _now):
+        cached = self._farm(name='A Ranch')
+        bare = self.factory.create_farm(self.company, name='B Ranch')
+        client = self.factory.create_authenticated_client(self.user)
+
+        response = client.get('/api/weather/spray-windows/', {'days_ahead': 1})
+
+        self.assertEqual(response.status_code, 200)
+        farms = response.data['farms']
+        self.assertEqual([f['id'] for f in farms], [cached.id, bare.id])
+        self.assertEqual(farms[0]['windows'][0]['duration_hours'], 24)
+        self.assertIsNone(farms[1]['windows'])
+        self.assertEqual(response.data['summary']['farms_with_forecast'], 1)
+
+
+class HourlyForecastTests(SimpleTestCase):
+
+    def test_forecast_steps_become_columns(self):
+        data = {'list': [
+            {'dt': T0 + 10800, 'main': {'temp': 60, 'humidity': 80}, 'wind': {'speed': 4}},
+            {'dt': T0, 'main': {'temp': 70, 'humidity': 50}, 'wind': {'speed': 5},
+             'rain': {'3h': 1.2}},
+        ]}
+
+        columns = WeatherService()._process_hourly_data(data)
+
+        self.assertEqual(columns['step_hours'], 3)
+        self.assertEqual(columns['dt'], [T0, T0 + 10800])
+        self.assertEqual(columns['rain'], [1.2, 0])
+        self.assertEqual(columns['wind_speed'], [5, 4])
+        self.assertAlmostEqual(columns['dewpoint'][0], 50.5, delta=0.5)
+
+
+class SprayWindowBenchmarkCommandTests(TestCase):
+
+    def test_runs_against_cache_rows(self):
+        out = io.StringIO()
+        call_command('benchmark_spray_windows', '--farms=3', '--days=1', '--db', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('3 farms, 72 forecast steps', output)
+        self.assertIn('find_company_spray_windows', output)
+        self.assertIn('rolled back', output)
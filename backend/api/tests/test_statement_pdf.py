@@ -0,0 +1,137 @@
+"""
+Tests for serving statement PDFs: ETag/If-None-Match, byte ranges and the
+presigned-URL redirect mode, against local filesystem storage.
+"""
+
+import hashlib
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+from api.models import PackinghouseStatement
+from api.tests.factories import TestDataFactory
+from api.view_helpers import RangeNotSatisfiable, parse_byte_range
+
+PDF_BYTES = b'%PDF-1.4\n' + bytes(range(256)) * 40
+
+
+class ParseByteRangeTests(TestCase):
+
+    def test_ranges(self):
+        self.assertEqual(parse_byte_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_byte_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_byte_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_byte_range('bytes=990-2000', 1000), (990, 999))
+        self.assertEqual(parse_byte_range('bytes=-5000', 1000), (0, 999))
+
+    def test_ignored_headers_send_whole_file(self):
+        for header in (None, '', 'items=0-5', 'bytes=0-5,10-20', 'bytes=9-3', 'bytes=a-b', 'bytes=-'):
+            self.assertIsNone(parse_byte_range(header, 1000), header)
+
+    def test_unsatisfiable(self):
+        for header in ('bytes=1000-', 'bytes=-0'):
+            with self.assertRaises(RangeNotSatisfiable):
+                parse_byte_range(header, 1000)
+
+
+class ServeStatementPdfTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.factory = TestDataFactory()
+        self.company, self.user = self.factory.create_company_with_user()
+        self.client = self.factory.create_authenticated_client(self.user)
+        self.statement = PackinghouseStatement.objects.create(
+            packinghouse=self.factory.create_packinghouse(self.company),
+            pdf_file=SimpleUploadedFile('statement.pdf', PDF_BYTES, 'application/pdf'),
+            original_filename='March Settlement.pdf', file_size_bytes=len(PDF_BYTES),
+            statement_type='settlement', status='extracted',
+        )
+        self.url = f'/api/packinghouse-statements/{self.statement.id}/pdf/'
+        self.etag = f'"{hashlib.sha256(PDF_BYTES).hexdigest()}"'
+
+    def _body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_upload_is_hashed(self):
+        self.assertEqual(self.statement.pdf_sha256, hashlib.sha256(PDF_BYTES).hexdigest())
+
+    def test_full_response_carries_etag(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(self._body(response), PDF_BYTES)
+
+    def test_if_none_match_returns_304(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response.content, b'')
+
+    def test_range_request(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=100-1123')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 100-1123/{len(PDF_BYTES)}')
+        self.assertEqual(response['Content-Length'], '1024')
+        self.assertEqual(self._body(response), PDF_BYTES[100:1124])
+
+    def test_suffix_range(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-16')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(self._body(response), PDF_BYTES[-16:])
+
+    def test_range_past_end_is_416(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(PDF_BYTES)}-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(PDF_BYTES)}')
+
+    def test_stale_if_range_sends_whole_file(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._body(response), PDF_BYTES)
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=self.etag)
+        self.assertEqual(response.status_code, 206)
+
+    def test_unhashed_statement_is_hashed_on_first_serve(self):
+        PackinghouseStatement.objects.filter(pk=self.statement.pk).update(pdf_sha256='')
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(self._body(response), PDF_BYTES)
+        self.statement.refresh_from_db()
+        self.assertEqual(f'"{self.statement.pdf_sha256}"', self.etag)
+
+    def test_redirect_ignored_with_local_storage(self):
+        with override_settings(STATEMENT_PDF_REDIRECT_SECONDS=300):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_redirects_to_presigned_url_with_cloud_storage(self):
+        storage = self.statement.pdf_file.storage
+        with override_settings(USE_CLOUD_STORAGE=True, STATEMENT_PDF_REDIRECT_SECONDS=300), \
+                patch.object(storage, 'url', return_value='https://bucket.example/signed') as url:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], 'https://bucket.example/signed')
+        self.assertEqual(url.call_args.kwargs['expire'], 300)
+        self.assertEqual(response['Cache-Control'], 'private, max-age=150')
@@ -0,0 +1,147 @@
+"""
+Tests for Celery task run instrumentation, the Prometheus endpoint and the
+task_metrics command.
+"""
+
+import io
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from api.models import TaskRunMetric
+from api.services.task_metrics import percentile, render_prometheus, summarize_task_runs
+from api.tasks.compliance_tasks import check_compliance_deadlines, check_license_expirations
+from api.tasks.instrumentation import rows_processed
+from api.tasks.monitoring_tasks import prune_task_run_metrics
+from api.tests.factories import TestDataFactory
+
+
+class RowsProcessedTests(SimpleTestCase):
+
+    def test_prefers_checked_keys(self):
+        self.assertEqual(
+            rows_processed({'licenses_checked': 7, 'alerts_created': 2}), 7
+        )
+
+    def test_explicit_key_wins(self):
+        self.assertEqual(rows_processed({'rows_processed': 3, 'x_checked': 9}), 3)
+
+    def test_falls_back_through_suffixes(self):
+        self.assertEqual(rows_processed({'reports_generated': 2, 'companies_skipped': 1}), 2)
+        self.assertIsNone(rows_processed({'deleted_alerts': 4}))
+        self.assertIsNone(rows_processed(None))
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([10, 20, 30, 40], 0.5), 25)
+        self.assertEqual(percentile([5], 0.95), 5)
+        self.assertIsNone(percentile([], 0.5))
+
+
+class TaskInstrumentationTests(TestCase):
+
+    def test_apply_records_one_metric_per_run(self):
+        check_compliance_deadlines.apply()
+
+        metric = TaskRunMetric.objects.get()
+        self.assertEqual(metric.task_name, 'api.tasks.compliance_tasks.check_compliance_deadlines')
+        self.assertEqual(metric.status, 'success')
+        self.assertGreater(metric.query_count, 0)
+        self.assertGreaterEqual(metric.duration_ms, metric.query_time_ms)
+        self.assertEqual(metric.rows_processed, 0)
+
+    def test_company_run_records_company(self):
+        factory = TestDataFactory()
+        companies = [factory.create_company() for _ in range(2)]
+
+        check_license_expirations.apply(kwargs={'company_id': companies[0].id})
+
+        metric = TaskRunMetric.objects.get()
+        self.assertEqual(metric.company_id, companies[0].id)
+
+    def test_direct_calls_are_not_recorded(self):
+        check_compliance_deadlines()
+        self.assertFalse(TaskRunMetric.objects.exists())
+
+    def test_prune_removes_old_runs(self):
+        now = timezone.now()
+        for days_ago in (1, 40):
+            TaskRunMetric.objects.create(
+                task_name='api.tasks.x', started_at=now - timedelta(days=days_ago),
+                duration_ms=5,
+            )
+
+        stats = prune_task_run_metrics(days=30)
+
+        self.assertEqual(stats, {'metrics_deleted': 1})
+        self.assertEqual(TaskRunMetric.objects.count(), 1)
+
+
+class TaskMetricsReportingTests(TestCase):
+
+    def setUp(self):
+        now = timezone.now()
+        for i, duration in enumerate([100, 200, 300, 400, 1000]):
+            TaskRunMetric.objects.create(
+                task_name='api.tasks.compliance_tasks.check_active_reis',
+                started_at=now - timedelta(minutes=i),
+                duration_ms=duration, query_count=i + 1, query_time_ms=10,
+                rows_processed=5, status='failure' if i == 4 else 'success',
+            )
+        TaskRunMetric.objects.create(
+            task_name='api.tasks.compliance_tasks.check_active_reis',
+            started_at=now - timedelta(days=3), duration_ms=99999,
+        )
+
+    def test_summary_percentiles_within_window(self):
+        [summary] = summarize_task_runs()
+
+        self.assertEqual(summary['runs'], 5)
+        self.assertEqual(summary['failures'], 1)
+        self.assertEqual(summary['p50_ms'], 300)
+        self.assertAlmostEqual(summary['p95_ms'], 880)
+        self.assertEqual(summary['total_rows'], 25)
+
+    def test_prometheus_rendering(self):
+        body = render_prometheus(summarize_task_runs())
+
+        self.assertIn('# TYPE finch_task_duration_seconds summary', body)
+        self.assertIn(
+            'finch_task_duration_seconds{task="api.tasks.compliance_tasks.check_active_reis",quantile="0.5"} 0.300000',
+            body,
+        )
+        self.assertIn(
+            'finch_task_runs{task="api.tasks.compliance_tasks.check_active_reis",status="failure"} 1',
+            body,
+        )
+
+    @override_settings(TASK_METRICS_TOKEN='scrape-secret')
+    def test_endpoint_requires_token(self):
+        self.assertEqual(self.client.get('/api/metrics/tasks/').status_code, 403)
+        self.assertEqual(
+            self.client.get(
+                '/api/metrics/tasks/', HTTP_AUTHORIZATION='Bearer wrong'
+            ).status_code,
+            403,
+        )
+
+        response = self.client.get(
+            '/api/metrics/tasks/', HTTP_AUTHORIZATION='Bearer scrape-secret'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn(b'finch_task_db_queries_count', response.content)
+
+    def test_endpoint_closed_without_configured_token(self):
+        response = self.client.get('/api/metrics/tasks/', HTTP_AUTHORIZATION='Bearer ')
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_prints_p50_p95(self):
+        out = io.StringIO()
+        call_command('task_metrics', '--days=1', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('p95 ms', output)
+        self.assertIn('compliance_tasks.check_active_reis', output)
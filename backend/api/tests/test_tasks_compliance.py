@@ -1,26 +1,36 @@
 from datetime import date, datetime, time, timedelta
+from decimal import Decimal
 from unittest.mock import patch
 
+from django.db import connection
+from django.db.models import Count
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from api.models import (
+    ApplicationEvent,
     Company,
     ComplianceProfile,
     ComplianceDeadline,
     ComplianceAlert,
     Farm,
     Field,
+    License,
     PesticideProduct,
     PesticideApplication,
     REIPostingRecord,
+    WPSTrainingRecord,
 )
 from api.tasks.compliance_tasks import (
     check_compliance_deadlines,
     generate_recurring_deadlines,
     generate_rei_posting_records,
     check_active_reis,
+    check_license_expirations,
+    check_wps_training_expirations,
 )
+from api.tests.factories import TestDataFactory
 
 
 class ComplianceTaskTests(TestCase):
@@ -141,6 +151,65 @@ class ComplianceTaskTests(TestCase):
             ).exists()
         )
 
+    def _generate_at(self, day):
+        fixed_now = timezone.make_aware(datetime.combine(day, time(8, 0)))
+        with patch('api.tasks.compliance_tasks.timezone.now', return_value=fixed_now):
+            return generate_recurring_deadlines(company_id=self.company.id)
+
+    def test_recurring_deadlines_extend_from_high_water_mark(self):
+        profile = ComplianceProfile.objects.create(
+            company=self.company, primary_state='CA',
+        )
+        first = self._generate_at(date(2026, 2, 24))
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.deadlines_generated_through, date(2027, 2, 24))
+        self.assertEqual(
+            ComplianceDeadline.objects.filter(company=self.company).count(),
+            first['deadlines_created'],
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            rerun = self._generate_at(date(2026, 2, 24))
+        self.assertEqual(rerun['deadlines_created'], 0)
+        self.assertEqual(
+            [q['sql'] for q in ctx.captured_queries if 'compliancedeadline' in q['sql']], [],
+        )
+
+        later = self._generate_at(date(2026, 3, 20))
+        self.assertEqual(later['deadlines_created'], 3)
+        self.assertEqual(
+            set(ComplianceDeadline.objects.filter(
+                company=self.company, due_date__gt=date(2027, 2, 24),
+            ).values_list('name', flat=True)),
+            {
+                'WPS Annual Training - 2027',
+                'PUR Report - February 2027',
+                'Water Quality Testing - Q1 2027',
+            },
+        )
+
+    def test_profile_change_regenerates_missing_deadlines(self):
+        profile = ComplianceProfile.objects.create(
+            company=self.company, primary_state='CA', requires_wps_compliance=False,
+        )
+        first = self._generate_at(date(2026, 2, 24))
+
+        profile.requires_wps_compliance = True
+        profile.save()
+        second = self._generate_at(date(2026, 2, 24))
+
+        self.assertEqual(second['deadlines_created'], 1)
+        self.assertEqual(
+            ComplianceDeadline.objects.filter(company=self.company).count(),
+            first['deadlines_created'] + 1,
+        )
+        self.assertTrue(
+            ComplianceDeadline.objects.filter(
+                company=self.company, name='WPS Annual Training - 2026', auto_generated=True,
+            ).exists()
+        )
+
     def test_generate_rei_posting_records_creates_record(self):
         app_date = date(2026, 2, 24)
         app = self._make_application(app_date, time(8, 0), time(10, 0))
@@ -183,3 +252,229 @@ class ComplianceTaskTests(TestCase):
             ComplianceAlert.objects.filter(related_object_type='REIPostingRecord').count(),
             2,
         )
+
+
+class GenerateREIPostingBatchTests(TestCase):
+    """The hourly REI backfill must not issue per-row queries."""
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company = self.factory.create_company()
+        self.farm = self.factory.create_farm(self.company)
+        self.field = self.factory.create_field(self.farm)
+        self.product = self.factory.create_pesticide_product(rei_hours=12)
+
+    def _backlog(self, size):
+        started = timezone.now() - timedelta(hours=1)
+        for _ in range(size):
+            self.factory.create_application(self.field, product=self.product)
+        ApplicationEvent.objects.bulk_create([
+            ApplicationEvent(
+                company=self.company, farm=self.farm, date_started=started,
+                treated_area_acres=Decimal('5.00'), rei_hours=Decimal('12'),
+            )
+            for _ in range(size)
+        ])
+        # Application saves may already have synced some postings; start
+        # every run from an empty posting table.
+        REIPostingRecord.objects.all().delete()
+
+    def _queries_for_backlog(self, size):
+        self._backlog(size)
+        with CaptureQueriesContext(connection) as ctx:
+            stats = generate_rei_posting_records()
+        self.assertEqual(stats['records_created'], 2 * size)
+        self.assertEqual(REIPostingRecord.objects.count(), 2 * size)
+        REIPostingRecord.objects.all().delete()
+        PesticideApplication.objects.all().delete()
+        ApplicationEvent.objects.all().delete()
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_flat_as_backlog_grows(self):
+        self.assertEqual(self._queries_for_backlog(3), self._queries_for_backlog(40))
+
+    def test_rerun_creates_nothing(self):
+        self._backlog(5)
+        generate_rei_posting_records()
+
+        stats = generate_rei_posting_records()
+
+        self.assertEqual(stats['records_created'], 0)
+        self.assertEqual(REIPostingRecord.objects.count(), 10)
+
+    def test_event_batch_sync_matches_single_sync(self):
+        now = timezone.now()
+        running = ApplicationEvent.objects.create(
+            company=self.company, farm=self.farm, date_started=now - timedelta(hours=2),
+            treated_area_acres=Decimal('5.00'), rei_hours=Decimal('4.5'),
+        )
+        over = ApplicationEvent.objects.create(
+            company=self.company, farm=self.farm, date_started=now - timedelta(days=3),
+            treated_area_acres=Decimal('5.00'), rei_hours=Decimal('4'),
+        )
+        REIPostingRecord.objects.all().delete()
+
+        created = ApplicationEvent.sync_rei_postings([running, over])
+
+        self.assertEqual(created, 1)
+        posting = REIPostingRecord.objects.get()
+        self.assertEqual(posting.event_id, running.id)
+        self.assertEqual(posting.rei_hours, 5)
+        self.assertEqual(posting.rei_end_datetime, running.date_started + timedelta(hours=4.5))
+
+    def test_postings_from_an_overlapping_run_are_not_counted(self):
+        self._backlog(3)
+        first = PesticideApplication.objects.order_by('id').first()
+        bulk_insert = REIPostingRecord.bulk_insert
+
+        def overlapping_run(records, source, **kwargs):
+            # Another run posts the first application between our read and insert
+            REIPostingRecord.objects.get_or_create(
+                application=first,
+                defaults={'rei_hours': 12, 'rei_end_datetime': timezone.now()},
+            )
+            return bulk_insert(records, source, **kwargs)
+
+        with patch.object(REIPostingRecord, 'bulk_insert', side_effect=overlapping_run):
+            stats = generate_rei_posting_records()
+
+        self.assertEqual(stats['applications_checked'], 6)
+        self.assertEqual(stats['records_created'], 5)
+        self.assertEqual(REIPostingRecord.objects.count(), 6)
+
+
+class ExpirationSweepTests(TestCase):
+    """License and WPS training sweeps over 10k records."""
+
+    SIZE = 10_000
+
+    def setUp(self):
+        self.factory = TestDataFactory()
+        self.company = self.factory.create_company()
+        self.today = timezone.now().date()
+
+    @staticmethod
+    def _non_insert(ctx):
+        # bulk_create batches by the backend's parameter limit (small on SQLite)
+        return [q for q in ctx.captured_queries if not q['sql'].startswith('INSERT')]
+
+    def _licenses(self):
+        # Days left cycle through expired, <=30, <=60, <=90 and later
+        days_left = [-5, 20, 45, 80, 200]
+        License.objects.bulk_create(
+            License(
+                company=self.company,
+                license_type='qal',
+                license_number=f'QAL-{n}',
+                issuing_authority='CA DPR',
+                issue_date=self.today - timedelta(days=300),
+                expiration_date=self.today + timedelta(days=days_left[n % 5]),
+                status='active',
+                renewal_in_progress=(n % 10 == 1),
+            )
+            for n in range(self.SIZE)
+        )
+
+    def test_license_sweep(self):
+        self._licenses()
+
+        with CaptureQueriesContext(connection) as ctx:
+            stats = check_license_expirations(company_id=self.company.id)
+
+        self.assertEqual(stats, {
+            'licenses_checked': self.SIZE,
+            'alerts_created': self.SIZE * 4 // 5,
+            'expired_count': self.SIZE // 5,
+        })
+        self.assertLessEqual(len(self._non_insert(ctx)), 12)
+        self.assertEqual(
+            dict(License.objects.values_list('status').annotate(n=Count('id')).order_by()),
+            {
+                'expired': 2000, 'expiring_soon': 1000, 'pending_renewal': 1000,
+                'active': 6000,
+            },
+        )
+        self.assertEqual(
+            dict(ComplianceAlert.objects.values_list('priority').annotate(n=Count('id')).order_by()),
+            {'critical': 4000, 'high': 2000, 'medium': 2000},
+        )
+
+        rerun = check_license_expirations(company_id=self.company.id)
+
+        self.assertEqual(rerun['alerts_created'], 0)
+        self.assertEqual(ComplianceAlert.objects.count(), 8000)
+
+    def test_license_alert_text_matches_model(self):
+        license = License.objects.create(
+            company=self.company, license_type='pca', license_number='PCA-1',
+            issuing_authority='CA DPR', issue_date=self.today - timedelta(days=300),
+            expiration_date=self.today + timedelta(days=25),
+        )
+        License.objects.filter(pk=license.pk).update(status='active')
+
+        check_license_expirations(company_id=self.company.id)
+
+        alert = ComplianceAlert.objects.get()
+        self.assertEqual(alert.title, 'License Expiring: Pest Control Advisor (PCA)')
+        self.assertEqual(
+            alert.message,
+            f"Company's Pest Control Advisor (PCA) (#PCA-1) expires in 25 days on "
+            f"{license.expiration_date}.",
+        )
+        self.assertEqual(alert.related_object_id, license.id)
+        self.assertEqual(License.objects.get().status, 'expiring_soon')
+
+    def test_license_status_follows_its_reminder_window(self):
+        inside, outside = [
+            License.objects.create(
+                company=self.company, license_type='qal', license_number=f'QAL-{days}',
+                issuing_authority='CA DPR', issue_date=self.today - timedelta(days=300),
+                expiration_date=self.today + timedelta(days=days), renewal_reminder_days=14,
+            )
+            for days in (10, 20)
+        ]
+        License.objects.update(status='active')
+
+        check_license_expirations(company_id=self.company.id)
+
+        self.assertEqual(
+            dict(License.objects.values_list('id', 'status')),
+            {inside.id: 'expiring_soon', outside.id: 'active'},
+        )
+        self.assertEqual(ComplianceAlert.objects.count(), 2)
+
+    def test_wps_training_sweep(self):
+        days_left = [10, 45, 80, 200]
+        WPSTrainingRecord.objects.bulk_create(
+            WPSTrainingRecord(
+                company=self.company,
+                trainee_name=f'Worker {n}',
+                training_type='pesticide_safety',
+                training_date=self.today - timedelta(days=300),
+                expiration_date=self.today + timedelta(days=days_left[n % 4]),
+                trainer_name='Trainer',
+            )
+            for n in range(self.SIZE)
+        )
+        WPSTrainingRecord.objects.create(
+            company=self.company, trainee_name='Lapsed', training_type='pesticide_safety',
+            training_date=self.today - timedelta(days=400),
+            expiration_date=self.today - timedelta(days=1), trainer_name='Trainer',
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            stats = check_wps_training_expirations(company_id=self.company.id)
+
+        self.assertEqual(stats, {
+            'records_checked': self.SIZE,
+            'alerts_created': self.SIZE * 3 // 4,
+            'expired_count': 0,
+        })
+        self.assertLessEqual(len(self._non_insert(ctx)), 4)
+        self.assertEqual(
+            dict(ComplianceAlert.objects.values_list('priority').annotate(n=Count('id')).order_by()),
+            {'high': 2500, 'medium': 2500, 'low': 2500},
+        )
+        self.assertEqual(
+            check_wps_training_expirations(company_id=self.company.id)['alerts_created'], 0,
+        )
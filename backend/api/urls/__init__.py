@@ -22,6 +22,8 @@ from ..team_views import (
     company_members, update_company_member, remove_company_member, transfer_ownership,
 )
 
+from ..monitoring_views import dashboard_cache_metrics, task_metrics
+
 from ..company_views import (
     get_company,
     update_company,
@@ -44,6 +46,8 @@ def health_check(request):
 urlpatterns = [
     # Health check (no auth required) - must be first for Railway
     path('health/', health_check, name='health-check'),
+    path('metrics/tasks/', task_metrics, name='task-metrics'),
+    path('metrics/dashboards/', dashboard_cache_metrics, name='dashboard-cache-metrics'),
 
     # Domain-specific URL modules
     path('', include('api.urls.farm_urls')),
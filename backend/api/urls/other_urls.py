@@ -34,6 +34,7 @@ from ..weather_views import (
     get_spray_conditions,
     get_spray_thresholds,
     get_all_farms_weather,
+    get_company_spray_windows,
 )
 
 router = DefaultRouter()
@@ -64,6 +65,7 @@ urlpatterns = router.urls + [
     path('weather/spray-conditions/<int:farm_id>/', get_spray_conditions, name='weather-spray-conditions'),
     path('weather/thresholds/', get_spray_thresholds, name='weather-thresholds'),
     path('weather/farms/', get_all_farms_weather, name='weather-all-farms'),
+    path('weather/spray-windows/', get_company_spray_windows, name='weather-spray-windows'),
 
     # PUR Import pipeline
     path('pur-import/upload/', pur_import_upload, name='pur-import-upload'),
@@ -3,7 +3,12 @@ Shared helper functions and base classes for views across the API.
 
 These functions are used by multiple view files for company validation (RLS).
 """
+import csv
+import tempfile
+
 from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
 from rest_framework import serializers, viewsets
 from .audit_utils import AuditLogMixin
 from .permissions import IsAuthenticated, HasCompanyAccess
@@ -26,6 +31,148 @@ def require_company(user):
     return company
 
 
+# Rows fetched per database round-trip when streaming an export. Memory is
+# bounded by this chunk rather than by the size of the result set.
+EXPORT_CHUNK_SIZE = 2000
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+class EchoBuffer:
+    """File-like object whose write() hands the value back, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows, header=None):
+    """Yield CSV-encoded lines for ``header`` and then each row in ``rows``."""
+    writer = csv.writer(EchoBuffer())
+    if header:
+        yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def streaming_csv_response(rows, filename, header=None):
+    """
+    Stream ``rows`` (any iterable of sequences, typically a generator over
+    ``queryset.iterator()``) as a CSV attachment.
+    """
+    response = StreamingHttpResponse(iter_csv(rows, header), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def xlsx_file_response(workbook, filename):
+    """
+    Save ``workbook`` to a temp file and return it as an attachment.
+
+    Pair with ``Workbook(write_only=True)`` so rows are flushed to disk as
+    they are appended instead of being held as a cell grid in memory.
+    """
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    response = FileResponse(output, content_type=XLSX_CONTENT_TYPE)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Bytes read per chunk when streaming part of a file for a Range request.
+RANGE_CHUNK_SIZE = 64 * 1024
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range starts past the end of the file."""
+
+
+def parse_byte_range(header, size):
+    """
+    Inclusive (start, end) offsets for a single-range ``Range: bytes=...``
+    header against a file of ``size`` bytes.
+
+    Returns None when there is no header or it isn't one we honour
+    (other units, multiple ranges, malformed), in which case the whole
+    file is sent, as RFC 9110 allows. Raises RangeNotSatisfiable when
+    the range can't be served.
+    """
+    if not header:
+        return None
+    units, _, spec = header.partition('=')
+    if units.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash or not (first or last) or not all(p.isdigit() for p in (first, last) if p):
+        return None
+
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def _iter_range(file, start, length):
+    try:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(RANGE_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def ranged_file_response(request, file, size, content_type, etag=None, filename=None):
+    """
+    Serve an open ``file`` of ``size`` bytes inline, answering a single
+    byte-range request with 206 Partial Content (or 416) and anything
+    else with the whole file.
+
+    ``etag`` is sent with the response and checked against If-Range, so a
+    client resuming with a stale ETag gets the full, current file.
+    """
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range or (etag and if_range == etag):
+        try:
+            byte_range = parse_byte_range(request.META.get('HTTP_RANGE'), size)
+        except RangeNotSatisfiable:
+            file.close()
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type, filename=filename or '')
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_range(file, start, end - start + 1), status=206, content_type=content_type,
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        if filename:
+            response['Content-Disposition'] = content_disposition_header(False, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    if etag:
+        response['ETag'] = etag
+    return response
+
+
 class CompanyFilteredViewSet(AuditLogMixin, viewsets.ModelViewSet):
     """
     Base ViewSet that handles company-scoped filtering and creation.
@@ -4,12 +4,16 @@ Weather Service Module
 Handles OpenWeatherMap API integration and spray condition assessment.
 """
 
+import logging
+import math
 import os
 import requests
 from datetime import datetime, timedelta
 from django.utils import timezone
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 class WeatherService:
     """Service class for weather API integration and spray assessment."""
@@ -129,6 +133,7 @@ class WeatherService:
 
             return {
                 'daily': daily_forecasts,
+                'hourly': self._process_hourly_data(data),
                 'fetched_at': timezone.now().isoformat(),
             }
         except requests.RequestException as e:
@@ -202,6 +207,32 @@ class WeatherService:
 
         return result
 
+    def _process_hourly_data(self, data):
+        """
+        Keep the forecast steps as parallel columns for spray window
+        detection: epoch seconds, °F, %, mph, dewpoint °F and rain (mm over
+        the step).
+        """
+        hourly = {
+            'step_hours': 3,
+            'dt': [],
+            'temperature': [],
+            'humidity': [],
+            'wind_speed': [],
+            'dewpoint': [],
+            'rain': [],
+        }
+        for item in sorted(data.get('list', []), key=lambda i: i['dt']):
+            temp = item['main']['temp']
+            humidity = item['main']['humidity']
+            hourly['dt'].append(item['dt'])
+            hourly['temperature'].append(temp)
+            hourly['humidity'].append(humidity)
+            hourly['wind_speed'].append(item['wind'].get('speed', 0))
+            hourly['dewpoint'].append(round(self._calculate_dewpoint(temp, humidity), 1))
+            hourly['rain'].append(item.get('rain', {}).get('3h', 0))
+        return hourly
+
     def _assess_daily_spray(self, day_data):
         """Quick assessment for daily forecast spray rating."""
         issues = 0
@@ -397,8 +428,8 @@ class WeatherService:
         a = 17.27
         b = 237.7
 
-        # Calculate alpha
-        alpha = ((a * temp_c) / (b + temp_c)) + (humidity / 100.0)
+        # Calculate alpha (relative humidity enters as its natural log)
+        alpha = ((a * temp_c) / (b + temp_c)) + math.log(max(humidity, 1) / 100.0)
 
         # Calculate dewpoint in Celsius
         dewpoint_c = (b * alpha) / (a - alpha)
@@ -481,19 +512,47 @@ class WeatherService:
                 'needs_location': True,
             }
 
+        cache = WeatherCache.objects.filter(farm=farm).first()
+        return self._cached_forecast(farm, cache)
+
+    def get_farm_forecasts(self, farms):
+        """
+        Forecasts for several farms keyed by farm id, reading every
+        WeatherCache row in one query and fetching only stale forecasts.
+
+        Farms without coordinates, and farms whose fetch fails with nothing
+        cached, are left out.
+        """
+        from .models import WeatherCache
+
+        farms = [farm for farm in farms if farm.has_coordinates]
+        caches = {
+            cache.farm_id: cache
+            for cache in WeatherCache.objects.filter(farm__in=farms)
+        }
+
+        forecasts = {}
+        for farm in farms:
+            try:
+                forecasts[farm.id] = self._cached_forecast(farm, caches.get(farm.id))
+            except Exception as e:
+                logger.warning(f"Forecast unavailable for farm {farm.id}: {e}")
+        return forecasts
+
+    def _cached_forecast(self, farm, cache):
+        """Forecast from the farm's WeatherCache row, refreshed when stale."""
+        from .models import WeatherCache
+
+        # Forecasts cached before hourly columns were kept are refetched
+        if cache and cache.forecast_data and 'hourly' in cache.forecast_data \
+                and not cache.is_forecast_stale:
+            forecast = cache.forecast_data
+            forecast['cached'] = True
+            return forecast
+
         lat = float(farm.gps_latitude)
         lon = float(farm.gps_longitude)
 
-        # Check cache
-        try:
-            cache = WeatherCache.objects.get(farm=farm)
-            if cache.forecast_data and not cache.is_forecast_stale:
-                forecast = cache.forecast_data
-                forecast['cached'] = True
-                return forecast
-        except WeatherCache.DoesNotExist:
-            cache = None
-
         # Fetch fresh data
         try:
             forecast = self.get_forecast(lat, lon)
@@ -224,3 +224,66 @@ def get_all_farms_weather(request):
         results.append(farm_data)
 
     return Response({'farms': results})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, HasCompanyAccess])
+def get_company_spray_windows(request):
+    """
+    Get spray windows for every farm belonging to the user's company.
+
+    Query params:
+        days_ahead: Optional (default: 7, max: 7)
+        application_method: Optional ('ground' or 'aerial', default: 'ground')
+        min_window_hours: Optional (default: 2)
+
+    Farms without coordinates or a forecast are listed with
+    ``windows: null``.
+    """
+    from .services.operations import SprayPlanningService
+
+    company = request.user.company_memberships.first()
+    if not company:
+        return Response(
+            {'error': 'No company associated with user'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        days_ahead = min(int(request.query_params.get('days_ahead', 7)), 7)
+        min_window_hours = float(request.query_params.get('min_window_hours', 2))
+    except ValueError:
+        return Response(
+            {'error': 'days_ahead and min_window_hours must be numbers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    application_method = request.query_params.get('application_method', 'ground')
+
+    service = SprayPlanningService(company_id=company.company_id)
+    windows = service.find_company_spray_windows(
+        days_ahead=days_ahead,
+        application_method=application_method,
+        min_window_hours=min_window_hours,
+    )
+
+    farms = Farm.objects.filter(company_id=company.company_id, active=True).order_by('name')
+    results = []
+    for farm in farms:
+        farm_windows = windows.get(farm.id)
+        results.append({
+            'id': farm.id,
+            'name': farm.name,
+            'has_coordinates': farm.has_coordinates,
+            'windows': [w.to_dict() for w in farm_windows] if farm_windows is not None else None,
+        })
+
+    all_windows = [w for farm_windows in windows.values() for w in farm_windows]
+    return Response({
+        'farms': results,
+        'summary': {
+            'farms_with_forecast': len(windows),
+            'total_windows': len(all_windows),
+            'good_windows': len([w for w in all_windows if w.rating == 'good']),
+            'fair_windows': len([w for w in all_windows if w.rating == 'fair']),
+        },
+    })
@@ -159,6 +159,18 @@ if CACHE_URL:
         'LOCATION': CACHE_URL,
     }
 
+# Seconds a dashboard payload stays cached (api/services/dashboard_cache.py).
+# Entries are keyed on the company's data version, so writes invalidate them
+# immediately; this only bounds how long date-relative figures can drift.
+# 0 disables dashboard caching.
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', '900'))
+
+# Seconds a worker keeps a resolved season config in its own memory
+# (api/services/season_service.py). Entries are also checked against season
+# versions in the cache, but without CACHE_URL that cache is per-process, so
+# this bounds how long other workers can serve a config after a change.
+# 0 disables the memo.
+SEASON_CONFIG_CACHE_TIMEOUT = int(os.environ.get('SEASON_CONFIG_CACHE_TIMEOUT', '60'))
 
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -236,6 +248,12 @@ else:
         },
     }
 
+# Seconds a presigned storage URL stays valid when statement PDFs are served
+# by redirecting to cloud storage instead of streaming them through a worker.
+# 0 streams every PDF through Django (required when the bucket has no CORS
+# rule for the frontend). Ignored with local storage.
+STATEMENT_PDF_REDIRECT_SECONDS = int(os.environ.get('STATEMENT_PDF_REDIRECT_SECONDS', '0'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # =============================================================================
@@ -499,8 +517,39 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'api.tasks.compliance_tasks.check_phi_compliance_for_upcoming_harvests',
         'schedule': crontab(hour=6, minute=0),
     },
+
+    # Rebuild audit activity counters for the previous days at 1 AM
+    'rollup-audit-daily-counts': {
+        'task': 'api.tasks.audit_tasks.rollup_audit_daily_counts',
+        'schedule': crontab(hour=1, minute=0),
+    },
+
+    # Create upcoming audit log partitions and archive cold months on the
+    # 1st of each month at 1:30 AM
+    'maintain-audit-partitions': {
+        'task': 'api.tasks.audit_tasks.maintain_audit_partitions',
+        'schedule': crontab(day_of_month=1, hour=1, minute=30),
+    },
+
+    # Drop task run metrics past retention daily at 2:30 AM
+    'prune-task-run-metrics': {
+        'task': 'api.tasks.monitoring_tasks.prune_task_run_metrics',
+        'schedule': crontab(hour=2, minute=30),
+    },
 }
 
+# Audit log retention: months kept in the database before partitions are
+# archived to compressed JSONL in default storage, and how many future
+# monthly partitions to keep created.
+AUDIT_LOG_RETENTION_MONTHS = int(os.environ.get('AUDIT_LOG_RETENTION_MONTHS', '24'))
+AUDIT_LOG_PARTITION_MONTHS_AHEAD = 2
+
+# Celery task run metrics (api/tasks/instrumentation.py): days of
+# TaskRunMetric rows kept, and the bearer token Prometheus presents to
+# /api/metrics/tasks/ and /api/metrics/dashboards/ (closed while empty).
+TASK_METRIC_RETENTION_DAYS = int(os.environ.get('TASK_METRIC_RETENTION_DAYS', '30'))
+TASK_METRICS_TOKEN = os.environ.get('TASK_METRICS_TOKEN', '')
+
 # =============================================================================
 # LOGGING
 # =============================================================================
@@ -80,3 +80,12 @@ def _safe_database_backwards(self, app_label, schema_editor, from_state, to_stat
 
 _OriginalRunSQL.database_forwards = _safe_database_forwards
 _OriginalRunSQL.database_backwards = _safe_database_backwards
+
+# Run Celery tasks inline so the compliance fan-out (group + chord) can be
+# exercised without a broker or result backend.
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
+# Dashboard payloads are cached per company id, and ids repeat across test
+# cases; tests that exercise the cache enable it with override_settings.
+DASHBOARD_CACHE_TIMEOUT = 0